@@ -39,6 +39,10 @@ class BenchmarkDataset(object):
     """Returns the path to the dataset file."""
     raise NotImplementedError()
 
+  def csv_dataset_path(self):
+    """Returns the path to the raw CSV dataset file, with a header line."""
+    raise NotImplementedError()
+
   def tf_metadata_schema_path(self):
     """Returns the path to the tf.Metadata schema file."""
     raise NotImplementedError()
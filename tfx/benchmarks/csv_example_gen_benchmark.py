@@ -0,0 +1,162 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""CsvExampleGen benchmark."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import tempfile
+import time
+
+# Standard Imports
+
+from absl import flags
+from absl import logging
+import apache_beam as beam
+from apache_beam.runners.portability import fn_api_runner
+from tfx_bsl.coders import csv_decoder
+
+from tensorflow.python.platform import test  # pylint: disable=g-direct-tensorflow-import
+from tfx.benchmarks import benchmark_utils
+from tfx.components.example_gen.csv_example_gen import executor as csv_exgen
+from tfx.types import standard_artifacts
+from tfx.utils import io_utils
+
+FLAGS = flags.FLAGS
+
+
+def _write_scaled_csv(csv_path, scale_factor, output_dir):
+  """Writes the CSV file with its data lines repeated scale_factor times.
+
+  Args:
+    csv_path: Path to CSV file with a header line.
+    scale_factor: Number of times the data lines are repeated.
+    output_dir: Directory to write the scaled CSV file to.
+
+  Returns:
+    Tuple of (path to the scaled CSV file, number of data lines in it).
+  """
+  with open(csv_path, "r") as fp:
+    header = fp.readline()
+    lines = [line for line in fp if line.strip()]
+  scaled_csv_path = os.path.join(output_dir, "data.csv")
+  with open(scaled_csv_path, "w") as fp:
+    fp.write(header)
+    for _ in range(scale_factor):
+      fp.writelines(lines)
+  return scaled_csv_path, len(lines) * scale_factor
+
+
+def _infer_column_infos(csv_path):
+  """Infers CSV column infos outside of Beam, for the known-types benchmark."""
+  column_names = io_utils.load_csv_column_names(csv_path)
+  parse_fn = csv_decoder.ParseCSVLine(delimiter=",")
+  parse_fn.setup()
+  inferrer = csv_decoder.ColumnTypeInferrer(
+      column_names, skip_blank_lines=True)
+  accumulator = inferrer.create_accumulator()
+  with open(csv_path, "r") as fp:
+    next(fp)
+    for line in fp:
+      for cells in parse_fn.process(line):
+        accumulator = inferrer.add_input(accumulator, cells)
+  return inferrer.extract_output(accumulator)
+
+
+class CsvExampleGenBenchmark(test.Benchmark):
+  """CsvExampleGen benchmark."""
+
+  def __init__(self):
+    super(CsvExampleGenBenchmark, self).__init__()
+    self._dataset = benchmark_utils.get_dataset(FLAGS.dataset)
+    self._scaled_csv_path = None
+    self._num_examples = None
+
+  def _get_scaled_csv(self):
+    if self._scaled_csv_path is None:
+      logging.info("Writing CSV dataset scaled up %dx.",
+                   FLAGS.csv_scale_factor)
+      self._scaled_csv_path, self._num_examples = _write_scaled_csv(
+          self._dataset.csv_dataset_path(), FLAGS.csv_scale_factor,
+          tempfile.mkdtemp())
+    return self._scaled_csv_path, self._num_examples
+
+  def _run_and_report(self, name, pipeline, num_examples):
+    start = time.time()
+    result = pipeline.run()
+    result.wait_until_finish()
+    end = time.time()
+    delta = end - start
+
+    self.report_benchmark(
+        name=benchmark_utils.with_dataset_prefix(name, FLAGS.dataset),
+        iters=1,
+        wall_time=delta,
+        extras={
+            "num_examples": num_examples,
+            "examples_per_second": num_examples / delta,
+            "csv_scale_factor": FLAGS.csv_scale_factor,
+        })
+
+  def benchmarkCsvToExampleInferredColumnTypes(self):
+    """Benchmark _CsvToExample with column types inferred from the data.
+
+    Runs the CsvExampleGen conversion, including the global column type
+    inference pass, in a Beam pipeline. Records the wall time and throughput.
+    """
+    csv_path, num_examples = self._get_scaled_csv()
+    input_base = standard_artifacts.ExternalArtifact()
+    input_base.uri = os.path.dirname(csv_path)
+
+    pipeline = beam.Pipeline(runner=fn_api_runner.FnApiRunner())
+    _ = (
+        pipeline
+        | "CsvToExample" >> csv_exgen._CsvToExample(  # pylint: disable=protected-access
+            input_dict={csv_exgen.INPUT_KEY: [input_base]},
+            exec_properties={},
+            split_pattern=os.path.basename(csv_path)))
+    self._run_and_report("benchmarkCsvToExampleInferredColumnTypes", pipeline,
+                         num_examples)
+
+  def benchmarkCsvToExampleKnownColumnTypes(self):
+    """Benchmark the batched CSV to tf.Example conversion with known types.
+
+    Column types are computed up front, as they would be read from a schema,
+    so the pipeline is a single pass over the data. Records the wall time and
+    throughput.
+    """
+    csv_path, num_examples = self._get_scaled_csv()
+    column_infos = _infer_column_infos(self._dataset.csv_dataset_path())
+
+    pipeline = beam.Pipeline(runner=fn_api_runner.FnApiRunner())
+    _ = (
+        pipeline
+        | "ReadFromText" >> beam.io.ReadFromText(
+            file_pattern=csv_path, skip_header_lines=1)
+        | "ParseCSVLine" >> beam.ParDo(csv_decoder.ParseCSVLine(delimiter=","))
+        | "BatchCSVLines" >> beam.BatchElements()
+        | "ToTFExample" >> beam.ParDo(
+            csv_exgen._ParsedCsvToTfExample(column_infos)))  # pylint: disable=protected-access
+    self._run_and_report("benchmarkCsvToExampleKnownColumnTypes", pipeline,
+                         num_examples)
+
+
+if __name__ == "__main__":
+  flags.DEFINE_string("dataset", "chicago_taxi", "Dataset to run on.")
+  flags.DEFINE_integer(
+      "csv_scale_factor", 100,
+      "Number of times the CSV dataset is repeated for the benchmark.")
+  test.main()
@@ -44,6 +44,10 @@ class ChicagoTaxiDataset(benchmark_dataset.BenchmarkDataset):
   def dataset_path(self):
     return self.datasets_dir("chicago_taxi/data/taxi_1M.tfrecords.gz")
 
+  def csv_dataset_path(self):
+    return self.datasets_dir(
+        "../../examples/chicago_taxi_pipeline/data/simple/data.csv")
+
   def tf_metadata_schema_path(self):
     return self.datasets_dir(
         "../../examples/chicago_taxi_pipeline/data/user_provided_schema/"
@@ -99,6 +103,7 @@ class ChicagoTaxiDataset(benchmark_dataset.BenchmarkDataset):
                   column_names, skip_blank_lines=True)))
       _ = (
           parsed_csv_lines
+          | "BatchCSVLines" >> beam.BatchElements()
           | "ToTFExample" >> beam.ParDo(
               csv_exgen._ParsedCsvToTfExample(),  # pylint: disable=protected-access
               column_infos)
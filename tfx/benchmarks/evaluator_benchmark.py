@@ -0,0 +1,156 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Evaluator benchmark for evaluating several models in one data pass."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import tempfile
+import time
+
+# Standard Imports
+
+from absl import flags
+import apache_beam as beam
+from apache_beam.runners.portability import fn_api_runner
+import tensorflow as tf
+import tensorflow_model_analysis as tfma
+
+from tensorflow.python.platform import test  # pylint: disable=g-direct-tensorflow-import
+from tfx.benchmarks import benchmark_utils
+
+FLAGS = flags.FLAGS
+
+_METRICS_NAMESPACE = "evaluator_benchmark"
+
+
+def _write_eval_split(dataset, max_num_examples, output_dir):
+  """Writes up to max_num_examples raw examples as an eval split.
+
+  Args:
+    dataset: The BenchmarkDataset to write.
+    max_num_examples: Maximum number of examples to write.
+    output_dir: Directory to write the eval split to.
+
+  Returns:
+    Path to the written file.
+  """
+  path = os.path.join(output_dir, "eval.tfrecords.gz")
+  with tf.io.TFRecordWriter(path, "GZIP") as writer:
+    for example_bytes in dataset.read_raw_dataset(
+        deserialize=False, limit=max_num_examples):
+      writer.write(example_bytes)
+  return path
+
+
+def _count_read(record):
+  beam.metrics.Metrics.counter(_METRICS_NAMESPACE, "records_read").inc()
+  beam.metrics.Metrics.counter(_METRICS_NAMESPACE,
+                               "bytes_read").inc(len(record))
+  return record
+
+
+def _get_counter(result, name):
+  counters = result.metrics().query(
+      beam.metrics.MetricsFilter().with_name(name))["counters"]
+  return sum(counter.committed for counter in counters)
+
+
+class EvaluatorBenchmark(test.Benchmark):
+  """Evaluator benchmark."""
+
+  def __init__(self):
+    super(EvaluatorBenchmark, self).__init__()
+    self._dataset = benchmark_utils.get_dataset(FLAGS.dataset)
+    self._eval_split_path = None
+
+  def _get_eval_split(self):
+    if self._eval_split_path is None:
+      self._eval_split_path = _write_eval_split(
+          self._dataset, FLAGS.evaluator_max_num_examples, tempfile.mkdtemp())
+    return self._eval_split_path
+
+  def _run_and_report(self, name, num_models):
+    """Evaluates num_models models the way the Evaluator executor does.
+
+    The eval split is read once and fed to all models in a single
+    ExtractEvaluateAndWriteResults, so the records and bytes read should stay
+    the same as num_models grows.
+
+    Args:
+      name: Name of the benchmark.
+      num_models: Number of models to evaluate.
+    """
+    model_names = ["model_%d" % i for i in range(num_models)]
+    eval_config = tfma.EvalConfig(model_specs=[
+        tfma.ModelSpec(name=model_name, signature_name="eval")
+        for model_name in model_names
+    ])
+    models = {
+        model_name: tfma.default_eval_shared_model(
+            eval_saved_model_path=self._dataset.tfma_saved_model_path())
+        for model_name in model_names
+    }
+
+    pipeline = beam.Pipeline(runner=fn_api_runner.FnApiRunner())
+    _ = (
+        pipeline
+        | "ReadData" >> beam.io.ReadFromTFRecord(
+            file_pattern=self._get_eval_split())
+        | "CountRead" >> beam.Map(_count_read)
+        | "ExtractEvaluateAndWriteResults" >>
+        tfma.ExtractEvaluateAndWriteResults(
+            eval_shared_model=models,
+            eval_config=eval_config,
+            output_path=tempfile.mkdtemp()))
+
+    start = time.time()
+    result = pipeline.run()
+    result.wait_until_finish()
+    end = time.time()
+    delta = end - start
+
+    records_read = _get_counter(result, "records_read")
+    self.report_benchmark(
+        name=benchmark_utils.with_dataset_prefix(name, FLAGS.dataset),
+        iters=1,
+        wall_time=delta,
+        extras={
+            "num_models": num_models,
+            "records_read": records_read,
+            "bytes_read": _get_counter(result, "bytes_read"),
+            "model_examples_per_second": records_read * num_models / delta,
+        })
+
+  def benchmarkEvaluate1Model(self):
+    """Benchmark evaluating a single model."""
+    self._run_and_report("benchmarkEvaluate1Model", 1)
+
+  def benchmarkEvaluate2Models(self):
+    """Benchmark evaluating 2 models in one pass over the eval split."""
+    self._run_and_report("benchmarkEvaluate2Models", 2)
+
+  def benchmarkEvaluate4Models(self):
+    """Benchmark evaluating 4 models in one pass over the eval split."""
+    self._run_and_report("benchmarkEvaluate4Models", 4)
+
+
+if __name__ == "__main__":
+  flags.DEFINE_string("dataset", "chicago_taxi", "Dataset to run on.")
+  flags.DEFINE_integer(
+      "evaluator_max_num_examples", 100000,
+      "Maximum number of examples of the dataset in the eval split.")
+  test.main()
@@ -0,0 +1,130 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark for reading Transform outputs in each materialization format."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import tempfile
+import time
+
+# Standard Imports
+
+from absl import flags
+import apache_beam as beam
+from apache_beam.runners.portability import fn_api_runner
+import pyarrow.parquet as pq
+import tensorflow as tf
+import tensorflow_transform as tft
+
+from tensorflow.python.platform import test  # pylint: disable=g-direct-tensorflow-import
+from tfx.benchmarks import benchmark_utils
+from tfx.components.transform import executor
+from tfx.components.transform import labels
+from tfx.utils import io_utils
+from tensorflow_metadata.proto.v0 import schema_pb2
+
+FLAGS = flags.FLAGS
+
+
+def _materialize(dataset, file_format, compression, output_dir):
+  """Writes the raw examples the way Transform materializes its outputs.
+
+  Args:
+    dataset: The BenchmarkDataset to write.
+    file_format: One of labels.FORMAT_*.
+    compression: One of labels.COMPRESSION_*, ignored for Parquet.
+    output_dir: Directory to write the files to.
+
+  Returns:
+    List of paths to the written files.
+  """
+  schema = io_utils.parse_pbtxt_file(dataset.tf_metadata_schema_path(),
+                                     schema_pb2.Schema())
+  prefix = os.path.join(output_dir, "examples")
+  with beam.Pipeline(runner=fn_api_runner.FnApiRunner()) as pipeline:
+    raw_examples = pipeline | "Create" >> beam.Create(
+        dataset.read_raw_dataset(deserialize=False))
+    if file_format == labels.FORMAT_PARQUET:
+      _ = (
+          raw_examples
+          | "Decode" >> beam.Map(
+              tft.coders.ExampleProtoCoder(schema).decode)
+          | "Write" >> executor.Executor._WriteParquet(  # pylint: disable=protected-access
+              schema, prefix))
+    else:
+      _ = (
+          raw_examples
+          | "Parse" >> beam.Map(
+              lambda x: (None, tf.train.Example.FromString(x)))
+          | "Write" >> executor.Executor._WriteExamples(  # pylint: disable=protected-access
+              file_format, prefix, compression=compression))
+  return tf.io.gfile.glob(prefix + "*")
+
+
+class TransformOutputReadBenchmark(test.Benchmark):
+  """Benchmark for reading Transform outputs in each materialization format."""
+
+  def __init__(self):
+    super(TransformOutputReadBenchmark, self).__init__()
+    self._dataset = benchmark_utils.get_dataset(FLAGS.dataset)
+
+  def _run_and_report(self, name, file_format, compression, read_fn):
+    """Materializes the dataset, then times read_fn over the written files."""
+    file_paths = _materialize(self._dataset, file_format, compression,
+                              tempfile.mkdtemp())
+    total_bytes = sum(tf.io.gfile.stat(p).length for p in file_paths)
+
+    start = time.time()
+    num_examples = sum(read_fn(p) for p in file_paths)
+    end = time.time()
+    delta = end - start
+
+    self.report_benchmark(
+        name=benchmark_utils.with_dataset_prefix(name, FLAGS.dataset),
+        iters=1,
+        wall_time=delta,
+        extras={
+            "num_examples": num_examples,
+            "examples_per_second": num_examples / delta,
+            "total_bytes": total_bytes,
+        })
+
+  def benchmarkReadTFRecordGzip(self):
+    """Benchmark reading gzip compressed TFRecord files (the default)."""
+    options = tf.compat.v1.io.TFRecordOptions(
+        tf.compat.v1.io.TFRecordCompressionType.GZIP)
+    self._run_and_report(
+        "benchmarkReadTFRecordGzip", labels.FORMAT_TFRECORD,
+        labels.COMPRESSION_GZIP, lambda p: sum(
+            1 for _ in tf.compat.v1.io.tf_record_iterator(p, options)))
+
+  def benchmarkReadTFRecord(self):
+    """Benchmark reading uncompressed TFRecord files."""
+    self._run_and_report(
+        "benchmarkReadTFRecord", labels.FORMAT_TFRECORD,
+        labels.COMPRESSION_UNCOMPRESSED,
+        lambda p: sum(1 for _ in tf.compat.v1.io.tf_record_iterator(p)))
+
+  def benchmarkReadParquet(self):
+    """Benchmark reading Parquet files."""
+    self._run_and_report("benchmarkReadParquet", labels.FORMAT_PARQUET, None,
+                         lambda p: pq.read_table(p).num_rows)
+
+
+if __name__ == "__main__":
+  flags.DEFINE_string("dataset", "chicago_taxi", "Dataset to run on.")
+  test.main()
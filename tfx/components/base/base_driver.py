@@ -18,7 +18,7 @@ from __future__ import division
 from __future__ import print_function
 
 import os
-from typing import Any, Dict, List, Text
+from typing import Any, Dict, List, Text, Type
 
 import absl
 import tensorflow as tf
@@ -150,6 +150,65 @@ class BaseDriver(object):
             producer_component_id=input_channel.producer_info.component_id)
     return result
 
+  def resolve_previous_artifacts(
+      self,
+      input_artifacts: Dict[Text, List[types.Artifact]],
+      exec_properties: Dict[Text, Any],  # pylint: disable=unused-argument
+      pipeline_info: data_types.PipelineInfo,  # pylint: disable=unused-argument
+      component_info: data_types.ComponentInfo,  # pylint: disable=unused-argument
+  ) -> Dict[Text, List[types.Artifact]]:
+    """Resolve input artifacts produced by earlier runs of the component.
+
+    Called after resolve_input_artifacts(). Subclasses might override this
+    function to resolve inputs such as caches from the outputs of earlier
+    executions of the same component, see _fetch_previous_outputs().
+
+    Args:
+      input_artifacts: Input artifacts from resolve_input_artifacts().
+      exec_properties: Dict of other execution properties, e.g., configs.
+      pipeline_info: An instance of data_types.PipelineInfo, holding pipeline
+        related properties including pipeline_name, pipeline_root and run_id
+      component_info: An instance of data_types.ComponentInfo, holding component
+        related properties including component_type and component_id.
+
+    Returns:
+      Final input artifacts that will be used in execution.
+    """
+    return input_artifacts
+
+  def _fetch_previous_outputs(
+      self, pipeline_info: data_types.PipelineInfo,
+      component_info: data_types.ComponentInfo,
+      artifact_type: Type[types.Artifact]) -> List[types.Artifact]:
+    """Fetches the published outputs of a type of earlier component runs.
+
+    Args:
+      pipeline_info: An instance of data_types.PipelineInfo. Only artifacts in
+        the context of the pipeline are fetched.
+      component_info: An instance of data_types.ComponentInfo. Only artifacts
+        produced by the component with its component_id are fetched.
+      artifact_type: Type of the artifacts to fetch.
+
+    Returns:
+      The artifacts, ordered by id, i.e. the latest one last.
+    """
+    pipeline_context = self._metadata_handler.get_pipeline_context(
+        pipeline_info)
+    if pipeline_context is None:
+      return []
+    type_name = artifact_type.TYPE_NAME
+    result = []
+    for mlmd_artifact in sorted(
+        self._metadata_handler.get_published_artifacts_by_type_within_context(
+            [type_name], pipeline_context.id).get(type_name, []),
+        key=lambda a: a.id):
+      if (mlmd_artifact.custom_properties['producer_component'].string_value
+          == component_info.component_id):
+        artifact = artifact_type()
+        artifact.set_mlmd_artifact(mlmd_artifact)
+        result.append(artifact)
+    return result
+
   def resolve_exec_properties(
       self,
       exec_properties: Dict[Text, Any],
@@ -232,6 +291,10 @@ class BaseDriver(object):
                                                    component_info)
     input_artifacts = self.resolve_input_artifacts(input_dict, exec_properties,
                                                    driver_args, pipeline_info)
+    input_artifacts = self.resolve_previous_artifacts(input_artifacts,
+                                                      exec_properties,
+                                                      pipeline_info,
+                                                      component_info)
     self.verify_input_artifacts(artifacts_dict=input_artifacts)
     absl.logging.debug('Resolved input artifacts are: %s', input_artifacts)
     # Step 2. Register execution in metadata.
@@ -143,6 +143,24 @@ class BaseDriverTest(tf.test.TestCase):
     self.assertCountEqual(execution_decision.output_dict,
                           self._output_artifacts)
 
+  def testFetchPreviousOutputs(self):
+    outputs = []
+    for aid, component_id in [(3, 'my_component_id'), (1, 'my_component_id'),
+                              (2, 'other_component_id')]:
+      artifact = _OutputArtifact()
+      artifact.id = aid
+      artifact.producer_component = component_id
+      outputs.append(artifact.mlmd_artifact)
+    get_artifacts = (
+        self._mock_metadata.get_published_artifacts_by_type_within_context)
+    get_artifacts.return_value = {_OutputArtifact.TYPE_NAME: outputs}
+    driver = base_driver.BaseDriver(metadata_handler=self._mock_metadata)
+    result = driver._fetch_previous_outputs(self._pipeline_info,
+                                            self._component_info,
+                                            _OutputArtifact)
+    self.assertEqual([1, 3], [a.id for a in result])
+    self.assertIsInstance(result[0], _OutputArtifact)
+
   def testVerifyInputArtifactsOk(self):
     driver = base_driver.BaseDriver(metadata_handler=self._mock_metadata)
     driver.verify_input_artifacts(self._input_artifacts)
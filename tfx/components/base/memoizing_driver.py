@@ -0,0 +1,124 @@
+# Lint as: python2, python3
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Driver which memoizes the results of light components by input content."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Text
+
+import absl
+import tensorflow as tf
+
+from tfx import types
+from tfx.components.base import base_driver
+from tfx.orchestration import data_types
+from tfx.types import artifact
+from tfx.utils import io_utils
+
+# Custom property of output artifacts holding the fingerprint of the inputs and
+# execution properties they were computed from.
+INPUT_FINGERPRINT_PROPERTY = 'input_fingerprint'
+
+
+class MemoizingDriver(base_driver.BaseDriver):
+  """Driver which reuses the outputs of earlier runs on identical inputs.
+
+  The outputs of light components such as SchemaGen and ExampleValidator only
+  depend on the content of their inputs and on their execution properties.
+  This driver fingerprints both and records the fingerprint on the output
+  artifacts. When caching is enabled and a published artifact in the metadata
+  store carries the same fingerprint, its files are copied to the new output
+  and the executor is not run. The fingerprint covers the component type, so
+  the outputs of any pipeline sharing the store can be reused.
+  """
+
+  def _get_input_fingerprint(self, input_dict: Dict[Text,
+                                                    List[types.Artifact]],
+                             exec_properties: Dict[Text, Any],
+                             component_type: Text) -> Text:
+    """Computes the fingerprint of input contents and execution properties."""
+    hasher = hashlib.sha256()
+    hasher.update(component_type.encode('utf-8'))
+    hasher.update(
+        json.dumps(exec_properties, sort_keys=True, default=str).encode(
+            'utf-8'))
+    for key in sorted(input_dict):
+      hasher.update(key.encode('utf-8'))
+      for input_artifact in input_dict[key]:
+        io_utils.update_hash_with_dir_content(hasher, input_artifact.uri)
+    return hasher.hexdigest()
+
+  def _find_memoized_artifact(self, output_artifact: types.Artifact,
+                              fingerprint: Text) -> Optional[types.Artifact]:
+    """Finds the latest published artifact computed with given fingerprint."""
+    candidates = []
+    for mlmd_artifact in self._metadata_handler.get_artifacts_by_type(
+        output_artifact.type_name):
+      if (mlmd_artifact.custom_properties[INPUT_FINGERPRINT_PROPERTY]
+          .string_value != fingerprint):
+        continue
+      candidate = type(output_artifact)()
+      candidate.set_mlmd_artifact(mlmd_artifact)
+      if (candidate.state == artifact.ArtifactState.PUBLISHED and
+          tf.io.gfile.exists(candidate.uri)):
+        candidates.append(candidate)
+    if not candidates:
+      return None
+    return max(candidates, key=lambda a: a.id)
+
+  def pre_execution(
+      self,
+      input_dict: Dict[Text, types.Channel],
+      output_dict: Dict[Text, types.Channel],
+      exec_properties: Dict[Text, Any],
+      driver_args: data_types.DriverArgs,
+      pipeline_info: data_types.PipelineInfo,
+      component_info: data_types.ComponentInfo,
+  ) -> data_types.ExecutionDecision:
+    """Overrides BaseDriver.pre_execution()."""
+    execution_decision = super(MemoizingDriver, self).pre_execution(
+        input_dict, output_dict, exec_properties, driver_args, pipeline_info,
+        component_info)
+    if execution_decision.use_cached_results:
+      return execution_decision
+
+    base_fingerprint = self._get_input_fingerprint(
+        execution_decision.input_dict, execution_decision.exec_properties,
+        component_info.component_type)
+    memoized_outputs = []
+    for key, output_list in execution_decision.output_dict.items():
+      for index, output_artifact in enumerate(output_list):
+        fingerprint = hashlib.sha256('{}:{}:{}'.format(
+            base_fingerprint, key, index).encode('utf-8')).hexdigest()
+        output_artifact.set_string_custom_property(INPUT_FINGERPRINT_PROPERTY,
+                                                   fingerprint)
+        if driver_args.enable_cache:
+          memoized_outputs.append(
+              (self._find_memoized_artifact(output_artifact, fingerprint),
+               output_artifact))
+
+    if memoized_outputs and all(m is not None for m, _ in memoized_outputs):
+      for memoized, output_artifact in memoized_outputs:
+        absl.logging.info('Reusing memoized output %s for %s', memoized.uri,
+                          output_artifact.uri)
+        io_utils.copy_dir(memoized.uri, output_artifact.uri)
+      execution_decision.use_cached_results = True
+    # With use_cached_results set the launcher skips the executor. The
+    # execution is not in a final state, so the outputs are still published.
+    return execution_decision
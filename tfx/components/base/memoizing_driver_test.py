@@ -0,0 +1,147 @@
+# Lint as: python2, python3
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for tfx.components.base.memoizing_driver."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import mock
+import tensorflow as tf
+from ml_metadata.proto import metadata_store_pb2
+from tfx import types
+from tfx.components.base import memoizing_driver
+from tfx.orchestration import data_types
+from tfx.types import artifact
+from tfx.types import channel
+from tfx.utils import io_utils
+
+
+class _InputArtifact(types.Artifact):
+  TYPE_NAME = 'InputArtifact'
+
+
+class _OutputArtifact(types.Artifact):
+  TYPE_NAME = 'OutputArtifact'
+
+
+class MemoizingDriverTest(tf.test.TestCase):
+
+  def setUp(self):
+    super(MemoizingDriverTest, self).setUp()
+    self._mock_metadata = tf.compat.v1.test.mock.Mock()
+    self._temp_dir = os.path.join(
+        os.environ.get('TEST_TMP_DIR', self.get_temp_dir()),
+        self._testMethodName)
+    input_artifact = _InputArtifact()
+    input_artifact.id = 1
+    input_artifact.uri = os.path.join(self._temp_dir, 'input_data', '1')
+    io_utils.write_string_file(
+        os.path.join(input_artifact.uri, 'data'), 'input content')
+    self._input_dict = {
+        'input_data':
+            types.Channel(
+                type=_InputArtifact,
+                artifacts=[input_artifact],
+                producer_info=channel.ChannelProducerInfo(
+                    component_id='c', key='k'))
+    }
+    self._mock_metadata.search_artifacts.return_value = [input_artifact]
+    self._mock_metadata.get_cached_outputs.return_value = None
+    self._mock_metadata.get_artifacts_by_type.return_value = []
+    self._exec_properties = {
+        'key': 'value',
+    }
+    self._driver_args = data_types.DriverArgs(enable_cache=True)
+    self._pipeline_info = data_types.PipelineInfo(
+        pipeline_name='my_pipeline_name',
+        pipeline_root=os.path.join(self._temp_dir, 'pipeline_root'),
+        run_id='my_run_id')
+    self._component_info = data_types.ComponentInfo(
+        component_type='a.b.c',
+        component_id='my_component_id',
+        pipeline_info=self._pipeline_info)
+
+  def _pre_execution(self, driver_class, execution_id):
+    execution = metadata_store_pb2.Execution()
+    execution.id = execution_id
+    self._mock_metadata.register_execution.return_value = execution
+    driver = driver_class(metadata_handler=self._mock_metadata)
+    return driver.pre_execution(
+        input_dict=self._input_dict,
+        output_dict={
+            'output_data':
+                types.Channel(
+                    type=_OutputArtifact, artifacts=[_OutputArtifact()])
+        },
+        exec_properties=self._exec_properties,
+        driver_args=self._driver_args,
+        pipeline_info=self._pipeline_info,
+        component_info=self._component_info)
+
+  def _publish(self, output_artifact, content):
+    io_utils.write_string_file(
+        os.path.join(output_artifact.uri, 'result'), content)
+    output_artifact.id = 10
+    output_artifact.state = artifact.ArtifactState.PUBLISHED
+    self._mock_metadata.get_artifacts_by_type.return_value = [
+        output_artifact.mlmd_artifact
+    ]
+
+  @mock.patch(
+      'tfx.components.base.base_driver.BaseDriver.verify_input_artifacts')
+  def testPreExecutionMemoMiss(self, mock_verify_input_artifacts_fn):
+    execution_decision = self._pre_execution(memoizing_driver.MemoizingDriver,
+                                              100)
+    self.assertFalse(execution_decision.use_cached_results)
+    output_artifact = execution_decision.output_dict['output_data'][0]
+    self.assertTrue(
+        output_artifact.get_string_custom_property(
+            memoizing_driver.INPUT_FINGERPRINT_PROPERTY))
+
+  @mock.patch(
+      'tfx.components.base.base_driver.BaseDriver.verify_input_artifacts')
+  def testPreExecutionMemoHit(self, mock_verify_input_artifacts_fn):
+    previous_output = self._pre_execution(memoizing_driver.MemoizingDriver,
+                                          100).output_dict['output_data'][0]
+    self._publish(previous_output, 'memoized')
+
+    execution_decision = self._pre_execution(memoizing_driver.MemoizingDriver,
+                                             101)
+    self.assertTrue(execution_decision.use_cached_results)
+    output_artifact = execution_decision.output_dict['output_data'][0]
+    self.assertNotEqual(previous_output.uri, output_artifact.uri)
+    self.assertEqual(
+        'memoized',
+        tf.io.gfile.GFile(os.path.join(output_artifact.uri,
+                                       'result')).read())
+
+  @mock.patch(
+      'tfx.components.base.base_driver.BaseDriver.verify_input_artifacts')
+  def testPreExecutionMemoMissOnChangedInput(self,
+                                             mock_verify_input_artifacts_fn):
+    previous_output = self._pre_execution(memoizing_driver.MemoizingDriver,
+                                          100).output_dict['output_data'][0]
+    self._publish(previous_output, 'memoized')
+
+    self._exec_properties['key'] = 'other_value'
+    execution_decision = self._pre_execution(memoizing_driver.MemoizingDriver,
+                                             101)
+    self.assertFalse(execution_decision.use_cached_results)
+
+
+if __name__ == '__main__':
+  tf.test.main()
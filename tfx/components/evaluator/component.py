@@ -86,14 +86,17 @@ class Evaluator(base_component.BaseComponent):
       output: Optional[types.Channel] = None,
       model_exports: Optional[types.Channel] = None,
       instance_name: Optional[Text] = None,
-      eval_config: Optional[tfma.EvalConfig] = None):
+      eval_config: Optional[tfma.EvalConfig] = None,
+      eval_sampling_config: Optional[evaluator_pb2.EvalSamplingConfig] = None):
     """Construct an Evaluator component.
 
     Args:
       examples: A Channel of type `standard_artifacts.Examples`, usually
         produced by an ExampleGen component. _required_
       model: A Channel of type `standard_artifacts.Model`, usually produced by
-        a Trainer component.
+        a Trainer component. It may hold several candidate models, e.g. from a
+        ResolverNode, to which the non baseline model_specs of eval_config are
+        matched in order. All models are evaluated in one pass over the data.
       baseline_model: An optional channel of type 'standard_artifacts.Model' as
         the baseline model for model diff and model validation purpose.
       feature_slicing_spec:
@@ -116,7 +119,12 @@ class Evaluator(base_component.BaseComponent):
         in the input arguments.
       eval_config: Instance of tfma.EvalConfig containg configuration settings
         for running the evaluation. This config has options for both estimator
-        and Keras.
+        and Keras. It may have any number of model_specs, at most one of
+        which is the baseline.
+      eval_sampling_config: Optional `evaluator_pb2.EvalSamplingConfig`
+        instance. If set, the models are evaluated on a sample of the eval
+        split, e.g. to bound the evaluation time of CI pipelines, and the sample
+        size is recorded on the output. By default, all examples are used.
     """
     if eval_config is not None and feature_slicing_spec is not None:
       raise ValueError("Exactly one of 'eval_config' or 'feature_slicing_spec' "
@@ -147,5 +155,6 @@ class Evaluator(base_component.BaseComponent):
         feature_slicing_spec=feature_slicing_spec,
         fairness_indicator_thresholds=fairness_indicator_thresholds,
         evaluation=evaluation,
-        eval_config=eval_config)
+        eval_config=eval_config,
+        eval_sampling_config=eval_sampling_config)
     super(Evaluator, self).__init__(spec=spec, instance_name=instance_name)
@@ -78,6 +78,18 @@ class ComponentTest(tf.test.TestCase):
     self.assertEqual(standard_artifacts.ModelEvaluation.TYPE_NAME,
                      evaluator.outputs['evaluation'].type_name)
 
+  def testConstructWithEvalSamplingConfig(self):
+    examples = standard_artifacts.Examples()
+    model_exports = standard_artifacts.Model()
+    evaluator = component.Evaluator(
+        examples=channel_utils.as_channel([examples]),
+        model=channel_utils.as_channel([model_exports]),
+        eval_sampling_config=evaluator_pb2.EvalSamplingConfig(
+            fraction=0.1, stratify_by_slices=True))
+    self.assertEqual(standard_artifacts.ModelEvaluation.TYPE_NAME,
+                     evaluator.outputs['evaluation'].type_name)
+    self.assertIn('eval_sampling_config', evaluator.exec_properties)
+
   def testConstructWithParameter(self):
     column_name = data_types.RuntimeParameter(name='column-name', ptype=Text)
     threshold = data_types.RuntimeParameter(name='threshold', ptype=float)
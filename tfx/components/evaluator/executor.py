@@ -21,13 +21,13 @@ from __future__ import print_function
 from typing import Any, Dict, List, Text
 
 import absl
-import apache_beam as beam
 import tensorflow as tf
 import tensorflow_model_analysis as tfma
 
 from google.protobuf import json_format
 from tfx import types
 from tfx.components.base import base_executor
+from tfx.components.util import eval_sampling
 from tfx.proto import evaluator_pb2
 from tfx.types import artifact_utils
 from tfx.utils import io_utils
@@ -73,9 +73,14 @@ class Executor(base_executor.BaseExecutor):
          exec_properties: Dict[Text, Any]) -> None:
     """Runs a batch job to evaluate the eval_model against the given input.
 
+    All models are evaluated in a single pass over the eval split: the
+    examples are read and decoded once and fed to every model.
+
     Args:
       input_dict: Input dict from input key to a list of Artifacts.
-        - model_exports: exported model.
+        - model_exports: exported models. With an eval_config, the non
+          baseline model_specs are matched in order to the models, or all
+          use the model if there is only one.
         - examples: examples for eval the model.
       output_dict: Output dict from output key to a list of Artifacts.
         - output: model evaluation results.
@@ -84,6 +89,9 @@ class Executor(base_executor.BaseExecutor):
         - feature_slicing_spec: JSON string of evaluator_pb2.FeatureSlicingSpec
           instance, providing the way to slice the data. Deprecated, use
           eval_config.slicing_specs instead.
+        - eval_sampling_config: Optionally, a JSON string of
+          evaluator_pb2.EvalSamplingConfig instance, to evaluate on a sample
+          of the eval split. The sample size is recorded on the output.
 
     Returns:
       None
@@ -94,10 +102,6 @@ class Executor(base_executor.BaseExecutor):
       raise ValueError('MODEL_KEY is missing from input dict.')
     if EVALUATION_KEY not in output_dict:
       raise ValueError('EVALUATION_KEY is missing from output dict.')
-    if len(input_dict[MODEL_KEY]) > 1:
-      raise ValueError(
-          'There can be only one candidate model, there are {}.'.format(
-              len(input_dict[MODEL_KEY])))
     if BASELINE_MODEL_KEY in input_dict and len(
         input_dict[BASELINE_MODEL_KEY]) > 1:
       raise ValueError(
@@ -121,9 +125,8 @@ class Executor(base_executor.BaseExecutor):
               thresholds=fairness_indicator_thresholds),
       ]
 
-    def _get_eval_saved_model(artifact: List[types.Artifact],
+    def _get_eval_saved_model(model_uri: Text,
                               tags=None) -> tfma.EvalSharedModel:
-      model_uri = artifact_utils.get_single_uri(artifact)
       if tags and tf.saved_model.SERVING in tags:
         model_path = path_utils.serving_model_path(model_uri)
       else:
@@ -139,14 +142,25 @@ class Executor(base_executor.BaseExecutor):
       slice_spec = None
       eval_config = tfma.EvalConfig()
       json_format.Parse(exec_properties['eval_config'], eval_config)
-      if len(eval_config.model_specs) > 2:
-        raise ValueError(
-            """Cannot support more than two models. There are {} models in this
-             eval_config.""".format(len(eval_config.model_specs)))
+      slice_features = sorted(
+          set(key for spec in eval_config.slicing_specs
+              for key in list(spec.feature_keys) + list(spec.feature_values)))
       models = {}
       if not eval_config.model_specs:
         eval_config.model_specs.add()
+      candidate_specs = [
+          spec for spec in eval_config.model_specs if not spec.is_baseline
+      ]
+      model_uris = [artifact.uri for artifact in input_dict[MODEL_KEY]]
+      if len(model_uris) == 1:
+        model_uris *= len(candidate_specs)
+      elif len(model_uris) != len(candidate_specs):
+        raise ValueError(
+            'There are {} candidate models but {} non baseline model_specs in '
+            'eval_config.'.format(len(model_uris), len(candidate_specs)))
+      candidate_model_uris = iter(model_uris)
       for model_spec in eval_config.model_specs:
+        tags = None
         if model_spec.signature_name != 'eval':
           tags = [tf.saved_model.SERVING]
         if model_spec.is_baseline:
@@ -155,12 +169,13 @@ class Executor(base_executor.BaseExecutor):
                 """No baseline model is present in Evaluator, check whether a
                  baseline is provided to the Executor.""")
           models[model_spec.name] = _get_eval_saved_model(
-              input_dict[BASELINE_MODEL_KEY], tags)
+              artifact_utils.get_single_uri(input_dict[BASELINE_MODEL_KEY]),
+              tags)
           absl.logging.info('Using {} as baseline model.'.format(
               models[model_spec.name].model_path))
         else:
           models[model_spec.name] = _get_eval_saved_model(
-              input_dict[MODEL_KEY], tags)
+              next(candidate_model_uris), tags)
           absl.logging.info('Using {} for model eval.'.format(
               models[model_spec.name].model_path))
     else:
@@ -173,21 +188,42 @@ class Executor(base_executor.BaseExecutor):
                         feature_slicing_spec)
       slice_spec = self._get_slice_spec_from_feature_slicing_spec(
           feature_slicing_spec)
-      models = _get_eval_saved_model(input_dict[MODEL_KEY])
+      slice_features = sorted(
+          set(column for spec in feature_slicing_spec.specs
+              for column in spec.column_for_slicing))
+      models = _get_eval_saved_model(
+          artifact_utils.get_single_uri(input_dict[MODEL_KEY]))
       absl.logging.info('Using {} for model eval.'.format(models.model_path))
 
+    eval_sampling_config = evaluator_pb2.EvalSamplingConfig()
+    if exec_properties.get('eval_sampling_config'):
+      json_format.Parse(exec_properties['eval_sampling_config'],
+                        eval_sampling_config)
+
     absl.logging.info('Evaluating model.')
     with self._make_beam_pipeline() as pipeline:
+      eval_data = (
+          pipeline
+          | 'ReadData' >> eval_sampling.ReadEvalExamples(  # pylint: disable=no-value-for-parameter
+              io_utils.all_files_pattern(
+                  artifact_utils.get_split_uri(input_dict[EXAMPLES_KEY],
+                                               'eval')), eval_sampling_config,
+              slice_features))
       # pylint: disable=expression-not-assigned
-      (pipeline
-       | 'ReadData' >> beam.io.ReadFromTFRecord(
-           file_pattern=io_utils.all_files_pattern(
-               artifact_utils.get_split_uri(input_dict[EXAMPLES_KEY], 'eval')))
+      (eval_data
        |
        'ExtractEvaluateAndWriteResults' >> tfma.ExtractEvaluateAndWriteResults(
            eval_shared_model=models,
            eval_config=eval_config,
            output_path=output_uri,
            slice_spec=slice_spec))
+      if eval_sampling.is_sampled(eval_sampling_config):
+        (eval_data
+         | 'WriteSampleSize' >> eval_sampling.WriteSampleSize(output_uri))  # pylint: disable=no-value-for-parameter
     absl.logging.info(
         'Evaluation complete. Results written to {}.'.format(output_uri))
+
+    if eval_sampling.is_sampled(eval_sampling_config):
+      eval_sampling.record_sampling(
+          artifact_utils.get_single_instance(output_dict[EVALUATION_KEY]),
+          output_uri, eval_sampling_config)
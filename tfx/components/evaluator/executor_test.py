@@ -167,6 +167,123 @@ class ExecutorTest(tf.test.TestCase, absl.testing.parameterized.TestCase):
         tf.io.gfile.exists(os.path.join(eval_output.uri, 'metrics')))
     self.assertTrue(tf.io.gfile.exists(os.path.join(eval_output.uri, 'plots')))
 
+  def testDoWithMultipleCandidates(self):
+    source_data_dir = os.path.join(
+        os.path.dirname(os.path.dirname(__file__)), 'testdata')
+    output_data_dir = os.path.join(
+        os.environ.get('TEST_UNDECLARED_OUTPUTS_DIR', self.get_temp_dir()),
+        self._testMethodName)
+
+    # Create input dict.
+    examples = standard_artifacts.Examples()
+    examples.uri = os.path.join(source_data_dir, 'csv_example_gen')
+    examples.split_names = artifact_utils.encode_split_names(['train', 'eval'])
+    models = []
+    for model_dir in ['trainer/current', 'trainer/previous', 'trainer/current']:
+      model = standard_artifacts.Model()
+      model.uri = os.path.join(source_data_dir, model_dir)
+      models.append(model)
+    baseline_model = standard_artifacts.Model()
+    baseline_model.uri = os.path.join(source_data_dir, 'trainer/previous/')
+    input_dict = {
+        executor.EXAMPLES_KEY: [examples],
+        executor.MODEL_KEY: models,
+        executor.BASELINE_MODEL_KEY: [baseline_model],
+    }
+
+    # Create output dict.
+    eval_output = standard_artifacts.ModelEvaluation()
+    eval_output.uri = os.path.join(output_data_dir, 'eval_output')
+    output_dict = {executor.EVALUATION_KEY: [eval_output]}
+
+    model_specs = [tfma.ModelSpec(name='baseline', is_baseline=True)]
+    model_specs.extend(
+        tfma.ModelSpec(name='candidate_{}'.format(i)) for i in range(3))
+    exec_properties = {
+        'eval_config':
+            json_format.MessageToJson(
+                tfma.EvalConfig(
+                    model_specs=model_specs,
+                    slicing_specs=[
+                        tfma.SlicingSpec(feature_keys=['trip_start_hour'])
+                    ]),
+                preserving_proto_field_name=True)
+    }
+
+    # Run executor.
+    evaluator = executor.Executor()
+    evaluator.Do(input_dict, output_dict, exec_properties)
+
+    # Check evaluator outputs.
+    self.assertTrue(
+        tf.io.gfile.exists(os.path.join(eval_output.uri, 'eval_config.json')))
+    self.assertTrue(
+        tf.io.gfile.exists(os.path.join(eval_output.uri, 'metrics')))
+
+    # The candidate models must match the non baseline model_specs.
+    input_dict[executor.MODEL_KEY] = models[:2]
+    with self.assertRaises(ValueError):
+      evaluator.Do(input_dict, output_dict, exec_properties)
+
+  @absl.testing.parameterized.named_parameters(
+      ('fixed_size', evaluator_pb2.EvalSamplingConfig(fixed_size=100), 100),
+      ('max_confidence_interval_half_width',
+       evaluator_pb2.EvalSamplingConfig(
+           max_confidence_interval_half_width=0.1), 97),
+      ('stratified_fraction',
+       evaluator_pb2.EvalSamplingConfig(
+           fraction=0.1, stratify_by_slices=True), None))
+  def testDoWithEvalSampling(self, eval_sampling_config, max_sample_size):
+    source_data_dir = os.path.join(
+        os.path.dirname(os.path.dirname(__file__)), 'testdata')
+    output_data_dir = os.path.join(
+        os.environ.get('TEST_UNDECLARED_OUTPUTS_DIR', self.get_temp_dir()),
+        self._testMethodName)
+
+    # Create input dict.
+    examples = standard_artifacts.Examples()
+    examples.uri = os.path.join(source_data_dir, 'csv_example_gen')
+    examples.split_names = artifact_utils.encode_split_names(['train', 'eval'])
+    model = standard_artifacts.Model()
+    model.uri = os.path.join(source_data_dir, 'trainer/current')
+    input_dict = {
+        executor.EXAMPLES_KEY: [examples],
+        executor.MODEL_KEY: [model],
+    }
+
+    # Create output dict.
+    eval_output = standard_artifacts.ModelEvaluation()
+    eval_output.uri = os.path.join(output_data_dir, 'eval_output')
+    output_dict = {executor.EVALUATION_KEY: [eval_output]}
+
+    exec_properties = {
+        'eval_config':
+            json_format.MessageToJson(
+                tfma.EvalConfig(slicing_specs=[
+                    tfma.SlicingSpec(feature_keys=['trip_start_hour'])
+                ]),
+                preserving_proto_field_name=True),
+        'eval_sampling_config':
+            json_format.MessageToJson(
+                eval_sampling_config, preserving_proto_field_name=True),
+    }
+
+    # Run executor.
+    evaluator = executor.Executor()
+    evaluator.Do(input_dict, output_dict, exec_properties)
+
+    # Check evaluator outputs.
+    self.assertTrue(
+        tf.io.gfile.exists(os.path.join(eval_output.uri, 'metrics')))
+    sample_size = eval_output.get_int_custom_property('eval_sample_size')
+    self.assertGreater(sample_size, 0)
+    if max_sample_size is not None:
+      self.assertLessEqual(sample_size, max_sample_size)
+    self.assertEqual(
+        json_format.MessageToJson(eval_sampling_config, indent=None),
+        eval_output.get_string_custom_property('eval_sampling_config'))
+
+
 if __name__ == '__main__':
   tf.compat.v1.enable_v2_behavior()
   tf.test.main()
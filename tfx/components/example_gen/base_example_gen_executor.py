@@ -22,11 +22,12 @@ import abc
 import bisect
 import hashlib
 import os
-from typing import Any, Dict, List, Text
+from typing import Any, Dict, List, Optional, Text
 
 import absl
 import apache_beam as beam
 from six import with_metaclass
+import tensorflow as tf
 
 from google.protobuf import json_format
 from tfx import types
@@ -43,6 +44,9 @@ INPUT_KEY = 'input'
 # Key for output examples in executor output_dict.
 EXAMPLES_KEY = 'examples'
 
+# File name prefix for input files copied as they are to the output.
+_COPIED_FILE_NAME = 'data_tfrecord_copied'
+
 
 def _PartitionFn(record: bytes, num_partitions: int, buckets: List[int]) -> int:
   assert num_partitions == len(
@@ -55,21 +59,54 @@ def _PartitionFn(record: bytes, num_partitions: int, buckets: List[int]) -> int:
   return bisect.bisect(buckets, bucket)
 
 
+def _AssignFilesToSplits(input_base_uri: Text, file_paths: List[Text],
+                         buckets: List[int]) -> List[List[Text]]:
+  """Assigns whole files to splits by the hash of their relative path."""
+  file_splits = [[] for _ in buckets]
+  for file_path in sorted(file_paths):
+    relative_path = os.path.relpath(file_path, input_base_uri)
+    index = _PartitionFn(
+        tf.compat.as_bytes(relative_path), len(buckets), buckets)
+    file_splits[index].append(file_path)
+  return file_splits
+
+
 @beam.ptransform_fn
 @beam.typehints.with_input_types(bytes)
 @beam.typehints.with_output_types(beam.pvalue.PDone)
 def _WriteSplit(example_split: beam.pvalue.PCollection,
-                output_split_path: Text) -> beam.pvalue.PDone:
+                output_split_path: Text,
+                shuffle: bool = True) -> beam.pvalue.PDone:
   """Shuffles and writes output split."""
+  if shuffle:
+    example_split = (
+        example_split | 'Shuffle' >> beam.transforms.Reshuffle())
+  # TODO(jyzhao): multiple output format.
   return (example_split
-          # TODO(jyzhao): make shuffle optional.
-          | 'Shuffle' >> beam.transforms.Reshuffle()
-          # TODO(jyzhao): multiple output format.
           | 'Write' >> beam.io.WriteToTFRecord(
               os.path.join(output_split_path, DEFAULT_FILE_NAME),
               file_name_suffix='.gz'))
 
 
+@beam.ptransform_fn
+@beam.typehints.with_input_types(beam.Pipeline)
+def _CopySplitFiles(pipeline: beam.Pipeline, file_paths: List[Text],
+                    output_split_path: Text) -> beam.pvalue.PCollection:
+  """Copies input files as they are to the output split, in parallel."""
+  copies = []
+  for index, file_path in enumerate(file_paths):
+    copies.append((file_path,
+                   os.path.join(
+                       output_split_path, '{}-{:05d}-of-{:05d}.gz'.format(
+                           _COPIED_FILE_NAME, index, len(file_paths)))))
+  return (pipeline
+          | 'CreateCopies' >> beam.Create(copies)
+          # Distributes the copies across workers.
+          | 'Reshuffle' >> beam.transforms.Reshuffle()
+          | 'Copy' >> beam.Map(
+              lambda copy: tf.io.gfile.copy(copy[0], copy[1], overwrite=True)))
+
+
 @beam.ptransform_fn
 @beam.typehints.with_input_types(beam.Pipeline)
 @beam.typehints.with_output_types(bytes)
@@ -132,6 +169,158 @@ class BaseExampleGenExecutor(
     """
     pass
 
+  def GetInputFilesToExamplePTransform(self) -> Optional[beam.PTransform]:
+    """Returns PTransform for converting a list of input files to TF examples.
+
+    Used when splits are assigned at file granularity, to convert the files of
+    each split which can not be copied with a single transform that reads all
+    of them, e.g. with a Beam ReadAll source. Executors which return None do
+    not support file granularity for such files.
+
+    Here is an example PTransform:
+      @beam.ptransform_fn
+      @beam.typehints.with_input_types(beam.Pipeline)
+      @beam.typehints.with_output_types(tf.train.Example)
+      def ExamplePTransform(
+          pipeline: beam.Pipeline,
+          input_dict: Dict[Text, List[types.Artifact]],
+          exec_properties: Dict[Text, Any],
+          file_paths: List[Text]) -> beam.pvalue.PCollection
+
+    Returns:
+      A PTransform, or None by default.
+    """
+    return None
+
+  def IsInputFileCopyable(  # pylint: disable=unused-argument
+      self, file_path: Text, exec_properties: Dict[Text, Any]) -> bool:
+    """Returns whether an input file can be copied as it is to the output.
+
+    Used when splits are assigned at file granularity. Input files which are
+    gzipped TFRecord files of tf.Examples, and which exec_properties do not
+    ask to transform, can be copied instead of being converted. Others are
+    converted by `GetInputFilesToExamplePTransform`.
+
+    Args:
+      file_path: Path of the input file.
+      exec_properties: A dict of execution properties.
+
+    Returns:
+      True if the file can be copied to the output, False by default.
+    """
+    return False
+
+  def _GetFileSplits(
+      self, input_dict: Dict[Text, List[types.Artifact]],
+      exec_properties: Dict[Text, Any], input_config: example_gen_pb2.Input,
+      output_config: example_gen_pb2.Output) -> List[List[Text]]:
+    """Returns the input files of each output split, for file granularity.
+
+    Args:
+      input_dict: Input dict from input key to a list of Artifacts.
+      exec_properties: A dict of execution properties.
+      input_config: An example_gen_pb2.Input instance.
+      output_config: An example_gen_pb2.Output instance.
+
+    Returns:
+      The input file paths of each output split, in the order of the splits of
+      output_config.
+
+    Raises:
+      ValueError: if the ExampleGen is not file based, or can not convert the
+        input files which can not be copied.
+      RuntimeError: if the input split pattern does not match any files.
+    """
+    if INPUT_KEY not in input_dict:
+      raise ValueError(
+          'File granularity is only supported by file based ExampleGens.')
+    assert len(
+        input_config.splits
+    ) == 1, 'input must have only one split when output split is specified.'
+    input_base_uri = artifact_utils.get_single_uri(input_dict[INPUT_KEY])
+    file_paths = tf.io.gfile.glob(
+        os.path.join(input_base_uri, input_config.splits[0].pattern))
+    if not file_paths:
+      raise RuntimeError('Split pattern {} does not match any files.'.format(
+          input_config.splits[0].pattern))
+    if self.GetInputFilesToExamplePTransform() is None:
+      for file_path in file_paths:
+        if not self.IsInputFileCopyable(file_path, exec_properties):
+          raise ValueError(
+              'File granularity is not supported for input file {}, which '
+              'can not be copied and {} has no input files to example '
+              'PTransform.'.format(file_path, self.__class__.__name__))
+    buckets = []
+    total_buckets = 0
+    for split in output_config.split_config.splits:
+      total_buckets += split.hash_buckets
+      buckets.append(total_buckets)
+    return _AssignFilesToSplits(input_base_uri, file_paths, buckets)
+
+  def _FileSplitsToExamples(
+      self,
+      pipeline: beam.Pipeline,
+      input_dict: Dict[Text, List[types.Artifact]],
+      exec_properties: Dict[Text, Any],
+      split_names: List[Text],
+      file_splits: List[List[Text]],
+      read_copyable_files: bool = False
+  ) -> Dict[Text, beam.pvalue.PCollection]:
+    """Converts the input files of each split to serialized TF examples.
+
+    Args:
+      pipeline: beam pipeline.
+      input_dict: Input dict from input key to a list of Artifacts.
+      exec_properties: A dict of execution properties.
+      split_names: Names of the output splits.
+      file_splits: The input files of each output split, from _GetFileSplits.
+      read_copyable_files: Whether to read the input files which can be
+        copied as they are, instead of leaving them to the caller to copy.
+
+    Returns:
+      Dict of beam PCollection of serialized TF examples with split name as
+      key. Unless read_copyable_files is set, splits which only have input
+      files that can be copied are left out.
+    """
+    result = {}
+    for split_name, file_paths in zip(split_names, file_splits):
+      converted_file_paths = []
+      read_file_paths = []
+      for file_path in file_paths:
+        if not self.IsInputFileCopyable(file_path, exec_properties):
+          converted_file_paths.append(file_path)
+        elif read_copyable_files:
+          read_file_paths.append(file_path)
+      split_examples = []
+      if converted_file_paths:
+        split_examples.append(
+            pipeline
+            | 'InputFilesToExample[{}]'.format(split_name) >>
+            self.GetInputFilesToExamplePTransform()(
+                input_dict, exec_properties, converted_file_paths)
+            | 'SerializeDeterministically[{}]'.format(split_name) >>
+            beam.Map(lambda x: x.SerializeToString(deterministic=True)))
+      if read_file_paths:
+        # Copyable files already hold serialized TF examples.
+        split_examples.append(
+            pipeline
+            | 'CreateCopyableFilePaths[{}]'.format(split_name) >>
+            beam.Create(read_file_paths)
+            | 'ReadCopyableFiles[{}]'.format(split_name) >>
+            beam.io.ReadAllFromTFRecord())
+      if len(split_examples) > 1:
+        result[split_name] = (
+            split_examples
+            | 'FlattenSplit[{}]'.format(split_name) >> beam.Flatten())
+      elif split_examples:
+        result[split_name] = split_examples[0]
+      elif not file_paths:
+        # Writes an empty shard, so that the split is still readable.
+        result[split_name] = (
+            pipeline | 'CreateEmptySplit[{}]'.format(split_name) >>
+            beam.Create([]))
+    return result
+
   def GenerateExamplesByBeam(
       self, pipeline: beam.Pipeline, input_dict: Dict[Text,
                                                       List[types.Artifact]],
@@ -167,6 +356,18 @@ class BaseExampleGenExecutor(
     # Get output split names.
     split_names = utils.generate_output_split_names(input_config, output_config)
 
+    if (output_config.split_config.granularity ==
+        example_gen_pb2.SplitConfig.FILE):
+      # Only Do copies input files as they are, so they are read here.
+      return self._FileSplitsToExamples(
+          pipeline,
+          input_dict,
+          exec_properties,
+          split_names,
+          self._GetFileSplits(input_dict, exec_properties, input_config,
+                              output_config),
+          read_copyable_files=True)
+
     example_splits = []
     input_to_example = self.GetInputSourceToExamplePTransform()
     if output_config.split_config.splits:
@@ -223,16 +424,52 @@ class BaseExampleGenExecutor(
     """
     self._log_startup(input_dict, output_dict, exec_properties)
 
+    input_config = example_gen_pb2.Input()
+    json_format.Parse(exec_properties['input_config'], input_config)
+    output_config = example_gen_pb2.Output()
+    json_format.Parse(exec_properties['output_config'], output_config)
+    file_granularity = (
+        output_config.split_config.granularity ==
+        example_gen_pb2.SplitConfig.FILE)
+
+    split_names = utils.generate_output_split_names(input_config,
+                                                    output_config)
+    file_splits = None
+    if file_granularity:
+      # Validates the input before the pipeline is built, and globs it once.
+      file_splits = self._GetFileSplits(input_dict, exec_properties,
+                                        input_config, output_config)
+
     absl.logging.info('Generating examples.')
     with self._make_beam_pipeline() as pipeline:
-      example_splits = self.GenerateExamplesByBeam(pipeline, input_dict,
-                                                   exec_properties)
+      if file_granularity:
+        example_splits = self._FileSplitsToExamples(
+            pipeline, input_dict, exec_properties, split_names, file_splits)
+      else:
+        example_splits = self.GenerateExamplesByBeam(pipeline, input_dict,
+                                                     exec_properties)
 
       # pylint: disable=expression-not-assigned, no-value-for-parameter
       for split_name, example_split in example_splits.items():
         (example_split
          | 'WriteSplit[{}]'.format(split_name) >> _WriteSplit(
-             artifact_utils.get_split_uri(output_dict['examples'], split_name)))
+             artifact_utils.get_split_uri(output_dict['examples'], split_name),
+             # Whole files are assigned to splits, so examples are not
+             # shuffled across files.
+             shuffle=not file_granularity))
+
+      if file_granularity:
+        for split_name, file_paths in zip(split_names, file_splits):
+          copyable_file_paths = [
+              file_path for file_path in file_paths
+              if self.IsInputFileCopyable(file_path, exec_properties)
+          ]
+          if copyable_file_paths:
+            (pipeline
+             | 'CopySplitFiles[{}]'.format(split_name) >> _CopySplitFiles(
+                 copyable_file_paths,
+                 artifact_utils.get_split_uri(output_dict['examples'],
+                                              split_name)))
       # pylint: enable=expression-not-assigned, no-value-for-parameter
 
     absl.logging.info('Examples generated.')
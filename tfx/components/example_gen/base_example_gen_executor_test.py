@@ -147,6 +147,47 @@ class BaseExampleGenExecutorTest(tf.test.TestCase):
         tf.io.gfile.GFile(self._train_output_file).size(),
         tf.io.gfile.GFile(self._eval_output_file).size())
 
+  def testDoFileGranularityNotFileBased(self):
+    exec_properties = {
+        'input_config':
+            json_format.MessageToJson(
+                example_gen_pb2.Input(splits=[
+                    example_gen_pb2.Input.Split(
+                        name='single', pattern='single/*'),
+                ]),
+                preserving_proto_field_name=True),
+        'output_config':
+            json_format.MessageToJson(
+                example_gen_pb2.Output(
+                    split_config=example_gen_pb2.SplitConfig(
+                        splits=[
+                            example_gen_pb2.SplitConfig.Split(
+                                name='train', hash_buckets=2),
+                            example_gen_pb2.SplitConfig.Split(
+                                name='eval', hash_buckets=1)
+                        ],
+                        granularity=example_gen_pb2.SplitConfig.FILE)))
+    }
+
+    example_gen = TestExampleGenExecutor()
+    with self.assertRaisesRegexp(ValueError, 'file based'):
+      example_gen.Do({}, self._output_dict, exec_properties)
+
+  def testAssignFilesToSplits(self):
+    file_paths = ['/input/data-{}'.format(i) for i in range(100)]
+    file_splits = base_example_gen_executor._AssignFilesToSplits(
+        '/input', file_paths, [2, 3])
+    self.assertLen(file_splits, 2)
+    self.assertCountEqual(file_paths, file_splits[0] + file_splits[1])
+    self.assertGreater(len(file_splits[0]), len(file_splits[1]))
+    # Assignment only depends on the path relative to the input base.
+    self.assertEqual(
+        [[path.replace('/input', '/moved') for path in split]
+         for split in file_splits],
+        base_example_gen_executor._AssignFilesToSplits(
+            '/moved', [p.replace('/input', '/moved') for p in file_paths],
+            [2, 3]))
+
 
 if __name__ == '__main__':
   tf.test.main()
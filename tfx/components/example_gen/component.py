@@ -144,7 +144,8 @@ class FileBasedExampleGen(base_component.BaseComponent):
       example_artifacts: Optional[types.Channel] = None,
       custom_executor_spec: Optional[executor_spec.ExecutorSpec] = None,
       input_base: Optional[types.Channel] = None,
-      instance_name: Optional[Text] = None):
+      instance_name: Optional[Text] = None,
+      schema: Optional[types.Channel] = None):
     """Construct a FileBasedExampleGen component.
 
     Args:
@@ -168,6 +169,9 @@ class FileBasedExampleGen(base_component.BaseComponent):
       instance_name: Optional unique instance name. Required only if multiple
         ExampleGen components are declared in the same pipeline.  Either
         `input_base` or `input` must be present in the input arguments.
+      schema: An optional Channel of type `standard_artifacts.Schema` which
+        describes the input data. Executors that decode untyped input, e.g.
+        CSV, use it instead of inferring the feature types from the data.
     """
     if input_base:
       absl.logging.warning(
@@ -189,6 +193,7 @@ class FileBasedExampleGen(base_component.BaseComponent):
         input_config=input_config,
         output_config=output_config,
         custom_config=custom_config,
+        schema=schema,
         examples=example_artifacts)
     super(FileBasedExampleGen, self).__init__(
         spec=spec,
@@ -20,18 +20,43 @@ from __future__ import print_function
 
 from typing import Any, Dict, Optional, Text, Union
 
+from tensorflow_metadata.proto.v0 import schema_pb2
 from tfx import types
 from tfx.components.base import executor_spec
 from tfx.components.example_gen import component
 from tfx.components.example_gen.csv_example_gen import executor
 from tfx.proto import example_gen_pb2
 
+# Feature types a CSV column can be converted to.
+_COLUMN_TYPE_NAMES = ('INT', 'FLOAT', 'BYTES')
+
+
+def _make_column_types_config(
+    column_types: Dict[Text, Text]) -> example_gen_pb2.CustomConfig:
+  """Packs a column name to feature type map as a schema in a CustomConfig."""
+  schema = schema_pb2.Schema()
+  for column_name, type_name in sorted(column_types.items()):
+    if type_name not in _COLUMN_TYPE_NAMES:
+      raise ValueError(
+          'Column {} has type {}, expected one of INT, FLOAT or BYTES.'.format(
+              column_name, type_name))
+    schema.feature.add(
+        name=column_name, type=schema_pb2.FeatureType.Value(type_name))
+  custom_config = example_gen_pb2.CustomConfig()
+  custom_config.custom_config.Pack(schema)
+  return custom_config
+
 
 class CsvExampleGen(component.FileBasedExampleGen):  # pylint: disable=protected-access
   """Official TFX CsvExampleGen component.
 
   The csv examplegen component takes csv data, and generates train
   and eval examples for downsteam components.
+
+  By default the type of every column is inferred from the data, which needs a
+  full pass over the input before any example can be written. If the column
+  types are given, either as a schema or as an explicit column type map, the
+  conversion is done in a single streaming pass.
   """
 
   EXECUTOR_SPEC = executor_spec.ExecutorClassSpec(executor.Executor)
@@ -45,7 +70,9 @@ class CsvExampleGen(component.FileBasedExampleGen):  # pylint: disable=protected
                                                                  Any]]] = None,
       example_artifacts: Optional[types.Channel] = None,
       input_base: Optional[types.Channel] = None,
-      instance_name: Optional[Text] = None):
+      instance_name: Optional[Text] = None,
+      schema: Optional[types.Channel] = None,
+      column_types: Optional[Dict[Text, Text]] = None):
     """Construct a CsvExampleGen component.
 
     Args:
@@ -67,11 +94,29 @@ class CsvExampleGen(component.FileBasedExampleGen):  # pylint: disable=protected
       input_base: Backwards compatibility alias for the 'input' argument.
       instance_name: Optional unique instance name. Necessary if multiple
         CsvExampleGen components are declared in the same pipeline.
+      schema: An optional Channel of type `standard_artifacts.Schema`. If set,
+        column types are read from the schema instead of being inferred, and
+        every column must be a feature of the schema.
+      column_types: An optional dict from column name to feature type name,
+        one of 'INT', 'FLOAT' or 'BYTES', covering every column. Used like
+        `schema` when no schema channel is available. Cells which can not be
+        parsed as the given type fail the conversion.
+
+    Raises:
+      ValueError: if both `schema` and `column_types` are set, or a column type
+        is not a valid feature type.
     """
+    if schema and column_types:
+      raise ValueError('Only one of schema and column_types can be set.')
+    custom_config = None
+    if column_types:
+      custom_config = _make_column_types_config(column_types)
     super(CsvExampleGen, self).__init__(
         input=input,
         input_config=input_config,
         output_config=output_config,
+        custom_config=custom_config,
         example_artifacts=example_artifacts,
         input_base=input_base,
-        instance_name=instance_name)
+        instance_name=instance_name,
+        schema=schema)
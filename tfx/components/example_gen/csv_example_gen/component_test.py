@@ -19,7 +19,10 @@ from __future__ import division
 from __future__ import print_function
 
 import tensorflow as tf
+from google.protobuf import json_format
+from tensorflow_metadata.proto.v0 import schema_pb2
 from tfx.components.example_gen.csv_example_gen import component
+from tfx.proto import example_gen_pb2
 from tfx.types import artifact_utils
 from tfx.types import channel_utils
 from tfx.types import standard_artifacts
@@ -39,6 +42,40 @@ class ComponentTest(tf.test.TestCase):
                      artifact_utils.decode_split_names(
                          artifact_collection[0].split_names))
 
+  def testConstructWithSchema(self):
+    input_base = standard_artifacts.ExternalArtifact()
+    schema = standard_artifacts.Schema()
+    csv_example_gen = component.CsvExampleGen(
+        input=channel_utils.as_channel([input_base]),
+        schema=channel_utils.as_channel([schema]))
+    self.assertEqual(standard_artifacts.Schema.TYPE_NAME,
+                     csv_example_gen.inputs['schema'].type_name)
+
+  def testConstructWithColumnTypes(self):
+    input_base = standard_artifacts.ExternalArtifact()
+    csv_example_gen = component.CsvExampleGen(
+        input=channel_utils.as_channel([input_base]),
+        column_types={'fare': 'FLOAT', 'company': 'BYTES'})
+    custom_config = example_gen_pb2.CustomConfig()
+    json_format.Parse(csv_example_gen.exec_properties['custom_config'],
+                      custom_config)
+    schema = schema_pb2.Schema()
+    self.assertTrue(custom_config.custom_config.Unpack(schema))
+    self.assertEqual(
+        [('company', schema_pb2.BYTES), ('fare', schema_pb2.FLOAT)],
+        [(feature.name, feature.type) for feature in schema.feature])
+
+  def testConstructWithInvalidColumnTypes(self):
+    input_base = standard_artifacts.ExternalArtifact()
+    with self.assertRaisesRegexp(ValueError, 'fare'):
+      component.CsvExampleGen(
+          input=channel_utils.as_channel([input_base]),
+          column_types={'fare': 'DOUBLE'})
+    with self.assertRaisesRegexp(ValueError, 'company'):
+      component.CsvExampleGen(
+          input=channel_utils.as_channel([input_base]),
+          column_types={'company': 'STRUCT'})
+
 
 if __name__ == '__main__':
   tf.test.main()
@@ -18,74 +18,238 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+from multiprocessing import pool
 import os
-from typing import Any, Dict, Iterable, List, Text
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Text
 
 import absl
 import apache_beam as beam
+import numpy as np
 import tensorflow as tf
 from tfx_bsl.coders import csv_decoder
 
+from google.protobuf import json_format
+from tensorflow_metadata.proto.v0 import schema_pb2
 from tfx import types
 from tfx.components.example_gen.base_example_gen_executor import BaseExampleGenExecutor
 from tfx.components.example_gen.base_example_gen_executor import INPUT_KEY
+from tfx.proto import example_gen_pb2
 from tfx.types import artifact_utils
 from tfx.utils import io_utils
 
 
-@beam.typehints.with_input_types(List[csv_decoder.CSVCell],
+# Key for the optional schema in executor input_dict. When present, column
+# types are taken from the schema instead of being inferred from the data.
+SCHEMA_KEY = 'schema'
+
+# Maximum number of CSV headers read concurrently.
+_MAX_HEADER_READ_THREADS = 16
+
+# Bounds for the number of parsed CSV lines converted together in one batch.
+_MIN_BATCH_SIZE = 100
+_MAX_BATCH_SIZE = 10000
+
+_SCHEMA_TYPE_TO_COLUMN_TYPE = {
+    schema_pb2.INT: csv_decoder.ColumnType.INT,
+    schema_pb2.FLOAT: csv_decoder.ColumnType.FLOAT,
+    schema_pb2.BYTES: csv_decoder.ColumnType.STRING,
+}
+
+
+def _column_infos_from_schema(
+    column_names: List[Text],
+    schema: schema_pb2.Schema) -> List[csv_decoder.ColumnInfo]:
+  """Builds CSV column infos from the feature types of a schema.
+
+  Args:
+    column_names: Column names in the order of the CSV header.
+    schema: A tf.metadata schema which contains a feature for every column.
+
+  Returns:
+    A list of csv_decoder.ColumnInfo, in the order of column_names.
+
+  Raises:
+    RuntimeError: if a column is missing from the schema or has a feature type
+      that can not be represented in a CSV cell.
+  """
+  feature_types = {feature.name: feature.type for feature in schema.feature}
+  column_infos = []
+  for column_name in column_names:
+    if column_name not in feature_types:
+      raise RuntimeError(
+          'Column {} is not in the provided schema.'.format(column_name))
+    column_type = _SCHEMA_TYPE_TO_COLUMN_TYPE.get(feature_types[column_name])
+    if column_type is None:
+      raise RuntimeError('Column {} has unsupported schema type {}.'.format(
+          column_name, feature_types[column_name]))
+    column_infos.append(csv_decoder.ColumnInfo(column_name, column_type))
+  return column_infos
+
+
+def _get_schema(
+    input_dict: Dict[Text, List[types.Artifact]],
+    exec_properties: Dict[Text, Any]) -> Optional[schema_pb2.Schema]:
+  """Returns the schema that provides the column types, if any.
+
+  The schema is read from the schema artifact in input_dict if it is present,
+  otherwise from a schema packed in the custom config.
+
+  Args:
+    input_dict: Input dict from input key to a list of Artifacts.
+    exec_properties: A dict of execution properties.
+
+  Returns:
+    A tf.metadata schema, or None if column types should be inferred.
+  """
+  if input_dict.get(SCHEMA_KEY):
+    schema_path = io_utils.get_only_uri_in_dir(
+        artifact_utils.get_single_uri(input_dict[SCHEMA_KEY]))
+    return io_utils.SchemaReader().read(schema_path)
+
+  if exec_properties.get('custom_config'):
+    custom_config = example_gen_pb2.CustomConfig()
+    json_format.Parse(exec_properties['custom_config'], custom_config)
+    if custom_config.custom_config.Is(schema_pb2.Schema.DESCRIPTOR):
+      schema = schema_pb2.Schema()
+      custom_config.custom_config.Unpack(schema)
+      return schema
+
+  return None
+
+
+def _load_column_names(csv_files: List[Text], csv_pattern: Text) -> List[Text]:
+  """Loads the header of every CSV file concurrently and checks they match.
+
+  Args:
+    csv_files: Paths of the CSV files in a split.
+    csv_pattern: The file pattern of the split, for error messages.
+
+  Returns:
+    The column names shared by all CSV files.
+
+  Raises:
+    RuntimeError: if the CSV files have different headers.
+  """
+  if len(csv_files) == 1:
+    return io_utils.load_csv_column_names(csv_files[0])
+
+  thread_pool = pool.ThreadPool(min(len(csv_files), _MAX_HEADER_READ_THREADS))
+  try:
+    headers = thread_pool.map(io_utils.load_csv_column_names, csv_files)
+  finally:
+    thread_pool.close()
+
+  column_names = headers[0]
+  for header in headers[1:]:
+    if header != column_names:
+      raise RuntimeError(
+          'Files in same split {} have different header.'.format(csv_pattern))
+  return column_names
+
+
+def _cells_to_int_features(
+    cells: Sequence[csv_decoder.CSVCell]) -> List[tf.train.Feature]:
+  values = np.asarray(cells).astype(np.int64).tolist()
+  return [
+      tf.train.Feature(int64_list=tf.train.Int64List(value=[value]))
+      for value in values
+  ]
+
+
+def _cells_to_float_features(
+    cells: Sequence[csv_decoder.CSVCell]) -> List[tf.train.Feature]:
+  values = np.asarray(cells).astype(np.float64).tolist()
+  return [
+      tf.train.Feature(float_list=tf.train.FloatList(value=[value]))
+      for value in values
+  ]
+
+
+def _cells_to_bytes_features(
+    cells: Sequence[csv_decoder.CSVCell]) -> List[tf.train.Feature]:
+  return [
+      tf.train.Feature(bytes_list=tf.train.BytesList(value=[cell]))
+      for cell in cells
+  ]
+
+
+_COLUMN_TYPE_TO_FEATURES_FN = {
+    csv_decoder.ColumnType.INT: _cells_to_int_features,
+    csv_decoder.ColumnType.FLOAT: _cells_to_float_features,
+    csv_decoder.ColumnType.STRING: _cells_to_bytes_features,
+}
+
+
+@beam.typehints.with_input_types(List[List[csv_decoder.CSVCell]],
                                  List[csv_decoder.ColumnInfo])
 @beam.typehints.with_output_types(tf.train.Example)
 class _ParsedCsvToTfExample(beam.DoFn):
-  """A beam.DoFn to convert a parsed CSV line to a tf.Example."""
-
-  def __init__(self):
-    self._column_handlers = None
-
-  def _process_column_infos(self, column_infos: List[csv_decoder.ColumnInfo]):
-    column_handlers = []
-    for column_info in column_infos:
-      # pylint: disable=g-long-lambda
-      if column_info.type == csv_decoder.ColumnType.INT:
-        handler_fn = lambda csv_cell: tf.train.Feature(
-            int64_list=tf.train.Int64List(value=[int(csv_cell)]))
-      elif column_info.type == csv_decoder.ColumnType.FLOAT:
-        handler_fn = lambda csv_cell: tf.train.Feature(
-            float_list=tf.train.FloatList(value=[float(csv_cell)]))
-      elif column_info.type == csv_decoder.ColumnType.STRING:
-        handler_fn = lambda csv_cell: tf.train.Feature(
-            bytes_list=tf.train.BytesList(value=[csv_cell]))
-      else:
-        handler_fn = None
-      column_handlers.append((column_info.name, handler_fn))
-
-    self._column_handlers = column_handlers
+  """A beam.DoFn to convert a batch of parsed CSV lines to tf.Examples.
+
+  The batch is transposed into columns and every column is converted with a
+  single vectorized call, rather than dispatching on the column type for every
+  cell.
+  """
+
+  def __init__(self, column_infos: Optional[List[
+      csv_decoder.ColumnInfo]] = None):
+    """Initializes the DoFn.
+
+    Args:
+      column_infos: Optional column infos known at construction time, e.g. from
+        a schema. If unset, they are expected as a side input of `process`.
+    """
+    self._column_infos = column_infos
+
+  def _column_to_features(
+      self, column_info: csv_decoder.ColumnInfo,
+      cells: Sequence[csv_decoder.CSVCell]) -> List[tf.train.Feature]:
+    present = [cell for cell in cells if cell]
+    if not present:
+      return [tf.train.Feature() for _ in cells]
+    features_fn = _COLUMN_TYPE_TO_FEATURES_FN.get(column_info.type)
+    if not features_fn:
+      raise ValueError(
+          'Internal error: failed to infer type of column {} while it'
+          'had at least some values {}'.format(column_info.name, present[0]))
+    try:
+      present_features = iter(features_fn(present))
+    except ValueError:
+      raise ValueError('Column {} has values which are not of type {}.'.format(
+          column_info.name, column_info.type.name))
+    if len(present) == len(cells):
+      return list(present_features)
+    # Empty cells become empty features.
+    return [
+        next(present_features) if cell else tf.train.Feature()
+        for cell in cells
+    ]
 
   def process(
-      self, csv_cells: List[csv_decoder.CSVCell],
-      column_infos: List[csv_decoder.ColumnInfo]) -> Iterable[tf.train.Example]:
-    if not self._column_handlers:
-      self._process_column_infos(column_infos)
+      self,
+      csv_lines: List[List[csv_decoder.CSVCell]],
+      column_infos: Optional[List[csv_decoder.ColumnInfo]] = None
+  ) -> Iterable[tf.train.Example]:
+    column_infos = self._column_infos or column_infos
 
     # skip blank lines.
-    if not csv_cells:
+    csv_lines = [csv_cells for csv_cells in csv_lines if csv_cells]
+    if not csv_lines:
       return
 
-    if len(csv_cells) != len(self._column_handlers):
-      raise ValueError('Invalid CSV line: {}'.format(csv_cells))
+    for csv_cells in csv_lines:
+      if len(csv_cells) != len(column_infos):
+        raise ValueError('Invalid CSV line: {}'.format(csv_cells))
 
-    feature = {}
-    for csv_cell, (column_name, handler_fn) in zip(csv_cells,
-                                                   self._column_handlers):
-      if not csv_cell:
-        feature[column_name] = tf.train.Feature()
-        continue
-      if not handler_fn:
-        raise ValueError(
-            'Internal error: failed to infer type of column {} while it'
-            'had at least some values {}'.format(column_name, csv_cell))
-      feature[column_name] = handler_fn(csv_cell)
-    yield tf.train.Example(features=tf.train.Features(feature=feature))
+    feature_columns = [
+        self._column_to_features(column_info, cells)
+        for column_info, cells in zip(column_infos, zip(*csv_lines))
+    ]
+    column_names = [column_info.name for column_info in column_infos]
+    for row_features in zip(*feature_columns):
+      yield tf.train.Example(
+          features=tf.train.Features(
+              feature=dict(zip(column_names, row_features))))
 
 
 @beam.ptransform_fn
@@ -94,7 +258,7 @@ class _ParsedCsvToTfExample(beam.DoFn):
 def _CsvToExample(  # pylint: disable=invalid-name
     pipeline: beam.Pipeline,
     input_dict: Dict[Text, List[types.Artifact]],
-    exec_properties: Dict[Text, Any],  # pylint: disable=unused-argument
+    exec_properties: Dict[Text, Any],
     split_pattern: Text) -> beam.pvalue.PCollection:
   """Read CSV files and transform to TF examples.
 
@@ -105,7 +269,12 @@ def _CsvToExample(  # pylint: disable=invalid-name
     input_dict: Input dict from input key to a list of Artifacts.
       - input_base: input dir that contains csv data. csv files must have header
         line.
+      - schema: optional schema artifact. If present, column types are read
+        from it and the column type inference pass over the data is skipped.
     exec_properties: A dict of execution properties.
+      - custom_config: optional JSON string of example_gen_pb2.CustomConfig
+        with a packed schema_pb2.Schema. Used the same way as the schema
+        artifact if the latter is not given.
     split_pattern: Split.pattern in Input config, glob relative file pattern
       that maps to input files with root directory given by input_base.
 
@@ -125,23 +294,81 @@ def _CsvToExample(  # pylint: disable=invalid-name
     raise RuntimeError(
         'Split pattern {} does not match any files.'.format(csv_pattern))
 
-  column_names = io_utils.load_csv_column_names(csv_files[0])
-  for csv_files in csv_files[1:]:
-    if io_utils.load_csv_column_names(csv_files) != column_names:
-      raise RuntimeError(
-          'Files in same split {} have different header.'.format(csv_pattern))
-
-  parsed_csv_lines = (
+  column_names = _load_column_names(csv_files, csv_pattern)
+  csv_lines = (
       pipeline
       | 'ReadFromText' >> beam.io.ReadFromText(
-          file_pattern=csv_pattern, skip_header_lines=1)
+          file_pattern=csv_pattern, skip_header_lines=1))
+  return (csv_lines
+          | 'CsvLinesToExample' >> _CsvLinesToExample(  # pylint: disable=no-value-for-parameter
+              input_dict, exec_properties, column_names))
+
+
+@beam.ptransform_fn
+@beam.typehints.with_input_types(beam.Pipeline)
+@beam.typehints.with_output_types(tf.train.Example)
+def _CsvFilesToExample(  # pylint: disable=invalid-name
+    pipeline: beam.Pipeline,
+    input_dict: Dict[Text, List[types.Artifact]],
+    exec_properties: Dict[Text, Any],
+    file_paths: List[Text]) -> beam.pvalue.PCollection:
+  """Read a list of CSV files and transform to TF examples.
+
+  Args:
+    pipeline: beam pipeline.
+    input_dict: Input dict from input key to a list of Artifacts, as for
+      _CsvToExample.
+    exec_properties: A dict of execution properties, as for _CsvToExample.
+    file_paths: Paths of the CSV files, which must have the same header line.
+
+  Returns:
+    PCollection of TF examples.
+
+  Raises:
+    RuntimeError: if csv headers are not equal.
+  """
+  column_names = _load_column_names(file_paths,
+                                    os.path.dirname(file_paths[0]))
+  csv_lines = (
+      pipeline
+      | 'CreateFilePaths' >> beam.Create(file_paths)
+      | 'ReadAllFromText' >> beam.io.ReadAllFromText(skip_header_lines=1))
+  return (csv_lines
+          | 'CsvLinesToExample' >> _CsvLinesToExample(  # pylint: disable=no-value-for-parameter
+              input_dict, exec_properties, column_names))
+
+
+@beam.ptransform_fn
+@beam.typehints.with_input_types(Text)
+@beam.typehints.with_output_types(tf.train.Example)
+def _CsvLinesToExample(  # pylint: disable=invalid-name
+    csv_lines: beam.pvalue.PCollection,
+    input_dict: Dict[Text, List[types.Artifact]],
+    exec_properties: Dict[Text, Any],
+    column_names: List[Text]) -> beam.pvalue.PCollection:
+  """Parses CSV lines without header and converts them to TF examples."""
+  parsed_csv_lines = (
+      csv_lines
       | 'ParseCSVLine' >> beam.ParDo(csv_decoder.ParseCSVLine(delimiter=',')))
+  batched_csv_lines = (
+      parsed_csv_lines
+      | 'BatchCSVLines' >> beam.BatchElements(
+          min_batch_size=_MIN_BATCH_SIZE, max_batch_size=_MAX_BATCH_SIZE))
+
+  schema = _get_schema(input_dict, exec_properties)
+  if schema is not None:
+    # Column types are known up front, so examples are converted in a single
+    # streaming pass without waiting on a global type inference combine.
+    column_infos = _column_infos_from_schema(column_names, schema)
+    return (batched_csv_lines
+            | 'ToTFExample' >> beam.ParDo(_ParsedCsvToTfExample(column_infos)))
+
   column_infos = beam.pvalue.AsSingleton(
       parsed_csv_lines
       | 'InferColumnTypes' >> beam.CombineGlobally(
           csv_decoder.ColumnTypeInferrer(column_names, skip_blank_lines=True)))
 
-  return (parsed_csv_lines
+  return (batched_csv_lines
           | 'ToTFExample' >> beam.ParDo(_ParsedCsvToTfExample(), column_infos))
 
 
@@ -151,3 +378,7 @@ class Executor(BaseExampleGenExecutor):
   def GetInputSourceToExamplePTransform(self) -> beam.PTransform:
     """Returns PTransform for CSV to TF examples."""
     return _CsvToExample
+
+  def GetInputFilesToExamplePTransform(self) -> beam.PTransform:
+    """Returns PTransform for a list of CSV files to TF examples."""
+    return _CsvFilesToExample
@@ -22,7 +22,10 @@ import os
 import apache_beam as beam
 from apache_beam.testing import util
 import tensorflow as tf
+from tfx_bsl.coders import csv_decoder
 from google.protobuf import json_format
+from google.protobuf import text_format
+from tensorflow_metadata.proto.v0 import schema_pb2
 from tfx.components.example_gen.base_example_gen_executor import INPUT_KEY
 from tfx.components.example_gen.csv_example_gen import executor
 from tfx.proto import example_gen_pb2
@@ -40,6 +43,8 @@ class ExecutorTest(tf.test.TestCase):
     input_base = standard_artifacts.ExternalArtifact()
     input_base.uri = os.path.join(input_data_dir, 'external')
     self._input_dict = {INPUT_KEY: [input_base]}
+    self._schema = standard_artifacts.Schema()
+    self._schema.uri = os.path.join(input_data_dir, 'schema_gen')
     super(ExecutorTest, self).setUp()
 
   def testCsvToExample(self):
@@ -59,6 +64,102 @@ class ExecutorTest(tf.test.TestCase):
 
       util.assert_that(examples, check_result)
 
+  def testCsvFilesToExample(self):
+    csv_files = tf.io.gfile.glob(
+        os.path.join(self._input_dict[INPUT_KEY][0].uri, 'csv', '*'))
+    with beam.Pipeline() as pipeline:
+      examples = (
+          pipeline
+          | 'ToTFExample' >> executor._CsvFilesToExample(
+              input_dict=self._input_dict,
+              exec_properties={},
+              file_paths=csv_files))
+
+      def check_result(got):
+        assert (15000 == len(got)), 'Unexpected example count'
+        assert (18 == len(got[0].features.feature)), 'Example not match'
+
+      util.assert_that(examples, check_result)
+
+  def testCsvToExampleWithSchema(self):
+    input_dict = dict(self._input_dict)
+    input_dict[executor.SCHEMA_KEY] = [self._schema]
+    with beam.Pipeline() as pipeline:
+      examples = (
+          pipeline
+          | 'ToTFExample' >> executor._CsvToExample(
+              input_dict=input_dict,
+              exec_properties={},
+              split_pattern='csv/*'))
+
+      def check_result(got):
+        assert (15000 == len(got)), 'Unexpected example count'
+        assert (18 == len(got[0].features.feature)), 'Example not match'
+        for example in got:
+          feature = example.features.feature
+          assert not feature['trip_start_hour'].HasField(
+              'float_list'), 'Schema INT column decoded as float'
+          assert not feature['pickup_census_tract'].HasField(
+              'float_list'), 'Schema BYTES column decoded as float'
+
+      util.assert_that(examples, check_result)
+
+  def testCsvToExampleWithColumnTypesInCustomConfig(self):
+    schema = schema_pb2.Schema()
+    with open(os.path.join(self._schema.uri, 'schema.pbtxt')) as f:
+      text_format.Parse(f.read(), schema)
+    custom_config = example_gen_pb2.CustomConfig()
+    custom_config.custom_config.Pack(schema)
+    exec_properties = {
+        'custom_config':
+            json_format.MessageToJson(
+                custom_config, preserving_proto_field_name=True)
+    }
+    with beam.Pipeline() as pipeline:
+      examples = (
+          pipeline
+          | 'ToTFExample' >> executor._CsvToExample(
+              input_dict=self._input_dict,
+              exec_properties=exec_properties,
+              split_pattern='csv/*'))
+
+      def check_result(got):
+        assert (15000 == len(got)), 'Unexpected example count'
+        assert (18 == len(got[0].features.feature)), 'Example not match'
+
+      util.assert_that(examples, check_result)
+
+  def testParsedCsvToTfExampleBatch(self):
+    column_infos = [
+        csv_decoder.ColumnInfo('int_feature', csv_decoder.ColumnType.INT),
+        csv_decoder.ColumnInfo('float_feature', csv_decoder.ColumnType.FLOAT),
+        csv_decoder.ColumnInfo('str_feature', csv_decoder.ColumnType.STRING),
+    ]
+    csv_lines = [[b'1', b'', b'a'], [], [b'', b'2.5', b'b']]
+
+    got = list(
+        executor._ParsedCsvToTfExample(column_infos).process(csv_lines))
+
+    self.assertLen(got, 2)
+    self.assertEqual([1],
+                     got[0].features.feature['int_feature'].int64_list.value)
+    self.assertEqual(tf.train.Feature(),
+                     got[0].features.feature['float_feature'])
+    self.assertEqual([b'a'],
+                     got[0].features.feature['str_feature'].bytes_list.value)
+    self.assertEqual(tf.train.Feature(),
+                     got[1].features.feature['int_feature'])
+    self.assertEqual([2.5],
+                     got[1].features.feature['float_feature'].float_list.value)
+
+  def testParsedCsvToTfExampleTypeMismatch(self):
+    column_infos = [
+        csv_decoder.ColumnInfo('int_feature', csv_decoder.ColumnType.INT)
+    ]
+    with self.assertRaisesRegexp(ValueError, 'int_feature'):
+      list(
+          executor._ParsedCsvToTfExample(column_infos).process([[b'abc']]))
+
   def testDo(self):
     output_data_dir = os.path.join(
         os.environ.get('TEST_UNDECLARED_OUTPUTS_DIR', self.get_temp_dir()),
@@ -18,67 +18,233 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import json
 import os
-from typing import Any, Dict, List, Text
+from typing import Any, Dict, Iterable, List, Optional, Text
 
 import absl
 import apache_beam as beam
+from avro import datafile
+from avro import io as avro_io
+import six
 import tensorflow as tf
 
+from tensorflow_metadata.proto.v0 import schema_pb2
 from tfx import types
+from tfx.components.example_gen import utils
 from tfx.components.example_gen.base_example_gen_executor import BaseExampleGenExecutor
 from tfx.components.example_gen.base_example_gen_executor import INPUT_KEY
-from tfx.components.example_gen.utils import dict_to_example
 from tfx.types import artifact_utils
 
 
+# Bounds for the number of Avro records converted together in one batch.
+_MIN_BATCH_SIZE = 100
+_MAX_BATCH_SIZE = 10000
+
+_AVRO_TYPE_TO_FEATURE_TYPE = {
+    'boolean': schema_pb2.INT,
+    'int': schema_pb2.INT,
+    'long': schema_pb2.INT,
+    'float': schema_pb2.FLOAT,
+    'double': schema_pb2.FLOAT,
+    'string': schema_pb2.BYTES,
+    'bytes': schema_pb2.BYTES,
+    'enum': schema_pb2.BYTES,
+}
+
+
+def _avro_type_to_column_type(field_name: Text,
+                              avro_type: Any) -> utils.ColumnType:
+  """Returns the ColumnType of an Avro record field from its Avro type."""
+  # Nullable fields are unions of a single type with 'null'.
+  if isinstance(avro_type, list):
+    non_null_types = [t for t in avro_type if t != 'null']
+    if len(non_null_types) != 1:
+      raise RuntimeError('Field {} has unsupported Avro union type {}.'.format(
+          field_name, avro_type))
+    avro_type = non_null_types[0]
+  is_list = False
+  if isinstance(avro_type, dict) and avro_type['type'] == 'array':
+    is_list = True
+    avro_type = avro_type['items']
+  if isinstance(avro_type, dict):
+    avro_type = avro_type['type']
+  if avro_type not in _AVRO_TYPE_TO_FEATURE_TYPE:
+    raise RuntimeError('Field {} has unsupported Avro type {}.'.format(
+        field_name, avro_type))
+  return utils.ColumnType(_AVRO_TYPE_TO_FEATURE_TYPE[avro_type], is_list)
+
+
+def _get_column_types(avro_file: Text,
+                      columns: Optional[List[Text]]) -> Dict[Text,
+                                                             utils.ColumnType]:
+  """Reads the column types from the writer schema of an Avro file.
+
+  Args:
+    avro_file: Path to an Avro file.
+    columns: Optional names of the fields to convert. If unset, all fields of
+      the schema are converted.
+
+  Returns:
+    Dict from field name to ColumnType.
+
+  Raises:
+    RuntimeError: if a requested column is not in the Avro schema.
+  """
+  with tf.io.gfile.GFile(avro_file, 'rb') as f:
+    reader = datafile.DataFileReader(f, avro_io.DatumReader())
+    # avro-python3 spells the metadata accessor GetMeta, avro get_meta.
+    get_meta = getattr(reader, 'GetMeta', None) or reader.get_meta
+    avro_schema = json.loads(six.ensure_text(get_meta(datafile.SCHEMA_KEY)))
+  field_types = {
+      field['name']: field['type'] for field in avro_schema['fields']
+  }
+  for column in columns or []:
+    if column not in field_types:
+      raise RuntimeError('Column {} is not in the Avro schema of {}.'.format(
+          column, avro_file))
+  return {
+      name: _avro_type_to_column_type(name, field_types[name])
+      for name in (columns or field_types.keys())
+  }
+
+
+@beam.typehints.with_input_types(List[Dict[Text, Any]])
+@beam.typehints.with_output_types(tf.train.Example)
+class _AvroRecordsToExamples(beam.DoFn):
+  """A beam.DoFn to convert a batch of Avro records to tf examples."""
+
+  def __init__(self, column_types: Dict[Text, utils.ColumnType]):
+    self._column_types = column_types
+
+  def process(self,
+              records: List[Dict[Text, Any]]) -> Iterable[tf.train.Example]:
+    column_values = {
+        name: [record.get(name) for record in records]
+        for name in self._column_types
+    }
+    for example in utils.columns_to_examples(self._column_types,
+                                             column_values):
+      yield example
+
+
 @beam.ptransform_fn
 @beam.typehints.with_input_types(beam.Pipeline)
 @beam.typehints.with_output_types(tf.train.Example)
 def _AvroToExample(  # pylint: disable=invalid-name
     pipeline: beam.Pipeline,
     input_dict: Dict[Text, List[types.Artifact]],
-    exec_properties: Dict[Text, Any],  # pylint: disable=unused-argument
+    exec_properties: Dict[Text, Any],
     split_pattern: Text) -> beam.pvalue.PCollection:
   """Read Avro files and transform to TF examples.
 
   Note that each input split will be transformed by this function separately.
+  Records are converted in batches, column by column, using the types from
+  the Avro schema of the first file of the split.
 
   Args:
     pipeline: beam pipeline.
     input_dict: Input dict from input key to a list of Artifacts.
       - input_base: input dir that contains Avro data.
     exec_properties: A dict of execution properties.
+      - custom_config: optional JSON string of example_gen_pb2.CustomConfig
+        with a packed example_gen_pb2.ColumnarInputConfig. Only the columns
+        it lists are converted.
     split_pattern: Split.pattern in Input config, glob relative file pattern
       that maps to input files with root directory given by input_base.
 
   Returns:
     PCollection of TF examples.
+
+  Raises:
+    RuntimeError: if split is empty.
   """
   input_base_uri = artifact_utils.get_single_uri(input_dict[INPUT_KEY])
   avro_pattern = os.path.join(input_base_uri, split_pattern)
   absl.logging.info(
       'Processing input avro data {} to TFExample.'.format(avro_pattern))
 
+  avro_files = tf.io.gfile.glob(avro_pattern)
+  if not avro_files:
+    raise RuntimeError(
+        'Split pattern {} does not match any files.'.format(avro_pattern))
+
+  return (pipeline
+          | 'ReadFromAvro' >> beam.io.ReadFromAvro(
+              avro_pattern, use_fastavro=True)
+          | 'RecordsToExample' >> _ConvertAvroRecords(  # pylint: disable=no-value-for-parameter
+              exec_properties, avro_files[0]))
+
+
+@beam.ptransform_fn
+@beam.typehints.with_input_types(beam.Pipeline)
+@beam.typehints.with_output_types(tf.train.Example)
+def _AvroFilesToExample(  # pylint: disable=invalid-name
+    pipeline: beam.Pipeline,
+    input_dict: Dict[Text, List[types.Artifact]],  # pylint: disable=unused-argument
+    exec_properties: Dict[Text, Any],
+    file_paths: List[Text]) -> beam.pvalue.PCollection:
+  """Read a list of Avro files and transform to TF examples.
+
+  Args:
+    pipeline: beam pipeline.
+    input_dict: Input dict from input key to a list of Artifacts.
+    exec_properties: A dict of execution properties, as for _AvroToExample.
+    file_paths: Paths of the Avro files.
+
+  Returns:
+    PCollection of TF examples.
+  """
   return (pipeline
-          | 'ReadFromAvro' >> beam.io.ReadFromAvro(avro_pattern)
-          | 'ToTFExample' >> beam.Map(dict_to_example))
+          | 'CreateFilePaths' >> beam.Create(file_paths)
+          | 'ReadAllFromAvro' >> beam.io.ReadAllFromAvro(use_fastavro=True)
+          | 'RecordsToExample' >> _ConvertAvroRecords(  # pylint: disable=no-value-for-parameter
+              exec_properties, file_paths[0]))
+
+
+@beam.ptransform_fn
+@beam.typehints.with_input_types(Dict[Text, Any])
+@beam.typehints.with_output_types(tf.train.Example)
+def _ConvertAvroRecords(  # pylint: disable=invalid-name
+    records: beam.pvalue.PCollection, exec_properties: Dict[Text, Any],
+    schema_file: Text) -> beam.pvalue.PCollection:
+  """Converts Avro records in batches with the schema of schema_file."""
+  columnar_input_config = utils.get_columnar_input_config(exec_properties)
+  columns = None
+  if columnar_input_config and columnar_input_config.columns:
+    columns = list(columnar_input_config.columns)
+  column_types = _get_column_types(schema_file, columns)
+
+  return (records
+          | 'BatchRecords' >> beam.BatchElements(
+              min_batch_size=_MIN_BATCH_SIZE, max_batch_size=_MAX_BATCH_SIZE)
+          | 'ToTFExample' >> beam.ParDo(_AvroRecordsToExamples(column_types)))
 
 
 class Executor(BaseExampleGenExecutor):
   """TFX example gen executor for processing avro format.
 
-  Data type conversion:
-    integer types will be converted to tf.train.Feature with tf.train.Int64List.
-    float types will be converted to tf.train.Feature with tf.train.FloatList.
-    string types will be converted to tf.train.Feature with tf.train.BytesList
-      and utf-8 encoding.
+  Data type conversion, based on the Avro schema:
+    int, long and boolean types will be converted to tf.train.Feature with
+      tf.train.Int64List.
+    float and double types will be converted to tf.train.Feature with
+      tf.train.FloatList.
+    string, bytes and enum types will be converted to tf.train.Feature with
+      tf.train.BytesList and utf-8 encoding.
+    array of the above types will be converted to a tf.train.Feature holding
+      all values of the array.
 
     Note that,
       Single value will be converted to a list of that single value.
       Missing value will be converted to empty tf.train.Feature().
+      Nullable fields, i.e. unions of a type with null, are supported.
 
-    For details, check the dict_to_example function in example_gen.utils.
+    Records are converted in batches, column by column. To convert only some
+    of the fields, pack an example_gen_pb2.ColumnarInputConfig into the
+    custom_config. As Avro is a row format, the other fields are still decoded
+    but never converted.
+
+    For details, check the columns_to_examples function in example_gen.utils.
 
 
   Example usage:
@@ -97,3 +263,7 @@ class Executor(BaseExampleGenExecutor):
   def GetInputSourceToExamplePTransform(self) -> beam.PTransform:
     """Returns PTransform for avro to TF examples."""
     return _AvroToExample
+
+  def GetInputFilesToExamplePTransform(self) -> beam.PTransform:
+    """Returns PTransform for a list of avro files to TF examples."""
+    return _AvroFilesToExample
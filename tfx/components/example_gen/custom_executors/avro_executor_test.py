@@ -59,6 +59,30 @@ class ExecutorTest(tf.test.TestCase):
 
       util.assert_that(examples, check_result)
 
+  def testAvroToExampleWithColumnProjection(self):
+    custom_config = example_gen_pb2.CustomConfig()
+    custom_config.custom_config.Pack(
+        example_gen_pb2.ColumnarInputConfig(columns=['fare', 'company']))
+    exec_properties = {
+        'custom_config':
+            json_format.MessageToJson(
+                custom_config, preserving_proto_field_name=True)
+    }
+    with beam.Pipeline() as pipeline:
+      examples = (
+          pipeline
+          | 'ToTFExample' >> avro_executor._AvroToExample(
+              input_dict=self._input_dict,
+              exec_properties=exec_properties,
+              split_pattern='avro/*.avro'))
+
+      def check_result(got):
+        assert (10000 == len(got)), 'Unexpected example count'
+        assert (set(['fare', 'company']) == set(
+            got[0].features.feature.keys())), 'Example not match'
+
+      util.assert_that(examples, check_result)
+
   def testDo(self):
     output_data_dir = os.path.join(
         os.environ.get('TEST_UNDECLARED_OUTPUTS_DIR', self.get_temp_dir()),
@@ -19,36 +19,83 @@ from __future__ import division
 from __future__ import print_function
 
 import os
-from typing import Any, Dict, List, Text
+from typing import Any, Dict, Iterable, List, Optional, Text
 
 import absl
 import apache_beam as beam
+import pyarrow as pa
+import pyarrow.parquet as pq
 import tensorflow as tf
 
+from tensorflow_metadata.proto.v0 import schema_pb2
 from tfx import types
+from tfx.components.example_gen import utils
 from tfx.components.example_gen.base_example_gen_executor import BaseExampleGenExecutor
 from tfx.components.example_gen.base_example_gen_executor import INPUT_KEY
-from tfx.components.example_gen.utils import dict_to_example
 from tfx.types import artifact_utils
 
 
+# Maximum number of rows of a Parquet row group converted at once.
+_MAX_BATCH_SIZE = 10000
+
+
+def _arrow_type_to_column_type(column_name: Text,
+                               arrow_type: pa.DataType) -> utils.ColumnType:
+  """Returns the ColumnType of a Parquet column from its arrow type."""
+  is_list = pa.types.is_list(arrow_type)
+  if is_list:
+    arrow_type = arrow_type.value_type
+  if pa.types.is_integer(arrow_type) or pa.types.is_boolean(arrow_type):
+    return utils.ColumnType(schema_pb2.INT, is_list)
+  if pa.types.is_floating(arrow_type):
+    return utils.ColumnType(schema_pb2.FLOAT, is_list)
+  if pa.types.is_string(arrow_type) or pa.types.is_binary(arrow_type):
+    return utils.ColumnType(schema_pb2.BYTES, is_list)
+  raise RuntimeError('Column {} has unsupported Parquet type {}.'.format(
+      column_name, arrow_type))
+
+
+@beam.typehints.with_input_types(pa.Table)
+@beam.typehints.with_output_types(tf.train.Example)
+class _ParquetTableToExamples(beam.DoFn):
+  """A beam.DoFn to convert a Parquet row group to tf examples."""
+
+  def process(self, table: pa.Table) -> Iterable[tf.train.Example]:
+    column_types = {
+        field.name: _arrow_type_to_column_type(field.name, field.type)
+        for field in table.schema
+    }
+    for offset in range(0, table.num_rows, _MAX_BATCH_SIZE):
+      batch = table.slice(offset, _MAX_BATCH_SIZE)
+      column_values = {
+          name: batch.column(name).to_pylist() for name in column_types
+      }
+      for example in utils.columns_to_examples(column_types, column_values):
+        yield example
+
+
 @beam.ptransform_fn
 @beam.typehints.with_input_types(beam.Pipeline)
 @beam.typehints.with_output_types(tf.train.Example)
 def _ParquetToExample(  # pylint: disable=invalid-name
     pipeline: beam.Pipeline,
     input_dict: Dict[Text, List[types.Artifact]],
-    exec_properties: Dict[Text, Any],  # pylint: disable=unused-argument
+    exec_properties: Dict[Text, Any],
     split_pattern: Text) -> beam.pvalue.PCollection:
   """Read Parquet files and transform to TF examples.
 
   Note that each input split will be transformed by this function separately.
+  Parquet row groups are read as arrow tables and converted column by column,
+  using the types from the Parquet file schema.
 
   Args:
     pipeline: beam pipeline.
     input_dict: Input dict from input key to a list of Artifacts.
       - input_base: input dir that contains Parquet data.
     exec_properties: A dict of execution properties.
+      - custom_config: optional JSON string of example_gen_pb2.CustomConfig
+        with a packed example_gen_pb2.ColumnarInputConfig. Only the columns
+        it lists are read from the Parquet files.
     split_pattern: Split.pattern in Input config, glob relative file pattern
       that maps to input files with root directory given by input_base.
 
@@ -60,27 +107,106 @@ def _ParquetToExample(  # pylint: disable=invalid-name
   absl.logging.info(
       'Processing input parquet data {} to TFExample.'.format(parquet_pattern))
 
+  columnar_input_config = utils.get_columnar_input_config(exec_properties)
+  columns = None
+  if columnar_input_config and columnar_input_config.columns:
+    columns = list(columnar_input_config.columns)
+
+  return (pipeline
+          | 'ReadFromParquet' >> beam.io.ReadFromParquetBatched(
+              parquet_pattern, columns=columns)
+          | 'ToTFExample' >> beam.ParDo(_ParquetTableToExamples()))
+
+
+def _get_column_types(
+    parquet_file: Text,
+    columns: Optional[List[Text]]) -> Dict[Text, utils.ColumnType]:
+  """Reads the column types from the schema of a Parquet file."""
+  with tf.io.gfile.GFile(parquet_file, 'rb') as f:
+    arrow_schema = pq.ParquetFile(f).schema.to_arrow_schema()
+  return {
+      field.name: _arrow_type_to_column_type(field.name, field.type)
+      for field in arrow_schema
+      if columns is None or field.name in columns
+  }
+
+
+@beam.typehints.with_input_types(List[Dict[Text, Any]])
+@beam.typehints.with_output_types(tf.train.Example)
+class _ParquetRowsToExamples(beam.DoFn):
+  """A beam.DoFn to convert a batch of Parquet rows to tf examples."""
+
+  def __init__(self, column_types: Dict[Text, utils.ColumnType]):
+    self._column_types = column_types
+
+  def process(self, rows: List[Dict[Text, Any]]) -> Iterable[tf.train.Example]:
+    column_values = {
+        name: [row.get(name) for row in rows] for name in self._column_types
+    }
+    for example in utils.columns_to_examples(self._column_types,
+                                             column_values):
+      yield example
+
+
+@beam.ptransform_fn
+@beam.typehints.with_input_types(beam.Pipeline)
+@beam.typehints.with_output_types(tf.train.Example)
+def _ParquetFilesToExample(  # pylint: disable=invalid-name
+    pipeline: beam.Pipeline,
+    input_dict: Dict[Text, List[types.Artifact]],  # pylint: disable=unused-argument
+    exec_properties: Dict[Text, Any],
+    file_paths: List[Text]) -> beam.pvalue.PCollection:
+  """Read a list of Parquet files and transform to TF examples.
+
+  Rows are converted in batches, column by column, using the types from the
+  Parquet schema of the first file.
+
+  Args:
+    pipeline: beam pipeline.
+    input_dict: Input dict from input key to a list of Artifacts.
+    exec_properties: A dict of execution properties, as for _ParquetToExample.
+    file_paths: Paths of the Parquet files.
+
+  Returns:
+    PCollection of TF examples.
+  """
+  columnar_input_config = utils.get_columnar_input_config(exec_properties)
+  columns = None
+  if columnar_input_config and columnar_input_config.columns:
+    columns = list(columnar_input_config.columns)
+  column_types = _get_column_types(file_paths[0], columns)
+
   return (pipeline
-          # TODO(jyzhao): support per column read by input_config.
-          | 'ReadFromParquet' >> beam.io.ReadFromParquet(parquet_pattern)
-          | 'ToTFExample' >> beam.Map(dict_to_example))
+          | 'CreateFilePaths' >> beam.Create(file_paths)
+          | 'ReadAllFromParquet' >> beam.io.ReadAllFromParquet(columns=columns)
+          | 'BatchRows' >> beam.BatchElements(max_batch_size=_MAX_BATCH_SIZE)
+          | 'ToTFExample' >> beam.ParDo(_ParquetRowsToExamples(column_types)))
 
 
 class Executor(BaseExampleGenExecutor):
   """TFX example gen executor for processing parquet format.
 
-  Data type conversion:
-    integer types will be converted to tf.train.Feature with tf.train.Int64List.
+  Data type conversion, based on the Parquet file schema:
+    integer and boolean types will be converted to tf.train.Feature with
+      tf.train.Int64List.
     float types will be converted to tf.train.Feature with tf.train.FloatList.
-    string types will be converted to tf.train.Feature with tf.train.BytesList
-      and utf-8 encoding.
+    string and binary types will be converted to tf.train.Feature with
+      tf.train.BytesList and utf-8 encoding.
+    list of the above types will be converted to a tf.train.Feature holding
+      all values of the list.
 
     Note that,
       Single value will be converted to a list of that single value.
       Missing value will be converted to empty tf.train.Feature().
-      Parquet data might lose precision, e.g., int96.
+      Columns of any other type, e.g., int96, timestamp or decimal, raise a
+      RuntimeError instead of being converted with lost precision; leave them
+      out of the ColumnarInputConfig columns to skip them.
 
-    For details, check the dict_to_example function in example_gen.utils.
+    Row groups are converted in batches, column by column. To read only some of
+    the columns, pack an example_gen_pb2.ColumnarInputConfig into the
+    custom_config; other columns are then never decoded.
+
+    For details, check the columns_to_examples function in example_gen.utils.
 
 
   Example usage:
@@ -99,3 +225,7 @@ class Executor(BaseExampleGenExecutor):
   def GetInputSourceToExamplePTransform(self) -> beam.PTransform:
     """Returns PTransform for parquet to TF examples."""
     return _ParquetToExample
+
+  def GetInputFilesToExamplePTransform(self) -> beam.PTransform:
+    """Returns PTransform for a list of parquet files to TF examples."""
+    return _ParquetFilesToExample
@@ -21,6 +21,8 @@ from __future__ import print_function
 import os
 import apache_beam as beam
 from apache_beam.testing import util
+import pyarrow as pa
+import pyarrow.parquet as pq
 import tensorflow as tf
 from google.protobuf import json_format
 from tfx.components.example_gen.base_example_gen_executor import INPUT_KEY
@@ -59,6 +61,55 @@ class ExecutorTest(tf.test.TestCase):
 
       util.assert_that(examples, check_result)
 
+  def testParquetToExampleWithColumnProjection(self):
+    custom_config = example_gen_pb2.CustomConfig()
+    custom_config.custom_config.Pack(
+        example_gen_pb2.ColumnarInputConfig(columns=['fare', 'company']))
+    exec_properties = {
+        'custom_config':
+            json_format.MessageToJson(
+                custom_config, preserving_proto_field_name=True)
+    }
+    with beam.Pipeline() as pipeline:
+      examples = (
+          pipeline
+          | 'ToTFExample' >> parquet_executor._ParquetToExample(
+              input_dict=self._input_dict,
+              exec_properties=exec_properties,
+              split_pattern='parquet/*'))
+
+      def check_result(got):
+        assert (10000 == len(got)), 'Unexpected example count'
+        assert (set(['fare', 'company']) == set(
+            got[0].features.feature.keys())), 'Example not match'
+
+      util.assert_that(examples, check_result)
+
+  def testParquetToExampleWithNullableListColumn(self):
+    input_base = standard_artifacts.ExternalArtifact()
+    input_base.uri = os.path.join(self.get_temp_dir(), self._testMethodName)
+    tf.io.gfile.makedirs(os.path.join(input_base.uri, 'parquet'))
+    pq.write_table(
+        pa.Table.from_arrays(
+            [pa.array([[1, None, 2], [None], None], type=pa.list_(pa.int64()))],
+            names=['ints']),
+        os.path.join(input_base.uri, 'parquet', 'data.parquet'))
+    with beam.Pipeline() as pipeline:
+      examples = (
+          pipeline
+          | 'ToTFExample' >> parquet_executor._ParquetToExample(
+              input_dict={INPUT_KEY: [input_base]},
+              exec_properties={},
+              split_pattern='parquet/*'))
+
+      def check_result(got):
+        values = sorted(
+            list(example.features.feature['ints'].int64_list.value)
+            for example in got)
+        assert ([[], [], [1, 2]] == values), 'Unexpected values'
+
+      util.assert_that(examples, check_result)
+
   def testDo(self):
     output_data_dir = os.path.join(
         os.environ.get('TEST_UNDECLARED_OUTPUTS_DIR', self.get_temp_dir()),
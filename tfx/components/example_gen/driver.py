@@ -31,6 +31,7 @@ from tfx.components.base import base_driver
 from tfx.orchestration import data_types
 from tfx.proto import example_gen_pb2
 from tfx.types import channel_utils
+from tfx.types import standard_artifacts
 from tfx.utils import io_utils
 
 # Fingerprint custom property.
@@ -103,13 +104,23 @@ class Driver(base_driver.BaseDriver):
       pipeline_info: data_types.PipelineInfo,
   ) -> Dict[Text, List[types.Artifact]]:
     """Overrides BaseDriver.resolve_input_artifacts()."""
-    del driver_args  # unused
-    del pipeline_info  # unused
+    # Inputs produced by upstream components, e.g. an optional schema, are
+    # resolved from metadata as usual. Only external inputs are registered here.
+    upstream_channels = {
+        key: channel
+        for key, channel in input_channels.items()
+        if channel.type_name != standard_artifacts.ExternalArtifact.TYPE_NAME
+    }
+    external_channels = {
+        key: channel
+        for key, channel in input_channels.items()
+        if key not in upstream_channels
+    }
 
     input_config = example_gen_pb2.Input()
     json_format.Parse(exec_properties['input_config'], input_config)
 
-    input_dict = channel_utils.unwrap_channel_dict(input_channels)
+    input_dict = channel_utils.unwrap_channel_dict(external_channels)
     for input_list in input_dict.values():
       for single_input in input_list:
         absl.logging.debug('Processing input %s.' % single_input.uri)
@@ -169,4 +180,10 @@ class Driver(base_driver.BaseDriver):
 
     exec_properties['input_config'] = json_format.MessageToJson(
         input_config, sort_keys=True, preserving_proto_field_name=True)
+    if upstream_channels:
+      input_dict.update(
+          super(Driver, self).resolve_input_artifacts(upstream_channels,
+                                                      exec_properties,
+                                                      driver_args,
+                                                      pipeline_info))
     return input_dict
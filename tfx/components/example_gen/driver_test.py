@@ -24,6 +24,7 @@ import tensorflow as tf
 from google.protobuf import json_format
 from ml_metadata.proto import metadata_store_pb2
 from tfx.components.example_gen import driver
+from tfx.orchestration import data_types
 from tfx.proto import example_gen_pb2
 from tfx.types import channel_utils
 from tfx.types import standard_artifacts
@@ -121,6 +122,39 @@ class DriverTest(tf.test.TestCase):
     self.assertEqual(3, updated_input_base.id)
     self.assertEqual(self._input_base_path, updated_input_base.uri)
 
+  def testResolveInputArtifactsWithUpstreamSchema(self):
+    split1 = os.path.join(self._input_base_path, 'split1', 'data')
+    io_utils.write_string_file(split1, 'testing')
+    schema = standard_artifacts.Schema()
+    schema.uri = os.path.join(self._input_base_path, 'schema')
+    schema.id = 7
+    input_channels = dict(self._input_channels)
+    input_channels['schema'] = channel_utils.as_channel([schema])
+    exec_properties = {
+        'input_config':
+            json_format.MessageToJson(
+                example_gen_pb2.Input(splits=[
+                    example_gen_pb2.Input.Split(name='s1', pattern='split1/*')
+                ]),
+                preserving_proto_field_name=True),
+    }
+
+    self._mock_metadata.get_artifacts_by_uri.return_value = []
+    self._mock_metadata.publish_artifacts.return_value = [
+        metadata_store_pb2.Artifact()
+    ]
+    updated_input_dict = self._example_gen_driver.resolve_input_artifacts(
+        input_channels, exec_properties,
+        data_types.DriverArgs(interactive_resolution=True), None)
+
+    self.assertEqual(2, len(updated_input_dict))
+    self.assertEqual(self._input_base_path,
+                     updated_input_dict['input_base'][0].uri)
+    # The schema is resolved as an upstream artifact, not as an external input.
+    self.assertEqual(7, updated_input_dict['schema'][0].id)
+    self._mock_metadata.get_artifacts_by_uri.assert_called_once_with(
+        self._input_base_path)
+
   def testGlobToRegex(self):
     glob_pattern = 'a(b)c'
     self.assertEqual(1, re.compile(glob_pattern).groups)
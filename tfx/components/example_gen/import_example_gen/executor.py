@@ -68,9 +68,55 @@ def _ImportExample(  # pylint: disable=invalid-name
           | 'ToTFExample' >> beam.Map(tf.train.Example.FromString))
 
 
+@beam.ptransform_fn
+@beam.typehints.with_input_types(beam.Pipeline)
+@beam.typehints.with_output_types(tf.train.Example)
+def _ImportExampleFiles(  # pylint: disable=invalid-name
+    pipeline: beam.Pipeline,
+    input_dict: Dict[Text, List[types.Artifact]],  # pylint: disable=unused-argument
+    exec_properties: Dict[Text, Any],  # pylint: disable=unused-argument
+    file_paths: List[Text]) -> beam.pvalue.PCollection:
+  """Read a list of TFRecord files to PCollection of TF examples.
+
+  Args:
+    pipeline: beam pipeline.
+    input_dict: Input dict from input key to a list of Artifacts.
+    exec_properties: A dict of execution properties.
+    file_paths: Paths of the TFRecord files.
+
+  Returns:
+    PCollection of TF examples.
+  """
+  return (pipeline
+          | 'CreateFilePaths' >> beam.Create(file_paths)
+          | 'ReadAllFromTFRecord' >> beam.io.ReadAllFromTFRecord()
+          | 'ToTFExample' >> beam.Map(tf.train.Example.FromString))
+
+
 class Executor(BaseExampleGenExecutor):
   """Generic TFX import example gen executor."""
 
   def GetInputSourceToExamplePTransform(self) -> beam.PTransform:
     """Returns PTransform for importing TF examples."""
     return _ImportExample
+
+  def GetInputFilesToExamplePTransform(self) -> beam.PTransform:
+    """Returns PTransform for importing TF examples from a list of files."""
+    return _ImportExampleFiles
+
+  def IsInputFileCopyable(self, file_path: Text,
+                          exec_properties: Dict[Text, Any]) -> bool:
+    """Gzipped TFRecord files are copied as they are to the output.
+
+    Files are only copied when no custom config is given, as it may ask for
+    the examples to be transformed, which requires reading them.
+
+    Args:
+      file_path: Path of the input file.
+      exec_properties: A dict of execution properties.
+
+    Returns:
+      Whether the file can be copied to the output.
+    """
+    return (file_path.endswith('.gz') and
+            not exec_properties.get('custom_config'))
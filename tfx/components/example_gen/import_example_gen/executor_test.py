@@ -105,6 +105,100 @@ class ExecutorTest(tf.test.TestCase):
         tf.io.gfile.GFile(train_output_file).size(),
         tf.io.gfile.GFile(eval_output_file).size())
 
+  def testDoFileGranularity(self):
+    output_data_dir = os.path.join(
+        os.environ.get('TEST_UNDECLARED_OUTPUTS_DIR', self.get_temp_dir()),
+        self._testMethodName)
+
+    # Create output dict.
+    examples = standard_artifacts.Examples()
+    examples.uri = output_data_dir
+    examples.split_names = artifact_utils.encode_split_names(['train', 'eval'])
+    output_dict = {'examples': [examples]}
+
+    # Create exec proterties.
+    exec_properties = {
+        'input_config':
+            json_format.MessageToJson(
+                example_gen_pb2.Input(splits=[
+                    example_gen_pb2.Input.Split(
+                        name='tfrecord', pattern='tfrecord/*'),
+                ]),
+                preserving_proto_field_name=True),
+        'output_config':
+            json_format.MessageToJson(
+                example_gen_pb2.Output(
+                    split_config=example_gen_pb2.SplitConfig(
+                        splits=[
+                            example_gen_pb2.SplitConfig.Split(
+                                name='train', hash_buckets=2),
+                            example_gen_pb2.SplitConfig.Split(
+                                name='eval', hash_buckets=1)
+                        ],
+                        granularity=example_gen_pb2.SplitConfig.FILE)),
+                preserving_proto_field_name=True)
+    }
+
+    # Run executor.
+    import_example_gen = executor.Executor()
+    import_example_gen.Do(self._input_dict, output_dict, exec_properties)
+
+    # Each gzipped input file is copied as it is to exactly one split.
+    input_files = tf.io.gfile.glob(
+        os.path.join(self._input_dict[INPUT_KEY][0].uri, 'tfrecord', '*'))
+    copied_files = (
+        tf.io.gfile.glob(
+            os.path.join(examples.uri, 'train', 'data_tfrecord_copied-*')) +
+        tf.io.gfile.glob(
+            os.path.join(examples.uri, 'eval', 'data_tfrecord_copied-*')))
+    self.assertLen(copied_files, len(input_files))
+    self.assertCountEqual(
+        [tf.io.gfile.GFile(f, 'rb').read() for f in input_files],
+        [tf.io.gfile.GFile(f, 'rb').read() for f in copied_files])
+
+  def testGenerateExamplesByBeamFileGranularity(self):
+    exec_properties = {
+        'input_config':
+            json_format.MessageToJson(
+                example_gen_pb2.Input(splits=[
+                    example_gen_pb2.Input.Split(
+                        name='tfrecord', pattern='tfrecord/*'),
+                ]),
+                preserving_proto_field_name=True),
+        'output_config':
+            json_format.MessageToJson(
+                example_gen_pb2.Output(
+                    split_config=example_gen_pb2.SplitConfig(
+                        splits=[
+                            example_gen_pb2.SplitConfig.Split(
+                                name='train', hash_buckets=2),
+                            example_gen_pb2.SplitConfig.Split(
+                                name='eval', hash_buckets=1)
+                        ],
+                        granularity=example_gen_pb2.SplitConfig.FILE)),
+                preserving_proto_field_name=True)
+    }
+    with beam.Pipeline() as pipeline:
+      example_splits = executor.Executor().GenerateExamplesByBeam(
+          pipeline, self._input_dict, exec_properties)
+      # Copyable input files are read when not called from Do.
+      examples = (
+          list(example_splits.values())
+          | 'FlattenSplits' >> beam.Flatten())
+
+      def check_result(got):
+        assert (15000 == len(got)), 'Unexpected example count'
+
+      util.assert_that(examples, check_result)
+
+  def testIsInputFileCopyable(self):
+    import_example_gen = executor.Executor()
+    self.assertTrue(import_example_gen.IsInputFileCopyable('data.gz', {}))
+    self.assertFalse(import_example_gen.IsInputFileCopyable('data', {}))
+    self.assertFalse(
+        import_example_gen.IsInputFileCopyable('data.gz',
+                                               {'custom_config': '{}'}))
+
 
 if __name__ == '__main__':
   tf.test.main()
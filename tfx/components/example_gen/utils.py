@@ -18,16 +18,23 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-from typing import Any, Dict, List, Text, Union
+import collections
+from typing import Any, Dict, List, Optional, Text, Union
 
 import six
 import tensorflow as tf
 
+from tensorflow_metadata.proto.v0 import schema_pb2
 from tfx.proto import example_gen_pb2
 from google.protobuf import json_format
 
 _DEFAULT_ENCODING = 'utf-8'
 
+# Type of an input column, as given by the schema of a columnar input file.
+#   feature_type: schema_pb2.FeatureType of the column values.
+#   is_list: whether each row holds a list of values rather than a single one.
+ColumnType = collections.namedtuple('ColumnType', ['feature_type', 'is_list'])
+
 
 def dict_to_example(instance: Dict[Text, Any]) -> tf.train.Example:
   """Converts dict to tf example."""
@@ -67,6 +74,91 @@ def dict_to_example(instance: Dict[Text, Any]) -> tf.train.Example:
   return tf.train.Example(features=tf.train.Features(feature=feature))
 
 
+def _int64_feature(values: List[Any]) -> tf.train.Feature:
+  return tf.train.Feature(int64_list=tf.train.Int64List(value=values))
+
+
+def _float_feature(values: List[Any]) -> tf.train.Feature:
+  return tf.train.Feature(float_list=tf.train.FloatList(value=values))
+
+
+def _bytes_feature(values: List[Any]) -> tf.train.Feature:
+  return tf.train.Feature(
+      bytes_list=tf.train.BytesList(
+          value=[tf.compat.as_bytes(v, _DEFAULT_ENCODING) for v in values]))
+
+
+_FEATURE_TYPE_TO_FEATURE_FN = {
+    schema_pb2.INT: _int64_feature,
+    schema_pb2.FLOAT: _float_feature,
+    schema_pb2.BYTES: _bytes_feature,
+}
+
+
+def _column_to_features(column_type: ColumnType,
+                        values: List[Any]) -> List[tf.train.Feature]:
+  """Converts the values of one column to a tf.train.Feature per row."""
+  to_feature = _FEATURE_TYPE_TO_FEATURE_FN[column_type.feature_type]
+  if column_type.is_list:
+    features = []
+    for v in values:
+      # Null elements of list cells, e.g. of nullable Parquet list columns,
+      # are dropped.
+      present_values = [x for x in v if x is not None] if v else None
+      features.append(
+          to_feature(present_values) if present_values else tf.train.Feature())
+    return features
+  return [
+      to_feature([v]) if v is not None else tf.train.Feature() for v in values
+  ]
+
+
+def columns_to_examples(
+    column_types: Dict[Text, ColumnType],
+    column_values: Dict[Text, List[Any]]) -> List[tf.train.Example]:
+  """Converts a batch of rows stored as columns to tf examples.
+
+  Unlike `dict_to_example`, the type of every column is given up front, e.g.
+  by the schema of the input file, so the conversion does not inspect the type
+  of every value.
+
+  Args:
+    column_types: Dict from column name to its ColumnType.
+    column_values: Dict from column name to the list of its values, one per
+      row. Missing values are None, and None elements of list values are
+      dropped. All lists must have the same length.
+
+  Returns:
+    A list of tf examples, one per row.
+  """
+  column_names = list(column_values.keys())
+  feature_columns = [
+      _column_to_features(column_types[name], column_values[name])
+      for name in column_names
+  ]
+  return [
+      tf.train.Example(
+          features=tf.train.Features(feature=dict(zip(column_names, row))))
+      for row in zip(*feature_columns)
+  ]
+
+
+def get_columnar_input_config(
+    exec_properties: Dict[Text, Any]
+) -> Optional[example_gen_pb2.ColumnarInputConfig]:
+  """Returns the ColumnarInputConfig packed in the custom config, if any."""
+  if not exec_properties.get('custom_config'):
+    return None
+  custom_config = example_gen_pb2.CustomConfig()
+  json_format.Parse(exec_properties['custom_config'], custom_config)
+  if not custom_config.custom_config.Is(
+      example_gen_pb2.ColumnarInputConfig.DESCRIPTOR):
+    return None
+  columnar_input_config = example_gen_pb2.ColumnarInputConfig()
+  custom_config.custom_config.Unpack(columnar_input_config)
+  return columnar_input_config
+
+
 def generate_output_split_names(
     input_config: Union[example_gen_pb2.Input, Dict[Text, Any]],
     output_config: Union[example_gen_pb2.Output, Dict[Text,
@@ -22,6 +22,8 @@ from typing import Text
 
 import tensorflow as tf
 
+from google.protobuf import json_format
+from tensorflow_metadata.proto.v0 import schema_pb2
 from tfx.components.example_gen import utils
 from tfx.orchestration import data_types
 from tfx.proto import example_gen_pb2
@@ -108,6 +110,86 @@ class UtilsTest(tf.test.TestCase):
         }
         """, example)
 
+  def testColumnsToExamples(self):
+    column_types = {
+        'int': utils.ColumnType(schema_pb2.INT, False),
+        'float_list': utils.ColumnType(schema_pb2.FLOAT, True),
+        'str': utils.ColumnType(schema_pb2.BYTES, False),
+    }
+    column_values = {
+        'int': [10, None],
+        'float_list': [[3.0, 4.0], []],
+        'str': ['abc', b'de'],
+    }
+    examples = utils.columns_to_examples(column_types, column_values)
+    self.assertLen(examples, 2)
+    self.assertProtoEquals(
+        """
+        features {
+          feature {
+            key: "float_list"
+            value {
+              float_list {
+                value: 3.0
+                value: 4.0
+              }
+            }
+          }
+          feature {
+            key: "int"
+            value {
+              int64_list {
+                value: 10
+              }
+            }
+          }
+          feature {
+            key: "str"
+            value {
+              bytes_list {
+                value: "abc"
+              }
+            }
+          }
+        }
+        """, examples[0])
+    self.assertProtoEquals(
+        """
+        features {
+          feature {
+            key: "float_list"
+            value {
+            }
+          }
+          feature {
+            key: "int"
+            value {
+            }
+          }
+          feature {
+            key: "str"
+            value {
+              bytes_list {
+                value: "de"
+              }
+            }
+          }
+        }
+        """, examples[1])
+
+  def testGetColumnarInputConfig(self):
+    self.assertIsNone(utils.get_columnar_input_config({}))
+    custom_config = example_gen_pb2.CustomConfig()
+    custom_config.custom_config.Pack(
+        example_gen_pb2.ColumnarInputConfig(columns=['a', 'b']))
+    exec_properties = {
+        'custom_config':
+            json_format.MessageToJson(
+                custom_config, preserving_proto_field_name=True)
+    }
+    self.assertEqual(['a', 'b'],
+                     utils.get_columnar_input_config(exec_properties).columns)
+
   def testMakeOutputSplitNames(self):
     split_names = utils.generate_output_split_names(
         input_config=example_gen_pb2.Input(splits=[
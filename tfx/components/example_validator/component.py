@@ -24,6 +24,7 @@ import absl
 from tfx import types
 from tfx.components.base import base_component
 from tfx.components.base import executor_spec
+from tfx.components.base import memoizing_driver
 from tfx.components.example_validator import executor
 from tfx.types import standard_artifacts
 from tfx.types.standard_component_specs import ExampleValidatorSpec
@@ -51,6 +52,10 @@ class ExampleValidator(base_component.BaseComponent):
   schema. The schema codifies properties which the input data is expected to
   satisfy, and is provided and maintained by the user.
 
+  The anomalies only depend on the content of the statistics and the schema.
+  When caching is enabled, anomalies computed by an earlier run of the pipeline
+  on identical inputs are reused.
+
   Please see https://www.tensorflow.org/tfx/data_validation for more details.
 
   ## Example
@@ -64,6 +69,7 @@ class ExampleValidator(base_component.BaseComponent):
 
   SPEC_CLASS = ExampleValidatorSpec
   EXECUTOR_SPEC = executor_spec.ExecutorClassSpec(executor.Executor)
+  DRIVER_CLASS = memoizing_driver.MemoizingDriver
 
   def __init__(self,
                statistics: types.Channel = None,
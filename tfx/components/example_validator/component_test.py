@@ -19,6 +19,7 @@ from __future__ import division
 from __future__ import print_function
 
 import tensorflow as tf
+from tfx.components.base import memoizing_driver
 from tfx.components.example_validator import component
 from tfx.types import artifact_utils
 from tfx.types import channel_utils
@@ -37,6 +38,8 @@ class ExampleValidatorTest(tf.test.TestCase):
     )
     self.assertEqual(standard_artifacts.ExampleAnomalies.TYPE_NAME,
                      example_validator.outputs['anomalies'].type_name)
+    self.assertIs(memoizing_driver.MemoizingDriver,
+                  example_validator.driver_class)
 
 
 if __name__ == '__main__':
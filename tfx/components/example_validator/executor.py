@@ -70,6 +70,16 @@ class Executor(base_executor.BaseExecutor):
     """
     self._log_startup(input_dict, output_dict, exec_properties)
 
+    # Set by StatisticsGen if the statistics are computed over a sample.
+    sampling_config = artifact_utils.get_single_instance(
+        input_dict[STATISTICS_KEY]).get_string_custom_property(
+            'sampling_config')
+    if sampling_config:
+      absl.logging.warning(
+          'Statistics are computed over a sample of the examples ({}), '
+          'anomalies in values absent from the sample are not found.'.format(
+              sampling_config))
+
     absl.logging.info('Validating schema against the computed statistics.')
     label_inputs = {
         labels.STATS:
@@ -25,6 +25,7 @@ from tfx.components.base import base_component
 from tfx.components.base import executor_spec
 from tfx.components.model_validator import driver
 from tfx.components.model_validator import executor
+from tfx.proto import evaluator_pb2
 from tfx.types import standard_artifacts
 from tfx.types.standard_component_specs import ModelValidatorSpec
 
@@ -71,7 +72,9 @@ class ModelValidator(base_component.BaseComponent):
                examples: types.Channel,
                model: types.Channel,
                blessing: Optional[types.Channel] = None,
-               instance_name: Optional[Text] = None):
+               instance_name: Optional[Text] = None,
+               eval_sampling_config: Optional[
+                   evaluator_pb2.EvalSamplingConfig] = None):
     """Construct a ModelValidator component.
 
     Args:
@@ -87,9 +90,18 @@ class ModelValidator(base_component.BaseComponent):
       instance_name: Optional name assigned to this specific instance of
         ModelValidator.  Required only if multiple ModelValidator components are
         declared in the same pipeline.
+      eval_sampling_config: Optional `evaluator_pb2.EvalSamplingConfig`
+        instance. If set, the models are evaluated on a sample of the eval
+        split, e.g. to bound the validation time of CI pipelines, and the
+        sample size is recorded on the blessing. By default, all examples are
+        used.
     """
     blessing = blessing or types.Channel(
         type=standard_artifacts.ModelBlessing,
         artifacts=[standard_artifacts.ModelBlessing()])
-    spec = ModelValidatorSpec(examples=examples, model=model, blessing=blessing)
+    spec = ModelValidatorSpec(
+        examples=examples,
+        model=model,
+        blessing=blessing,
+        eval_sampling_config=eval_sampling_config)
     super(ModelValidator, self).__init__(spec=spec, instance_name=instance_name)
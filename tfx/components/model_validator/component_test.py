@@ -20,6 +20,7 @@ from __future__ import print_function
 
 import tensorflow as tf
 from tfx.components.model_validator import component
+from tfx.proto import evaluator_pb2
 from tfx.types import channel_utils
 from tfx.types import standard_artifacts
 
@@ -35,6 +36,18 @@ class ComponentTest(tf.test.TestCase):
     self.assertEqual(standard_artifacts.ModelBlessing.TYPE_NAME,
                      model_validator.outputs['blessing'].type_name)
 
+  def testConstructWithEvalSamplingConfig(self):
+    examples = standard_artifacts.Examples()
+    model = standard_artifacts.Model()
+    model_validator = component.ModelValidator(
+        examples=channel_utils.as_channel([examples]),
+        model=channel_utils.as_channel([model]),
+        eval_sampling_config=evaluator_pb2.EvalSamplingConfig(
+            fixed_size=1000))
+    self.assertEqual(standard_artifacts.ModelBlessing.TYPE_NAME,
+                     model_validator.outputs['blessing'].type_name)
+    self.assertIn('eval_sampling_config', model_validator.exec_properties)
+
 
 if __name__ == '__main__':
   tf.test.main()
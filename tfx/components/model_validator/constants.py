@@ -33,6 +33,9 @@ ARTIFACT_PROPERTY_BLESSED_MODEL_ID_KEY = 'blessed_model_id'
 # Paths to store model eval results for validation.
 CURRENT_MODEL_EVAL_RESULT_PATH = 'eval_results/current_model'
 BLESSED_MODEL_EVAL_RESULT_PATH = 'eval_results/blessed_model'
+# Path in blessing artifacts to store model eval results for reuse by later
+# validations, by model id, eval examples URI and slice spec.
+CACHED_EVAL_RESULTS_PATH = 'cached_eval_results'
 
 # Values for blessing results.
 BLESSED_VALUE = 1
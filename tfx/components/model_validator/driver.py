@@ -18,10 +18,11 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-from typing import Any, Dict, Optional, Text, Tuple
+from typing import Any, Dict, List, Optional, Text, Tuple
 
 import absl
 
+from ml_metadata.proto import metadata_store_pb2
 from tfx.components.base import base_driver
 from tfx.orchestration import data_types
 
@@ -29,13 +30,10 @@ from tfx.orchestration import data_types
 class Driver(base_driver.BaseDriver):
   """Custom driver for model validator."""
 
-  def _fetch_last_blessed_model(
-      self,
-      pipeline_name: Text,
-      component_id: Text,
-  ) -> Tuple[Optional[Text], Optional[int]]:
-    """Fetch last blessed model in metadata based on span."""
-    previous_blessed_models = []
+  def _fetch_blessings(self, pipeline_name: Text,
+                       component_id: Text) -> List[metadata_store_pb2.Artifact]:
+    """Fetch the blessings of the component in metadata."""
+    blessings = []
     for a in self._metadata_handler.get_artifacts_by_type('ModelBlessing'):
       # TODO(ccy): get pipeline name from MLMD context.
       if 'pipeline_name' in a.properties:
@@ -43,9 +41,20 @@ class Driver(base_driver.BaseDriver):
       else:
         p = a.custom_properties['pipeline_name'].string_value
       if (p == pipeline_name and
-          a.custom_properties['blessed'].int_value == 1 and
           a.custom_properties['component_id'].string_value == component_id):
-        previous_blessed_models.append(a)
+        blessings.append(a)
+    return blessings
+
+  def _fetch_last_blessed_model(
+      self,
+      pipeline_name: Text,
+      component_id: Text,
+  ) -> Tuple[Optional[Text], Optional[int]]:
+    """Fetch last blessed model in metadata based on span."""
+    previous_blessed_models = [
+        a for a in self._fetch_blessings(pipeline_name, component_id)
+        if a.custom_properties['blessed'].int_value == 1
+    ]
 
     if previous_blessed_models:
       # TODO(b/138845899): consider use span instead of id.
@@ -57,6 +66,32 @@ class Driver(base_driver.BaseDriver):
     else:
       return None, None
 
+  def _fetch_cached_eval_result_uris(self, pipeline_name: Text,
+                                     component_id: Text) -> List[Text]:
+    """Fetch the URIs of blessings which may hold the blessed model's evals.
+
+    The last blessed model was evaluated by the validation which blessed it,
+    and by the validations against it since then.
+
+    Args:
+      pipeline_name: Name of the pipeline.
+      component_id: Id of the model validator component.
+
+    Returns:
+      The URIs of those blessings, the latest first.
+    """
+    blessings = self._fetch_blessings(pipeline_name, component_id)
+    blessed_ids = [
+        a.id for a in blessings
+        if a.custom_properties['blessed'].int_value == 1
+    ]
+    if not blessed_ids:
+      return []
+    return [
+        a.uri for a in sorted(blessings, key=lambda a: a.id, reverse=True)
+        if a.id >= max(blessed_ids)
+    ]
+
   # pyformat: disable
   def resolve_exec_properties(
       self, exec_properties: Dict[Text, Any],
@@ -67,6 +102,9 @@ class Driver(base_driver.BaseDriver):
     (exec_properties['blessed_model'],
      exec_properties['blessed_model_id']) = self._fetch_last_blessed_model(
          pipeline_info.pipeline_name, component_info.component_id)
+    exec_properties['cached_eval_result_uris'] = (
+        self._fetch_cached_eval_result_uris(pipeline_info.pipeline_name,
+                                            component_info.component_id))
     exec_properties['current_component_id'] = component_info.component_id
     absl.logging.info('Resolved last blessed model {}'.format(
         exec_properties['blessed_model']))
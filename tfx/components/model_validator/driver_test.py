@@ -32,6 +32,7 @@ class DriverTest(tf.test.TestCase):
                             pipeline_name: Text, component_id: Text):
     model_blessing = standard_artifacts.ModelBlessing()
     model_blessing.id = aid
+    model_blessing.uri = 'blessing-%d' % aid
     model_blessing.pipeline_name = pipeline_name
     model_blessing.set_string_custom_property('current_model', 'uri-%d' % aid)
     model_blessing.set_int_custom_property('current_model_id', aid)
@@ -84,6 +85,37 @@ class DriverTest(tf.test.TestCase):
                      model_validator_driver._fetch_last_blessed_model(
                          pipeline_name, component_id))
 
+  def testFetchCachedEvalResultUris(self):
+    # Mock metadata.
+    mock_metadata = tf.compat.v1.test.mock.Mock()
+    model_validator_driver = driver.Driver(mock_metadata)
+    component_id = 'test_component'
+    pipeline_name = 'test_pipeline'
+
+    # No blessed model.
+    mock_metadata.get_artifacts_by_type.return_value = [
+        self._create_mock_artifact(1, False, pipeline_name, component_id)
+    ]
+    self.assertEqual([],
+                     model_validator_driver._fetch_cached_eval_result_uris(
+                         pipeline_name, component_id))
+
+    # The blessing of the last blessed model and the blessings since then.
+    artifacts = [
+        self._create_mock_artifact(aid, aid % 2, pipeline_name, component_id)
+        for aid in [4, 3, 2, 1]
+    ]
+    artifacts.append(
+        self._create_mock_artifact(
+            aid=5,
+            is_blessed=True,
+            pipeline_name=pipeline_name,
+            component_id='different_component'))
+    mock_metadata.get_artifacts_by_type.return_value = artifacts
+    self.assertEqual(['blessing-4', 'blessing-3'],
+                     model_validator_driver._fetch_cached_eval_result_uris(
+                         pipeline_name, component_id))
+
 
 if __name__ == '__main__':
   tf.test.main()
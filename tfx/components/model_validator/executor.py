@@ -18,22 +18,45 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import hashlib
+import json
 import os
-from typing import Any, Dict, List, Text
+from typing import Any, Dict, List, Optional, Text, Tuple
 
 import absl
-import apache_beam as beam
 import tensorflow as tf
 import tensorflow_model_analysis as tfma
 
+from google.protobuf import json_format
 from tfx import types
 from tfx.components.base import base_executor
 from tfx.components.model_validator import constants
+from tfx.components.util import eval_sampling
+from tfx.proto import evaluator_pb2
 from tfx.types import artifact_utils
 from tfx.utils import io_utils
 from tfx.utils import path_utils
 
 
+def _get_eval_result_key(
+    model_id: int, examples_uri: Text,
+    slice_spec: List[tfma.slicer.SingleSliceSpec],
+    eval_sampling_config: evaluator_pb2.EvalSamplingConfig) -> Text:
+  """Returns the key of the eval result of a model on examples.
+
+  Examples artifacts are never modified once published, so the URI of the
+  eval split identifies the eval examples without reading them.
+  """
+  key = json.dumps({
+      'model_id': model_id,
+      'examples_uri': examples_uri,
+      'slice_spec': sorted(repr(spec) for spec in slice_spec),
+      'eval_sampling_config': json_format.MessageToJson(
+          eval_sampling_config, sort_keys=True, indent=None),
+  }, sort_keys=True)
+  return hashlib.sha256(tf.compat.as_bytes(key)).hexdigest()
+
+
 class Executor(base_executor.BaseExecutor):
   """TFX model validator executor.
 
@@ -89,34 +112,130 @@ class Executor(base_executor.BaseExecutor):
         return False
     return True
 
-  def _generate_blessing_result(self, eval_examples_uri: Text,
-                                slice_spec: List[tfma.slicer.SingleSliceSpec],
-                                current_model_dir: Text,
-                                blessed_model_dir: Text) -> bool:
+  def _fetch_cached_eval_result(self, eval_result_path: Text,
+                                cached_eval_result_uris: List[Text]) -> bool:
+    """Copies a cached eval result to eval_result_path, if there is one.
+
+    Args:
+      eval_result_path: Path under CACHED_EVAL_RESULTS_PATH of the blessing to
+        write the eval result to, ending with the eval result key.
+      cached_eval_result_uris: URIs of earlier blessings to look for an eval
+        result with the same key in.
+
+    Returns:
+      Whether a cached eval result was found.
+    """
+    key = os.path.basename(eval_result_path)
+    for uri in cached_eval_result_uris:
+      cached_path = os.path.join(uri, constants.CACHED_EVAL_RESULTS_PATH, key)
+      if tf.io.gfile.isdir(cached_path):
+        absl.logging.info('Reusing eval result %s.', cached_path)
+        io_utils.copy_dir(cached_path, eval_result_path)
+        return True
+    return False
+
+  def _generate_blessing_result(
+      self,
+      eval_examples_uri: Text,
+      slice_spec: List[tfma.slicer.SingleSliceSpec],
+      current_model_dir: Text,
+      blessed_model_dir: Text,
+      current_model_id: Optional[int] = None,
+      blessed_model_id: Optional[int] = None,
+      blessing_uri: Optional[Text] = None,
+      cached_eval_result_uris: Optional[List[Text]] = None,
+      eval_sampling_config: Optional[evaluator_pb2.EvalSamplingConfig] = None
+  ) -> Tuple[bool, Text]:
+    """Evaluates the current and blessed models and compares them.
+
+    If blessing_uri is given, the eval result of each model with an id is
+    written under its CACHED_EVAL_RESULTS_PATH, keyed by the model id, the
+    URI of the eval examples and the slice spec. A model is only
+    evaluated if no eval result with its key is in cached_eval_result_uris,
+    so that e.g. the blessed model is not evaluated again on unchanged data.
+
+    Args:
+      eval_examples_uri: URI of the eval examples.
+      slice_spec: Slices to compute the metrics of.
+      current_model_dir: URI of the current model.
+      blessed_model_dir: URI of the blessed model, or None.
+      current_model_id: Optional metadata id of the current model.
+      blessed_model_id: Optional metadata id of the blessed model.
+      blessing_uri: Optional URI of the blessing to cache eval results in.
+      cached_eval_result_uris: Optional URIs of earlier blessings to reuse
+        eval results from.
+      eval_sampling_config: Optional evaluator_pb2.EvalSamplingConfig to
+        evaluate the models on a sample of the eval examples with.
+
+    Returns:
+      Whether the current model is blessed, and the path of the eval result of
+      the current model.
+    """
     current_model_eval_result_path = os.path.join(
         self._temp_path, constants.CURRENT_MODEL_EVAL_RESULT_PATH)
     blessed_model_eval_result_path = os.path.join(
         self._temp_path, constants.BLESSED_MODEL_EVAL_RESULT_PATH)
+    eval_sampling_config = (
+        eval_sampling_config or evaluator_pb2.EvalSamplingConfig())
+    eval_current_model = True
+    eval_blessed_model = blessed_model_dir is not None
+    if blessing_uri is not None:
+      # Artifacts which are not registered in metadata have no id to key
+      # their eval results by.
+      if current_model_id:
+        current_model_eval_result_path = os.path.join(
+            blessing_uri, constants.CACHED_EVAL_RESULTS_PATH,
+            _get_eval_result_key(current_model_id, eval_examples_uri,
+                                 slice_spec, eval_sampling_config))
+        eval_current_model = not self._fetch_cached_eval_result(
+            current_model_eval_result_path, cached_eval_result_uris or [])
+      if eval_blessed_model and blessed_model_id:
+        blessed_model_eval_result_path = os.path.join(
+            blessing_uri, constants.CACHED_EVAL_RESULTS_PATH,
+            _get_eval_result_key(blessed_model_id, eval_examples_uri,
+                                 slice_spec, eval_sampling_config))
+        eval_blessed_model = not self._fetch_cached_eval_result(
+            blessed_model_eval_result_path, cached_eval_result_uris or [])
+
+    if eval_current_model or eval_blessed_model:
+      with self._make_beam_pipeline() as pipeline:
+        eval_data = (
+            pipeline
+            | 'ReadData' >> eval_sampling.ReadEvalExamples(  # pylint: disable=no-value-for-parameter
+                io_utils.all_files_pattern(eval_examples_uri),
+                eval_sampling_config))
 
-    with self._make_beam_pipeline() as pipeline:
-      eval_data = (
-          pipeline | 'ReadData' >> beam.io.ReadFromTFRecord(
-              file_pattern=io_utils.all_files_pattern(eval_examples_uri)))
-
-      current_model = tfma.default_eval_shared_model(
-          eval_saved_model_path=path_utils.eval_model_path(current_model_dir))
-      (eval_data | 'EvalCurrentModel' >> tfma.ExtractEvaluateAndWriteResults(  # pylint: disable=expression-not-assigned
-          eval_shared_model=current_model,
-          slice_spec=slice_spec,
-          output_path=current_model_eval_result_path))
-
-      if blessed_model_dir is not None:
-        blessed_model = tfma.default_eval_shared_model(
-            eval_saved_model_path=path_utils.eval_model_path(blessed_model_dir))
-        (eval_data | 'EvalBlessedModel' >> tfma.ExtractEvaluateAndWriteResults(  # pylint: disable=expression-not-assigned
-            eval_shared_model=blessed_model,
-            slice_spec=slice_spec,
-            output_path=blessed_model_eval_result_path))
+        if eval_current_model:
+          current_model = tfma.default_eval_shared_model(
+              eval_saved_model_path=path_utils.eval_model_path(
+                  current_model_dir))
+          _ = (
+              eval_data
+              | 'EvalCurrentModel' >> tfma.ExtractEvaluateAndWriteResults(
+                  eval_shared_model=current_model,
+                  slice_spec=slice_spec,
+                  output_path=current_model_eval_result_path))
+          if eval_sampling.is_sampled(eval_sampling_config):
+            _ = (
+                eval_data
+                | 'WriteCurrentSampleSize' >> eval_sampling.WriteSampleSize(  # pylint: disable=no-value-for-parameter
+                    current_model_eval_result_path))
+
+        if eval_blessed_model:
+          blessed_model = tfma.default_eval_shared_model(
+              eval_saved_model_path=path_utils.eval_model_path(
+                  blessed_model_dir))
+          _ = (
+              eval_data
+              | 'EvalBlessedModel' >> tfma.ExtractEvaluateAndWriteResults(
+                  eval_shared_model=blessed_model,
+                  slice_spec=slice_spec,
+                  output_path=blessed_model_eval_result_path))
+          if eval_sampling.is_sampled(eval_sampling_config):
+            _ = (
+                eval_data
+                | 'WriteBlessedSampleSize' >> eval_sampling.WriteSampleSize(  # pylint: disable=no-value-for-parameter
+                    blessed_model_eval_result_path))
 
     absl.logging.info('all files in current_model_eval_result_path: [%s]',
                       str(tf.io.gfile.listdir(current_model_eval_result_path)))
@@ -125,12 +244,12 @@ class Executor(base_executor.BaseExecutor):
 
     if not self._pass_threshold(current_model_eval_result):
       absl.logging.info('Current model does not pass threshold.')
-      return False
+      return False, current_model_eval_result_path
     absl.logging.info('Current model passes threshold.')
 
     if blessed_model_dir is None:
       absl.logging.info('No blessed model yet.')
-      return True
+      return True, current_model_eval_result_path
     absl.logging.info('all files in blessed_model_eval_result: [%s]',
                       str(tf.io.gfile.listdir(blessed_model_eval_result_path)))
     blessed_model_eval_result = tfma.load_eval_result(
@@ -139,10 +258,10 @@ class Executor(base_executor.BaseExecutor):
     if (self._compare_eval_result(current_model_eval_result,
                                   blessed_model_eval_result)):
       absl.logging.info('Current model better than blessed model.')
-      return True
+      return True, current_model_eval_result_path
     else:
       absl.logging.info('Current model worse than blessed model.')
-      return False
+      return False, current_model_eval_result_path
 
   def Do(self, input_dict: Dict[Text, List[types.Artifact]],
          output_dict: Dict[Text, List[types.Artifact]],
@@ -158,6 +277,12 @@ class Executor(base_executor.BaseExecutor):
       exec_properties: A dict of execution properties.
         - blessed_model: last blessed model for validation.
         - blessed_model_id: last blessed model id.
+        - cached_eval_result_uris: optional URIs of earlier blessings to reuse
+          model eval results from.
+        - eval_sampling_config: Optionally, a JSON string of
+          evaluator_pb2.EvalSamplingConfig instance, to evaluate the models on
+          a sample of the eval split. The sample size is recorded on the
+          blessing.
 
     Returns:
       None
@@ -194,13 +319,26 @@ class Executor(base_executor.BaseExecutor):
       blessing.set_int_custom_property(
           constants.ARTIFACT_PROPERTY_BLESSED_MODEL_ID_KEY, blessed_model_id)
 
+    eval_sampling_config = evaluator_pb2.EvalSamplingConfig()
+    if exec_properties.get('eval_sampling_config'):
+      json_format.Parse(exec_properties['eval_sampling_config'],
+                        eval_sampling_config)
+
     absl.logging.info('Validating model.')
     # TODO(b/125853306): support customized slice spec.
-    blessed = self._generate_blessing_result(
+    blessed, current_model_eval_result_path = self._generate_blessing_result(
         eval_examples_uri=eval_examples_uri,
         slice_spec=[tfma.slicer.SingleSliceSpec()],
         current_model_dir=current_model.uri,
-        blessed_model_dir=blessed_model_dir)
+        blessed_model_dir=blessed_model_dir,
+        current_model_id=current_model.id,
+        blessed_model_id=blessed_model_id,
+        blessing_uri=blessing.uri,
+        cached_eval_result_uris=exec_properties.get('cached_eval_result_uris'),
+        eval_sampling_config=eval_sampling_config)
+    if eval_sampling.is_sampled(eval_sampling_config):
+      eval_sampling.record_sampling(blessing, current_model_eval_result_path,
+                                    eval_sampling_config)
 
     if blessed:
       io_utils.write_string_file(
@@ -21,8 +21,11 @@ from __future__ import print_function
 import os
 import tensorflow as tf
 
+from google.protobuf import json_format
+
 from tfx.components.model_validator import constants
 from tfx.components.model_validator import executor
+from tfx.proto import evaluator_pb2
 from tfx.types import artifact_utils
 from tfx.types import standard_artifacts
 
@@ -95,6 +98,60 @@ class ExecutorTest(tf.test.TestCase):
         tf.io.gfile.exists(
             os.path.join(self._blessing.uri, constants.BLESSED_FILE_NAME)))
 
+  def testDoReusesCachedEvalResults(self):
+    self._input_dict[constants.MODEL_KEY][0].id = 124
+    exec_properties = {
+        'blessed_model': os.path.join(self._source_data_dir, 'trainer/blessed'),
+        'blessed_model_id': 123,
+        'cached_eval_result_uris': [],
+        'current_component_id': self.component_id,
+    }
+
+    # Run executor, caching the eval results of both models.
+    model_validator = executor.Executor(self._context)
+    model_validator.Do(self._input_dict, self._output_dict, exec_properties)
+    self.assertLen(
+        tf.io.gfile.listdir(
+            os.path.join(self._blessing.uri,
+                         constants.CACHED_EVAL_RESULTS_PATH)), 2)
+
+    # Validate the same models on the same data again.
+    blessing = standard_artifacts.ModelBlessing()
+    blessing.uri = os.path.join(
+        os.path.dirname(self._blessing.uri), 'next_blessing')
+    exec_properties['cached_eval_result_uris'] = [self._blessing.uri]
+    with tf.compat.v1.test.mock.patch.object(
+        executor.tfma, 'ExtractEvaluateAndWriteResults') as mock_evaluate:
+      model_validator.Do(self._input_dict,
+                         {constants.BLESSING_KEY: [blessing]}, exec_properties)
+      mock_evaluate.assert_not_called()
+    self.assertTrue(
+        tf.io.gfile.exists(
+            os.path.join(blessing.uri, constants.BLESSED_FILE_NAME)))
+
+  def testDoWithEvalSampling(self):
+    exec_properties = {
+        'blessed_model': os.path.join(self._source_data_dir, 'trainer/blessed'),
+        'blessed_model_id': 123,
+        'current_component_id': self.component_id,
+        'eval_sampling_config':
+            json_format.MessageToJson(
+                evaluator_pb2.EvalSamplingConfig(fixed_size=50),
+                preserving_proto_field_name=True),
+    }
+
+    # Run executor.
+    model_validator = executor.Executor(self._context)
+    model_validator.Do(self._input_dict, self._output_dict, exec_properties)
+
+    # Check model validator outputs.
+    self.assertTrue(
+        tf.io.gfile.exists(
+            os.path.join(self._blessing.uri, constants.BLESSED_FILE_NAME)))
+    sample_size = self._blessing.get_int_custom_property('eval_sample_size')
+    self.assertGreater(sample_size, 0)
+    self.assertLessEqual(sample_size, 50)
+
 
 if __name__ == '__main__':
   tf.test.main()
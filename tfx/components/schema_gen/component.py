@@ -24,6 +24,7 @@ import absl
 from tfx import types
 from tfx.components.base import base_component
 from tfx.components.base import executor_spec
+from tfx.components.base import memoizing_driver
 from tfx.components.schema_gen import executor
 from tfx.orchestration import data_types
 from tfx.types import standard_artifacts
@@ -44,6 +45,10 @@ class SchemaGen(base_component.BaseComponent):
   In a typical TFX pipeline, the SchemaGen component generates a schema which is
   is consumed by the other pipeline components.
 
+  The inferred schema only depends on the content of the statistics and on the
+  execution properties. When caching is enabled, a schema inferred by an earlier
+  run of the pipeline on identical inputs is reused.
+
   Please see https://www.tensorflow.org/tfx/data_validation for more details.
 
   ## Example
@@ -56,6 +61,7 @@ class SchemaGen(base_component.BaseComponent):
 
   SPEC_CLASS = SchemaGenSpec
   EXECUTOR_SPEC = executor_spec.ExecutorClassSpec(executor.Executor)
+  DRIVER_CLASS = memoizing_driver.MemoizingDriver
 
   def __init__(
       self,
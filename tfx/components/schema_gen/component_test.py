@@ -19,6 +19,7 @@ from __future__ import division
 from __future__ import print_function
 
 import tensorflow as tf
+from tfx.components.base import memoizing_driver
 from tfx.components.schema_gen import component
 from tfx.orchestration import data_types
 from tfx.types import artifact_utils
@@ -52,6 +53,14 @@ class SchemaGenTest(tf.test.TestCase):
         str(schema_gen.spec.exec_properties['infer_feature_shape']),
         str(infer_shape))
 
+  def testConstructMemoizingDriver(self):
+    statistics_artifact = standard_artifacts.ExampleStatistics()
+    statistics_artifact.split_names = artifact_utils.encode_split_names(
+        ['train'])
+    schema_gen = component.SchemaGen(
+        statistics=channel_utils.as_channel([statistics_artifact]))
+    self.assertIs(memoizing_driver.MemoizingDriver, schema_gen.driver_class)
+
 
 if __name__ == '__main__':
   tf.test.main()
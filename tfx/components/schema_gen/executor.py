@@ -72,6 +72,15 @@ class Executor(base_executor.BaseExecutor):
         _DEFAULT_FILE_NAME)
 
     infer_feature_shape = exec_properties['infer_feature_shape']
+    # Set by StatisticsGen if the statistics are computed over a sample.
+    sampling_config = artifact_utils.get_single_instance(
+        input_dict[STATISTICS_KEY]).get_string_custom_property(
+            'sampling_config')
+    if sampling_config:
+      absl.logging.warning(
+          'Statistics are computed over a sample of the examples ({}), the '
+          'inferred schema may miss rare values and features.'.format(
+              sampling_config))
     absl.logging.info('Infering schema from statistics.')
     schema = tfdv.infer_schema(
         tfdv.load_statistics(train_stats_uri), infer_feature_shape)
@@ -24,7 +24,9 @@ import absl
 from tfx import types
 from tfx.components.base import base_component
 from tfx.components.base import executor_spec
+from tfx.components.statistics_gen import driver
 from tfx.components.statistics_gen import executor
+from tfx.proto import statistics_gen_pb2
 from tfx.types import artifact
 from tfx.types import artifact_utils
 from tfx.types import standard_artifacts
@@ -46,16 +48,47 @@ class StatisticsGen(base_component.BaseComponent):
     # Computes statistics over data for visualization and example validation.
     statistics_gen = StatisticsGen(examples=example_gen.outputs['examples'])
   ```
+
+  When `examples` holds several Examples artifacts, e.g. a rolling window of
+  spans resolved by a ResolverNode, their statistics are merged. With
+  `enable_statistics_cache=True`, the statistics output by the latest
+  successful run of this StatisticsGen in the same pipeline are read as
+  `cached_statistics`, and the statistics of the artifacts they already cover
+  are reused instead of recomputed:
+  ```
+    statistics_gen = StatisticsGen(
+        examples=examples_resolver.outputs['examples'],
+        enable_statistics_cache=True)
+  ```
+
+  With a `slicing_config`, statistics of feature value slices are computed in
+  the same pass over each split:
+  ```
+    statistics_gen = StatisticsGen(
+        examples=example_gen.outputs['examples'],
+        slicing_config=statistics_gen_pb2.SlicingConfig(slice_specs=[
+            statistics_gen_pb2.SliceSpec(features=[
+                statistics_gen_pb2.SliceSpec.Feature(name='payment_type')
+            ])
+        ]))
+  ```
   """
 
   SPEC_CLASS = StatisticsGenSpec
   EXECUTOR_SPEC = executor_spec.ExecutorClassSpec(executor.Executor)
+  DRIVER_CLASS = driver.Driver
 
   def __init__(self,
                examples: types.Channel = None,
                output: Optional[types.Channel] = None,
                input_data: Optional[types.Channel] = None,
-               instance_name: Optional[Text] = None):
+               instance_name: Optional[Text] = None,
+               cached_statistics: Optional[types.Channel] = None,
+               enable_statistics_cache: bool = False,
+               sampling_config: Optional[
+                   statistics_gen_pb2.SamplingConfig] = None,
+               slicing_config: Optional[
+                   statistics_gen_pb2.SlicingConfig] = None):
     """Construct a StatisticsGen component.
 
     Args:
@@ -68,6 +101,20 @@ class StatisticsGen(base_component.BaseComponent):
       instance_name: Optional name assigned to this specific instance of
         StatisticsGen.  Required only if multiple StatisticsGen components are
         declared in the same pipeline.
+      cached_statistics: Optional `ExampleStatisticsPath` channel with
+        statistics of previous runs, whose per artifact statistics are reused
+        for Examples artifacts they already cover. If not given and
+        'enable_statistics_cache' is True, the statistics of the latest run of
+        this component are used.
+      enable_statistics_cache: If True, the statistics output by the latest
+        successful run of this component in the pipeline are resolved from
+        metadata as `cached_statistics`.
+      sampling_config: Optional `statistics_gen_pb2.SamplingConfig` instance.
+        If set, statistics are computed over a sample of the examples of each
+        split and are approximate. By default, all examples are used.
+      slicing_config: Optional `statistics_gen_pb2.SlicingConfig` instance. If
+        set, the statistics of each split are also output with a dataset per
+        feature value slice, in the 'sliced_stats' directory of the output.
     """
     if input_data:
       absl.logging.warning(
@@ -82,5 +129,11 @@ class StatisticsGen(base_component.BaseComponent):
       output = types.Channel(
           type=standard_artifacts.ExampleStatistics,
           artifacts=[statistics_artifact])
-    spec = StatisticsGenSpec(examples=examples, statistics=output)
+    spec = StatisticsGenSpec(
+        examples=examples,
+        cached_statistics=cached_statistics,
+        enable_statistics_cache=enable_statistics_cache,
+        sampling_config=sampling_config,
+        slicing_config=slicing_config,
+        statistics=output)
     super(StatisticsGen, self).__init__(spec=spec, instance_name=instance_name)
@@ -20,6 +20,7 @@ from __future__ import print_function
 
 import tensorflow as tf
 from tfx.components.statistics_gen import component
+from tfx.proto import statistics_gen_pb2
 from tfx.types import artifact_utils
 from tfx.types import channel_utils
 from tfx.types import standard_artifacts
@@ -35,6 +36,46 @@ class ComponentTest(tf.test.TestCase):
     self.assertEqual(standard_artifacts.ExampleStatistics.TYPE_NAME,
                      statistics_gen.outputs['statistics'].type_name)
 
+  def testConstructWithCachedStatistics(self):
+    examples = standard_artifacts.Examples()
+    examples.split_names = artifact_utils.encode_split_names(['train', 'eval'])
+    statistics_gen = component.StatisticsGen(
+        examples=channel_utils.as_channel([examples]),
+        cached_statistics=channel_utils.as_channel(
+            [standard_artifacts.ExampleStatistics()]))
+    self.assertEqual(standard_artifacts.ExampleStatistics.TYPE_NAME,
+                     statistics_gen.inputs['cached_statistics'].type_name)
+
+  def testConstructWithStatisticsCache(self):
+    examples = standard_artifacts.Examples()
+    examples.split_names = artifact_utils.encode_split_names(['train', 'eval'])
+    statistics_gen = component.StatisticsGen(
+        examples=channel_utils.as_channel([examples]),
+        enable_statistics_cache=True)
+    self.assertTrue(statistics_gen.exec_properties['enable_statistics_cache'])
+
+  def testConstructWithSamplingConfig(self):
+    examples = standard_artifacts.Examples()
+    examples.split_names = artifact_utils.encode_split_names(['train', 'eval'])
+    statistics_gen = component.StatisticsGen(
+        examples=channel_utils.as_channel([examples]),
+        sampling_config=statistics_gen_pb2.SamplingConfig(fraction=0.5))
+    self.assertEqual(standard_artifacts.ExampleStatistics.TYPE_NAME,
+                     statistics_gen.outputs['statistics'].type_name)
+    self.assertIn('sampling_config', statistics_gen.exec_properties)
+
+  def testConstructWithSlicingConfig(self):
+    examples = standard_artifacts.Examples()
+    examples.split_names = artifact_utils.encode_split_names(['train', 'eval'])
+    statistics_gen = component.StatisticsGen(
+        examples=channel_utils.as_channel([examples]),
+        slicing_config=statistics_gen_pb2.SlicingConfig(slice_specs=[
+            statistics_gen_pb2.SliceSpec(features=[
+                statistics_gen_pb2.SliceSpec.Feature(name='payment_type')
+            ])
+        ]))
+    self.assertIn('slicing_config', statistics_gen.exec_properties)
+
 
 if __name__ == '__main__':
   tf.test.main()
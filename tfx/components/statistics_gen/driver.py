@@ -0,0 +1,59 @@
+# Lint as: python2, python3
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""TFX StatisticsGen Driver."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from typing import Any, Dict, List, Text
+
+import absl
+
+from tfx import types
+from tfx.components.base import base_driver
+from tfx.orchestration import data_types
+from tfx.types import standard_artifacts
+
+# Key in input_dict, see StatisticsGenSpec.
+_CACHED_STATISTICS_KEY = 'cached_statistics'
+
+
+class Driver(base_driver.BaseDriver):
+  """Custom driver for StatisticsGen.
+
+  If the statistics cache is enabled and no 'cached_statistics' input is
+  given, the statistics produced by the latest successful run of the same
+  StatisticsGen component in the pipeline are resolved from metadata as the
+  cached statistics, so that the statistics of Examples artifacts it already
+  covered are reused.
+  """
+
+  def resolve_previous_artifacts(
+      self, input_artifacts: Dict[Text, List[types.Artifact]],
+      exec_properties: Dict[Text, Any],
+      pipeline_info: data_types.PipelineInfo,
+      component_info: data_types.ComponentInfo
+  ) -> Dict[Text, List[types.Artifact]]:
+    """Overrides BaseDriver.resolve_previous_artifacts()."""
+    if (exec_properties.get('enable_statistics_cache') and
+        not input_artifacts.get(_CACHED_STATISTICS_KEY)):
+      previous_statistics = self._fetch_previous_outputs(
+          pipeline_info, component_info, standard_artifacts.ExampleStatistics)
+      if previous_statistics:
+        absl.logging.info('Using cached statistics from %s',
+                          previous_statistics[-1].uri)
+        input_artifacts[_CACHED_STATISTICS_KEY] = [previous_statistics[-1]]
+    return input_artifacts
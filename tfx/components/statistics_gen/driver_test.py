@@ -0,0 +1,67 @@
+# Lint as: python2, python3
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for tfx.components.statistics_gen.driver."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import tensorflow as tf
+from tfx.components.statistics_gen import driver
+from tfx.orchestration import data_types
+from tfx.types import standard_artifacts
+
+
+class DriverTest(tf.test.TestCase):
+
+  def setUp(self):
+    super(DriverTest, self).setUp()
+    self._mock_metadata = tf.compat.v1.test.mock.Mock()
+    statistics = []
+    for aid, component_id in [(1, 'StatisticsGen'), (2, 'StatisticsGen'),
+                              (3, 'StatisticsGen.other')]:
+      artifact = standard_artifacts.ExampleStatistics()
+      artifact.id = aid
+      artifact.uri = 'uri-%d' % aid
+      artifact.producer_component = component_id
+      statistics.append(artifact.mlmd_artifact)
+    get_artifacts = (
+        self._mock_metadata.get_published_artifacts_by_type_within_context)
+    get_artifacts.return_value = {
+        standard_artifacts.ExampleStatistics.TYPE_NAME: statistics
+    }
+    self._pipeline_info = data_types.PipelineInfo(
+        pipeline_name='p', pipeline_root='/p', run_id='r')
+    self._component_info = data_types.ComponentInfo(
+        component_type='c',
+        component_id='StatisticsGen',
+        pipeline_info=self._pipeline_info)
+
+  def _resolve_input_artifacts(self, exec_properties):
+    statistics_gen_driver = driver.Driver(self._mock_metadata)
+    return statistics_gen_driver.resolve_previous_artifacts(
+        {}, exec_properties, self._pipeline_info, self._component_info)
+
+  def testResolveLatestStatistics(self):
+    result = self._resolve_input_artifacts({'enable_statistics_cache': True})
+    self.assertEqual(['uri-2'], [a.uri for a in result['cached_statistics']])
+
+  def testResolveStatisticsCacheDisabled(self):
+    result = self._resolve_input_artifacts({})
+    self.assertNotIn('cached_statistics', result)
+
+
+if __name__ == '__main__':
+  tf.test.main()
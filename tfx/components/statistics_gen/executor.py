@@ -18,30 +18,145 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import collections
+import hashlib
 import os
 from typing import Any, Dict, List, Text
 
 import absl
 import apache_beam as beam
+import tensorflow as tf
+import tensorflow_data_validation as tfdv
+from tensorflow_data_validation import constants
 from tensorflow_data_validation.api import stats_api
 from tensorflow_data_validation.coders import tf_example_decoder
 from tensorflow_data_validation.statistics import stats_options as options
+from tensorflow_data_validation.utils import slicing_util
 
+from google.protobuf import json_format
 from tensorflow_metadata.proto.v0 import statistics_pb2
 from tfx import types
 from tfx.components.base import base_executor
+from tfx.components.statistics_gen import merge_utils
+from tfx.components.util import sampling_utils
+from tfx.proto import statistics_gen_pb2
 from tfx.types import artifact_utils
 from tfx.utils import io_utils
 
 
 # Key for examples in executor input_dict.
 EXAMPLES_KEY = 'examples'
+# Key for statistics of previous runs in executor input_dict.
+CACHED_STATISTICS_KEY = 'cached_statistics'
 
 # Key for output statistics in executor output_dict.
 STATISTICS_KEY = 'statistics'
 
+# Key for sampling config in executor exec_properties.
+SAMPLING_CONFIG_KEY = 'sampling_config'
+# Key for slicing config in executor exec_properties.
+SLICING_CONFIG_KEY = 'slicing_config'
+# Custom properties of the output recording the sampling of the statistics.
+SAMPLING_CONFIG_PROPERTY = 'sampling_config'
+SAMPLE_RATE_PROPERTY = 'sample_rate'
+
 # Default file name for stats generated.
 _DEFAULT_FILE_NAME = 'stats_tfrecord'
+# Directory in the output with the statistics of each input Examples artifact.
+_PARTIAL_STATS_DIR = 'partial_stats'
+# Directory in the output with the statistics of each slice of each split, in a
+# sub-directory named after the split.
+SLICED_STATS_DIR = 'sliced_stats'
+
+
+def _partial_stats_path(
+    examples: types.Artifact, split: Text,
+    sampling_config: statistics_gen_pb2.SamplingConfig,
+    slicing_config: statistics_gen_pb2.SlicingConfig) -> Text:
+  """Returns the path of the statistics of a split relative to the output.
+
+  Examples artifacts are never modified once published, so their URI together
+  with the sampling and slicing configs identifies the statistics.
+
+  Args:
+    examples: An Examples artifact.
+    split: Name of a split of the Examples artifact.
+    sampling_config: Sampling config the statistics are computed with.
+    slicing_config: Slicing config the statistics are computed with.
+  """
+  key = examples.uri
+  if sampling_config.WhichOneof('sampling'):
+    key += '\n' + json_format.MessageToJson(
+        sampling_config, sort_keys=True, indent=None)
+  if slicing_config.slice_specs:
+    key += '\n' + json_format.MessageToJson(
+        slicing_config, sort_keys=True, indent=None)
+  key = hashlib.sha256(tf.compat.as_bytes(key)).hexdigest()
+  return os.path.join(_PARTIAL_STATS_DIR, key, split, _DEFAULT_FILE_NAME)
+
+
+def _make_slice_functions(
+    slicing_config: statistics_gen_pb2.SlicingConfig) -> List[Any]:
+  """Returns a TFDV slice function for each slice spec of a slicing config."""
+  slice_functions = []
+  for slice_spec in slicing_config.slice_specs:
+    features = {}
+    for feature in slice_spec.features:
+      values = (
+          list(feature.int_values) or
+          [tf.compat.as_bytes(v) for v in feature.string_values])
+      features[feature.name] = values or None
+    slice_functions.append(slicing_util.get_feature_value_slicer(features))
+  return slice_functions
+
+
+def _write_statistics(stats: statistics_pb2.DatasetFeatureStatisticsList,
+                      output_path: Text) -> None:
+  tf.io.gfile.makedirs(os.path.dirname(output_path))
+  with tf.io.TFRecordWriter(output_path) as writer:
+    writer.write(stats.SerializeToString())
+
+
+@beam.ptransform_fn
+@beam.typehints.with_input_types(beam.Pipeline)
+@beam.typehints.with_output_types(bytes)
+def _ReadExamples(  # pylint: disable=invalid-name
+    pipeline: beam.Pipeline, file_pattern: Text,
+    sampling_config: statistics_gen_pb2.SamplingConfig
+) -> beam.pvalue.PCollection:
+  """Reads serialized examples, or a sample of them, from TFRecord files.
+
+  Examples are sampled by a hash of their serialization, so that the same
+  files and sampling config give the same statistics, which are cached by the
+  sampling config.
+  """
+  sampling = sampling_config.WhichOneof('sampling')
+  if sampling == 'per_shard_size':
+    size = sampling_config.per_shard_size
+    return (pipeline
+            | 'ListFiles' >> beam.Create(tf.io.gfile.glob(file_pattern))
+            # Distributes the files across workers.
+            | 'Reshuffle' >> beam.transforms.Reshuffle()
+            | 'ReadShardHeads' >> beam.FlatMap(io_utils.read_tfrecord_head,
+                                              size))
+
+  records = (
+      pipeline
+      | 'ReadFromTFRecord' >>
+      beam.io.ReadFromTFRecord(file_pattern=file_pattern))
+  if sampling == 'fraction':
+    fraction = sampling_config.fraction
+    return (records
+            | 'SampleFraction' >> beam.Filter(
+                lambda r: sampling_utils.get_record_hash(r) < fraction))
+  if sampling == 'fixed_size':
+    return (records
+            | 'SampleFixedSize' >> beam.combiners.Top.Of(
+                sampling_config.fixed_size,
+                key=sampling_utils.get_record_hash,
+                reverse=True)
+            | 'FlattenSample' >> beam.FlatMap(lambda sample: sample))
+  return records
 
 
 class Executor(base_executor.BaseExecutor):
@@ -51,6 +166,15 @@ class Executor(base_executor.BaseExecutor):
   over training data, which can be used for visualization and validation.
   StatisticsGen uses Beam and appropriate algorithms to scale to large datasets.
 
+  If the input has multiple Examples artifacts, e.g. a rolling window of spans,
+  statistics are computed for each of them and merged. The statistics of each
+  artifact are kept in the output, and reused instead of recomputed by later
+  runs which are given this output as `cached_statistics`.
+
+  Statistics of feature value slices are computed in the same pass over each
+  split as the statistics of all examples, and are output as a sliced
+  DatasetFeatureStatisticsList next to the unsliced statistics.
+
   To include StatisticsGen in a TFX pipeline, configure your pipeline similar to
   https://github.com/tensorflow/tfx/blob/master/tfx/examples/chicago_taxi_pipeline/taxi_pipeline_simple.py#L75.
   """
@@ -64,41 +188,127 @@ class Executor(base_executor.BaseExecutor):
       input_dict: Input dict from input key to a list of Artifacts.
         - input_data: A list of type `standard_artifacts.Examples`. This should
           contain both 'train' and 'eval' split.
+        - cached_statistics: Optionally, a list of type
+          `standard_artifacts.ExampleStatistics` from previous runs.
       output_dict: Output dict from output key to a list of Artifacts.
         - output: A list of type `standard_artifacts.ExampleStatistics`. This
           should contain both the 'train' and 'eval' splits.
-      exec_properties: A dict of execution properties. Not used yet.
+      exec_properties: A dict of execution properties.
+        - sampling_config: Optionally, a JSON string of
+          statistics_gen_pb2.SamplingConfig instance.
+        - slicing_config: Optionally, a JSON string of
+          statistics_gen_pb2.SlicingConfig instance. The statistics of each
+          split are then also output with a dataset per slice, in
+          `SLICED_STATS_DIR/<split>/stats_tfrecord` of the output.
 
     Returns:
       None
     """
     self._log_startup(input_dict, output_dict, exec_properties)
 
-    split_uris = []
+    sampling_config = statistics_gen_pb2.SamplingConfig()
+    if exec_properties.get(SAMPLING_CONFIG_KEY):
+      json_format.Parse(exec_properties[SAMPLING_CONFIG_KEY], sampling_config)
+    if (sampling_config.WhichOneof('sampling') == 'fraction' and
+        not 0 < sampling_config.fraction <= 1):
+      raise ValueError('fraction must be in (0, 1], got {}.'.format(
+          sampling_config.fraction))
+    slicing_config = statistics_gen_pb2.SlicingConfig()
+    if exec_properties.get(SLICING_CONFIG_KEY):
+      json_format.Parse(exec_properties[SLICING_CONFIG_KEY], slicing_config)
+    output_root = artifact_utils.get_single_uri(output_dict[STATISTICS_KEY])
+    cached_roots = [
+        artifact.uri for artifact in input_dict.get(CACHED_STATISTICS_KEY, [])
+    ]
+
+    # Statistics of each split of each input artifact, by split.
+    split_partial_paths = collections.OrderedDict()
+    # Splits whose statistics are not cached, as (split, input uri, path).
+    splits_to_compute = []
     for artifact in input_dict[EXAMPLES_KEY]:
       for split in artifact_utils.decode_split_names(artifact.split_names):
-        uri = os.path.join(artifact.uri, split)
-        split_uris.append((split, uri))
-    with self._make_beam_pipeline() as p:
-      # TODO(b/126263006): Support more stats_options through config.
-      stats_options = options.StatsOptions()
-      for split, uri in split_uris:
-        absl.logging.info('Generating statistics for split {}'.format(split))
-        input_uri = io_utils.all_files_pattern(uri)
-        output_uri = artifact_utils.get_split_uri(output_dict[STATISTICS_KEY],
-                                                  split)
-        output_path = os.path.join(output_uri, _DEFAULT_FILE_NAME)
-        _ = (
-            p
-            | 'ReadData.' + split >>
-            beam.io.ReadFromTFRecord(file_pattern=input_uri)
-            | 'DecodeData.' + split >> tf_example_decoder.DecodeTFExample()
-            | 'GenerateStatistics.' + split >>
-            stats_api.GenerateStatistics(stats_options)
-            | 'WriteStatsOutput.' + split >> beam.io.WriteToTFRecord(
-                output_path,
-                shard_name_template='',
-                coder=beam.coders.ProtoCoder(
-                    statistics_pb2.DatasetFeatureStatisticsList)))
-        absl.logging.info('Statistics for split {} written to {}.'.format(
-            split, output_uri))
+        partial_path = _partial_stats_path(artifact, split, sampling_config,
+                                           slicing_config)
+        output_path = os.path.join(output_root, partial_path)
+        split_partial_paths.setdefault(split, []).append(output_path)
+        for cached_root in cached_roots:
+          cached_path = os.path.join(cached_root, partial_path)
+          if tf.io.gfile.exists(cached_path):
+            absl.logging.info('Reusing statistics of {} for split {}.'.format(
+                artifact.uri, split))
+            tf.io.gfile.makedirs(os.path.dirname(output_path))
+            tf.io.gfile.copy(cached_path, output_path, overwrite=True)
+            break
+        else:
+          splits_to_compute.append(
+              (split, os.path.join(artifact.uri, split), output_path))
+
+    if splits_to_compute:
+      with self._make_beam_pipeline() as p:
+        # TODO(b/126263006): Support more stats_options through config.
+        # Slices are computed by the same GenerateStatistics, so each split is
+        # still read and decoded once.
+        stats_options = options.StatsOptions(
+            slice_functions=_make_slice_functions(slicing_config) or None)
+        for split, uri, output_path in splits_to_compute:
+          absl.logging.info('Generating statistics for split {} of {}'.format(
+              split, uri))
+          input_uri = io_utils.all_files_pattern(uri)
+          label = '{}[{}]'.format(split, uri)
+          _ = (
+              p
+              | 'ReadData.' + label >> _ReadExamples(  # pylint: disable=no-value-for-parameter
+                  input_uri, sampling_config)
+              | 'DecodeData.' + label >> tf_example_decoder.DecodeTFExample()
+              | 'GenerateStatistics.' + label >>
+              stats_api.GenerateStatistics(stats_options)
+              | 'WriteStatsOutput.' + label >> beam.io.WriteToTFRecord(
+                  output_path,
+                  shard_name_template='',
+                  coder=beam.coders.ProtoCoder(
+                      statistics_pb2.DatasetFeatureStatisticsList)))
+
+    for split, partial_paths in split_partial_paths.items():
+      output_uri = artifact_utils.get_split_uri(output_dict[STATISTICS_KEY],
+                                                split)
+      output_path = os.path.join(output_uri, _DEFAULT_FILE_NAME)
+      tf.io.gfile.makedirs(output_uri)
+      if slicing_config.slice_specs:
+        partial_stats = [tfdv.load_statistics(path) for path in partial_paths]
+        if len(partial_stats) == 1:
+          sliced_stats = partial_stats[0]
+        else:
+          absl.logging.info(
+              'Merging sliced statistics of {} inputs for split {}'.format(
+                  len(partial_paths), split))
+          sliced_stats = merge_utils.merge_sliced_statistics(partial_stats)
+        _write_statistics(
+            sliced_stats,
+            os.path.join(output_root, SLICED_STATS_DIR, split,
+                         _DEFAULT_FILE_NAME))
+        # Consumers of the unsliced statistics expect a single dataset.
+        stats = statistics_pb2.DatasetFeatureStatisticsList()
+        stats.datasets.extend(d for d in sliced_stats.datasets
+                              if d.name == constants.DEFAULT_SLICE_KEY)
+        _write_statistics(stats, output_path)
+      elif len(partial_paths) == 1:
+        tf.io.gfile.copy(partial_paths[0], output_path, overwrite=True)
+      else:
+        absl.logging.info('Merging statistics of {} inputs for split {}'.format(
+            len(partial_paths), split))
+        stats = merge_utils.merge_statistics(
+            [tfdv.load_statistics(path) for path in partial_paths])
+        _write_statistics(stats, output_path)
+      absl.logging.info('Statistics for split {} written to {}.'.format(
+          split, output_uri))
+
+    if sampling_config.WhichOneof('sampling'):
+      # Records on the output that the statistics are approximate.
+      for artifact in output_dict[STATISTICS_KEY]:
+        artifact.set_string_custom_property(
+            SAMPLING_CONFIG_PROPERTY,
+            json_format.MessageToJson(sampling_config, indent=None))
+        if sampling_config.WhichOneof('sampling') == 'fraction':
+          # Artifact has no setter of double custom properties.
+          artifact.mlmd_artifact.custom_properties[
+              SAMPLE_RATE_PROPERTY].double_value = sampling_config.fraction
@@ -22,9 +22,12 @@ import os
 import tempfile
 
 from absl.testing import absltest
+import mock
 import tensorflow as tf
 import tensorflow_data_validation as tfdv
+from google.protobuf import json_format
 from tfx.components.statistics_gen import executor
+from tfx.proto import statistics_gen_pb2
 from tfx.types import artifact_utils
 from tfx.types import standard_artifacts
 
@@ -80,6 +83,174 @@ class ExecutorTest(absltest.TestCase):
     self._validate_stats_output(
         os.path.join(stats.uri, 'eval', 'stats_tfrecord'))
 
+  def testDoWithCachedStatistics(self):
+    source_data_dir = os.path.join(
+        os.path.dirname(os.path.dirname(__file__)), 'testdata')
+    output_data_dir = os.path.join(
+        os.environ.get('TEST_UNDECLARED_OUTPUTS_DIR', self.get_temp_dir()),
+        self._testMethodName)
+
+    # Create two input spans with the same data.
+    span1 = standard_artifacts.Examples()
+    span1.uri = os.path.join(source_data_dir, 'csv_example_gen')
+    span1.split_names = artifact_utils.encode_split_names(['train', 'eval'])
+    span2 = standard_artifacts.Examples()
+    span2.uri = os.path.join(output_data_dir, 'span2')
+    span2.split_names = span1.split_names
+    for split in ['train', 'eval']:
+      tf.io.gfile.makedirs(os.path.join(span2.uri, split))
+      for filename in tf.io.gfile.listdir(os.path.join(span1.uri, split)):
+        tf.io.gfile.copy(
+            os.path.join(span1.uri, split, filename),
+            os.path.join(span2.uri, split, filename))
+
+    # First run over span1 only.
+    cached_stats = standard_artifacts.ExampleStatistics()
+    cached_stats.uri = os.path.join(output_data_dir, 'cached')
+    cached_stats.split_names = span1.split_names
+    executor.Executor().Do({executor.EXAMPLES_KEY: [span1]},
+                           {executor.STATISTICS_KEY: [cached_stats]},
+                           exec_properties={})
+
+    # Second run over both spans reuses the statistics of span1.
+    stats = standard_artifacts.ExampleStatistics()
+    stats.uri = os.path.join(output_data_dir, 'stats')
+    stats.split_names = span1.split_names
+    with mock.patch.object(
+        executor.stats_api,
+        'GenerateStatistics',
+        wraps=executor.stats_api.GenerateStatistics) as generate_stats:
+      executor.Executor().Do(
+          {
+              executor.EXAMPLES_KEY: [span1, span2],
+              executor.CACHED_STATISTICS_KEY: [cached_stats],
+          }, {executor.STATISTICS_KEY: [stats]},
+          exec_properties={})
+      # Only span2 is computed, for both splits.
+      self.assertEqual(2, generate_stats.call_count)
+
+    for split in ['train', 'eval']:
+      stats_path = os.path.join(stats.uri, split, 'stats_tfrecord')
+      self._validate_stats_output(stats_path)
+      cached_stats_path = os.path.join(cached_stats.uri, split,
+                                       'stats_tfrecord')
+      self.assertEqual(
+          2 * tfdv.load_statistics(cached_stats_path).datasets[0].num_examples,
+          tfdv.load_statistics(stats_path).datasets[0].num_examples)
+
+  def _run_with_sampling(self, sampling_config):
+    source_data_dir = os.path.join(
+        os.path.dirname(os.path.dirname(__file__)), 'testdata')
+    output_data_dir = os.path.join(
+        os.environ.get('TEST_UNDECLARED_OUTPUTS_DIR', self.get_temp_dir()),
+        self._testMethodName)
+
+    examples = standard_artifacts.Examples()
+    examples.uri = os.path.join(source_data_dir, 'csv_example_gen')
+    examples.split_names = artifact_utils.encode_split_names(['train', 'eval'])
+    stats = standard_artifacts.ExampleStatistics()
+    stats.uri = output_data_dir
+    stats.split_names = artifact_utils.encode_split_names(['train', 'eval'])
+
+    executor.Executor().Do(
+        {executor.EXAMPLES_KEY: [examples]},
+        {executor.STATISTICS_KEY: [stats]},
+        exec_properties={
+            'sampling_config':
+                json_format.MessageToJson(
+                    sampling_config, preserving_proto_field_name=True)
+        })
+    return stats
+
+  def testDoWithFractionSampling(self):
+    stats = self._run_with_sampling(
+        statistics_gen_pb2.SamplingConfig(fraction=0.1))
+    train_stats_path = os.path.join(stats.uri, 'train', 'stats_tfrecord')
+    self._validate_stats_output(train_stats_path)
+    # The test data has about 10000 train examples.
+    self.assertLess(
+        tfdv.load_statistics(train_stats_path).datasets[0].num_examples, 5000)
+    self.assertEqual(
+        0.1,
+        stats.mlmd_artifact.custom_properties['sample_rate'].double_value)
+    self.assertTrue(stats.get_string_custom_property('sampling_config'))
+
+  def testDoWithInvalidFraction(self):
+    with self.assertRaisesRegexp(ValueError, 'fraction'):
+      self._run_with_sampling(statistics_gen_pb2.SamplingConfig(fraction=1.5))
+
+  def testDoWithFixedSizeSampling(self):
+    stats = self._run_with_sampling(
+        statistics_gen_pb2.SamplingConfig(fixed_size=100))
+    for split in ['train', 'eval']:
+      stats_path = os.path.join(stats.uri, split, 'stats_tfrecord')
+      self._validate_stats_output(stats_path)
+      self.assertEqual(
+          100,
+          tfdv.load_statistics(stats_path).datasets[0].num_examples)
+
+  def testDoWithPerShardSampling(self):
+    stats = self._run_with_sampling(
+        statistics_gen_pb2.SamplingConfig(per_shard_size=10))
+    source_data_dir = os.path.join(
+        os.path.dirname(os.path.dirname(__file__)), 'testdata')
+    num_train_files = len(
+        tf.io.gfile.listdir(
+            os.path.join(source_data_dir, 'csv_example_gen', 'train')))
+    train_stats_path = os.path.join(stats.uri, 'train', 'stats_tfrecord')
+    self._validate_stats_output(train_stats_path)
+    self.assertEqual(
+        10 * num_train_files,
+        tfdv.load_statistics(train_stats_path).datasets[0].num_examples)
+
+  def testDoWithSlicing(self):
+    source_data_dir = os.path.join(
+        os.path.dirname(os.path.dirname(__file__)), 'testdata')
+    output_data_dir = os.path.join(
+        os.environ.get('TEST_UNDECLARED_OUTPUTS_DIR', self.get_temp_dir()),
+        self._testMethodName)
+
+    examples = standard_artifacts.Examples()
+    examples.uri = os.path.join(source_data_dir, 'csv_example_gen')
+    examples.split_names = artifact_utils.encode_split_names(['train', 'eval'])
+    stats = standard_artifacts.ExampleStatistics()
+    stats.uri = output_data_dir
+    stats.split_names = artifact_utils.encode_split_names(['train', 'eval'])
+    slicing_config = statistics_gen_pb2.SlicingConfig(slice_specs=[
+        statistics_gen_pb2.SliceSpec(features=[
+            statistics_gen_pb2.SliceSpec.Feature(
+                name='payment_type', string_values=['Cash'])
+        ])
+    ])
+
+    with mock.patch.object(
+        executor.stats_api,
+        'GenerateStatistics',
+        wraps=executor.stats_api.GenerateStatistics) as generate_stats:
+      executor.Executor().Do(
+          {executor.EXAMPLES_KEY: [examples]},
+          {executor.STATISTICS_KEY: [stats]},
+          exec_properties={
+              'slicing_config': json_format.MessageToJson(slicing_config)
+          })
+      # One pass over each split computes all slices.
+      self.assertEqual(2, generate_stats.call_count)
+
+    for split in ['train', 'eval']:
+      stats_path = os.path.join(stats.uri, split, 'stats_tfrecord')
+      self._validate_stats_output(stats_path)
+      sliced_stats = tfdv.load_statistics(
+          os.path.join(stats.uri, executor.SLICED_STATS_DIR, split,
+                       'stats_tfrecord'))
+      self.assertLen(sliced_stats.datasets, 2)
+      slices = {d.name: d for d in sliced_stats.datasets}
+      all_examples = slices.pop(executor.constants.DEFAULT_SLICE_KEY)
+      cash = list(slices.values())[0]
+      self.assertEqual(
+          tfdv.load_statistics(stats_path).datasets[0], all_examples)
+      self.assertGreater(cash.num_examples, 0)
+      self.assertLess(cash.num_examples, all_examples.num_examples)
+
 
 if __name__ == '__main__':
   absltest.main()
@@ -0,0 +1,339 @@
+# Lint as: python2, python3
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Utilities for merging statistics computed over disjoint parts of data.
+
+Counts, min, max, mean and standard deviation are merged exactly. Histograms,
+quantiles, medians and top values are merged approximately, assuming values
+are uniformly distributed within each histogram bucket. The number of unique
+values is approximated by its largest value over the parts. Weighted and
+custom statistics are not merged.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import math
+from typing import Iterable, List, Optional, Sequence, Text, Tuple, Union
+
+from tensorflow_metadata.proto.v0 import statistics_pb2
+
+# Key of a feature, its name or the steps of its path.
+_FeatureKey = Union[Text, Tuple[Text, ...]]
+
+
+def _feature_key(feature: statistics_pb2.FeatureNameStatistics) -> _FeatureKey:
+  if feature.HasField('path'):
+    return tuple(feature.path.step)
+  return feature.name
+
+
+def _bucket_mass(bucket: statistics_pb2.Histogram.Bucket, low: float,
+                 high: float, include_high: bool) -> float:
+  """Returns the number of samples of the bucket within [low, high)."""
+  if bucket.low_value == bucket.high_value:
+    if low <= bucket.low_value < high or (include_high and
+                                          bucket.low_value == high):
+      return bucket.sample_count
+    return 0.0
+  overlap = (
+      min(high, bucket.high_value) - max(low, bucket.low_value))
+  if overlap <= 0:
+    return 0.0
+  return bucket.sample_count * overlap / (bucket.high_value - bucket.low_value)
+
+
+def _cdf(buckets: Sequence[statistics_pb2.Histogram.Bucket],
+         value: float) -> float:
+  """Returns the number of samples with value at most the given value."""
+  total = 0.0
+  for bucket in buckets:
+    if bucket.high_value <= value:
+      total += bucket.sample_count
+    elif bucket.low_value < value:
+      total += _bucket_mass(bucket, bucket.low_value, value, False)
+  return total
+
+
+def _quantile(buckets: Sequence[statistics_pb2.Histogram.Bucket],
+              boundaries: Sequence[float], rank: float) -> float:
+  """Returns the value below which `rank` samples fall."""
+  previous_boundary = boundaries[0]
+  previous_cdf = 0.0
+  for boundary in boundaries:
+    cdf = _cdf(buckets, boundary)
+    if cdf >= rank:
+      if cdf == previous_cdf:
+        return boundary
+      return previous_boundary + (boundary - previous_boundary) * (
+          rank - previous_cdf) / (cdf - previous_cdf)
+    previous_boundary = boundary
+    previous_cdf = cdf
+  return boundaries[-1]
+
+
+def _merge_histograms(histograms: Sequence[statistics_pb2.Histogram]
+                     ) -> statistics_pb2.Histogram:
+  """Merges histograms of the same type over disjoint parts of data."""
+  result = statistics_pb2.Histogram(
+      type=histograms[0].type, name=histograms[0].name)
+  result.num_nan = sum(h.num_nan for h in histograms)
+  result.num_undefined = sum(h.num_undefined for h in histograms)
+  buckets = [b for h in histograms for b in h.buckets if b.sample_count > 0]
+  if not buckets:
+    return result
+  num_buckets = max(len(h.buckets) for h in histograms)
+  low_value = min(b.low_value for b in buckets)
+  high_value = max(b.high_value for b in buckets)
+
+  if result.type == statistics_pb2.Histogram.QUANTILES:
+    total = sum(b.sample_count for b in buckets)
+    points = sorted(
+        set([b.low_value for b in buckets] + [b.high_value for b in buckets]))
+    boundaries = [low_value] + [
+        _quantile(buckets, points, total * i / num_buckets)
+        for i in range(1, num_buckets)
+    ] + [high_value]
+    for low, high in zip(boundaries[:-1], boundaries[1:]):
+      result.buckets.add(
+          low_value=low, high_value=high, sample_count=total / num_buckets)
+    return result
+
+  width = (high_value - low_value) / num_buckets
+  boundaries = [low_value + i * width for i in range(num_buckets)
+               ] + [high_value]
+  for i, (low, high) in enumerate(zip(boundaries[:-1], boundaries[1:])):
+    include_high = i == num_buckets - 1
+    result.buckets.add(
+        low_value=low,
+        high_value=high,
+        sample_count=sum(
+            _bucket_mass(b, low, high, include_high) for b in buckets))
+  return result
+
+
+def _merge_histogram_lists(
+    histogram_lists: Iterable[Iterable[statistics_pb2.Histogram]]
+) -> List[statistics_pb2.Histogram]:
+  """Merges lists of histograms by histogram type and name."""
+  by_kind = collections.OrderedDict()
+  for histograms in histogram_lists:
+    for histogram in histograms:
+      by_kind.setdefault((histogram.type, histogram.name), []).append(histogram)
+  return [_merge_histograms(hs) for hs in by_kind.values()]
+
+
+def _merge_common_stats(stats: Sequence[statistics_pb2.CommonStatistics],
+                        result: statistics_pb2.CommonStatistics) -> None:
+  """Merges common statistics into result."""
+  present = [s for s in stats if s.num_non_missing]
+  result.num_non_missing = sum(s.num_non_missing for s in stats)
+  result.num_missing = sum(s.num_missing for s in stats)
+  result.tot_num_values = sum(s.tot_num_values for s in stats)
+  if present:
+    result.min_num_values = min(s.min_num_values for s in present)
+    result.max_num_values = max(s.max_num_values for s in present)
+  if result.num_non_missing:
+    result.avg_num_values = result.tot_num_values / result.num_non_missing
+  for name in ('num_values_histogram', 'feature_list_length_histogram'):
+    histograms = [getattr(s, name) for s in stats if s.HasField(name)]
+    if histograms:
+      getattr(result, name).CopyFrom(_merge_histograms(histograms))
+
+
+def _merge_num_stats(stats: Sequence[statistics_pb2.NumericStatistics],
+                     result: statistics_pb2.NumericStatistics) -> None:
+  """Merges numeric statistics into result."""
+  _merge_common_stats([s.common_stats for s in stats], result.common_stats)
+  present = [s for s in stats if s.common_stats.tot_num_values]
+  result.num_zeros = sum(s.num_zeros for s in stats)
+  total = sum(s.common_stats.tot_num_values for s in present)
+  if total:
+    result.mean = sum(
+        s.mean * s.common_stats.tot_num_values for s in present) / total
+    second_moment = sum(
+        (s.std_dev**2 + s.mean**2) * s.common_stats.tot_num_values
+        for s in present) / total
+    result.std_dev = math.sqrt(max(0.0, second_moment - result.mean**2))
+    result.min = min(s.min for s in present)
+    result.max = max(s.max for s in present)
+  result.histograms.extend(
+      _merge_histogram_lists(s.histograms for s in stats))
+  for histogram in result.histograms:
+    if (histogram.type == statistics_pb2.Histogram.QUANTILES and
+        histogram.buckets):
+      middle = histogram.buckets[len(histogram.buckets) // 2]
+      if len(histogram.buckets) % 2:
+        result.median = (middle.low_value + middle.high_value) / 2
+      else:
+        result.median = middle.low_value
+
+
+def _merge_string_stats(stats: Sequence[statistics_pb2.StringStatistics],
+                        result: statistics_pb2.StringStatistics) -> None:
+  """Merges string statistics into result."""
+  _merge_common_stats([s.common_stats for s in stats], result.common_stats)
+  result.unique = max(s.unique for s in stats)
+  total = sum(s.common_stats.tot_num_values for s in stats)
+  if total:
+    result.avg_length = sum(
+        s.avg_length * s.common_stats.tot_num_values for s in stats) / total
+
+  num_top_values = max(len(s.top_values) for s in stats)
+  frequencies = collections.Counter()
+  for s in stats:
+    for top_value in s.top_values:
+      frequencies[top_value.value] += top_value.frequency
+  for value, frequency in sorted(
+      frequencies.items(), key=lambda x: (-x[1], x[0]))[:num_top_values]:
+    result.top_values.add(value=value, frequency=frequency)
+
+  num_ranks = max(len(s.rank_histogram.buckets) for s in stats)
+  if num_ranks:
+    counts = collections.Counter()
+    for s in stats:
+      for bucket in s.rank_histogram.buckets:
+        counts[bucket.label] += bucket.sample_count
+    for rank, (label, count) in enumerate(
+        sorted(counts.items(), key=lambda x: (-x[1], x[0]))[:num_ranks]):
+      result.rank_histogram.buckets.add(
+          low_rank=rank, high_rank=rank, label=label, sample_count=count)
+
+
+def _merge_bytes_stats(stats: Sequence[statistics_pb2.BytesStatistics],
+                       result: statistics_pb2.BytesStatistics) -> None:
+  """Merges bytes statistics into result."""
+  _merge_common_stats([s.common_stats for s in stats], result.common_stats)
+  present = [s for s in stats if s.common_stats.tot_num_values]
+  result.unique = max(s.unique for s in stats)
+  total = sum(s.common_stats.tot_num_values for s in present)
+  if total:
+    result.avg_num_bytes = sum(
+        s.avg_num_bytes * s.common_stats.tot_num_values
+        for s in present) / total
+    result.min_num_bytes = min(s.min_num_bytes for s in present)
+    result.max_num_bytes = max(s.max_num_bytes for s in present)
+
+
+def _merge_features(
+    features: Sequence[statistics_pb2.FeatureNameStatistics]
+) -> statistics_pb2.FeatureNameStatistics:
+  """Merges the statistics of one feature over disjoint parts of data."""
+  result = statistics_pb2.FeatureNameStatistics()
+  first = features[0]
+  if first.HasField('path'):
+    result.path.CopyFrom(first.path)
+  else:
+    result.name = first.name
+  result.type = first.type
+  stats_field = first.WhichOneof('stats')
+  stats = [
+      getattr(f, stats_field)
+      for f in features
+      if f.WhichOneof('stats') == stats_field
+  ]
+  if stats_field == 'num_stats':
+    _merge_num_stats(stats, result.num_stats)
+  elif stats_field == 'string_stats':
+    _merge_string_stats(stats, result.string_stats)
+  elif stats_field == 'bytes_stats':
+    _merge_bytes_stats(stats, result.bytes_stats)
+  elif stats_field == 'struct_stats':
+    _merge_common_stats([s.common_stats for s in stats],
+                        result.struct_stats.common_stats)
+  return result
+
+
+def merge_dataset_statistics(
+    datasets: Sequence[statistics_pb2.DatasetFeatureStatistics],
+    name: Optional[Text] = None) -> statistics_pb2.DatasetFeatureStatistics:
+  """Merges the statistics of disjoint parts of a dataset.
+
+  Args:
+    datasets: Statistics of each part of the dataset.
+    name: Optional name of the merged dataset statistics.
+
+  Returns:
+    Statistics of the whole dataset.
+  """
+  result = statistics_pb2.DatasetFeatureStatistics()
+  if name:
+    result.name = name
+  result.num_examples = sum(d.num_examples for d in datasets)
+  features = collections.OrderedDict()
+  present_examples = collections.Counter()
+  for dataset in datasets:
+    for feature in dataset.features:
+      features.setdefault(_feature_key(feature), []).append(feature)
+      present_examples[_feature_key(feature)] += dataset.num_examples
+  for key, feature_stats in features.items():
+    merged = _merge_features(feature_stats)
+    # Parts in which the feature is absent count as missing.
+    absent_examples = result.num_examples - present_examples[key]
+    if absent_examples:
+      stats_field = merged.WhichOneof('stats')
+      if stats_field:
+        getattr(merged, stats_field).common_stats.num_missing += (
+            absent_examples)
+    result.features.add().CopyFrom(merged)
+  return result
+
+
+def merge_statistics(
+    statistics: Sequence[statistics_pb2.DatasetFeatureStatisticsList]
+) -> statistics_pb2.DatasetFeatureStatisticsList:
+  """Merges DatasetFeatureStatisticsLists of disjoint parts of a dataset.
+
+  Each list is expected to hold the statistics of a single dataset.
+
+  Args:
+    statistics: Statistics of each part of the dataset.
+
+  Returns:
+    A DatasetFeatureStatisticsList with the statistics of the whole dataset.
+  """
+  datasets = [d for s in statistics for d in s.datasets]
+  result = statistics_pb2.DatasetFeatureStatisticsList()
+  if datasets:
+    result.datasets.add().CopyFrom(
+        merge_dataset_statistics(datasets, datasets[0].name))
+  return result
+
+
+def merge_sliced_statistics(
+    statistics: Sequence[statistics_pb2.DatasetFeatureStatisticsList]
+) -> statistics_pb2.DatasetFeatureStatisticsList:
+  """Merges sliced DatasetFeatureStatisticsLists of disjoint parts of a dataset.
+
+  Each list is expected to hold the statistics of each slice of its part as a
+  dataset named after the slice. Slices missing from a part have no examples
+  in it.
+
+  Args:
+    statistics: Sliced statistics of each part of the dataset.
+
+  Returns:
+    A DatasetFeatureStatisticsList with the statistics of each slice of the
+    whole dataset, in order of first appearance.
+  """
+  slices = collections.OrderedDict()
+  for part in statistics:
+    for dataset in part.datasets:
+      slices.setdefault(dataset.name, []).append(dataset)
+  result = statistics_pb2.DatasetFeatureStatisticsList()
+  for name, datasets in slices.items():
+    result.datasets.add().CopyFrom(merge_dataset_statistics(datasets, name))
+  return result
@@ -0,0 +1,164 @@
+# Lint as: python2, python3
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for tfx.components.statistics_gen.merge_utils."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import tensorflow as tf
+from tfx.components.statistics_gen import merge_utils
+
+from google.protobuf import text_format
+from tensorflow_metadata.proto.v0 import statistics_pb2
+
+
+def _parse_stats(text):
+  return text_format.Parse(text, statistics_pb2.DatasetFeatureStatisticsList())
+
+
+class MergeUtilsTest(tf.test.TestCase):
+
+  def testMergeNumericStatistics(self):
+    # Values 0, 2 and 4, 6.
+    stats1 = _parse_stats("""
+        datasets {
+          num_examples: 2
+          features {
+            name: 'x'
+            type: INT
+            num_stats {
+              common_stats {
+                num_non_missing: 2 min_num_values: 1 max_num_values: 1
+                avg_num_values: 1.0 tot_num_values: 2
+              }
+              mean: 1.0 std_dev: 1.0 num_zeros: 1 min: 0.0 max: 2.0
+              histograms {
+                type: STANDARD
+                buckets { low_value: 0.0 high_value: 1.0 sample_count: 1.0 }
+                buckets { low_value: 1.0 high_value: 2.0 sample_count: 1.0 }
+              }
+            }
+          }
+        }""")
+    stats2 = _parse_stats("""
+        datasets {
+          num_examples: 3
+          features {
+            name: 'x'
+            type: INT
+            num_stats {
+              common_stats {
+                num_non_missing: 2 num_missing: 1 min_num_values: 1
+                max_num_values: 1 avg_num_values: 1.0 tot_num_values: 2
+              }
+              mean: 5.0 std_dev: 1.0 min: 4.0 max: 6.0
+              histograms {
+                type: STANDARD
+                buckets { low_value: 4.0 high_value: 5.0 sample_count: 1.0 }
+                buckets { low_value: 5.0 high_value: 6.0 sample_count: 1.0 }
+              }
+            }
+          }
+        }""")
+    merged = merge_utils.merge_statistics([stats1, stats2])
+    self.assertLen(merged.datasets, 1)
+    self.assertEqual(5, merged.datasets[0].num_examples)
+    num_stats = merged.datasets[0].features[0].num_stats
+    self.assertEqual(4, num_stats.common_stats.num_non_missing)
+    self.assertEqual(1, num_stats.common_stats.num_missing)
+    self.assertEqual(4, num_stats.common_stats.tot_num_values)
+    self.assertEqual(1, num_stats.num_zeros)
+    self.assertAlmostEqual(3.0, num_stats.mean)
+    self.assertAlmostEqual(5.0**0.5, num_stats.std_dev)
+    self.assertEqual(0.0, num_stats.min)
+    self.assertEqual(6.0, num_stats.max)
+    histogram = num_stats.histograms[0]
+    self.assertLen(histogram.buckets, 2)
+    self.assertEqual([0.0, 3.0, 6.0], [
+        histogram.buckets[0].low_value, histogram.buckets[0].high_value,
+        histogram.buckets[1].high_value
+    ])
+    self.assertEqual([2.0, 2.0], [b.sample_count for b in histogram.buckets])
+
+  def testMergeStringStatistics(self):
+    stats1 = _parse_stats("""
+        datasets {
+          num_examples: 3
+          features {
+            name: 's'
+            type: STRING
+            string_stats {
+              common_stats { num_non_missing: 3 tot_num_values: 3 }
+              unique: 2 avg_length: 1.0
+              top_values { value: 'a' frequency: 2.0 }
+              top_values { value: 'b' frequency: 1.0 }
+            }
+          }
+        }""")
+    stats2 = _parse_stats("""
+        datasets {
+          num_examples: 3
+          features {
+            name: 's'
+            type: STRING
+            string_stats {
+              common_stats { num_non_missing: 3 tot_num_values: 3 }
+              unique: 2 avg_length: 3.0
+              top_values { value: 'b' frequency: 2.0 }
+              top_values { value: 'c' frequency: 1.0 }
+            }
+          }
+        }""")
+    string_stats = merge_utils.merge_statistics(
+        [stats1, stats2]).datasets[0].features[0].string_stats
+    self.assertEqual(2, string_stats.unique)
+    self.assertAlmostEqual(2.0, string_stats.avg_length)
+    self.assertEqual([('b', 3.0), ('a', 2.0)],
+                     [(v.value, v.frequency) for v in string_stats.top_values])
+
+  def testMergeFeatureAbsentFromPart(self):
+    stats1 = _parse_stats("""
+        datasets {
+          num_examples: 2
+          features {
+            name: 'x'
+            type: FLOAT
+            num_stats { common_stats { num_non_missing: 2 tot_num_values: 2 } }
+          }
+        }""")
+    stats2 = _parse_stats("""
+        datasets { num_examples: 3 }""")
+    num_stats = merge_utils.merge_statistics(
+        [stats1, stats2]).datasets[0].features[0].num_stats
+    self.assertEqual(2, num_stats.common_stats.num_non_missing)
+    self.assertEqual(3, num_stats.common_stats.num_missing)
+
+  def testMergeSlicedStatistics(self):
+    stats1 = _parse_stats("""
+        datasets { name: 'All Examples' num_examples: 3 }
+        datasets { name: 'x_1' num_examples: 1 }
+        datasets { name: 'x_2' num_examples: 2 }""")
+    stats2 = _parse_stats("""
+        datasets { name: 'All Examples' num_examples: 2 }
+        datasets { name: 'x_3' num_examples: 1 }
+        datasets { name: 'x_1' num_examples: 1 }""")
+    merged = merge_utils.merge_sliced_statistics([stats1, stats2])
+    self.assertEqual([('All Examples', 5), ('x_1', 2), ('x_2', 2), ('x_3', 1)],
+                     [(d.name, d.num_examples) for d in merged.datasets])
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -24,6 +24,7 @@ import absl
 from tfx import types
 from tfx.components.base import base_component
 from tfx.components.base import executor_spec
+from tfx.components.trainer import driver
 from tfx.components.trainer import executor
 from tfx.orchestration import data_types
 from tfx.proto import trainer_pb2
@@ -99,6 +100,7 @@ class Trainer(base_component.BaseComponent):
   """
 
   SPEC_CLASS = TrainerSpec
+  DRIVER_CLASS = driver.Driver
   EXECUTOR_SPEC = executor_spec.ExecutorClassSpec(executor.Executor)
 
   def __init__(
@@ -116,6 +118,9 @@ class Trainer(base_component.BaseComponent):
       train_args: Union[trainer_pb2.TrainArgs, Dict[Text, Any]] = None,
       eval_args: Union[trainer_pb2.EvalArgs, Dict[Text, Any]] = None,
       custom_config: Optional[Dict[Text, Any]] = None,
+      local_staging_config: Optional[trainer_pb2.LocalStagingConfig] = None,
+      warm_start_config: Optional[trainer_pb2.WarmStartConfig] = None,
+      early_stopping_config: Optional[trainer_pb2.EarlyStoppingConfig] = None,
       custom_executor_spec: Optional[executor_spec.ExecutorSpec] = None,
       output: Optional[types.Channel] = None,
       transform_output: Optional[types.Channel] = None,
@@ -167,11 +172,29 @@ class Trainer(base_component.BaseComponent):
         based trainer. See 'module_file' for the required signature of the UDF.
         Exactly one of 'module_file' or 'trainer_fn' must be supplied.
       train_args: A trainer_pb2.TrainArgs instance, containing args used for
-        training. Current only num_steps is available.
+        training. Currently num_steps and num_local_workers are available.
+        With num_local_workers, training runs in that many local processes of a
+        multi-worker TF cluster, among which the train files are sharded.
       eval_args: A trainer_pb2.EvalArgs instance, containing args used for eval.
         Current only num_steps is available.
       custom_config: A dict which contains addtional training job parameters
         that will be passed into user module.
+      local_staging_config: An optional trainer_pb2.LocalStagingConfig. If
+        given, the examples are staged once per execution on local disk,
+        decompressed and re-sharded, and `train_files`, `eval_files` and the
+        `data_accessor` of TrainerFnArgs read the staged files. This saves the
+        network and decompression cost of every epoch after the first.
+      warm_start_config: An optional trainer_pb2.WarmStartConfig. If given and
+        no 'base_model' is supplied, the latest blessed or latest model of this
+        Trainer in the pipeline which was trained on the same transformed
+        feature schema is resolved from metadata as the base model, passed to
+        the user function as TrainerFnArgs.base_model to warm start from.
+      early_stopping_config: An optional trainer_pb2.EarlyStoppingConfig. The
+        default executor stops training once the eval metric has not
+        decreased for the configured number of steps, and rejects it with
+        train_args.num_local_workers > 1. The generic executor passes Keras
+        callbacks which do the same at the end of each epoch to run_fn as
+        TrainerFnArgs.early_stopping_callbacks, for model.fit().
       custom_executor_spec: Optional custom executor spec.
       output: Optional `Model` channel for result of exported models.
       transform_output: Backwards compatibility alias for the 'transform_graph'
@@ -221,6 +244,9 @@ class Trainer(base_component.BaseComponent):
         run_fn=run_fn,
         trainer_fn=trainer_fn,
         custom_config=custom_config,
+        local_staging_config=local_staging_config,
+        warm_start_config=warm_start_config,
+        early_stopping_config=early_stopping_config,
         model=output)
     super(Trainer, self).__init__(
         spec=spec,
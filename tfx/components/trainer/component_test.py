@@ -172,6 +172,34 @@ class ComponentTest(tf.test.TestCase):
     self.assertEqual(standard_artifacts.HyperParameters.TYPE_NAME,
                      trainer.inputs['hyperparameters'].type_name)
 
+  def testConstructWithLocalStagingConfig(self):
+    trainer = component.Trainer(
+        module_file='/path/to/module/file',
+        transformed_examples=self.examples,
+        transform_graph=self.transform_output,
+        schema=self.schema,
+        train_args=self.train_args,
+        eval_args=self.eval_args,
+        local_staging_config=trainer_pb2.LocalStagingConfig(num_shards=4))
+    self._verify_outputs(trainer)
+    self.assertIn('local_staging_config', trainer.spec.exec_properties)
+
+  def testConstructWithWarmStartAndEarlyStopping(self):
+    trainer = component.Trainer(
+        module_file='/path/to/module/file',
+        transformed_examples=self.examples,
+        transform_graph=self.transform_output,
+        schema=self.schema,
+        train_args=self.train_args,
+        eval_args=self.eval_args,
+        warm_start_config=trainer_pb2.WarmStartConfig(
+            model_selection=trainer_pb2.WarmStartConfig.LATEST),
+        early_stopping_config=trainer_pb2.EarlyStoppingConfig(
+            max_steps_without_decrease=1000))
+    self._verify_outputs(trainer)
+    self.assertIn('warm_start_config', trainer.spec.exec_properties)
+    self.assertIn('early_stopping_config', trainer.spec.exec_properties)
+
 
 if __name__ == '__main__':
   tf.test.main()
@@ -0,0 +1,162 @@
+# Lint as: python2, python3
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Builds tf.data input pipelines over the splits of Examples artifacts."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from typing import List, Optional, Text
+
+import tensorflow as tf
+
+from tensorflow_metadata.proto.v0 import schema_pb2
+from tensorflow_transform.tf_metadata import schema_utils
+from tfx import types
+from tfx.components.trainer import local_workers
+from tfx.components.util import examples_utils
+from tfx.types import artifact_utils
+from tfx.utils import io_utils
+
+_AUTOTUNE = tf.data.experimental.AUTOTUNE
+
+# Compression type of tf.data.TFRecordDataset for each TFRecord file format.
+_TFRECORD_COMPRESSION_TYPES = {
+    examples_utils.FILE_FORMAT_TFRECORDS_GZIP: 'GZIP',
+    examples_utils.FILE_FORMAT_TFRECORDS: '',
+}
+
+_DEFAULT_SHUFFLE_BUFFER_SIZE = 10000
+
+
+class DataAccessor(object):
+  """Builds tuned tf.data pipelines reading the splits of Examples artifacts.
+
+  The pipelines read the files of a split in parallel, parse batches of
+  serialized tf.Examples with the feature spec of a schema and prefetch the
+  batches, so that reading the examples keeps up with training. The file
+  format and compression are taken from the Examples artifact.
+  """
+
+  def __init__(self,
+               examples: List[types.Artifact],
+               schema_file: Text,
+               num_shards: int = 1,
+               shard_index: int = 0):
+    """Constructs a DataAccessor.
+
+    Args:
+      examples: A list of Examples artifacts, each split of which must be in
+        exactly one of them.
+      schema_file: Path to the schema of the examples, as a text proto.
+      num_shards: Number of shards the examples are split into, e.g. one per
+        worker of a multi-worker training.
+      shard_index: Index of the shard the datasets read.
+    """
+    self._examples = examples
+    self._schema_file = schema_file
+    self._num_shards = num_shards
+    self._shard_index = shard_index
+
+  def _get_feature_spec(self):
+    schema = io_utils.parse_pbtxt_file(self._schema_file, schema_pb2.Schema())
+    return schema_utils.schema_as_feature_spec(schema).feature_spec
+
+  def _get_compression_type(self, split: Text) -> Text:
+    examples = next(
+        a for a in self._examples
+        if split in artifact_utils.decode_split_names(a.split_names))
+    file_format = examples_utils.get_file_format(examples)
+    if file_format not in _TFRECORD_COMPRESSION_TYPES:
+      raise ValueError(
+          'Cannot read the {} split of {} with tf.data: unsupported file '
+          'format {}.'.format(split, examples.uri, file_format))
+    return _TFRECORD_COMPRESSION_TYPES[file_format]
+
+  def tf_dataset(self,
+                 split: Text,
+                 batch_size: int,
+                 label_key: Optional[Text] = None,
+                 num_epochs: Optional[int] = None,
+                 shuffle: bool = True,
+                 shuffle_buffer_size: int = _DEFAULT_SHUFFLE_BUFFER_SIZE,
+                 num_parallel_reads: int = _AUTOTUNE,
+                 cache_file: Optional[Text] = None) -> tf.data.Dataset:
+    """Returns a tf.data.Dataset of batches of parsed examples of a split.
+
+    Args:
+      split: Name of the split to read.
+      batch_size: Number of examples per batch.
+      label_key: Optional name of the label feature. If given, the elements are
+        (features, label) tuples, otherwise dicts of features.
+      num_epochs: Number of passes over the split, None to repeat forever.
+      shuffle: Whether to shuffle the order of the files and the examples.
+      shuffle_buffer_size: Number of examples to shuffle across.
+      num_parallel_reads: Number of files read concurrently, autotuned by
+        default.
+      cache_file: Optional path prefix on a local disk to cache the serialized
+        examples to after the first epoch, or the empty string to cache them in
+        memory.
+
+    Returns:
+      A tf.data.Dataset.
+
+    Raises:
+      ValueError: If the split is not in a TFRecord file format.
+    """
+    compression_type = self._get_compression_type(split)
+    file_patterns = examples_utils.get_split_file_patterns(
+        self._examples, split)
+    # Shards are made of files if there are enough of them, of records
+    # otherwise.
+    shard_records = False
+    if self._num_shards > 1:
+      shard_files = local_workers.shard_file_patterns(
+          file_patterns, self._shard_index, self._num_shards)
+      if shard_files is None:
+        shard_records = True
+      else:
+        file_patterns = shard_files
+    dataset = tf.data.Dataset.list_files(file_patterns, shuffle=shuffle)
+    dataset = dataset.interleave(
+        lambda f: tf.data.TFRecordDataset(f, compression_type=compression_type),
+        cycle_length=num_parallel_reads,
+        num_parallel_calls=_AUTOTUNE)
+    if shard_records:
+      dataset = dataset.shard(self._num_shards, self._shard_index)
+    if self._num_shards > 1:
+      # Distribution strategies must not shard the examples again.
+      options = tf.data.Options()
+      options.experimental_distribute.auto_shard_policy = (
+          tf.data.experimental.AutoShardPolicy.OFF)
+      dataset = dataset.with_options(options)
+    if cache_file is not None:
+      dataset = dataset.cache(cache_file)
+    if shuffle:
+      dataset = dataset.shuffle(shuffle_buffer_size)
+      options = tf.data.Options()
+      options.experimental_deterministic = False
+      dataset = dataset.with_options(options)
+    dataset = dataset.repeat(num_epochs).batch(batch_size)
+
+    feature_spec = self._get_feature_spec()
+
+    def _parse(serialized):
+      features = tf.io.parse_example(serialized, feature_spec)
+      if label_key is None:
+        return features
+      return features, features.pop(label_key)
+
+    return dataset.map(_parse, num_parallel_calls=_AUTOTUNE).prefetch(_AUTOTUNE)
@@ -0,0 +1,71 @@
+# Lint as: python2, python3
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for tfx.components.trainer.data_accessor."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import tensorflow as tf
+from tfx.components.trainer import data_accessor
+from tfx.components.util import examples_utils
+from tfx.types import artifact_utils
+from tfx.types import standard_artifacts
+
+
+class DataAccessorTest(tf.test.TestCase):
+
+  def setUp(self):
+    super(DataAccessorTest, self).setUp()
+    source_data_dir = os.path.join(
+        os.path.dirname(os.path.dirname(__file__)), 'testdata')
+    self._examples = standard_artifacts.Examples()
+    self._examples.uri = os.path.join(source_data_dir,
+                                      'transform/transformed_examples')
+    self._examples.split_names = artifact_utils.encode_split_names(
+        ['train', 'eval'])
+    self._schema_file = os.path.join(
+        source_data_dir,
+        'transform/transform_output/transformed_metadata/schema.pbtxt')
+
+  def testTfDataset(self):
+    accessor = data_accessor.DataAccessor([self._examples], self._schema_file)
+    dataset = accessor.tf_dataset(
+        'eval', batch_size=4, label_key='tips_xf', num_epochs=1)
+    num_examples = 0
+    for features, label in dataset:
+      self.assertIn('fare_xf', features)
+      self.assertNotIn('tips_xf', features)
+      self.assertLessEqual(label.shape[0], 4)
+      num_examples += label.shape[0]
+    expected = sum(
+        1 for _ in tf.compat.v1.io.tf_record_iterator(
+            os.path.join(self._examples.uri, 'eval',
+                         'transformed_examples-00000-of-00001.gz'),
+            tf.compat.v1.io.TFRecordOptions(
+                tf.compat.v1.io.TFRecordCompressionType.GZIP)))
+    self.assertEqual(expected, num_examples)
+
+  def testTfDatasetUnsupportedFormat(self):
+    examples_utils.set_file_format(self._examples,
+                                   examples_utils.FILE_FORMAT_PARQUET)
+    accessor = data_accessor.DataAccessor([self._examples], self._schema_file)
+    with self.assertRaises(ValueError):
+      accessor.tf_dataset('train', batch_size=4)
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -18,17 +18,61 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-from typing import Any, Dict, Text
+import hashlib
+import os
+from typing import Any, Dict, List, Optional, Text
 
 import absl
+import tensorflow as tf
+import tensorflow_transform as tft
 
+from google.protobuf import json_format
+from tfx import types
 from tfx.components.base import base_driver
+from tfx.components.model_validator import constants as model_validator
 from tfx.orchestration import data_types
+from tfx.proto import trainer_pb2
+from tfx.types import artifact_utils
 from tfx.types import standard_artifacts
+from tfx.utils import io_utils
+
+# Keys in input_dict and output_dict, see TrainerSpec.
+_BASE_MODEL_KEY = 'base_model'
+_SCHEMA_KEY = 'schema'
+_TRANSFORM_GRAPH_KEY = 'transform_graph'
+_MODEL_KEY = 'model'
+
+# Custom property of output models holding the fingerprint of the schema of the
+# features they were trained on, i.e. the transformed schema if a transform
+# graph is given.
+FEATURE_SCHEMA_FINGERPRINT_PROPERTY = 'feature_schema_fingerprint'
+
+
+def _get_feature_schema_fingerprint(
+    input_dict: Dict[Text, List[types.Artifact]]) -> Text:
+  """Returns the fingerprint of the schema of the features trained on."""
+  if input_dict.get(_TRANSFORM_GRAPH_KEY):
+    schema_file = os.path.join(
+        artifact_utils.get_single_uri(input_dict[_TRANSFORM_GRAPH_KEY]),
+        tft.TFTransformOutput.TRANSFORMED_METADATA_DIR, 'schema.pbtxt')
+  elif input_dict.get(_SCHEMA_KEY):
+    schema_file = io_utils.get_only_uri_in_dir(
+        artifact_utils.get_single_uri(input_dict[_SCHEMA_KEY]))
+  else:
+    return ''
+  with tf.io.gfile.GFile(schema_file, 'rb') as f:
+    return hashlib.sha256(f.read()).hexdigest()
 
 
 class Driver(base_driver.BaseDriver):
-  """Custom driver for Trainer."""
+  """Custom driver for Trainer.
+
+  Output models are annotated with the fingerprint of the schema of the
+  features they were trained on. If a WarmStartConfig is given and no
+  'base_model' input is, the latest blessed or latest model of the same
+  Trainer in the pipeline with the same fingerprint is resolved from metadata
+  as the base model to warm start from.
+  """
 
   def _fetch_latest_model(self):
     previous_models = self._metadata_handler.get_artifacts_by_type(
@@ -52,3 +96,78 @@ class Driver(base_driver.BaseDriver):
       absl.logging.debug('Model directory to warm start from: {}'.format(
           exec_properties['warm_start_from']))
     return exec_properties
+
+  def _fetch_warm_start_model(
+      self, pipeline_info: data_types.PipelineInfo,
+      component_info: data_types.ComponentInfo, model_selection: int,
+      feature_schema_fingerprint: Text) -> Optional[types.Artifact]:
+    # Models trained on other features can not be warm started from.
+    models = [
+        m for m in self._fetch_previous_outputs(
+            pipeline_info, component_info, standard_artifacts.Model)
+        if FEATURE_SCHEMA_FINGERPRINT_PROPERTY in
+        m.mlmd_artifact.custom_properties and
+        m.get_string_custom_property(FEATURE_SCHEMA_FINGERPRINT_PROPERTY) ==
+        feature_schema_fingerprint
+    ]
+    if models and (
+        model_selection == trainer_pb2.WarmStartConfig.LATEST_BLESSED):
+      pipeline_context = self._metadata_handler.get_pipeline_context(
+          pipeline_info)
+      blessing_type = standard_artifacts.ModelBlessing.TYPE_NAME
+      blessed_model_ids = set(
+          b.custom_properties[
+              model_validator.ARTIFACT_PROPERTY_CURRENT_MODEL_ID_KEY].int_value
+          for b in self._metadata_handler
+          .get_published_artifacts_by_type_within_context(
+              [blessing_type], pipeline_context.id).get(blessing_type, [])
+          if b.custom_properties[
+              model_validator.ARTIFACT_PROPERTY_BLESSED_KEY].int_value == 1)
+      blessed_models = [m for m in models if m.id in blessed_model_ids]
+      models = blessed_models or models
+    return models[-1] if models else None
+
+  def resolve_previous_artifacts(
+      self,
+      input_artifacts: Dict[Text, List[types.Artifact]],
+      exec_properties: Dict[Text, Any],
+      pipeline_info: data_types.PipelineInfo,
+      component_info: data_types.ComponentInfo,
+  ) -> Dict[Text, List[types.Artifact]]:
+    """Overrides BaseDriver.resolve_previous_artifacts()."""
+    result = dict(input_artifacts)
+    if (exec_properties.get('warm_start_config') and
+        not result.get(_BASE_MODEL_KEY)):
+      warm_start_config = trainer_pb2.WarmStartConfig()
+      json_format.Parse(exec_properties['warm_start_config'],
+                        warm_start_config)
+      base_model = self._fetch_warm_start_model(
+          pipeline_info, component_info, warm_start_config.model_selection,
+          _get_feature_schema_fingerprint(result))
+      if base_model is None:
+        absl.logging.info('No model to warm start from, training from scratch.')
+      else:
+        absl.logging.info('Warm starting from model %s', base_model.uri)
+        result[_BASE_MODEL_KEY] = [base_model]
+    return result
+
+  def pre_execution(
+      self,
+      input_dict: Dict[Text, types.Channel],
+      output_dict: Dict[Text, types.Channel],
+      exec_properties: Dict[Text, Any],
+      driver_args: data_types.DriverArgs,
+      pipeline_info: data_types.PipelineInfo,
+      component_info: data_types.ComponentInfo,
+  ) -> data_types.ExecutionDecision:
+    """Extends BaseDriver.pre_execution() to fingerprint the output models."""
+    execution_decision = super(Driver, self).pre_execution(
+        input_dict, output_dict, exec_properties, driver_args, pipeline_info,
+        component_info)
+    if not execution_decision.use_cached_results:
+      fingerprint = _get_feature_schema_fingerprint(
+          execution_decision.input_dict)
+      for model in execution_decision.output_dict.get(_MODEL_KEY, []):
+        model.set_string_custom_property(FEATURE_SCHEMA_FINGERPRINT_PROPERTY,
+                                         fingerprint)
+    return execution_decision
@@ -18,8 +18,13 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import mock
 import tensorflow as tf
+from google.protobuf import json_format
+from tfx.components.model_validator import constants as model_validator
 from tfx.components.trainer import driver
+from tfx.orchestration import data_types
+from tfx.proto import trainer_pb2
 from tfx.types import standard_artifacts
 
 
@@ -38,6 +43,85 @@ class DriverTest(tf.test.TestCase):
     result = trainer_driver._fetch_latest_model()
     self.assertEqual('uri-3', result)
 
+  def _create_warm_start_driver(self, blessed_model_ids):
+    artifacts = {}
+    for aid, component_id, fingerprint in [(1, 'Trainer', 'fp'),
+                                           (2, 'Trainer', 'fp'),
+                                           (3, 'Trainer.other', 'fp'),
+                                           (4, 'Trainer', 'other_fp')]:
+      model = standard_artifacts.Model()
+      model.id = aid
+      model.uri = 'uri-%d' % aid
+      model.producer_component = component_id
+      model.set_string_custom_property(
+          driver.FEATURE_SCHEMA_FINGERPRINT_PROPERTY, fingerprint)
+      artifacts.setdefault(model.type_name, []).append(model.mlmd_artifact)
+    for aid in [1, 2]:
+      blessing = standard_artifacts.ModelBlessing()
+      blessing.id = 10 + aid
+      blessing.set_int_custom_property(
+          model_validator.ARTIFACT_PROPERTY_CURRENT_MODEL_ID_KEY, aid)
+      blessing.set_int_custom_property(
+          model_validator.ARTIFACT_PROPERTY_BLESSED_KEY,
+          1 if aid in blessed_model_ids else 0)
+      artifacts.setdefault(blessing.type_name,
+                           []).append(blessing.mlmd_artifact)
+    mock_metadata = tf.compat.v1.test.mock.Mock()
+    get_artifacts = mock_metadata.get_published_artifacts_by_type_within_context
+    get_artifacts.side_effect = (
+        lambda type_names, unused_context_id: {
+            t: artifacts.get(t, []) for t in type_names
+        })
+    self._pipeline_info = data_types.PipelineInfo(
+        pipeline_name='p', pipeline_root='/p', run_id='r')
+    self._component_info = data_types.ComponentInfo(
+        component_type='c',
+        component_id='Trainer',
+        pipeline_info=self._pipeline_info)
+    return driver.Driver(mock_metadata)
+
+  def testFetchLatestBlessedWarmStartModel(self):
+    trainer_driver = self._create_warm_start_driver(blessed_model_ids=[1])
+    model = trainer_driver._fetch_warm_start_model(
+        self._pipeline_info, self._component_info,
+        trainer_pb2.WarmStartConfig.LATEST_BLESSED, 'fp')
+    self.assertEqual('uri-1', model.uri)
+
+  def testFetchLatestWarmStartModel(self):
+    trainer_driver = self._create_warm_start_driver(blessed_model_ids=[1])
+    model = trainer_driver._fetch_warm_start_model(
+        self._pipeline_info, self._component_info,
+        trainer_pb2.WarmStartConfig.LATEST, 'fp')
+    self.assertEqual('uri-2', model.uri)
+
+  def testFetchWarmStartModelWithoutBlessing(self):
+    trainer_driver = self._create_warm_start_driver(blessed_model_ids=[])
+    model = trainer_driver._fetch_warm_start_model(
+        self._pipeline_info, self._component_info,
+        trainer_pb2.WarmStartConfig.LATEST_BLESSED, 'fp')
+    self.assertEqual('uri-2', model.uri)
+
+  def testFetchWarmStartModelWithOtherFeatures(self):
+    trainer_driver = self._create_warm_start_driver(blessed_model_ids=[1])
+    self.assertIsNone(
+        trainer_driver._fetch_warm_start_model(
+            self._pipeline_info, self._component_info,
+            trainer_pb2.WarmStartConfig.LATEST, 'unknown_fp'))
+
+  def testResolvePreviousArtifacts(self):
+    trainer_driver = self._create_warm_start_driver(blessed_model_ids=[1])
+    exec_properties = {
+        'warm_start_config':
+            json_format.MessageToJson(
+                trainer_pb2.WarmStartConfig(
+                    model_selection=trainer_pb2.WarmStartConfig.LATEST))
+    }
+    with mock.patch.object(
+        driver, '_get_feature_schema_fingerprint', return_value='fp'):
+      result = trainer_driver.resolve_previous_artifacts(
+          {}, exec_properties, self._pipeline_info, self._component_info)
+    self.assertEqual(['uri-2'], [m.uri for m in result['base_model']])
+
 
 if __name__ == '__main__':
   tf.test.main()
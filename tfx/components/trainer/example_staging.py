@@ -0,0 +1,183 @@
+# Lint as: python2, python3
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Stages Examples artifacts on local disk for multi-epoch training."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import fcntl
+import hashlib
+import multiprocessing
+import os
+import tempfile
+from typing import IO, Dict, Text
+
+import absl
+import tensorflow as tf
+
+from tfx import types
+from tfx.components.util import examples_utils
+from tfx.proto import trainer_pb2
+from tfx.types import artifact_utils
+from tfx.types import standard_artifacts
+
+# Options to read the files of each TFRecord file format with.
+_TFRECORD_OPTIONS = {
+    examples_utils.FILE_FORMAT_TFRECORDS_GZIP:
+        tf.compat.v1.io.TFRecordOptions(
+            tf.compat.v1.io.TFRecordCompressionType.GZIP),
+    examples_utils.FILE_FORMAT_TFRECORDS:
+        None,
+}
+
+# Marker file written to a stage once all its files are written.
+_STAGE_COMPLETE_FILE_NAME = '_STAGED'
+
+# Open lock files of the stages used by this process, by stage uri. A shared
+# lock is held on the lock file of a stage while it is in use.
+_stage_lock_files = {}  # type: Dict[Text, IO[Text]]
+
+
+def get_staging_dir(config: trainer_pb2.LocalStagingConfig) -> Text:
+  """Returns the directory examples are staged in for a LocalStagingConfig."""
+  return config.staging_dir or os.path.join(tempfile.gettempdir(),
+                                            'tfx_staged_examples')
+
+
+def _get_stage_uri(examples: types.Artifact, staging_dir: Text) -> Text:
+  # Stages are keyed by artifact id and uri, so that later executions on the
+  # same host reuse them, and artifacts of different metadata stores with the
+  # same id do not share a stage.
+  uri_hash = hashlib.sha256(examples.uri.encode('utf-8')).hexdigest()[:16]
+  if examples.id:
+    key = 'examples-{}-{}'.format(examples.id, uri_hash)
+  else:
+    key = 'uri-{}'.format(uri_hash)
+  return os.path.join(staging_dir, key)
+
+
+def _lock_stage(stage_uri: Text) -> None:
+  """Takes a shared lock on a stage, waiting while it is being removed."""
+  if stage_uri in _stage_lock_files:
+    return
+  tf.io.gfile.makedirs(os.path.dirname(stage_uri))
+  lock_file = open(stage_uri + '.lock', 'a')
+  fcntl.flock(lock_file, fcntl.LOCK_SH)
+  _stage_lock_files[stage_uri] = lock_file
+
+
+def _write_split(file_patterns, options, split_dir, num_shards):
+  """Decompresses the files of a split into num_shards round-robin shards."""
+  tf.io.gfile.makedirs(split_dir)
+  writers = [
+      tf.io.TFRecordWriter(
+          os.path.join(split_dir, 'data-{:05d}-of-{:05d}'.format(
+              i, num_shards))) for i in range(num_shards)
+  ]
+  try:
+    index = 0
+    for file_pattern in file_patterns:
+      for file_path in sorted(tf.io.gfile.glob(file_pattern)):
+        for record in tf.compat.v1.io.tf_record_iterator(file_path, options):
+          writers[index % num_shards].write(record)
+          index += 1
+  finally:
+    for writer in writers:
+      writer.close()
+
+
+def stage_examples(examples: types.Artifact,
+                   config: trainer_pb2.LocalStagingConfig) -> types.Artifact:
+  """Stages an Examples artifact as uncompressed files on local disk.
+
+  The files of each split are decompressed and re-sharded into
+  `config.num_shards` files, so that each parallel reader reads one file. A
+  stage which already exists for the artifact is reused. The stage must be
+  released with `release_stage` once it is no longer read from.
+
+  Args:
+    examples: An Examples artifact in a TFRecord file format.
+    config: A LocalStagingConfig.
+
+  Returns:
+    An Examples artifact with the same splits whose uri is the stage, or
+    `examples` itself if it is not in a TFRecord file format.
+  """
+  file_format = examples_utils.get_file_format(examples)
+  if file_format not in _TFRECORD_OPTIONS:
+    absl.logging.warning(
+        'Examples in %s are not staged: unsupported file format %s.',
+        examples.uri, file_format)
+    return examples
+
+  staged = standard_artifacts.Examples()
+  staged.split_names = examples.split_names
+  staged.uri = _get_stage_uri(examples, get_staging_dir(config))
+  examples_utils.set_file_format(staged, examples_utils.FILE_FORMAT_TFRECORDS)
+  _lock_stage(staged.uri)
+  if tf.io.gfile.exists(os.path.join(staged.uri, _STAGE_COMPLETE_FILE_NAME)):
+    absl.logging.info('Reusing staged examples in %s.', staged.uri)
+    return staged
+
+  absl.logging.info('Staging examples in %s to %s.', examples.uri, staged.uri)
+  num_shards = config.num_shards or multiprocessing.cpu_count()
+  # Stages are written to a temp dir first, so that concurrent executions
+  # never read a partially written stage.
+  temp_uri = '{}.tmp-{}'.format(staged.uri, os.getpid())
+  if tf.io.gfile.exists(temp_uri):
+    tf.io.gfile.rmtree(temp_uri)
+  for split in artifact_utils.decode_split_names(examples.split_names):
+    _write_split(
+        examples_utils.get_split_file_patterns([examples], split),
+        _TFRECORD_OPTIONS[file_format], os.path.join(temp_uri, split),
+        num_shards)
+  with tf.io.gfile.GFile(os.path.join(temp_uri, _STAGE_COMPLETE_FILE_NAME),
+                         'w') as f:
+    f.write('')
+  try:
+    tf.io.gfile.rename(temp_uri, staged.uri)
+  except tf.errors.OpError:
+    # Another execution has staged the same examples meanwhile.
+    tf.io.gfile.rmtree(temp_uri)
+  return staged
+
+
+def release_stage(staged: types.Artifact, remove: bool = True) -> None:
+  """Releases an Examples artifact returned by stage_examples.
+
+  Args:
+    staged: The Examples artifact returned by stage_examples.
+    remove: Whether to remove the files of the stage. They are kept if another
+      execution on the host still uses the stage.
+  """
+  lock_file = _stage_lock_files.pop(staged.uri, None)
+  if lock_file is None:
+    return
+  try:
+    if not remove or not tf.io.gfile.exists(staged.uri):
+      return
+    try:
+      # The exclusive lock can only be taken if no other execution holds a
+      # shared lock, i.e. reads from the stage.
+      fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except IOError:
+      absl.logging.info('Keeping staged examples in %s, which are in use.',
+                        staged.uri)
+      return
+    absl.logging.info('Removing staged examples in %s.', staged.uri)
+    tf.io.gfile.rmtree(staged.uri)
+  finally:
+    lock_file.close()
@@ -0,0 +1,108 @@
+# Lint as: python2, python3
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for tfx.components.trainer.example_staging."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import fcntl
+import os
+import tensorflow as tf
+from tfx.components.trainer import example_staging
+from tfx.components.util import examples_utils
+from tfx.proto import trainer_pb2
+from tfx.types import artifact_utils
+from tfx.types import standard_artifacts
+
+
+def _count_records(file_pattern, options=None):
+  return sum(
+      sum(1 for _ in tf.compat.v1.io.tf_record_iterator(path, options))
+      for path in tf.io.gfile.glob(file_pattern))
+
+
+class ExampleStagingTest(tf.test.TestCase):
+
+  def setUp(self):
+    super(ExampleStagingTest, self).setUp()
+    source_data_dir = os.path.join(
+        os.path.dirname(os.path.dirname(__file__)), 'testdata')
+    self._examples = standard_artifacts.Examples()
+    self._examples.id = 7
+    self._examples.uri = os.path.join(source_data_dir,
+                                      'transform/transformed_examples')
+    self._examples.split_names = artifact_utils.encode_split_names(
+        ['train', 'eval'])
+    self._config = trainer_pb2.LocalStagingConfig(
+        staging_dir=os.path.join(
+            os.environ.get('TEST_UNDECLARED_OUTPUTS_DIR', self.get_temp_dir()),
+            self._testMethodName),
+        num_shards=3)
+
+  def testStageExamples(self):
+    staged = example_staging.stage_examples(self._examples, self._config)
+    self.assertStartsWith(staged.uri,
+                          os.path.join(self._config.staging_dir, 'examples-7-'))
+    self.assertEqual(examples_utils.FILE_FORMAT_TFRECORDS,
+                     examples_utils.get_file_format(staged))
+    gzip_options = tf.compat.v1.io.TFRecordOptions(
+        tf.compat.v1.io.TFRecordCompressionType.GZIP)
+    for split in ['train', 'eval']:
+      self.assertLen(tf.io.gfile.listdir(os.path.join(staged.uri, split)), 3)
+      self.assertEqual(
+          _count_records(
+              os.path.join(self._examples.uri, split, '*'), gzip_options),
+          _count_records(os.path.join(staged.uri, split, '*')))
+
+    example_staging.release_stage(staged)
+    self.assertFalse(tf.io.gfile.exists(staged.uri))
+
+  def testStageExamplesKeyedByUri(self):
+    staged = example_staging.stage_examples(self._examples, self._config)
+    # An artifact with the same id from another metadata store.
+    other_examples = standard_artifacts.Examples()
+    other_examples.id = self._examples.id
+    other_examples.uri = os.path.join(self.get_temp_dir(), 'other_examples')
+    self.assertNotEqual(
+        staged.uri,
+        example_staging._get_stage_uri(other_examples,
+                                       self._config.staging_dir))
+
+  def testReleaseStageKeepsStageInUse(self):
+    staged = example_staging.stage_examples(self._examples, self._config)
+    # Another execution reading from the stage.
+    with open(staged.uri + '.lock') as lock_file:
+      fcntl.flock(lock_file, fcntl.LOCK_SH)
+      example_staging.release_stage(staged)
+    self.assertTrue(tf.io.gfile.exists(staged.uri))
+
+  def testStageExamplesReusesStage(self):
+    staged = example_staging.stage_examples(self._examples, self._config)
+    marker = os.path.join(staged.uri, 'train', 'marker')
+    with tf.io.gfile.GFile(marker, 'w') as f:
+      f.write('')
+    example_staging.stage_examples(self._examples, self._config)
+    self.assertTrue(tf.io.gfile.exists(marker))
+
+  def testStageExamplesUnsupportedFormat(self):
+    examples_utils.set_file_format(self._examples,
+                                   examples_utils.FILE_FORMAT_PARQUET)
+    self.assertIs(self._examples,
+                  example_staging.stage_examples(self._examples, self._config))
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -18,13 +18,15 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import contextlib
 import json
 import os
-from typing import Any, Dict, List, Text
+from typing import Any, Dict, Iterator, List, Text
 
 import absl
 import tensorflow as tf
 import tensorflow_model_analysis as tfma
+import tensorflow_transform as tft
 
 from google.protobuf import json_format
 
@@ -32,6 +34,10 @@ from tensorflow.python.lib.io import file_io  # pylint: disable=g-direct-tensorf
 from tensorflow_metadata.proto.v0 import schema_pb2
 from tfx import types
 from tfx.components.base import base_executor
+from tfx.components.trainer import data_accessor
+from tfx.components.trainer import example_staging
+from tfx.components.trainer import local_workers
+from tfx.components.util import examples_utils
 from tfx.proto import trainer_pb2
 from tfx.types import artifact_utils
 from tfx.utils import import_utils
@@ -52,9 +58,9 @@ TRANSFORM_GRAPH_KEY = 'transform_graph'
 # Key for output model in executor output_dict.
 OUTPUT_MODEL_KEY = 'model'
 
-
-def _all_files_pattern(file_pattern: Text) -> Text:
-  return os.path.join(file_pattern, '*')
+# Prefix of the directories in the output model directory that local workers
+# other than the chief write to. They are removed after training.
+_WORKER_SCRATCH_DIR_PREFIX = '.worker-'
 
 
 class TrainerFnArgs(object):
@@ -70,6 +76,44 @@ class TrainerFnArgs(object):
     return self._data[key]
 
 
+class _KerasEarlyStoppingCallback(tf.keras.callbacks.Callback):
+  """Stops Keras training once an eval metric stops decreasing.
+
+  The Keras counterpart of the early stopping hook of the estimator Executor.
+  The metric is read from the validation logs at the end of each epoch, so
+  training must run in several epochs with validation data.
+  """
+
+  def __init__(self, config: trainer_pb2.EarlyStoppingConfig):
+    super(_KerasEarlyStoppingCallback, self).__init__()
+    self._config = config
+    self._metric_name = 'val_' + (config.metric_name or 'loss')
+    self._step = 0
+    self._best_value = None
+    self._best_step = 0
+
+  def on_train_batch_end(self, batch, logs=None):
+    self._step += 1
+
+  def on_epoch_end(self, epoch, logs=None):
+    value = (logs or {}).get(self._metric_name)
+    if value is None:
+      absl.logging.warning(
+          'Early stopping metric %s is not available, available metrics: %s.',
+          self._metric_name, sorted(logs or {}))
+      return
+    if self._best_value is None or value < self._best_value:
+      self._best_value = value
+      self._best_step = self._step
+    elif (self._step >= self._config.min_steps and
+          self._step - self._best_step >=
+          self._config.max_steps_without_decrease):
+      absl.logging.info(
+          'Stopping training at step %d, %s has not decreased since step %d.',
+          self._step, self._metric_name, self._best_step)
+      self.model.stop_training = True
+
+
 class GenericExecutor(base_executor.BaseExecutor):
   """Local generic trainer executor for the TFX Trainer component.
 
@@ -96,6 +140,10 @@ class GenericExecutor(base_executor.BaseExecutor):
   # Name of subdirectory which contains checkpoints from prior runs
   _CHECKPOINT_FILE_NAME = 'checkpoint'
 
+  # Whether local workers other than the chief write the model to a scratch
+  # directory instead of the output, as Keras multi-worker training requires.
+  _NON_CHIEF_WRITES_MODEL_TO_SCRATCH_DIR = True
+
   def _GetFn(self, exec_properties: Dict[Text, Any], fn_name: Text) -> Any:
     """Loads and returns user-defined function."""
 
@@ -115,6 +163,72 @@ class GenericExecutor(base_executor.BaseExecutor):
     return import_utils.import_func_from_module('.'.join(fn_path_split[0:-1]),
                                                 fn_path_split[-1])
 
+  @contextlib.contextmanager
+  def _StageExamples(
+      self, input_dict: Dict[Text, List[types.Artifact]],
+      exec_properties: Dict[Text, Any]
+  ) -> Iterator[Dict[Text, List[types.Artifact]]]:
+    """Stages the examples on local disk if a LocalStagingConfig is given.
+
+    Args:
+      input_dict: Input dict from input key to a list of artifacts.
+      exec_properties: A dict of execution properties.
+
+    Yields:
+      The input dict, with the examples replaced by the staged examples.
+    """
+    if not exec_properties.get('local_staging_config'):
+      yield input_dict
+      return
+    config = trainer_pb2.LocalStagingConfig()
+    json_format.Parse(exec_properties['local_staging_config'], config)
+    examples = input_dict[EXAMPLES_KEY]
+    staged_examples = [
+        example_staging.stage_examples(e, config) for e in examples
+    ]
+    result = dict(input_dict)
+    result[EXAMPLES_KEY] = staged_examples
+    try:
+      yield result
+    finally:
+      for original, staged in zip(examples, staged_examples):
+        if staged is not original:
+          example_staging.release_stage(
+              staged, remove=not config.keep_staged_examples)
+
+  def _GetNumLocalWorkers(self, exec_properties: Dict[Text, Any]) -> int:
+    train_args = trainer_pb2.TrainArgs()
+    json_format.Parse(exec_properties['train_args'], train_args)
+    return train_args.num_local_workers
+
+  def _MaybeRunLocalWorkers(self, input_dict: Dict[Text, List[types.Artifact]],
+                            output_dict: Dict[Text, List[types.Artifact]],
+                            exec_properties: Dict[Text, Any]) -> bool:
+    """Runs this executor in local worker processes if so configured.
+
+    Args:
+      input_dict: Input dict from input key to a list of artifacts.
+      output_dict: Output dict from output key to a list of artifacts.
+      exec_properties: A dict of execution properties.
+
+    Returns:
+      Whether the execution ran in local workers.
+    """
+    num_local_workers = self._GetNumLocalWorkers(exec_properties)
+    if not local_workers.is_launcher(num_local_workers):
+      return False
+    # The examples are already staged for the workers.
+    worker_exec_properties = dict(exec_properties)
+    worker_exec_properties.pop('local_staging_config', None)
+    local_workers.run_workers(
+        '%s.%s' % (self.__class__.__module__, self.__class__.__name__),
+        input_dict, output_dict, worker_exec_properties, num_local_workers)
+    output_path = artifact_utils.get_single_uri(output_dict[OUTPUT_MODEL_KEY])
+    for scratch_dir in tf.io.gfile.glob(
+        os.path.join(output_path, _WORKER_SCRATCH_DIR_PREFIX + '*')):
+      tf.io.gfile.rmtree(scratch_dir)
+    return True
+
   def _GetFnArgs(self, input_dict: Dict[Text, List[types.Artifact]],
                  output_dict: Dict[Text, List[types.Artifact]],
                  exec_properties: Dict[Text, Any]) -> TrainerFnArgs:
@@ -123,18 +237,30 @@ class GenericExecutor(base_executor.BaseExecutor):
       raise ValueError('Expect custom_config to be a dict but got %s instead' %
                        type(custom_config))
 
+    train_args = trainer_pb2.TrainArgs()
+    eval_args = trainer_pb2.EvalArgs()
+    json_format.Parse(exec_properties['train_args'], train_args)
+    json_format.Parse(exec_properties['eval_args'], eval_args)
+    worker_index, num_workers = local_workers.get_worker_task(
+        train_args.num_local_workers)
+
     # Set up training parameters
-    train_files = [
-        _all_files_pattern(
-            artifact_utils.get_split_uri(input_dict[EXAMPLES_KEY], 'train'))
-    ]
+    train_files = examples_utils.get_split_file_patterns(
+        input_dict[EXAMPLES_KEY], 'train')
+    if num_workers > 1:
+      worker_train_files = local_workers.shard_file_patterns(
+          train_files, worker_index, num_workers)
+      if worker_train_files is None:
+        absl.logging.warning(
+            'Fewer train files than local workers, every worker reads all '
+            'train files.')
+      else:
+        train_files = worker_train_files
     transform_output = artifact_utils.get_single_uri(
         input_dict[TRANSFORM_GRAPH_KEY]) if input_dict.get(
             TRANSFORM_GRAPH_KEY, None) else None
-    eval_files = [
-        _all_files_pattern(
-            artifact_utils.get_split_uri(input_dict[EXAMPLES_KEY], 'eval'))
-    ]
+    eval_files = examples_utils.get_split_file_patterns(
+        input_dict[EXAMPLES_KEY], 'eval')
     schema_file = io_utils.get_only_uri_in_dir(
         artifact_utils.get_single_uri(input_dict[SCHEMA_KEY]))
     # TODO(ruoyu): Make this a dict of tag -> uri instead of list.
@@ -149,11 +275,6 @@ class GenericExecutor(base_executor.BaseExecutor):
     else:
       hyperparameters_config = None
 
-    train_args = trainer_pb2.TrainArgs()
-    eval_args = trainer_pb2.EvalArgs()
-    json_format.Parse(exec_properties['train_args'], train_args)
-    json_format.Parse(exec_properties['eval_args'], eval_args)
-
     # https://github.com/tensorflow/tfx/issues/45: Replace num_steps=0 with
     # num_steps=None.  Conversion of the proto to python will set the default
     # value of an int as 0 so modify the value here.  Tensorflow will raise an
@@ -161,7 +282,29 @@ class GenericExecutor(base_executor.BaseExecutor):
     train_steps = train_args.num_steps or None
     eval_steps = eval_args.num_steps or None
 
+    early_stopping_callbacks = []
+    if exec_properties.get('early_stopping_config'):
+      early_stopping_config = trainer_pb2.EarlyStoppingConfig()
+      json_format.Parse(exec_properties['early_stopping_config'],
+                        early_stopping_config)
+      if early_stopping_config.max_steps_without_decrease:
+        early_stopping_callbacks.append(
+            _KerasEarlyStoppingCallback(early_stopping_config))
+    else:
+      early_stopping_config = None
+
+    # Transformed examples are parsed with the schema of the transform output.
+    if transform_output:
+      examples_schema_file = os.path.join(
+          transform_output, tft.TFTransformOutput.TRANSFORMED_METADATA_DIR,
+          'schema.pbtxt')
+    else:
+      examples_schema_file = schema_file
+
     output_path = artifact_utils.get_single_uri(output_dict[OUTPUT_MODEL_KEY])
+    if worker_index > 0 and self._NON_CHIEF_WRITES_MODEL_TO_SCRATCH_DIR:
+      output_path = os.path.join(
+          output_path, '{}{}'.format(_WORKER_SCRATCH_DIR_PREFIX, worker_index))
     serving_model_dir = path_utils.serving_model_dir(output_path)
     eval_model_dir = path_utils.eval_model_dir(output_path)
 
@@ -189,6 +332,19 @@ class GenericExecutor(base_executor.BaseExecutor):
         base_model=base_model,
         # An optional kerastuner.HyperParameters config.
         hyperparameters=hyperparameters_config,
+        # An optional trainer_pb2.EarlyStoppingConfig. Will be None if not
+        # specified.
+        early_stopping_config=early_stopping_config,
+        # Keras callbacks stopping training as configured by
+        # early_stopping_config, to pass to model.fit(). Empty if not
+        # configured.
+        early_stopping_callbacks=early_stopping_callbacks,
+        # Builds tf.data datasets of the splits of the examples.
+        data_accessor=data_accessor.DataAccessor(
+            input_dict[EXAMPLES_KEY],
+            examples_schema_file,
+            num_shards=num_workers,
+            shard_index=worker_index),
         # Additional parameters to pass to trainer function.
         **custom_config)
 
@@ -207,6 +363,8 @@ class GenericExecutor(base_executor.BaseExecutor):
           splits.
         - transform_output: Optional input transform graph.
         - schema: Schema of the data.
+        - base_model: Optional model to warm start from, resolved by the
+          driver if a warm_start_config is given.
       output_dict: Output dict from output key to a list of Artifacts.
         - output: Exported model.
       exec_properties: A dict of execution properties.
@@ -220,6 +378,12 @@ class GenericExecutor(base_executor.BaseExecutor):
           directory to find previous model to warm start on.
         - custom_config: Optional. Additional parameters to pass to trainer
           function.
+        - local_staging_config: Optional. JSON string of
+          trainer_pb2.LocalStagingConfig instance, to stage the examples on
+          local disk.
+        - early_stopping_config: Optional. JSON string of
+          trainer_pb2.EarlyStoppingConfig instance, implemented by the Keras
+          callbacks passed to run_fn.
 
     Returns:
       None
@@ -231,18 +395,21 @@ class GenericExecutor(base_executor.BaseExecutor):
     """
     self._log_startup(input_dict, output_dict, exec_properties)
 
-    fn_args = self._GetFnArgs(input_dict, output_dict, exec_properties)
-    run_fn = self._GetFn(exec_properties, 'run_fn')
-
-    run_fn(fn_args)
+    with self._StageExamples(input_dict, exec_properties) as staged_input_dict:
+      if self._MaybeRunLocalWorkers(staged_input_dict, output_dict,
+                                    exec_properties):
+        return
+      fn_args = self._GetFnArgs(staged_input_dict, output_dict,
+                                exec_properties)
+      run_fn = self._GetFn(exec_properties, 'run_fn')
 
-    # Train the model
-    absl.logging.info('Training model.')
-    run_fn(fn_args)
-    if not tf.io.gfile.exists(fn_args.serving_model_dir):
-      raise RuntimeError('run_fn failed to generate model.')
-    absl.logging.info('Training complete. Model written to %s',
-                      fn_args.serving_model_dir)
+      # Train the model
+      absl.logging.info('Training model.')
+      run_fn(fn_args)
+      if not tf.io.gfile.exists(fn_args.serving_model_dir):
+        raise RuntimeError('run_fn failed to generate model.')
+      absl.logging.info('Training complete. Model written to %s',
+                        fn_args.serving_model_dir)
 
 
 class Executor(GenericExecutor):
@@ -257,6 +424,36 @@ class Executor(GenericExecutor):
   tf.estimator.train_and_evaluate API to train locally.
   """
 
+  # The estimator only lets the chief write checkpoints and exports, and all
+  # workers need the same model_dir.
+  _NON_CHIEF_WRITES_MODEL_TO_SCRATCH_DIR = False
+
+  def _AddEarlyStoppingHook(
+      self, estimator: tf.estimator.Estimator,
+      train_spec: tf.estimator.TrainSpec, eval_spec: tf.estimator.EvalSpec,
+      config: trainer_pb2.EarlyStoppingConfig) -> tf.estimator.TrainSpec:
+    """Returns train_spec with a hook stopping training on an eval plateau."""
+    hook = tf.estimator.experimental.stop_if_no_decrease_hook(
+        estimator,
+        config.metric_name or 'loss',
+        config.max_steps_without_decrease,
+        eval_dir=estimator.eval_dir(eval_spec.name),
+        min_steps=config.min_steps)
+    hooks = tuple(train_spec.hooks) + (hook,)
+    return train_spec._replace(hooks=hooks)  # pylint: disable=protected-access
+
+  def _RunFinalExporters(self, estimator: tf.estimator.Estimator,
+                         eval_spec: tf.estimator.EvalSpec) -> None:
+    """Runs the exporters of eval_spec on the latest checkpoint."""
+    checkpoint_path = estimator.latest_checkpoint()
+    for exporter in eval_spec.exporters:
+      exporter.export(
+          estimator,
+          os.path.join(estimator.model_dir, 'export', exporter.name),
+          checkpoint_path,
+          eval_result=None,
+          is_the_final_export=True)
+
   def Do(self, input_dict: Dict[Text, List[types.Artifact]],
          output_dict: Dict[Text, List[types.Artifact]],
          exec_properties: Dict[Text, Any]) -> None:
@@ -273,6 +470,8 @@ class Executor(GenericExecutor):
           splits.
         - transform_output: Optional input transform graph.
         - schema: Schema of the data.
+        - base_model: Optional model to warm start from, resolved by the
+          driver if a warm_start_config is given.
       output_dict: Output dict from output key to a list of Artifacts.
         - output: Exported model.
       exec_properties: A dict of execution properties.
@@ -286,42 +485,86 @@ class Executor(GenericExecutor):
           directory to find previous model to warm start on.
         - custom_config: Optional. Additional parameters to pass to trainer
           function.
+        - local_staging_config: Optional. JSON string of
+          trainer_pb2.LocalStagingConfig instance, to stage the examples on
+          local disk.
+        - early_stopping_config: Optional. JSON string of
+          trainer_pb2.EarlyStoppingConfig instance, to stop training once the
+          eval metric stops decreasing.
 
     Returns:
       None
 
     Raises:
       ValueError: When neither or both of 'module_file' and 'trainer_fn'
-        are present in 'exec_properties'.
+        are present in 'exec_properties', or when training in local workers
+        with an estimator without a train_distribute strategy or with early
+        stopping.
     """
     self._log_startup(input_dict, output_dict, exec_properties)
 
-    fn_args = self._GetFnArgs(input_dict, output_dict, exec_properties)
-    trainer_fn = self._GetFn(exec_properties, 'trainer_fn')
-
-    schema = io_utils.parse_pbtxt_file(fn_args.schema_file, schema_pb2.Schema())
-
-    training_spec = trainer_fn(fn_args, schema)
-
-    # Train the model
-    absl.logging.info('Training model.')
-    tf.estimator.train_and_evaluate(training_spec['estimator'],
-                                    training_spec['train_spec'],
-                                    training_spec['eval_spec'])
-    absl.logging.info('Training complete.  Model written to %s',
-                      fn_args.serving_model_dir)
-
-    # Export an eval savedmodel for TFMA
-    # For distributed training, master and worker(s) try to export multiple
-    # eval_savedmodels (b/147378113). To avoid that, only export
-    # eval_savedmodel if eval_model_dir does not exist as an intermediate
-    # solution until b/147378113 is resolved.
-    if not tf.io.gfile.exists(fn_args.eval_model_dir):
-      absl.logging.info('Exporting eval_savedmodel for TFMA.')
-      tfma.export.export_eval_savedmodel(
-          estimator=training_spec['estimator'],
-          export_dir_base=fn_args.eval_model_dir,
-          eval_input_receiver_fn=training_spec['eval_input_receiver_fn'])
-
-      absl.logging.info('Exported eval_savedmodel to %s.',
-                        fn_args.eval_model_dir)
+    # The early stopping hook reads the eval results of an evaluator task,
+    # which local workers do not have.
+    if (self._GetNumLocalWorkers(exec_properties) > 1 and
+        exec_properties.get('early_stopping_config')):
+      raise ValueError(
+          'early_stopping_config is not supported with num_local_workers > 1 '
+          'for estimators, as local workers do not evaluate during training.')
+
+    with self._StageExamples(input_dict, exec_properties) as staged_input_dict:
+      if self._MaybeRunLocalWorkers(staged_input_dict, output_dict,
+                                    exec_properties):
+        return
+      fn_args = self._GetFnArgs(staged_input_dict, output_dict,
+                                exec_properties)
+      trainer_fn = self._GetFn(exec_properties, 'trainer_fn')
+
+      schema = io_utils.parse_pbtxt_file(fn_args.schema_file,
+                                         schema_pb2.Schema())
+
+      training_spec = trainer_fn(fn_args, schema)
+
+      worker_index, num_workers = local_workers.get_worker_task(
+          self._GetNumLocalWorkers(exec_properties))
+      if (num_workers > 1 and
+          not training_spec['estimator'].config.train_distribute):
+        raise ValueError(
+            'Training with num_local_workers > 1 requires the estimator to '
+            'have a multi-worker train_distribute strategy in its RunConfig, '
+            'otherwise every worker trains its own model.')
+
+      train_spec = training_spec['train_spec']
+      if (fn_args.early_stopping_config and
+          fn_args.early_stopping_config.max_steps_without_decrease):
+        train_spec = self._AddEarlyStoppingHook(training_spec['estimator'],
+                                                train_spec,
+                                                training_spec['eval_spec'],
+                                                fn_args.early_stopping_config)
+
+      # Train the model
+      absl.logging.info('Training model.')
+      tf.estimator.train_and_evaluate(training_spec['estimator'], train_spec,
+                                      training_spec['eval_spec'])
+      # Exporters only run on an evaluator task, which local workers do not
+      # have, so the chief exports the final model itself.
+      if num_workers > 1 and worker_index == 0:
+        self._RunFinalExporters(training_spec['estimator'],
+                                training_spec['eval_spec'])
+      absl.logging.info('Training complete.  Model written to %s',
+                        fn_args.serving_model_dir)
+
+      # Export an eval savedmodel for TFMA
+      # For distributed training, master and worker(s) try to export multiple
+      # eval_savedmodels (b/147378113). To avoid that, only export
+      # eval_savedmodel if eval_model_dir does not exist as an intermediate
+      # solution until b/147378113 is resolved. Local workers other than the
+      # chief never export it.
+      if worker_index == 0 and not tf.io.gfile.exists(fn_args.eval_model_dir):
+        absl.logging.info('Exporting eval_savedmodel for TFMA.')
+        tfma.export.export_eval_savedmodel(
+            estimator=training_spec['estimator'],
+            export_dir_base=fn_args.eval_model_dir,
+            eval_input_receiver_fn=training_spec['eval_input_receiver_fn'])
+
+        absl.logging.info('Exported eval_savedmodel to %s.',
+                          fn_args.eval_model_dir)
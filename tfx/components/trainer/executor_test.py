@@ -20,6 +20,7 @@ from __future__ import print_function
 
 import json
 import os
+import mock
 import tensorflow as tf
 from google.protobuf import json_format
 from tfx.components.testdata.module_file import trainer_module
@@ -170,6 +171,92 @@ class ExecutorTest(tf.test.TestCase):
         exec_properties=self._exec_properties)
     self._verify_model_exports()
 
+  def testDoWithLocalStaging(self):
+    staging_dir = os.path.join(self._output_data_dir, 'staging')
+    self._exec_properties['module_file'] = self._module_file
+    self._exec_properties['local_staging_config'] = json_format.MessageToJson(
+        trainer_pb2.LocalStagingConfig(staging_dir=staging_dir, num_shards=2),
+        preserving_proto_field_name=True)
+    self._trainer_executor.Do(
+        input_dict=self._input_dict,
+        output_dict=self._output_dict,
+        exec_properties=self._exec_properties)
+    self._verify_model_exports()
+    # The staged examples are removed after the execution.
+    self.assertEqual([], tf.io.gfile.listdir(staging_dir))
+
+  def testDoWithEarlyStopping(self):
+    self._exec_properties['module_file'] = self._module_file
+    self._exec_properties['early_stopping_config'] = json_format.MessageToJson(
+        trainer_pb2.EarlyStoppingConfig(max_steps_without_decrease=100),
+        preserving_proto_field_name=True)
+    self._trainer_executor.Do(
+        input_dict=self._input_dict,
+        output_dict=self._output_dict,
+        exec_properties=self._exec_properties)
+    self._verify_model_exports()
+
+  def _set_num_local_workers(self, num_local_workers):
+    self._exec_properties['train_args'] = json_format.MessageToJson(
+        trainer_pb2.TrainArgs(
+            num_steps=1000, num_local_workers=num_local_workers),
+        preserving_proto_field_name=True)
+
+  def testDoWithLocalWorkersWithoutTrainDistribute(self):
+    self._exec_properties['module_file'] = self._module_file
+    self._set_num_local_workers(2)
+    # The workers fail as the estimator of the module has no train_distribute.
+    with self.assertRaises(RuntimeError):
+      self._trainer_executor.Do(
+          input_dict=self._input_dict,
+          output_dict=self._output_dict,
+          exec_properties=self._exec_properties)
+
+  def testDoWithLocalWorkersAndEarlyStopping(self):
+    self._exec_properties['module_file'] = self._module_file
+    self._exec_properties['early_stopping_config'] = json_format.MessageToJson(
+        trainer_pb2.EarlyStoppingConfig(max_steps_without_decrease=100),
+        preserving_proto_field_name=True)
+    self._set_num_local_workers(2)
+    with self.assertRaisesRegexp(ValueError, 'early_stopping_config'):
+      self._trainer_executor.Do(
+          input_dict=self._input_dict,
+          output_dict=self._output_dict,
+          exec_properties=self._exec_properties)
+
+  @mock.patch.object(executor.local_workers, 'get_worker_task')
+  @mock.patch.object(executor.local_workers, 'is_launcher')
+  def testLocalWorkerWithoutTrainDistribute(self, mock_is_launcher,
+                                            mock_get_worker_task):
+    mock_is_launcher.return_value = False
+    mock_get_worker_task.return_value = (1, 2)
+    self._exec_properties['module_file'] = self._module_file
+    self._set_num_local_workers(2)
+    with self.assertRaisesRegexp(ValueError, 'train_distribute'):
+      self._trainer_executor.Do(
+          input_dict=self._input_dict,
+          output_dict=self._output_dict,
+          exec_properties=self._exec_properties)
+
+  def testKerasEarlyStoppingCallback(self):
+    callback = executor._KerasEarlyStoppingCallback(
+        trainer_pb2.EarlyStoppingConfig(
+            max_steps_without_decrease=20, min_steps=10))
+    model = tf.keras.Sequential()
+    model.stop_training = False
+    callback.set_model(model)
+
+    def _run_epoch(val_loss):
+      for batch in range(10):
+        callback.on_train_batch_end(batch)
+      callback.on_epoch_end(0, {'val_loss': val_loss})
+      return model.stop_training
+
+    self.assertFalse(_run_epoch(1.0))
+    self.assertFalse(_run_epoch(0.5))
+    self.assertFalse(_run_epoch(0.6))
+    self.assertTrue(_run_epoch(0.7))
+
 
 if __name__ == '__main__':
   tf.test.main()
@@ -0,0 +1,159 @@
+# Lint as: python2, python3
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Runs Trainer executors as workers of a local multi-worker TF cluster."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import contextlib
+import json
+import os
+import socket
+from typing import Any, Dict, List, Optional, Text, Tuple
+
+import absl
+import tensorflow as tf
+
+from tfx import types
+from tfx.components.util import subprocess_utils
+
+# Environment variable holding the cluster spec and task of a TF worker.
+TF_CONFIG_ENV = 'TF_CONFIG'
+
+# Environment variable holding the index of a local worker, 0 being the chief.
+# It tells local workers apart from workers of a cluster configured otherwise.
+_LOCAL_WORKER_INDEX_ENV = 'TFX_LOCAL_WORKER_INDEX'
+
+
+def is_launcher(num_local_workers: int) -> bool:
+  """Returns whether this process should launch the local workers.
+
+  Args:
+    num_local_workers: TrainArgs.num_local_workers.
+
+  Returns:
+    True if training is multi-process and this process is not a worker of a
+    TF cluster yet, neither a local one nor one of a configured cluster.
+  """
+  return num_local_workers > 1 and TF_CONFIG_ENV not in os.environ
+
+
+def get_worker_task(num_local_workers: int) -> Tuple[int, int]:
+  """Returns the (index, number of workers) of this local worker.
+
+  Args:
+    num_local_workers: TrainArgs.num_local_workers.
+
+  Returns:
+    The index of this worker, 0 being the chief, and the number of workers if
+    this process is a local worker, otherwise (0, 1).
+  """
+  if num_local_workers <= 1 or _LOCAL_WORKER_INDEX_ENV not in os.environ:
+    return 0, 1
+  return int(os.environ[_LOCAL_WORKER_INDEX_ENV]), num_local_workers
+
+
+def _get_tf_config(addresses: List[Text], index: int) -> Dict[Text, Any]:
+  """Returns the TF_CONFIG of a local worker.
+
+  The first worker is the chief, as Estimators require a chief task in the
+  cluster. Multi-worker distribution strategies train on the chief as well.
+
+  Args:
+    addresses: Addresses of the local workers.
+    index: Index of the local worker.
+
+  Returns:
+    A TF_CONFIG dict.
+  """
+  return {
+      'cluster': {
+          'chief': addresses[:1],
+          'worker': addresses[1:]
+      },
+      'task': {
+          'type': 'chief' if index == 0 else 'worker',
+          'index': max(index - 1, 0)
+      }
+  }
+
+
+def shard_file_patterns(file_patterns: List[Text], index: int,
+                        num_shards: int) -> Optional[List[Text]]:
+  """Returns the files of a shard of the files matching file_patterns.
+
+  Args:
+    file_patterns: A list of file patterns.
+    index: Index of the shard.
+    num_shards: Number of shards.
+
+  Returns:
+    Every num_shards-th file starting at index, or None if there are fewer
+    files than shards.
+  """
+  files = sorted(f for pattern in file_patterns
+                 for f in tf.io.gfile.glob(pattern))
+  if len(files) < num_shards:
+    return None
+  return files[index::num_shards]
+
+
+@contextlib.contextmanager
+def _reserve_ports(num_ports):
+  """Yields unused ports, reserved until the context exits."""
+  sockets = []
+  try:
+    for _ in range(num_ports):
+      s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+      s.bind(('localhost', 0))
+      sockets.append(s)
+    yield [s.getsockname()[1] for s in sockets]
+  finally:
+    for s in sockets:
+      s.close()
+
+
+def run_workers(executor_class_path: Text,
+                input_dict: Dict[Text, List[types.Artifact]],
+                output_dict: Dict[Text, List[types.Artifact]],
+                exec_properties: Dict[Text, Any],
+                num_workers: int) -> None:
+  """Runs an executor in num_workers local processes forming a TF cluster.
+
+  Each process runs the executor with a TF_CONFIG for its task, so that
+  multi-worker distribution strategies train across the processes.
+
+  Args:
+    executor_class_path: Python class of the executor, as <module>.<class>.
+    input_dict: Input dict from input key to a list of artifacts.
+    output_dict: Output dict from output key to a list of artifacts.
+    exec_properties: A dict of execution properties.
+    num_workers: Number of worker processes.
+
+  Raises:
+    RuntimeError: If a worker process fails.
+  """
+  # The ports are released before the workers start, so that they can bind
+  # them.
+  with _reserve_ports(num_workers) as ports:
+    addresses = ['localhost:{}'.format(port) for port in ports]
+  absl.logging.info('Starting %d local workers: %s', num_workers, addresses)
+  subprocess_utils.run_executor_processes(
+      executor_class_path, input_dict, output_dict, exec_properties, [{
+          TF_CONFIG_ENV: json.dumps(_get_tf_config(addresses, index)),
+          _LOCAL_WORKER_INDEX_ENV: str(index)
+      } for index in range(num_workers)])
+  absl.logging.info('All %d local workers completed.', num_workers)
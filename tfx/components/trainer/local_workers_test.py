@@ -0,0 +1,135 @@
+# Lint as: python2, python3
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for tfx.components.trainer.local_workers."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import json
+import os
+import mock
+import tensorflow as tf
+from tfx.components.base import base_executor
+from tfx.components.trainer import local_workers
+from tfx.types import standard_artifacts
+from tfx.utils import io_utils
+
+# Module of the executors run by the workers, which import it by name.
+_TEST_MODULE = 'tfx.components.trainer.local_workers_test'
+
+
+class _TaskWritingExecutor(base_executor.BaseExecutor):
+  """Writes the TF_CONFIG task of the worker to the output."""
+
+  def Do(self, input_dict, output_dict, exec_properties):
+    task = json.loads(os.environ[local_workers.TF_CONFIG_ENV])['task']
+    io_utils.write_string_file(
+        os.path.join(output_dict['model'][0].uri,
+                     '{}-{}'.format(task['type'], task['index'])),
+        exec_properties['content'])
+
+
+class _FailingExecutor(base_executor.BaseExecutor):
+
+  def Do(self, input_dict, output_dict, exec_properties):
+    raise RuntimeError('Worker failed.')
+
+
+class LocalWorkersTest(tf.test.TestCase):
+
+  def setUp(self):
+    super(LocalWorkersTest, self).setUp()
+    self._output_data_dir = os.path.join(
+        os.environ.get('TEST_UNDECLARED_OUTPUTS_DIR', self.get_temp_dir()),
+        self._testMethodName)
+
+  def testGetWorkerTask(self):
+    with mock.patch.dict(os.environ, {}, clear=True):
+      self.assertTrue(local_workers.is_launcher(4))
+      self.assertFalse(local_workers.is_launcher(1))
+      self.assertEqual((0, 1), local_workers.get_worker_task(4))
+    addresses = ['localhost:{}'.format(i) for i in range(4)]
+    with mock.patch.dict(
+        os.environ, {
+            local_workers.TF_CONFIG_ENV:
+                json.dumps(local_workers._get_tf_config(addresses, 2)),
+            local_workers._LOCAL_WORKER_INDEX_ENV: '2'
+        }):
+      self.assertFalse(local_workers.is_launcher(4))
+      self.assertEqual((2, 4), local_workers.get_worker_task(4))
+      self.assertEqual((0, 1), local_workers.get_worker_task(0))
+
+  def testGetWorkerTaskInConfiguredCluster(self):
+    tf_config = {
+        'cluster': {
+            'chief': ['host0:2222'],
+            'worker': ['host1:2222'],
+            'ps': ['host2:2222']
+        },
+        'task': {
+            'type': 'ps',
+            'index': 0
+        }
+    }
+    with mock.patch.dict(
+        os.environ, {local_workers.TF_CONFIG_ENV: json.dumps(tf_config)},
+        clear=True):
+      self.assertFalse(local_workers.is_launcher(4))
+      self.assertEqual((0, 1), local_workers.get_worker_task(4))
+
+  def testTfConfigForEstimators(self):
+    addresses = ['localhost:{}'.format(i) for i in range(3)]
+    for index in range(3):
+      with mock.patch.dict(
+          os.environ, {
+              local_workers.TF_CONFIG_ENV:
+                  json.dumps(local_workers._get_tf_config(addresses, index))
+          }):
+        run_config = tf.estimator.RunConfig()
+      self.assertEqual(index == 0, run_config.is_chief)
+      self.assertEqual(3, run_config.num_worker_replicas)
+      self.assertEqual(0, run_config.num_ps_replicas)
+
+  def testShardFilePatterns(self):
+    for i in range(5):
+      io_utils.write_string_file(
+          os.path.join(self._output_data_dir, 'data-{}'.format(i)), '')
+    pattern = os.path.join(self._output_data_dir, 'data-*')
+    self.assertEqual([
+        os.path.join(self._output_data_dir, 'data-1'),
+        os.path.join(self._output_data_dir, 'data-3')
+    ], local_workers.shard_file_patterns([pattern], 1, 2))
+    self.assertIsNone(local_workers.shard_file_patterns([pattern], 1, 6))
+
+  def testRunWorkers(self):
+    model = standard_artifacts.Model()
+    model.uri = os.path.join(self._output_data_dir, 'model')
+    local_workers.run_workers(_TEST_MODULE + '._TaskWritingExecutor', {},
+                              {'model': [model]}, {'content': 'trained'}, 3)
+    self.assertCountEqual(['chief-0', 'worker-0', 'worker-1'],
+                          tf.io.gfile.listdir(model.uri))
+
+  def testRunWorkersFailure(self):
+    model = standard_artifacts.Model()
+    model.uri = os.path.join(self._output_data_dir, 'model')
+    with self.assertRaises(RuntimeError):
+      local_workers.run_workers(
+          _TEST_MODULE + '._FailingExecutor', {},
+          {'model': [model]}, {}, 2)
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -21,15 +21,17 @@ from __future__ import print_function
 import os
 import time
 
-from typing import Text
+from typing import Optional, Text
 
 import tensorflow.compat.v1 as tf
+from tfx.components.trainer.rewriting import rewrite_cache
 from tfx.components.trainer.rewriting import rewriter
 
 
 def _invoke_rewriter(src: Text, dst: Text, rewriter_inst: rewriter.BaseRewriter,
                      src_model_type: rewriter.ModelType,
-                     dst_model_type: rewriter.ModelType):
+                     dst_model_type: rewriter.ModelType,
+                     cache_dir: Optional[Text] = None):
   """Converts the provided model by invoking the specified rewriters.
 
   Args:
@@ -38,6 +40,8 @@ def _invoke_rewriter(src: Text, dst: Text, rewriter_inst: rewriter.BaseRewriter,
     rewriter_inst: instance of the rewriter to invoke.
     src_model_type: the `rewriter.ModelType` of the source model.
     dst_model_type: the `rewriter.ModelType` of the destination model.
+    cache_dir: Optional directory of a `rewrite_cache.RewriteCache` to reuse
+      rewritten models from.
 
   Raises:
     ValueError: if the source path is the same as the destination path.
@@ -49,23 +53,30 @@ def _invoke_rewriter(src: Text, dst: Text, rewriter_inst: rewriter.BaseRewriter,
   original_model = rewriter.ModelDescription(src_model_type, src)
   rewritten_model = rewriter.ModelDescription(dst_model_type, dst)
 
-  rewriter_inst.perform_rewrite(original_model, rewritten_model)
+  cache = rewrite_cache.RewriteCache(cache_dir) if cache_dir else None
+  rewriter_inst.perform_rewrite(original_model, rewritten_model, cache)
 
 
 class RewritingExporter(tf.estimator.Exporter):
   """This class invokes the base exporter and a series of rewriters."""
 
-  def __init__(self, base_exporter: tf.estimator.Exporter,
-               rewriter_inst: rewriter.BaseRewriter):
+  def __init__(self,
+               base_exporter: tf.estimator.Exporter,
+               rewriter_inst: rewriter.BaseRewriter,
+               cache_dir: Optional[Text] = None):
     """Initializes the rewriting exporter.
 
     Args:
       base_exporter: The exporter of the original model.
       rewriter_inst: The rewriter instance to invoke. Must inherit from
         `rewriter.BaseRewriter`.
+      cache_dir: Optional directory, e.g. under the pipeline root, in which
+        rewritten models are cached by the content of the exported model and
+        the config of the rewriter.
     """
     self._base_exporter = base_exporter
     self._rewriter_inst = rewriter_inst
+    self._cache_dir = cache_dir
 
   @property
   def name(self):
@@ -111,7 +122,7 @@ class RewritingExporter(tf.estimator.Exporter):
 
     _invoke_rewriter(base_path, tmp_rewrite_path, self._rewriter_inst,
                      rewriter.ModelType.SAVED_MODEL,
-                     rewriter.ModelType.ANY_MODEL)
+                     rewriter.ModelType.ANY_MODEL, self._cache_dir)
 
     tf.io.gfile.rmtree(base_path)
     tf.io.gfile.rename(tmp_rewrite_path, base_path)
@@ -122,7 +133,8 @@ def rewrite_saved_model(
     src: Text,
     dst: Text,
     rewriter_inst: rewriter.BaseRewriter,
-    dst_model_type: rewriter.ModelType = rewriter.ModelType.SAVED_MODEL):
+    dst_model_type: rewriter.ModelType = rewriter.ModelType.SAVED_MODEL,
+    cache_dir: Optional[Text] = None):
   """Rewrites the provided SavedModel.
 
   Args:
@@ -131,6 +143,8 @@ def rewrite_saved_model(
     rewriter_inst: the rewriter instance to invoke. Must inherit from
       `rewriter.BaseRewriter`.
     dst_model_type: the `rewriter.ModelType` of the destination model.
+    cache_dir: Optional directory in which rewritten models are cached by the
+      content of the saved_model and the config of the rewriter.
   """
   _invoke_rewriter(src, dst, rewriter_inst, rewriter.ModelType.SAVED_MODEL,
-                   dst_model_type)
+                   dst_model_type, cache_dir)
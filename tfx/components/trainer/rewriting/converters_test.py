@@ -164,6 +164,38 @@ class RewritingExporterTest(tf.test.TestCase):
                                                self._is_the_final_export)
     self.assertTrue(tr.rewrite_called)
 
+  @mock.patch.object(tf.estimator.FinalExporter, 'export')
+  def testRewritingExporterReusesCachedRewrite(self, base_exporter_mock):
+
+    class _CachingTestRewriter(self._TestRewriter):
+
+      def _get_cache_key(self):
+        return 'test_key'
+
+    base_exporter_mock.side_effect = _export_fn
+    cache_dir = tempfile.mkdtemp()
+
+    tr = _CachingTestRewriter(False)
+    converters.RewritingExporter(self._base_exporter, tr, cache_dir).export(
+        self._estimator, self._export_path, self._checkpoint_path,
+        self._eval_result, self._is_the_final_export)
+    self.assertTrue(tr.rewrite_called)
+
+    # An identical model exported to another path reuses the rewrite.
+    tr = _CachingTestRewriter(False)
+    final_path = converters.RewritingExporter(
+        self._base_exporter, tr,
+        cache_dir).export(self._estimator, tempfile.mkdtemp(),
+                          self._checkpoint_path, self._eval_result,
+                          self._is_the_final_export)
+    self.assertFalse(tr.rewrite_called)
+    self.assertTrue(
+        tf.io.gfile.exists(os.path.join(final_path, REWRITTEN_SAVED_MODEL)))
+    self.assertTrue(
+        tf.io.gfile.exists(
+            os.path.join(final_path, tf.saved_model.ASSETS_DIRECTORY,
+                         REWRITTEN_VOCAB)))
+
 
 class RewriteSavedModelTest(tf.test.TestCase):
 
@@ -175,7 +207,8 @@ class RewriteSavedModelTest(tf.test.TestCase):
     converters.rewrite_saved_model(src, dst, rewriter_inst)
     invoke_rewriter_mock.assert_called_once_with(src, dst, rewriter_inst,
                                                  rewriter.ModelType.SAVED_MODEL,
-                                                 rewriter.ModelType.SAVED_MODEL)
+                                                 rewriter.ModelType.SAVED_MODEL,
+                                                 None)
 
 
 if __name__ == '__main__':
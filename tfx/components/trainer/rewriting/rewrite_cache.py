@@ -0,0 +1,109 @@
+# Lint as: python2, python3
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Content-addressed cache of the outputs of rewriters."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import hashlib
+import os
+import time
+
+from typing import Text
+
+import absl
+import six
+import tensorflow.compat.v1 as tf
+
+from tfx.utils import io_utils
+
+
+def _get_model_fingerprint(model_path: Text) -> Text:
+  """Returns a hex digest of the relative paths and contents of model files."""
+  fingerprint = hashlib.sha256()
+  io_utils.update_hash_with_dir_content(fingerprint, model_path)
+  return fingerprint.hexdigest()
+
+
+class RewriteCache(object):
+  """Stores the outputs of rewriters by the content of their input models.
+
+  A rewritten model is stored under a key made of a fingerprint of the files
+  of the original model, the config of the rewriter and the TensorFlow
+  version. Rewriting an identical model with an identical rewriter, e.g. after
+  a pipeline change that retrained the model to the same result, then copies
+  the stored output instead of running the rewriter again.
+
+  Entries are written to a temporary directory and renamed into place, so
+  concurrent rewrites may share a cache. Entries are never evicted.
+  """
+
+  def __init__(self, cache_dir: Text):
+    """Constructs a RewriteCache.
+
+    Args:
+      cache_dir: Directory the rewritten models are stored in.
+    """
+    self._cache_dir = six.ensure_text(cache_dir)
+
+  def get_key(self, model_path: Text, rewriter_key: Text) -> Text:
+    """Returns the key of the rewrite of a model by a rewriter.
+
+    Args:
+      model_path: Path of the original model.
+      rewriter_key: A string identifying the rewriter and its config.
+
+    Returns:
+      A hex digest.
+    """
+    key = '\n'.join([
+        _get_model_fingerprint(six.ensure_text(model_path)), rewriter_key,
+        tf.__version__
+    ])
+    return hashlib.sha256(tf.compat.as_bytes(key)).hexdigest()
+
+  def fetch(self, key: Text, dst: Text) -> bool:
+    """Copies the rewritten model stored under key to dst, if any.
+
+    Args:
+      key: A key returned by get_key.
+      dst: Path to copy the rewritten model to.
+
+    Returns:
+      Whether the cache had a rewritten model for key.
+    """
+    entry_path = os.path.join(self._cache_dir, key)
+    if not tf.io.gfile.isdir(entry_path):
+      return False
+    io_utils.copy_dir(entry_path, six.ensure_text(dst))
+    return True
+
+  def store(self, key: Text, src: Text) -> None:
+    """Stores a copy of the rewritten model at src under key.
+
+    Args:
+      key: A key returned by get_key.
+      src: Path of the rewritten model.
+    """
+    entry_path = os.path.join(self._cache_dir, key)
+    tmp_entry_path = '{}.tmp-{}'.format(entry_path, int(time.time() * 1e6))
+    io_utils.copy_dir(six.ensure_text(src), tmp_entry_path)
+    try:
+      tf.io.gfile.rename(tmp_entry_path, entry_path)
+    except tf.errors.OpError:
+      # Another rewrite of the same model stored it first.
+      absl.logging.info('Rewrite of %s is already cached.', key)
+      tf.io.gfile.rmtree(tmp_entry_path)
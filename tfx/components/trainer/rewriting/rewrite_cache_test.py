@@ -0,0 +1,75 @@
+# Lint as: python2, python3
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for tfx.components.trainer.rewriting.rewrite_cache."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+
+import tensorflow.compat.v1 as tf
+
+from tfx.components.trainer.rewriting import rewrite_cache
+
+
+class RewriteCacheTest(tf.test.TestCase):
+
+  def setUp(self):
+    super(RewriteCacheTest, self).setUp()
+    self._temp_dir = os.path.join(self.get_temp_dir(), self._testMethodName)
+    self._cache = rewrite_cache.RewriteCache(
+        os.path.join(self._temp_dir, 'cache'))
+
+  def _write_model(self, path, contents):
+    for relative_path, content in contents.items():
+      file_path = os.path.join(path, relative_path)
+      tf.io.gfile.makedirs(os.path.dirname(file_path))
+      with tf.io.gfile.GFile(file_path, 'w') as f:
+        f.write(content)
+
+  def testGetKey(self):
+    model = {'saved_model.pb': 'graph', 'variables/variables.index': 'index'}
+    self._write_model(os.path.join(self._temp_dir, 'a'), model)
+    self._write_model(os.path.join(self._temp_dir, 'b'), model)
+    self._write_model(
+        os.path.join(self._temp_dir, 'c'),
+        {'saved_model.pb': 'graph', 'variables/variables.index': 'changed'})
+
+    key = self._cache.get_key(os.path.join(self._temp_dir, 'a'), 'rw')
+    # The key depends on the contents of the model, not on its path.
+    self.assertEqual(
+        key, self._cache.get_key(os.path.join(self._temp_dir, 'b'), 'rw'))
+    self.assertNotEqual(
+        key, self._cache.get_key(os.path.join(self._temp_dir, 'c'), 'rw'))
+    self.assertNotEqual(
+        key, self._cache.get_key(os.path.join(self._temp_dir, 'a'), 'rw2'))
+
+  def testFetchAndStore(self):
+    rewritten_path = os.path.join(self._temp_dir, 'rewritten')
+    self._write_model(rewritten_path, {'tflite': 'model'})
+    dst = os.path.join(self._temp_dir, 'dst')
+
+    self.assertFalse(self._cache.fetch('key', dst))
+    self._cache.store('key', rewritten_path)
+    # Storing the same key again keeps the first entry.
+    self._cache.store('key', rewritten_path)
+    self.assertTrue(self._cache.fetch('key', dst))
+    with tf.io.gfile.GFile(os.path.join(dst, 'tflite')) as f:
+      self.assertEqual('model', f.read())
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -22,10 +22,13 @@ import abc
 import collections
 import enum
 
-from typing import Text
+from typing import Optional, Text
 
+import absl
 import six
 
+from tfx.components.trainer.rewriting import rewrite_cache
+
 ModelDescription = collections.namedtuple('ModelDescription',
                                           ['model_type', 'path'])
 
@@ -88,8 +91,20 @@ class BaseRewriter(six.with_metaclass(abc.ABCMeta, object)):
     """
     pass
 
-  def perform_rewrite(self, original_model: ModelDescription,
-                      rewritten_model: ModelDescription):
+  def _get_cache_key(self) -> Optional[Text]:
+    """Returns a string identifying the config of the rewriter.
+
+    Rewriters returning a key must write the same rewritten model for the same
+    original model and key, so that rewritten models can be reused from a
+    `rewrite_cache.RewriteCache`. The default of None disables caching.
+    """
+    return None
+
+  def perform_rewrite(
+      self,
+      original_model: ModelDescription,
+      rewritten_model: ModelDescription,
+      cache: Optional[rewrite_cache.RewriteCache] = None):
     """Invoke all validations and perform the rewrite.
 
     Args:
@@ -97,6 +112,9 @@ class BaseRewriter(six.with_metaclass(abc.ABCMeta, object)):
         original model.
       rewritten_model: A `base_rewriter.ModelDescription` object describing the
         location and type of the rewritten model.
+      cache: Optional `rewrite_cache.RewriteCache` to reuse the rewritten model
+        from, if the rewriter has a cache key. Validated rewritten models are
+        added to it.
 
     Raises:
       ValueError: if the model was not successfully rewritten.
@@ -109,12 +127,23 @@ class BaseRewriter(six.with_metaclass(abc.ABCMeta, object)):
                                                      str(original_model),
                                                      str(v)))
 
-    try:
-      self._rewrite(original_model, rewritten_model)
-    except ValueError as v:
-      raise ValueError(
-          '{} failed to rewrite model. Original model: {}. Error {}'.format(
-              self.name, str(original_model), str(v)))
+    cache_key = None
+    rewriter_key = self._get_cache_key()
+    if cache is not None and rewriter_key is not None:
+      cache_key = cache.get_key(original_model.path,
+                                type(self).__name__ + '\n' + rewriter_key)
+    cached = cache_key is not None and cache.fetch(cache_key,
+                                                   rewritten_model.path)
+    if cached:
+      absl.logging.info('%s reused the cached rewrite of %s.', self.name,
+                        original_model.path)
+    else:
+      try:
+        self._rewrite(original_model, rewritten_model)
+      except ValueError as v:
+        raise ValueError(
+            '{} failed to rewrite model. Original model: {}. Error {}'.format(
+                self.name, str(original_model), str(v)))
 
     try:
       self._post_rewrite_validate(rewritten_model)
@@ -122,3 +151,6 @@ class BaseRewriter(six.with_metaclass(abc.ABCMeta, object)):
       raise ValueError(
           '{} failed to validate rewritten model. Rewritten model: {}. Error {}'
           .format(self.name, str(rewritten_model), str(v)))
+
+    if cache_key is not None and not cached:
+      cache.store(cache_key, rewritten_model.path)
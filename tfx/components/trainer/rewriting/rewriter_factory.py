@@ -25,8 +25,10 @@ from __future__ import print_function
 from typing import Text
 
 from tfx.components.trainer.rewriting import rewriter
+from tfx.components.trainer.rewriting import saved_model_rewriter  # pylint: disable=unused-import
 from tfx.components.trainer.rewriting import tflite_rewriter  # pylint: disable=unused-import
 
+SAVED_MODEL_REWRITER = "SavedModelRewriter"
 TFLITE_REWRITER = "TFLiteRewriter"
 
 
@@ -30,6 +30,12 @@ class RewriterFactoryTest(absltest.TestCase):
     self.assertTrue(tfrw)
     self.assertEqual(tfrw.name, 'my_rewriter')
 
+  def testRewriterSuccessfullyCreatedSavedModelRewriter(self):
+    smrw = rewriter_factory.create_rewriter(
+        rewriter_factory.SAVED_MODEL_REWRITER, name='my_rewriter')
+    self.assertTrue(smrw)
+    self.assertEqual(smrw.name, 'my_rewriter')
+
 
 if __name__ == '__main__':
   absltest.main()
@@ -0,0 +1,456 @@
+# Lint as: python2, python3
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Rewriter that optimizes SavedModels for server-side inference."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import enum
+import json
+import os
+import time
+
+from typing import Any, Dict, List, Optional, Sequence, Text
+
+import absl
+import numpy as np
+import six
+import tensorflow.compat.v1 as tf
+
+from google.protobuf import text_format
+from tensorflow.core.framework import tensor_pb2
+from tensorflow.core.framework import types_pb2
+from tensorflow.core.protobuf import config_pb2
+from tensorflow.core.protobuf import meta_graph_pb2
+from tensorflow.core.protobuf import rewriter_config_pb2
+from tensorflow.core.protobuf import saved_model_pb2
+from tensorflow.python.grappler import tf_optimizer  # pylint: disable=g-direct-tensorflow-import
+from tfx.components.trainer.rewriting import rewriter
+from tfx.utils import io_utils
+
+EXTRA_ASSETS_DIRECTORY = 'assets.extra'
+
+# Name of the file in the assets.extra directory of the rewritten model which
+# holds the size and latency of the original and rewritten models.
+STATS_FILENAME = 'rewrite_stats.json'
+
+# Key of the signature holding the init op of TF2 SavedModels.
+_INIT_OP_SIGNATURE_KEY = '__saved_model_init_op'
+
+# Float weights with fewer elements are not quantized, as the size saved does
+# not make up for dequantizing them.
+_MIN_QUANTIZED_WEIGHT_SIZE = 1024
+
+_NUM_BENCHMARK_RUNS = 20
+
+
+class QuantizationType(enum.Enum):
+  """Post-training quantization of the float weights of a SavedModel.
+
+  Quantization only compresses the stored weights. They are converted back to
+  float when the model is loaded, so computation stays in float, unlike the
+  TFLite quantization modes of the same names.
+  """
+  NONE = 1
+  # Weight-only compression: weights are stored as 8 bit integers with a
+  # per-tensor range and dequantized to float when the model is loaded.
+  DYNAMIC_RANGE = 2
+  # Weights are stored as float16 and cast to float when the model is loaded.
+  FLOAT16 = 3
+
+
+def _get_dir_size(path: Text) -> int:
+  """Returns the total size in bytes of the files under path."""
+  size = 0
+  for dir_name, _, leaf_files in tf.io.gfile.walk(path):
+    for leaf_file in leaf_files:
+      size += tf.io.gfile.stat(os.path.join(dir_name, leaf_file)).length
+  return size
+
+
+def _is_tf2_saved_model(path: Text) -> bool:
+  """Returns whether a SavedModel was saved with the object-based TF2 API."""
+  saved_model = saved_model_pb2.SavedModel()
+  pb_path = os.path.join(path, tf.saved_model.SAVED_MODEL_FILENAME_PB)
+  if tf.io.gfile.exists(pb_path):
+    with tf.io.gfile.GFile(pb_path, 'rb') as f:
+      saved_model.ParseFromString(f.read())
+  else:
+    with tf.io.gfile.GFile(
+        os.path.join(path, tf.saved_model.SAVED_MODEL_FILENAME_PBTXT)) as f:
+      text_format.Parse(f.read(), saved_model)
+  return any(m.object_graph_def.nodes for m in saved_model.meta_graphs)
+
+
+def _get_op_name(tensor_name: Text) -> Text:
+  return tensor_name.split(':')[0].lstrip('^')
+
+
+def _get_init_op_name(
+    meta_graph: meta_graph_pb2.MetaGraphDef) -> Optional[Text]:
+  """Returns the name of the op initializing tables etc. of a SavedModel."""
+  if _INIT_OP_SIGNATURE_KEY in meta_graph.signature_def:
+    init_op_outputs = meta_graph.signature_def[_INIT_OP_SIGNATURE_KEY].outputs
+    return _get_op_name(init_op_outputs[_INIT_OP_SIGNATURE_KEY].name)
+  for key in (tf.saved_model.MAIN_OP_KEY, tf.saved_model.LEGACY_INIT_OP_KEY):
+    if (key in meta_graph.collection_def and
+        meta_graph.collection_def[key].node_list.value):
+      return _get_op_name(meta_graph.collection_def[key].node_list.value[0])
+  return None
+
+
+def _fold_constants(graph_def: tf.GraphDef,
+                    fetch_node_names: List[Text]) -> tf.GraphDef:
+  """Folds the constant subgraphs of graph_def with Grappler."""
+  meta_graph = tf.train.export_meta_graph(graph_def=graph_def)
+  fetch_collection = meta_graph_pb2.CollectionDef()
+  fetch_collection.node_list.value.extend(fetch_node_names)
+  meta_graph.collection_def['train_op'].CopyFrom(fetch_collection)
+  config = config_pb2.ConfigProto()
+  rewrite_options = config.graph_options.rewrite_options
+  rewrite_options.optimizers.extend(['constfold', 'dependency'])
+  rewrite_options.meta_optimizer_iterations = (
+      rewriter_config_pb2.RewriterConfig.ONE)
+  return tf_optimizer.OptimizeGraph(config, meta_graph)
+
+
+def _make_const_node(name: Text, value: np.ndarray, dtype: Any,
+                     device: Text) -> tf.NodeDef:
+  node = tf.NodeDef(name=name, op='Const', device=device)
+  node.attr['dtype'].type = dtype
+  if dtype == types_pb2.DT_QUINT8:
+    node.attr['value'].tensor.CopyFrom(
+        tensor_pb2.TensorProto(
+            dtype=dtype,
+            tensor_shape=tf.TensorShape(value.shape).as_proto(),
+            tensor_content=value.astype(np.uint8).tobytes()))
+  else:
+    node.attr['value'].tensor.CopyFrom(tf.make_tensor_proto(value))
+  return node
+
+
+def _quantize_weights(graph_def: tf.GraphDef,
+                      quantization_type: QuantizationType) -> tf.GraphDef:
+  """Replaces large float constants with quantized constants.
+
+  Each quantized constant is followed by an op converting it back to float,
+  named like the original constant, so that consumers are unchanged. Grappler
+  folds the conversion when the model is loaded, so that only the stored model
+  is smaller.
+
+  Args:
+    graph_def: A frozen GraphDef.
+    quantization_type: A QuantizationType other than NONE.
+
+  Returns:
+    The quantized GraphDef.
+  """
+  result = tf.GraphDef()
+  result.versions.CopyFrom(graph_def.versions)
+  result.library.CopyFrom(graph_def.library)
+  for node in graph_def.node:
+    if node.op != 'Const' or node.attr['dtype'].type != types_pb2.DT_FLOAT:
+      result.node.add().CopyFrom(node)
+      continue
+    weights = tf.make_ndarray(node.attr['value'].tensor)
+    if (weights.size < _MIN_QUANTIZED_WEIGHT_SIZE or
+        weights.min() == weights.max()):
+      result.node.add().CopyFrom(node)
+      continue
+    min_value, max_value = float(weights.min()), float(weights.max())
+
+    if quantization_type == QuantizationType.FLOAT16:
+      result.node.extend([
+          _make_const_node(node.name + '/float16', weights.astype(np.float16),
+                           types_pb2.DT_HALF, node.device)
+      ])
+      cast = result.node.add(name=node.name, op='Cast', device=node.device)
+      cast.input.append(node.name + '/float16')
+      cast.attr['SrcT'].type = types_pb2.DT_HALF
+      cast.attr['DstT'].type = types_pb2.DT_FLOAT
+    else:
+      # Dequantize in MIN_COMBINED mode computes
+      # min + value * (max - min) / 255 for quint8 values.
+      quantized = np.round(
+          (weights - min_value) / (max_value - min_value) * 255)
+      result.node.extend([
+          _make_const_node(node.name + '/quantized', quantized,
+                           types_pb2.DT_QUINT8, node.device),
+          _make_const_node(node.name + '/min',
+                           np.array(min_value, dtype=np.float32),
+                           types_pb2.DT_FLOAT, node.device),
+          _make_const_node(node.name + '/max',
+                           np.array(max_value, dtype=np.float32),
+                           types_pb2.DT_FLOAT, node.device),
+      ])
+      dequantize = result.node.add(
+          name=node.name, op='Dequantize', device=node.device)
+      dequantize.input.extend([
+          node.name + '/quantized', node.name + '/min', node.name + '/max'
+      ])
+      dequantize.attr['T'].type = types_pb2.DT_QUINT8
+      dequantize.attr['mode'].s = b'MIN_COMBINED'
+  return result
+
+
+def _set_asset_paths(graph_def: tf.GraphDef,
+                     meta_graph: meta_graph_pb2.MetaGraphDef,
+                     model_path: Text) -> None:
+  """Turns the asset tensors into constants holding the paths of the assets.
+
+  The SavedModel builder copies the files the asset tensors hold the paths of
+  to the assets directory of the new model.
+
+  Args:
+    graph_def: A frozen GraphDef of the model.
+    meta_graph: The MetaGraphDef of the model.
+    model_path: Path of the model.
+  """
+  asset_paths = {
+      _get_op_name(asset.tensor_info.name): os.path.join(
+          model_path, tf.saved_model.ASSETS_DIRECTORY, asset.filename)
+      for asset in meta_graph.asset_file_def
+  }
+  for node in graph_def.node:
+    if node.name in asset_paths:
+      asset_node = _make_const_node(
+          node.name, np.array(six.ensure_binary(asset_paths[node.name])),
+          types_pb2.DT_STRING, node.device)
+      node.CopyFrom(asset_node)
+
+
+def _benchmark(model_path: Text, tags: Sequence[Text], signature_key: Text,
+               examples: List[bytes]) -> Dict[Text, Any]:
+  """Returns the outputs and mean latency of a signature on examples."""
+  with tf.Graph().as_default() as graph:
+    with tf.Session(graph=graph) as sess:
+      meta_graph = tf.saved_model.loader.load(sess, tags, model_path)
+      signature = meta_graph.signature_def[signature_key]
+      if (len(signature.inputs) != 1 or
+          list(signature.inputs.values())[0].dtype != types_pb2.DT_STRING):
+        raise ValueError(
+            'Signature {} must take a single tensor of serialized examples to '
+            'be benchmarked.'.format(signature_key))
+      feed_dict = {list(signature.inputs.values())[0].name: examples}
+      fetches = {k: v.name for k, v in signature.outputs.items()}
+      # The first run also initializes lazily created kernels.
+      outputs = sess.run(fetches, feed_dict=feed_dict)
+      start_time = time.time()
+      for _ in range(_NUM_BENCHMARK_RUNS):
+        sess.run(fetches, feed_dict=feed_dict)
+      latency = (time.time() - start_time) / _NUM_BENCHMARK_RUNS
+  return {'outputs': outputs, 'latency_seconds': latency}
+
+
+class SavedModelRewriter(rewriter.BaseRewriter):
+  """Freezes, prunes and optionally quantizes SavedModels for serving.
+
+  The variables of the model are frozen into constants, the graph is pruned to
+  the ops the kept signatures need and its constant subgraphs are folded, which
+  saves variable reads and ops per request. Float weights can be quantized to
+  make the model smaller. The size of the model before and after the rewrite,
+  and if sample examples are given the latency of both models on them, are
+  written to assets.extra/rewrite_stats.json of the rewritten model.
+  """
+
+  def __init__(self,
+               name: Text,
+               signature_keys: Optional[List[Text]] = None,
+               quantization_type: QuantizationType = QuantizationType.NONE,
+               tags: Optional[List[Text]] = None,
+               sample_examples: Optional[List[bytes]] = None,
+               benchmark_signature_key: Text = (
+                   tf.saved_model.DEFAULT_SERVING_SIGNATURE_DEF_KEY),
+               copy_assets_extra: bool = True):
+    """Create an instance of the SavedModelRewriter.
+
+    Args:
+      name: The name to use when identifying the rewriter.
+      signature_keys: Keys of the signatures to keep. All signatures are kept
+        if None.
+      quantization_type: The `QuantizationType` of the float weights.
+      tags: Tags of the MetaGraphDef to rewrite. Defaults to serving.
+      sample_examples: Optional serialized tf.Examples to validate and
+        benchmark the rewritten model on.
+      benchmark_signature_key: Key of the signature to benchmark, which must
+        take a single tensor of serialized examples.
+      copy_assets_extra: Boolean whether to copy the assets.extra directory to
+        the rewritten model directory.
+    """
+    self._name = name
+    self._signature_keys = signature_keys
+    self._quantization_type = quantization_type
+    self._tags = tags or [tf.saved_model.SERVING]
+    self._sample_examples = sample_examples
+    self._benchmark_signature_key = benchmark_signature_key
+    self._copy_assets_extra = copy_assets_extra
+    self._original_model = None
+
+  @property
+  def name(self) -> Text:
+    """The user-specified name of the rewriter."""
+    return self._name
+
+  def _get_cache_key(self) -> Text:
+    """Returns a string identifying the config of the rewriter."""
+    return json.dumps({
+        'signature_keys': self._signature_keys,
+        'quantization_type': self._quantization_type.name,
+        'tags': sorted(self._tags),
+        'copy_assets_extra': self._copy_assets_extra,
+    }, sort_keys=True)
+
+  def _pre_rewrite_validate(self, original_model: rewriter.ModelDescription):
+    """Performs pre-rewrite checks to see if the model can be rewritten.
+
+    Args:
+      original_model: A `ModelDescription` object describing the model to be
+        rewritten.
+
+    Raises:
+      ValueError: If the original model does not have the expected structure,
+        or is a TF2 SavedModel.
+    """
+    if original_model.model_type != rewriter.ModelType.SAVED_MODEL:
+      raise ValueError('SavedModelRewriter can only rewrite SavedModels.')
+    path = six.ensure_text(original_model.path)
+    if not tf.saved_model.contains_saved_model(path):
+      raise ValueError('No SavedModel found in {}.'.format(
+          original_model.path))
+    # The variables of TF2 SavedModels, e.g. of Keras models, are read in
+    # functions, which convert_variables_to_constants does not inline.
+    if _is_tf2_saved_model(path):
+      raise ValueError(
+          'SavedModelRewriter can not rewrite the TF2 SavedModel in {}, only '
+          'SavedModels built with tf.compat.v1.saved_model.Builder, e.g. '
+          'Estimator exports.'.format(original_model.path))
+    self._original_model = original_model
+
+  def _rewrite(self, original_model: rewriter.ModelDescription,
+               rewritten_model: rewriter.ModelDescription):
+    """Rewrites the provided model.
+
+    Args:
+      original_model: A `ModelDescription` specifying the original model to be
+        rewritten.
+      rewritten_model: A `ModelDescription` specifying the format and location
+        of the rewritten model.
+
+    Raises:
+      ValueError: If the model could not be sucessfully rewritten.
+    """
+    if rewritten_model.model_type not in [
+        rewriter.ModelType.SAVED_MODEL, rewriter.ModelType.ANY_MODEL
+    ]:
+      raise ValueError('SavedModelRewriter can only rewrite to SavedModels.')
+    src = six.ensure_text(original_model.path)
+    dst = six.ensure_text(rewritten_model.path)
+
+    with tf.Graph().as_default() as graph:
+      with tf.Session(graph=graph) as sess:
+        meta_graph = tf.saved_model.loader.load(sess, self._tags, src)
+        signature_defs = {
+            k: v
+            for k, v in meta_graph.signature_def.items()
+            if k != _INIT_OP_SIGNATURE_KEY and
+            (self._signature_keys is None or k in self._signature_keys)
+        }
+        missing_keys = set(self._signature_keys or []) - set(signature_defs)
+        if missing_keys:
+          raise ValueError('Signatures {} not found.'.format(
+              sorted(missing_keys)))
+        init_op_name = _get_init_op_name(meta_graph)
+        # The init op and the assets it reads are kept along with the ops the
+        # signatures need, everything else is pruned.
+        fetch_node_names = sorted(
+            set(
+                _get_op_name(t.name)
+                for s in signature_defs.values()
+                for t in list(s.outputs.values()) + list(s.inputs.values())))
+        fetch_node_names.extend(
+            _get_op_name(asset.tensor_info.name)
+            for asset in meta_graph.asset_file_def)
+        if init_op_name:
+          fetch_node_names.append(init_op_name)
+        graph_def = tf.graph_util.convert_variables_to_constants(
+            sess, graph.as_graph_def(), fetch_node_names)
+
+    graph_def = _fold_constants(graph_def, fetch_node_names)
+    if self._quantization_type != QuantizationType.NONE:
+      graph_def = _quantize_weights(graph_def, self._quantization_type)
+    _set_asset_paths(graph_def, meta_graph, src)
+
+    # The builder requires a new directory.
+    if tf.io.gfile.exists(dst):
+      tf.io.gfile.rmtree(dst)
+    with tf.Graph().as_default() as graph:
+      with tf.Session(graph=graph) as sess:
+        tf.import_graph_def(graph_def, name='')
+        builder = tf.saved_model.Builder(dst)
+        builder.add_meta_graph_and_variables(
+            sess,
+            self._tags,
+            signature_def_map=signature_defs,
+            assets_collection=[
+                graph.get_tensor_by_name(asset.tensor_info.name)
+                for asset in meta_graph.asset_file_def
+            ],
+            main_op=(graph.get_operation_by_name(init_op_name)
+                     if init_op_name else None))
+        builder.save()
+
+    if self._copy_assets_extra:
+      src_assets_extra = os.path.join(src, EXTRA_ASSETS_DIRECTORY)
+      if tf.io.gfile.isdir(src_assets_extra):
+        io_utils.copy_dir(src_assets_extra,
+                          os.path.join(dst, EXTRA_ASSETS_DIRECTORY))
+
+  def _post_rewrite_validate(self, rewritten_model: rewriter.ModelDescription):
+    """Validates the rewritten model and records its size and latency.
+
+    Args:
+      rewritten_model: A `ModelDescription` specifying the format and location
+        of the rewritten model.
+
+    Raises:
+      ValueError: If the rewritten model is not valid.
+    """
+    src = six.ensure_text(self._original_model.path)
+    dst = six.ensure_text(rewritten_model.path)
+    stats = {
+        'original_size_bytes': _get_dir_size(src),
+        'rewritten_size_bytes': _get_dir_size(dst),
+    }
+    if self._sample_examples:
+      original = _benchmark(src, self._tags, self._benchmark_signature_key,
+                            self._sample_examples)
+      rewritten = _benchmark(dst, self._tags, self._benchmark_signature_key,
+                             self._sample_examples)
+      for key, value in original['outputs'].items():
+        if np.shape(rewritten['outputs'].get(key)) != np.shape(value):
+          raise ValueError(
+              'Output {} of the rewritten model has shape {}, expected {}.'
+              .format(key, np.shape(rewritten['outputs'].get(key)),
+                      np.shape(value)))
+      stats.update({
+          'num_sample_examples': len(self._sample_examples),
+          'original_latency_seconds': original['latency_seconds'],
+          'rewritten_latency_seconds': rewritten['latency_seconds'],
+      })
+    absl.logging.info('%s rewrite stats: %s', self.name, stats)
+    io_utils.write_string_file(
+        os.path.join(dst, EXTRA_ASSETS_DIRECTORY, STATS_FILENAME),
+        json.dumps(stats, sort_keys=True))
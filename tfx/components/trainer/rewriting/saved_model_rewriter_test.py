@@ -0,0 +1,176 @@
+# Lint as: python2, python3
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for tfx.components.trainer.rewriting.saved_model_rewriter."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import json
+import os
+
+from absl.testing import parameterized
+import numpy as np
+import tensorflow.compat.v1 as tf
+
+from tfx.components.trainer.rewriting import rewriter
+from tfx.components.trainer.rewriting import saved_model_rewriter
+
+_NUM_FEATURES = 64
+
+
+def _make_example(value):
+  return tf.train.Example(
+      features=tf.train.Features(
+          feature={
+              'x':
+                  tf.train.Feature(
+                      float_list=tf.train.FloatList(
+                          value=[value] * _NUM_FEATURES))
+          })).SerializeToString()
+
+
+class SavedModelRewriterTest(tf.test.TestCase, parameterized.TestCase):
+
+  def setUp(self):
+    super(SavedModelRewriterTest, self).setUp()
+    self._temp_dir = os.path.join(self.get_temp_dir(), self._testMethodName)
+    self._src_model_path = os.path.join(self._temp_dir, 'src')
+    self._dst_model_path = os.path.join(self._temp_dir, 'dst')
+    self._examples = [_make_example(float(i)) for i in range(8)]
+
+    with tf.Graph().as_default() as graph:
+      with tf.Session(graph=graph) as sess:
+        serialized = tf.placeholder(tf.string, [None], name='examples')
+        features = tf.parse_example(
+            serialized,
+            {'x': tf.FixedLenFeature([_NUM_FEATURES], tf.float32)})
+        weights = tf.get_variable(
+            'weights', initializer=np.random.uniform(
+                size=(_NUM_FEATURES, 32)).astype(np.float32))
+        scores = tf.matmul(features['x'], weights)
+        unused_loss = tf.reduce_sum(scores, name='loss')
+        sess.run(tf.global_variables_initializer())
+        builder = tf.saved_model.Builder(self._src_model_path)
+        builder.add_meta_graph_and_variables(
+            sess, [tf.saved_model.SERVING],
+            signature_def_map={
+                'serving_default':
+                    tf.saved_model.predict_signature_def(
+                        {'examples': serialized}, {'scores': scores}),
+                'other':
+                    tf.saved_model.predict_signature_def(
+                        {'examples': serialized}, {'x': features['x']}),
+            })
+        builder.save()
+    self._expected_scores = self._predict(self._src_model_path,
+                                          'serving_default')['scores']
+
+  def _predict(self, model_path, signature_key):
+    with tf.Graph().as_default() as graph:
+      with tf.Session(graph=graph) as sess:
+        meta_graph = tf.saved_model.loader.load(sess,
+                                                [tf.saved_model.SERVING],
+                                                model_path)
+        signature = meta_graph.signature_def[signature_key]
+        return sess.run({k: v.name for k, v in signature.outputs.items()},
+                        {signature.inputs['examples'].name: self._examples})
+
+  def _rewrite(self, rw):
+    rw.perform_rewrite(
+        rewriter.ModelDescription(rewriter.ModelType.SAVED_MODEL,
+                                  self._src_model_path),
+        rewriter.ModelDescription(rewriter.ModelType.SAVED_MODEL,
+                                  self._dst_model_path))
+
+  @parameterized.named_parameters(
+      ('None', saved_model_rewriter.QuantizationType.NONE, 1e-6),
+      ('Float16', saved_model_rewriter.QuantizationType.FLOAT16, 1e-2),
+      ('DynamicRange', saved_model_rewriter.QuantizationType.DYNAMIC_RANGE,
+       5e-2))
+  def testRewrite(self, quantization_type, rtol):
+    self._rewrite(
+        saved_model_rewriter.SavedModelRewriter(
+            'myrw',
+            signature_keys=['serving_default'],
+            quantization_type=quantization_type,
+            sample_examples=self._examples))
+
+    self.assertAllClose(
+        self._expected_scores,
+        self._predict(self._dst_model_path, 'serving_default')['scores'],
+        rtol=rtol)
+    with tf.Graph().as_default() as graph:
+      with tf.Session(graph=graph) as sess:
+        meta_graph = tf.saved_model.loader.load(sess,
+                                                [tf.saved_model.SERVING],
+                                                self._dst_model_path)
+        self.assertEqual(['serving_default'], list(meta_graph.signature_def))
+        # The variables are frozen and the ops of other signatures pruned.
+        self.assertEqual([], tf.global_variables())
+        self.assertNotIn('loss', [n.name for n in meta_graph.graph_def.node])
+
+    with tf.io.gfile.GFile(
+        os.path.join(self._dst_model_path,
+                     saved_model_rewriter.EXTRA_ASSETS_DIRECTORY,
+                     saved_model_rewriter.STATS_FILENAME)) as f:
+      stats = json.loads(f.read())
+    self.assertGreater(stats['original_size_bytes'], 0)
+    self.assertGreater(stats['rewritten_size_bytes'], 0)
+    self.assertEqual(len(self._examples), stats['num_sample_examples'])
+    self.assertIn('original_latency_seconds', stats)
+    self.assertIn('rewritten_latency_seconds', stats)
+
+  def testRewriteQuantizedIsSmaller(self):
+    self._rewrite(saved_model_rewriter.SavedModelRewriter('myrw'))
+    frozen_size = saved_model_rewriter._get_dir_size(self._dst_model_path)
+    tf.io.gfile.rmtree(self._dst_model_path)
+    self._rewrite(
+        saved_model_rewriter.SavedModelRewriter(
+            'myrw',
+            quantization_type=(
+                saved_model_rewriter.QuantizationType.DYNAMIC_RANGE)))
+    self.assertLess(
+        saved_model_rewriter._get_dir_size(self._dst_model_path), frozen_size)
+
+  def testRewriteMissingSignature(self):
+    with self.assertRaises(ValueError):
+      self._rewrite(
+          saved_model_rewriter.SavedModelRewriter(
+              'myrw', signature_keys=['missing']))
+
+  def testRewriteKerasModel(self):
+    keras_model_path = os.path.join(self._temp_dir, 'keras')
+    model = tf.keras.Sequential(
+        [tf.keras.layers.Dense(1, input_shape=(_NUM_FEATURES,))])
+    tf.keras.models.save_model(model, keras_model_path, save_format='tf')
+    with self.assertRaisesRegexp(ValueError, 'TF2 SavedModel'):
+      saved_model_rewriter.SavedModelRewriter('myrw').perform_rewrite(
+          rewriter.ModelDescription(rewriter.ModelType.SAVED_MODEL,
+                                    keras_model_path),
+          rewriter.ModelDescription(rewriter.ModelType.SAVED_MODEL,
+                                    self._dst_model_path))
+
+  def testRewriteNotSavedModel(self):
+    with self.assertRaises(ValueError):
+      saved_model_rewriter.SavedModelRewriter('myrw').perform_rewrite(
+          rewriter.ModelDescription(rewriter.ModelType.TFLITE_MODEL,
+                                    self._src_model_path),
+          rewriter.ModelDescription(rewriter.ModelType.SAVED_MODEL,
+                                    self._dst_model_path))
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -18,6 +18,7 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import json
 import os
 import time
 
@@ -82,6 +83,16 @@ class TFLiteRewriter(rewriter.BaseRewriter):
     """The user-specified name of the rewriter."""
     return self._name
 
+  def _get_cache_key(self) -> Text:
+    """Returns a string identifying the config of the rewriter."""
+    return json.dumps({
+        'filename': self._filename,
+        'enable_experimental_new_converter':
+            self._enable_experimental_new_converter,
+        'copy_assets': self._copy_assets,
+        'copy_assets_extra': self._copy_assets_extra,
+    }, sort_keys=True)
+
   def _pre_rewrite_validate(self, original_model: rewriter.ModelDescription):
     """Performs pre-rewrite checks to see if the model can be rewritten.
 
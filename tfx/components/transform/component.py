@@ -24,8 +24,10 @@ import absl
 from tfx import types
 from tfx.components.base import base_component
 from tfx.components.base import executor_spec
+from tfx.components.transform import driver
 from tfx.components.transform import executor
 from tfx.orchestration import data_types
+from tfx.proto import transform_pb2
 from tfx.types import artifact
 from tfx.types import artifact_utils
 from tfx.types import standard_artifacts
@@ -59,11 +61,53 @@ class Transform(base_component.BaseComponent):
       module_file=module_file)
   ```
 
+  ## Statistics
+  With `compute_statistics=True`, Transform also publishes the statistics of
+  its input and output examples, so that a pipeline does not need to read the
+  data again in StatisticsGen:
+  ```
+  transform = Transform(
+      examples=example_gen.outputs['examples'],
+      schema=infer_schema.outputs['schema'],
+      module_file=module_file,
+      compute_statistics=True)
+  validate_stats = ExampleValidator(
+      statistics=transform.outputs['pre_transform_statistics'],
+      schema=infer_schema.outputs['schema'])
+  ```
+
+  ## Analyzer cache
+  With `enable_analyzer_cache=True`, Transform outputs the `tf.Transform`
+  analyzer cache of each analyzed dataset as an `updated_analyzer_cache`
+  artifact, and reads the cache output by its latest successful run in the
+  same pipeline. When the examples are a rolling window of spans, only the new
+  spans are then analyzed. Cache entries are carried forward by hardlink where
+  the file system allows it, and entries of spans which left the window are
+  dropped.
+
+  ## Materialization
+  The transformed examples are written as gzipped TFRecord files by default. A
+  `transform_pb2.MaterializationConfig` can write them uncompressed, which is
+  faster to read over many training epochs, or as Parquet files, and can set
+  the number of files of each split. The format is recorded on the
+  `transformed_examples` artifact.
+
+  With `incremental=True`, the examples can be a rolling window of spans, each
+  of which is transformed into a sub-directory of each split. Spans which the
+  latest successful run of the component materialized are not materialized
+  again if the `preprocessing_fn` has no analyzers and neither it nor the
+  schema changed, as the transform graph then does not depend on the data. With
+  analyzers, all spans are materialized. The `transformed_examples` artifact
+  then references the files of the earlier runs, which must not be garbage
+  collected while in use. Readers get
+  the files of all spans with `examples_utils.get_split_file_patterns()`.
+
   Please see https://www.tensorflow.org/tfx/transform for more details.
   """
 
   SPEC_CLASS = TransformSpec
   EXECUTOR_SPEC = executor_spec.ExecutorClassSpec(executor.Executor)
+  DRIVER_CLASS = driver.Driver
 
   def __init__(
       self,
@@ -74,6 +118,14 @@ class Transform(base_component.BaseComponent):
                                        data_types.RuntimeParameter]] = None,
       transform_graph: Optional[types.Channel] = None,
       transformed_examples: Optional[types.Channel] = None,
+      compute_statistics: bool = False,
+      analyzer_cache: Optional[types.Channel] = None,
+      enable_analyzer_cache: bool = False,
+      updated_analyzer_cache: Optional[types.Channel] = None,
+      materialization_config: Optional[
+          transform_pb2.MaterializationConfig] = None,
+      in_process_input_size_threshold: Optional[int] = None,
+      batch_memory_budget: Optional[int] = None,
       input_data: Optional[types.Channel] = None,
       instance_name: Optional[Text] = None):
     """Construct a Transform component.
@@ -103,13 +155,42 @@ class Transform(base_component.BaseComponent):
       transformed_examples: Optional output 'ExamplesPath' channel for
         materialized transformed examples, which includes both 'train' and
         'eval' splits.
+      compute_statistics: If True, also outputs 'pre_transform_statistics'
+        and 'post_transform_statistics' channels of type
+        `standard_artifacts.ExampleStatistics`, computed on the 'train' and
+        'eval' splits of the raw and the transformed examples respectively.
+        As Transform reads the raw examples anyway, the pre-transform
+        statistics can be consumed by SchemaGen and ExampleValidator in place
+        of the output of a separate StatisticsGen.
+      analyzer_cache: Optional input 'TransformCache' channel of an analyzer
+        cache to read. If not given and 'enable_analyzer_cache' is True, the
+        cache output by the latest successful run of this component is used.
+      enable_analyzer_cache: If True, the analyzer cache is read and written
+        across runs, so that analysis only reads the datasets which are not
+        in the cache.
+      updated_analyzer_cache: Optional output 'TransformCache' channel for the
+        analyzer cache of the current datasets. Created if
+        'enable_analyzer_cache' is True.
+      materialization_config: Optional `transform_pb2.MaterializationConfig`
+        for the files of the transformed examples. Defaults to gzipped
+        TFRecord files. Incremental materialization can not be combined with
+        'compute_statistics'.
+      in_process_input_size_threshold: Optional total size in bytes of the
+        input data below which the Beam pipeline is run in-process, without
+        starting SDK worker processes. Only applies if the Beam pipeline args
+        do not set a runner. Defaults to 32MiB, and 0 disables it.
+      batch_memory_budget: Optional memory budget in bytes for a batch of
+        decoded instances. The batch size is bounded so that a batch fits the
+        budget, as estimated on the first instances of the data. Defaults to
+        256MiB, and 0 leaves the batch size to Beam.
       input_data: Backwards compatibility alias for the 'examples' argument.
       instance_name: Optional unique instance name. Necessary iff multiple
         transform components are declared in the same pipeline.
 
     Raises:
       ValueError: When both or neither of 'module_file' and 'preprocessing_fn'
-        is supplied.
+        is supplied, or when 'compute_statistics' is combined with incremental
+        materialization.
     """
     if input_data:
       absl.logging.warning(
@@ -121,6 +202,11 @@ class Transform(base_component.BaseComponent):
       raise ValueError(
           "Exactly one of 'module_file' or 'preprocessing_fn' must be supplied."
       )
+    if (compute_statistics and materialization_config and
+        materialization_config.incremental):
+      raise ValueError(
+          "'compute_statistics' is not supported with incremental "
+          'materialization.')
 
     transform_graph = transform_graph or types.Channel(
         type=standard_artifacts.TransformGraph,
@@ -131,11 +217,36 @@ class Transform(base_component.BaseComponent):
           artifact.DEFAULT_EXAMPLE_SPLITS)
       transformed_examples = types.Channel(
           type=standard_artifacts.Examples, artifacts=[example_artifact])
+    pre_transform_statistics = None
+    post_transform_statistics = None
+    if compute_statistics:
+      pre_transform_statistics = self._make_statistics_channel()
+      post_transform_statistics = self._make_statistics_channel()
+    if enable_analyzer_cache and not updated_analyzer_cache:
+      updated_analyzer_cache = types.Channel(
+          type=standard_artifacts.TransformCache,
+          artifacts=[standard_artifacts.TransformCache()])
     spec = TransformSpec(
         examples=examples,
         schema=schema,
         module_file=module_file,
         preprocessing_fn=preprocessing_fn,
+        enable_analyzer_cache=enable_analyzer_cache,
+        materialization_config=materialization_config,
+        in_process_input_size_threshold=in_process_input_size_threshold,
+        batch_memory_budget=batch_memory_budget,
+        analyzer_cache=analyzer_cache,
         transform_graph=transform_graph,
-        transformed_examples=transformed_examples)
+        transformed_examples=transformed_examples,
+        pre_transform_statistics=pre_transform_statistics,
+        post_transform_statistics=post_transform_statistics,
+        updated_analyzer_cache=updated_analyzer_cache)
     super(Transform, self).__init__(spec=spec, instance_name=instance_name)
+
+  def _make_statistics_channel(self) -> types.Channel:
+    statistics_artifact = standard_artifacts.ExampleStatistics()
+    statistics_artifact.split_names = artifact_utils.encode_split_names(
+        artifact.DEFAULT_EXAMPLE_SPLITS)
+    return types.Channel(
+        type=standard_artifacts.ExampleStatistics,
+        artifacts=[statistics_artifact])
@@ -22,6 +22,7 @@ from typing import Text
 import tensorflow as tf
 from tfx.components.transform import component
 from tfx.orchestration import data_types
+from tfx.proto import transform_pb2
 from tfx.types import artifact_utils
 from tfx.types import channel_utils
 from tfx.types import standard_artifacts
@@ -76,6 +77,78 @@ class ComponentTest(tf.test.TestCase):
     self.assertEqual(preprocessing_fn,
                      transform.spec.exec_properties['preprocessing_fn'])
 
+  def testConstructWithStatistics(self):
+    transform = component.Transform(
+        examples=self.examples,
+        schema=self.schema,
+        module_file='/path/to/preprocessing.py',
+        compute_statistics=True,
+    )
+    self._verify_outputs(transform)
+    for key in ['pre_transform_statistics', 'post_transform_statistics']:
+      self.assertEqual(standard_artifacts.ExampleStatistics.TYPE_NAME,
+                       transform.outputs[key].type_name)
+      self.assertEqual(['train', 'eval'],
+                       artifact_utils.decode_split_names(
+                           transform.outputs[key].get()[0].split_names))
+
+  def testConstructWithAnalyzerCache(self):
+    transform = component.Transform(
+        examples=self.examples,
+        schema=self.schema,
+        module_file='/path/to/preprocessing.py',
+        enable_analyzer_cache=True,
+    )
+    self._verify_outputs(transform)
+    self.assertEqual(standard_artifacts.TransformCache.TYPE_NAME,
+                     transform.outputs['updated_analyzer_cache'].type_name)
+    self.assertTrue(transform.spec.exec_properties['enable_analyzer_cache'])
+
+  def testConstructWithMaterializationConfig(self):
+    transform = component.Transform(
+        examples=self.examples,
+        schema=self.schema,
+        module_file='/path/to/preprocessing.py',
+        materialization_config=transform_pb2.MaterializationConfig(
+            format=transform_pb2.MaterializationConfig.PARQUET, num_shards=4),
+    )
+    self._verify_outputs(transform)
+    self.assertJsonEqual(
+        '{"format": "PARQUET", "num_shards": 4}',
+        transform.spec.exec_properties['materialization_config'])
+
+  def testConstructWithInProcessInputSizeThreshold(self):
+    transform = component.Transform(
+        examples=self.examples,
+        schema=self.schema,
+        module_file='/path/to/preprocessing.py',
+        in_process_input_size_threshold=0,
+    )
+    self._verify_outputs(transform)
+    self.assertEqual(
+        0, transform.spec.exec_properties['in_process_input_size_threshold'])
+
+  def testConstructWithBatchMemoryBudget(self):
+    transform = component.Transform(
+        examples=self.examples,
+        schema=self.schema,
+        module_file='/path/to/preprocessing.py',
+        batch_memory_budget=1 << 20,
+    )
+    self._verify_outputs(transform)
+    self.assertEqual(1 << 20,
+                     transform.spec.exec_properties['batch_memory_budget'])
+
+  def testConstructIncrementalWithStatistics(self):
+    with self.assertRaises(ValueError):
+      _ = component.Transform(
+          examples=self.examples,
+          schema=self.schema,
+          module_file='/path/to/preprocessing.py',
+          compute_statistics=True,
+          materialization_config=transform_pb2.MaterializationConfig(
+              incremental=True))
+
   def testConstructMissingUserModule(self):
     with self.assertRaises(ValueError):
       _ = component.Transform(
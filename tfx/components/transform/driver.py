@@ -0,0 +1,83 @@
+# Lint as: python2, python3
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""TFX Transform Driver."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from typing import Any, Dict, List, Optional, Text, Type
+
+import absl
+
+from google.protobuf import json_format
+from tfx import types
+from tfx.components.base import base_driver
+from tfx.orchestration import data_types
+from tfx.proto import transform_pb2
+from tfx.types import standard_artifacts
+
+# Keys in input_dict, see TransformSpec.
+_ANALYZER_CACHE_KEY = 'analyzer_cache'
+_PREVIOUS_TRANSFORMED_EXAMPLES_KEY = 'previous_transformed_examples'
+
+
+class Driver(base_driver.BaseDriver):
+  """Custom driver for Transform.
+
+  If the analyzer cache is enabled and no 'analyzer_cache' input is given, the
+  cache produced by the latest successful run of the same Transform component
+  in the pipeline is resolved from metadata as the input cache. Likewise, the
+  transformed examples of the latest run are resolved for incremental
+  materialization.
+  """
+
+  def _fetch_latest_output(
+      self, pipeline_info: data_types.PipelineInfo,
+      component_info: data_types.ComponentInfo,
+      artifact_type: Type[types.Artifact]) -> Optional[types.Artifact]:
+    previous_outputs = self._fetch_previous_outputs(pipeline_info,
+                                                    component_info,
+                                                    artifact_type)
+    return previous_outputs[-1] if previous_outputs else None
+
+  def resolve_previous_artifacts(
+      self, input_artifacts: Dict[Text, List[types.Artifact]],
+      exec_properties: Dict[Text, Any],
+      pipeline_info: data_types.PipelineInfo,
+      component_info: data_types.ComponentInfo
+  ) -> Dict[Text, List[types.Artifact]]:
+    """Overrides BaseDriver.resolve_previous_artifacts()."""
+    if (exec_properties.get('enable_analyzer_cache') and
+        not input_artifacts.get(_ANALYZER_CACHE_KEY)):
+      latest_cache = self._fetch_latest_output(
+          pipeline_info, component_info, standard_artifacts.TransformCache)
+      if latest_cache is not None:
+        absl.logging.info('Using analyzer cache from %s', latest_cache.uri)
+        input_artifacts[_ANALYZER_CACHE_KEY] = [latest_cache]
+
+    materialization_config = transform_pb2.MaterializationConfig()
+    if exec_properties.get('materialization_config'):
+      json_format.Parse(exec_properties['materialization_config'],
+                        materialization_config)
+    if (materialization_config.incremental and
+        not input_artifacts.get(_PREVIOUS_TRANSFORMED_EXAMPLES_KEY)):
+      latest_examples = self._fetch_latest_output(
+          pipeline_info, component_info, standard_artifacts.Examples)
+      if latest_examples is not None:
+        absl.logging.info('Using previously transformed examples from %s',
+                          latest_examples.uri)
+        input_artifacts[_PREVIOUS_TRANSFORMED_EXAMPLES_KEY] = [latest_examples]
+    return input_artifacts
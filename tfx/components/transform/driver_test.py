@@ -0,0 +1,90 @@
+# Lint as: python2, python3
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for tfx.components.transform.driver."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import tensorflow as tf
+from google.protobuf import json_format
+from tfx.components.transform import driver
+from tfx.orchestration import data_types
+from tfx.proto import transform_pb2
+from tfx.types import standard_artifacts
+
+
+class DriverTest(tf.test.TestCase):
+
+  def setUp(self):
+    super(DriverTest, self).setUp()
+    self._mock_metadata = tf.compat.v1.test.mock.Mock()
+    artifacts = {}
+    for aid, component_id, artifact_type in [
+        (1, 'Transform', standard_artifacts.TransformCache),
+        (2, 'Transform', standard_artifacts.TransformCache),
+        (3, 'Transform.other', standard_artifacts.TransformCache),
+        (4, 'Transform', standard_artifacts.Examples),
+        (5, 'Transform.other', standard_artifacts.Examples)
+    ]:
+      artifact = artifact_type()
+      artifact.id = aid
+      artifact.uri = 'uri-%d' % aid
+      artifact.producer_component = component_id
+      artifacts.setdefault(artifact_type.TYPE_NAME,
+                           []).append(artifact.mlmd_artifact)
+    get_artifacts = (
+        self._mock_metadata.get_published_artifacts_by_type_within_context)
+    get_artifacts.side_effect = (
+        lambda type_names, unused_context_id: {
+            t: artifacts.get(t, []) for t in type_names
+        })
+    self._pipeline_info = data_types.PipelineInfo(
+        pipeline_name='p', pipeline_root='/p', run_id='r')
+    self._component_info = data_types.ComponentInfo(
+        component_type='c',
+        component_id='Transform',
+        pipeline_info=self._pipeline_info)
+
+  def _resolve_input_artifacts(self, exec_properties):
+    transform_driver = driver.Driver(self._mock_metadata)
+    return transform_driver.resolve_previous_artifacts(
+        {}, exec_properties, self._pipeline_info, self._component_info)
+
+  def testResolveLatestAnalyzerCache(self):
+    result = self._resolve_input_artifacts({'enable_analyzer_cache': True})
+    self.assertEqual(['uri-2'], [a.uri for a in result['analyzer_cache']])
+
+  def testResolveAnalyzerCacheDisabled(self):
+    result = self._resolve_input_artifacts({'enable_analyzer_cache': False})
+    self.assertNotIn('analyzer_cache', result)
+
+  def testResolvePreviousTransformedExamples(self):
+    result = self._resolve_input_artifacts({
+        'materialization_config':
+            json_format.MessageToJson(
+                transform_pb2.MaterializationConfig(incremental=True))
+    })
+    self.assertEqual(['uri-4'],
+                     [a.uri for a in result['previous_transformed_examples']])
+    self.assertNotIn('analyzer_cache', result)
+
+  def testResolvePreviousTransformedExamplesDisabled(self):
+    result = self._resolve_input_artifacts({})
+    self.assertNotIn('previous_transformed_examples', result)
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -18,15 +18,21 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import hashlib
 import os
 from typing import Any, Dict, Generator, Iterable, List, Mapping, Optional, Sequence, Text, Tuple, Union
 
 import absl
 import apache_beam as beam
+from apache_beam.options.pipeline_options import PipelineOptions
+from apache_beam.options.pipeline_options import StandardOptions
+from apache_beam.runners.portability import fn_api_runner
+import numpy as np
 import pyarrow as pa
 import tensorflow as tf
 import tensorflow_data_validation as tfdv
 import tensorflow_transform as tft
+from tensorflow_transform import analyzer_nodes
 from tensorflow_transform import impl_helper
 import tensorflow_transform.beam as tft_beam
 from tensorflow_transform.beam import analyzer_cache
@@ -37,6 +43,7 @@ from tensorflow_transform.tf_metadata import dataset_schema
 from tensorflow_transform.tf_metadata import metadata_io
 from tensorflow_transform.tf_metadata import schema_utils
 import tfx_bsl
+from google.protobuf import json_format
 from tensorflow_metadata.proto.v0 import schema_pb2
 from tensorflow_metadata.proto.v0 import statistics_pb2
 from tfx import types
@@ -44,7 +51,9 @@ from tfx.components.base import base_executor
 from tfx.components.transform import labels
 from tfx.components.transform import stats_options as transform_stats_options
 from tfx.components.transform import messages
+from tfx.components.util import examples_utils
 from tfx.components.util import value_utils
+from tfx.proto import transform_pb2
 from tfx.types import artifact_utils
 from tfx.utils import import_utils
 from tfx.utils import io_utils
@@ -62,6 +71,16 @@ TEMP_PATH_KEY = 'temp_path'
 TRANSFORM_GRAPH_KEY = 'transform_graph'
 # Key for output model in executor output_dict.
 TRANSFORMED_EXAMPLES_KEY = 'transformed_examples'
+# Key for input analyzer cache in executor input_dict.
+ANALYZER_CACHE_KEY = 'analyzer_cache'
+# Key for output analyzer cache in executor output_dict.
+UPDATED_ANALYZER_CACHE_KEY = 'updated_analyzer_cache'
+# Key for the transformed examples of the previous run in executor input_dict.
+PREVIOUS_TRANSFORMED_EXAMPLES_KEY = 'previous_transformed_examples'
+# Key for output pre-transform statistics in executor output_dict.
+PRE_TRANSFORM_STATISTICS_KEY = 'pre_transform_statistics'
+# Key for output post-transform statistics in executor output_dict.
+POST_TRANSFORM_STATISTICS_KEY = 'post_transform_statistics'
 
 RAW_EXAMPLE_KEY = 'raw_example'
 
@@ -75,6 +94,34 @@ _TRANSFORM_INTERNAL_FEATURE_FOR_KEY = '__TFT_PASS_KEY__'
 # Default file name prefix for transformed_examples.
 _DEFAULT_TRANSFORMED_EXAMPLES_PREFIX = 'transformed_examples'
 
+# Default total size in bytes of the input data below which Transform runs its
+# Beam pipeline in-process, if no Beam runner is configured.
+DEFAULT_IN_PROCESS_INPUT_SIZE_THRESHOLD = 32 << 20
+
+# Default memory budget in bytes for a batch of decoded instances.
+DEFAULT_BATCH_MEMORY_BUDGET = 256 << 20
+# Number of instances sampled to estimate the memory of a decoded instance.
+_BATCH_SIZE_SAMPLE_SIZE = 100
+# Bounds of the batch size derived from the batch memory budget. Above the
+# upper bound, which is Beam's default maximum batch size, the batch size is
+# left to Beam, which adapts it to the measured per-batch latency.
+_MIN_BATCH_SIZE = 1
+_MAX_BATCH_SIZE = 10000
+
+# Arrow types of transformed features in Parquet materialization.
+_ARROW_TYPES = {
+    tf.int64: pa.int64(),
+    tf.float32: pa.float32(),
+    tf.string: pa.binary(),
+}
+
+# Default file name for statistics outputs, the same as StatisticsGen's.
+_DEFAULT_STATS_FILE_NAME = 'stats_tfrecord'
+
+# Custom property of incrementally materialized transformed examples for the
+# fingerprint of the analyzer-free transform graph they were transformed with.
+_TRANSFORM_FINGERPRINT_PROPERTY = 'transform_fingerprint'
+
 # Temporary path inside transform_output used for tft.beam
 # TODO(b/125451545): Provide a safe temp path from base executor instead.
 _TEMP_DIR_IN_TRANSFORM_OUTPUT = '.temp_path'
@@ -130,7 +177,9 @@ class _Dataset(object):
                data_format: Union[Text, int],
                metadata: dataset_metadata.DatasetMetadata,
                stats_output_path: Optional[Text] = None,
-               materialize_output_path: Optional[Text] = None):
+               materialize_output_path: Optional[Text] = None,
+               pre_transform_output_stats_path: Optional[Text] = None,
+               post_transform_output_stats_path: Optional[Text] = None):
     """Initialize a Dataset.
 
     Args:
@@ -140,6 +189,10 @@ class _Dataset(object):
       metadata: A DatasetMetadata object describing the dataset.
       stats_output_path: The file path where to write stats for the dataset.
       materialize_output_path: The file path where to write the dataset.
+      pre_transform_output_stats_path: The file path where to write
+        pre-transform stats for the dataset as a TFRecord file, if any.
+      post_transform_output_stats_path: The file path where to write
+        post-transform stats for the dataset as a TFRecord file, if any.
     """
     self._file_pattern = file_pattern
     file_pattern_suffix = os.path.join(
@@ -152,6 +205,8 @@ class _Dataset(object):
     self._metadata = metadata
     self._stats_output_path = stats_output_path
     self._materialize_output_path = materialize_output_path
+    self._pre_transform_output_stats_path = pre_transform_output_stats_path
+    self._post_transform_output_stats_path = post_transform_output_stats_path
     self._index = None
     self._serialized = None
     self._decoded = None
@@ -175,6 +230,14 @@ class _Dataset(object):
     assert self._materialize_output_path
     return self._materialize_output_path
 
+  @property
+  def pre_transform_output_stats_path(self):
+    return self._pre_transform_output_stats_path
+
+  @property
+  def post_transform_output_stats_path(self):
+    return self._post_transform_output_stats_path
+
   @property
   def index(self):
     assert self._index is not None
@@ -277,6 +340,19 @@ def _GetSchemaProto(
   return getattr(schema, '_schema_proto', schema)
 
 
+def _EstimateInstanceBytes(instance: Any) -> int:
+  """Estimates the memory in bytes of a decoded instance."""
+  if isinstance(instance, dict):
+    return sum(_EstimateInstanceBytes(v) for v in instance.values())
+  if isinstance(instance, bytes):
+    return len(instance)
+  if isinstance(instance, np.ndarray) and instance.dtype == object:
+    return instance.nbytes + sum(
+        _EstimateInstanceBytes(v) for v in instance.flat)
+  # numpy arrays and scalars.
+  return getattr(instance, 'nbytes', 8)
+
+
 class Executor(base_executor.BaseExecutor):
   """Transform executor."""
 
@@ -296,42 +372,139 @@ class Executor(base_executor.BaseExecutor):
           should contain two splits 'train' and 'eval'.
         - schema: A list of type `standard_artifacts.Schema` which should
           contain a single schema artifact.
+        - analyzer_cache: Optionally, a list of type
+          `standard_artifacts.TransformCache` which should contain a single
+          analyzer cache artifact to read.
+        - previous_transformed_examples: Optionally, a list of type
+          `standard_artifacts.Examples` which should contain the transformed
+          examples of the previous run, for incremental materialization.
       output_dict: Output dict from key to a list of artifacts, including:
         - transform_output: Output of 'tf.Transform', which includes an exported
           Tensorflow graph suitable for both training and serving;
         - transformed_examples: Materialized transformed examples, which
           includes both 'train' and 'eval' splits.
+        - pre_transform_statistics: Optionally, a list of type
+          `standard_artifacts.ExampleStatistics` for statistics of the 'train'
+          and 'eval' splits of the input examples.
+        - post_transform_statistics: Optionally, a list of type
+          `standard_artifacts.ExampleStatistics` for statistics of the 'train'
+          and 'eval' splits of the transformed examples.
+        - updated_analyzer_cache: Optionally, a list of type
+          `standard_artifacts.TransformCache` for the analyzer cache of the
+          analyzed datasets.
       exec_properties: A dict of execution properties, including either one of:
         - module_file: The file path to a python module file, from which the
           'preprocessing_fn' function will be loaded.
         - preprocessing_fn: The module path to a python function that
           implements 'preprocessing_fn'.
+        - materialization_config: Optionally, a JSON serialized
+          `transform_pb2.MaterializationConfig` for the files of the
+          transformed examples.
+        - in_process_input_size_threshold: Optionally, the total size in
+          bytes of the input data below which the Beam pipeline is run
+          in-process if no runner is configured. 0 disables it, and it
+          defaults to DEFAULT_IN_PROCESS_INPUT_SIZE_THRESHOLD.
+        - batch_memory_budget: Optionally, the memory budget in bytes for a
+          batch of decoded instances, which bounds the batch size. 0 disables
+          it, and it defaults to DEFAULT_BATCH_MEMORY_BUDGET.
 
     Returns:
       None
+
+    Raises:
+      ValueError: If materialization is incremental and either examples
+        artifacts have the same span or statistics outputs are requested.
     """
     self._log_startup(input_dict, output_dict, exec_properties)
-    train_data_uri = artifact_utils.get_split_uri(input_dict[EXAMPLES_KEY],
-                                                  'train')
-    eval_data_uri = artifact_utils.get_split_uri(input_dict[EXAMPLES_KEY],
-                                                 'eval')
     schema_file = io_utils.get_only_uri_in_dir(
         artifact_utils.get_single_uri(input_dict[SCHEMA_KEY]))
     transform_output = artifact_utils.get_single_uri(
         output_dict[TRANSFORM_GRAPH_KEY])
-    transformed_train_output = artifact_utils.get_split_uri(
-        output_dict[TRANSFORMED_EXAMPLES_KEY], 'train')
-    transformed_eval_output = artifact_utils.get_split_uri(
-        output_dict[TRANSFORMED_EXAMPLES_KEY], 'eval')
+    transformed_examples = artifact_utils.get_single_instance(
+        output_dict[TRANSFORMED_EXAMPLES_KEY])
+
+    materialization_config = transform_pb2.MaterializationConfig()
+    if exec_properties.get('materialization_config'):
+      json_format.Parse(exec_properties['materialization_config'],
+                        materialization_config)
+    if (materialization_config.format ==
+        transform_pb2.MaterializationConfig.PARQUET):
+      materialize_file_format = labels.FORMAT_PARQUET
+      file_format = examples_utils.FILE_FORMAT_PARQUET
+    elif (materialization_config.compression ==
+          transform_pb2.MaterializationConfig.UNCOMPRESSED):
+      materialize_file_format = labels.FORMAT_TFRECORD
+      file_format = examples_utils.FILE_FORMAT_TFRECORDS
+    else:
+      materialize_file_format = labels.FORMAT_TFRECORD
+      file_format = examples_utils.FILE_FORMAT_TFRECORDS_GZIP
+
+    if materialization_config.incremental:
+      if (output_dict.get(PRE_TRANSFORM_STATISTICS_KEY) or
+          output_dict.get(POST_TRANSFORM_STATISTICS_KEY)):
+        raise ValueError('Statistics outputs are not supported with '
+                         'incremental materialization.')
+      # Each span is analyzed and transformed as a dataset of its own, and the
+      # transformed examples of a span are written to sub-directories of the
+      # split directories.
+      examples_by_span = {}
+      for examples in input_dict[EXAMPLES_KEY]:
+        if examples.span in examples_by_span:
+          raise ValueError(
+              'Examples artifacts {} and {} have the same span {}.'.format(
+                  examples_by_span[examples.span].uri, examples.uri,
+                  examples.span))
+        examples_by_span[examples.span] = examples
+      # Spans can only be reused if the transform graph does not depend on the
+      # data, which is decided before the data is analyzed.
+      fingerprint = self._GetPreprocessingFingerprint(
+          self._GetPreprocessingFn(
+              {
+                  labels.MODULE_FILE: exec_properties.get('module_file'),
+                  labels.PREPROCESSING_FN:
+                      exec_properties.get('preprocessing_fn'),
+              }, {}),
+          self._ReadMetadata(labels.FORMAT_TF_EXAMPLE, schema_file))
+      previous_span_uris = self._GetPreviousSpanUris(
+          input_dict.get(PREVIOUS_TRANSFORMED_EXAMPLES_KEY), file_format,
+          examples_by_span, fingerprint)
+      new_spans = sorted(set(examples_by_span) - set(previous_span_uris))
+      absl.logging.info('Materializing spans %s, reusing spans %s.', new_spans,
+                        sorted(previous_span_uris))
+      analyze_data_uris = [
+          artifact_utils.get_split_uri([examples_by_span[span]], 'train')
+          for span in sorted(examples_by_span)
+      ]
+      transform_data_uris, transformed_outputs = self._GetSpanPaths(
+          examples_by_span, new_spans, transformed_examples.uri)
+    else:
+      train_data_uri = artifact_utils.get_split_uri(input_dict[EXAMPLES_KEY],
+                                                    'train')
+      eval_data_uri = artifact_utils.get_split_uri(input_dict[EXAMPLES_KEY],
+                                                   'eval')
+      analyze_data_uris = [train_data_uri]
+      transform_data_uris = [train_data_uri, eval_data_uri]
+      transformed_outputs = [
+          artifact_utils.get_split_uri(output_dict[TRANSFORMED_EXAMPLES_KEY],
+                                       split) for split in ['train', 'eval']
+      ]
     temp_path = os.path.join(transform_output, _TEMP_DIR_IN_TRANSFORM_OUTPUT)
     absl.logging.debug('Using temp path %s for tft.beam', temp_path)
 
     def _GetCachePath(label, params_dict):
-      if label not in params_dict:
+      if not params_dict.get(label):
         return None
       else:
         return artifact_utils.get_single_uri(params_dict[label])
 
+    in_process_input_size_threshold = exec_properties.get(
+        'in_process_input_size_threshold')
+    if in_process_input_size_threshold is None:
+      in_process_input_size_threshold = DEFAULT_IN_PROCESS_INPUT_SIZE_THRESHOLD
+    batch_memory_budget = exec_properties.get('batch_memory_budget')
+    if batch_memory_budget is None:
+      batch_memory_budget = DEFAULT_BATCH_MEMORY_BUDGET
+
     label_inputs = {
         labels.COMPUTE_STATISTICS_LABEL:
             False,
@@ -339,47 +512,172 @@ class Executor(base_executor.BaseExecutor):
             schema_file,
         labels.EXAMPLES_DATA_FORMAT_LABEL:
             labels.FORMAT_TF_EXAMPLE,
-        labels.ANALYZE_DATA_PATHS_LABEL:
-            io_utils.all_files_pattern(train_data_uri),
+        labels.ANALYZE_DATA_PATHS_LABEL: [
+            io_utils.all_files_pattern(uri) for uri in analyze_data_uris
+        ],
         labels.ANALYZE_PATHS_FILE_FORMATS_LABEL:
-            labels.FORMAT_TFRECORD,
+            [labels.FORMAT_TFRECORD] * len(analyze_data_uris),
         labels.TRANSFORM_DATA_PATHS_LABEL: [
-            io_utils.all_files_pattern(train_data_uri),
-            io_utils.all_files_pattern(eval_data_uri)
-        ],
-        labels.TRANSFORM_PATHS_FILE_FORMATS_LABEL: [
-            labels.FORMAT_TFRECORD, labels.FORMAT_TFRECORD
+            io_utils.all_files_pattern(uri) for uri in transform_data_uris
         ],
+        labels.TRANSFORM_PATHS_FILE_FORMATS_LABEL:
+            [labels.FORMAT_TFRECORD] * len(transform_data_uris),
         labels.TFT_STATISTICS_USE_TFDV_LABEL:
             True,
         labels.MODULE_FILE:
             exec_properties.get('module_file', None),
         labels.PREPROCESSING_FN:
             exec_properties.get('preprocessing_fn', None),
+        labels.IN_PROCESS_INPUT_SIZE_THRESHOLD_LABEL:
+            in_process_input_size_threshold,
+        labels.BATCH_MEMORY_BUDGET_LABEL:
+            batch_memory_budget,
     }
-    cache_input = _GetCachePath('cache_input_path', input_dict)
+    # The 'cache_input_path' and 'cache_output_path' keys are supported for
+    # backwards compatibility.
+    cache_input = (
+        _GetCachePath(ANALYZER_CACHE_KEY, input_dict) or
+        _GetCachePath('cache_input_path', input_dict))
     if cache_input is not None:
       label_inputs[labels.CACHE_INPUT_PATH_LABEL] = cache_input
 
     label_outputs = {
         labels.TRANSFORM_METADATA_OUTPUT_PATH_LABEL: transform_output,
         labels.TRANSFORM_MATERIALIZE_OUTPUT_PATHS_LABEL: [
-            os.path.join(transformed_train_output,
-                         _DEFAULT_TRANSFORMED_EXAMPLES_PREFIX),
-            os.path.join(transformed_eval_output,
-                         _DEFAULT_TRANSFORMED_EXAMPLES_PREFIX),
+            os.path.join(output, _DEFAULT_TRANSFORMED_EXAMPLES_PREFIX)
+            for output in transformed_outputs
         ],
         labels.TEMP_OUTPUT_LABEL: str(temp_path),
     }
-    cache_output = _GetCachePath('cache_output_path', output_dict)
+    cache_output = (
+        _GetCachePath(UPDATED_ANALYZER_CACHE_KEY, output_dict) or
+        _GetCachePath('cache_output_path', output_dict))
     if cache_output is not None:
       label_outputs[labels.CACHE_OUTPUT_PATH_LABEL] = cache_output
+
+    label_outputs.update({
+        labels.TRANSFORM_MATERIALIZE_FILE_FORMAT_LABEL:
+            materialize_file_format,
+        labels.TRANSFORM_MATERIALIZE_COMPRESSION_LABEL:
+            transform_pb2.MaterializationConfig.Compression.Name(
+                materialization_config.compression),
+        labels.TRANSFORM_MATERIALIZE_NUM_SHARDS_LABEL:
+            materialization_config.num_shards,
+    })
+    # Recorded for readers of the transformed examples, e.g. Trainer.
+    examples_utils.set_file_format(transformed_examples, file_format)
+
+    # Statistics are computed while reading the data for transform, and are
+    # written in the format of StatisticsGen outputs.
+    for key, label in [
+        (PRE_TRANSFORM_STATISTICS_KEY,
+         labels.PRE_TRANSFORM_OUTPUT_STATS_PATHS_LABEL),
+        (POST_TRANSFORM_STATISTICS_KEY,
+         labels.POST_TRANSFORM_OUTPUT_STATS_PATHS_LABEL),
+    ]:
+      if output_dict.get(key):
+        label_outputs[label] = [
+            os.path.join(
+                artifact_utils.get_split_uri(output_dict[key], split),
+                _DEFAULT_STATS_FILE_NAME) for split in ['train', 'eval']
+        ]
     status_file = 'status_file'  # Unused
     self.Transform(label_inputs, label_outputs, status_file)
+
+    if materialization_config.incremental:
+      span_uris = {span: transformed_examples.uri for span in new_spans}
+      span_uris.update(previous_span_uris)
+      examples_utils.set_span_uris(transformed_examples, span_uris)
+      if fingerprint is not None:
+        transformed_examples.set_string_custom_property(
+            _TRANSFORM_FINGERPRINT_PROPERTY, fingerprint)
     absl.logging.debug('Cleaning up temp path %s on executor success',
                        temp_path)
     io_utils.delete_dir(temp_path)
 
+  @staticmethod
+  def _GetPreviousSpanUris(
+      previous_transformed_examples: Optional[List[types.Artifact]],
+      file_format: Text, examples_by_span: Dict[int, types.Artifact],
+      fingerprint: Optional[Text]) -> Dict[int, Text]:
+    """Returns the spans which the previous run materialized and can be reused.
+
+    Args:
+      previous_transformed_examples: Optionally, a list which should contain
+        the transformed examples of the previous run.
+      file_format: The file format of the transformed examples of this run.
+      examples_by_span: A dict from span to the input examples of this run.
+      fingerprint: The fingerprint of the preprocessing_fn of this run, or None
+        if it requires analyzing the data.
+
+    Returns:
+      A dict from each span of the input examples which the previous run
+      materialized to the URI of the artifact it is in. The dict is empty if
+      the previous transformed examples are missing, in another file format or
+      were transformed with another transform graph.
+    """
+    if not previous_transformed_examples or fingerprint is None:
+      return {}
+    previous = artifact_utils.get_single_instance(previous_transformed_examples)
+    if (examples_utils.get_file_format(previous) != file_format or
+        _TRANSFORM_FINGERPRINT_PROPERTY not in
+        previous.mlmd_artifact.custom_properties or
+        previous.get_string_custom_property(_TRANSFORM_FINGERPRINT_PROPERTY) !=
+        fingerprint):
+      return {}
+    return {
+        span: uri
+        for span, uri in examples_utils.get_span_uris(previous).items()
+        if span in examples_by_span
+    }
+
+  @staticmethod
+  def _GetSpanPaths(
+      examples_by_span: Dict[int, types.Artifact], spans: Sequence[int],
+      transformed_examples_uri: Text) -> Tuple[List[Text], List[Text]]:
+    """Returns input and output directories of the splits of the given spans.
+
+    Args:
+      examples_by_span: A dict from span to the input examples.
+      spans: The spans to transform.
+      transformed_examples_uri: URI of the transformed examples artifact.
+
+    Returns:
+      A tuple of the input split directories and the corresponding output
+      directories of transformed examples.
+    """
+    data_uris = []
+    outputs = []
+    for span in spans:
+      for split in ['train', 'eval']:
+        data_uris.append(
+            artifact_utils.get_split_uri([examples_by_span[span]], split))
+        outputs.append(
+            os.path.join(transformed_examples_uri, split,
+                         examples_utils.get_span_dir_name(span)))
+    return data_uris, outputs
+
+  @staticmethod
+  @beam.ptransform_fn
+  @beam.typehints.with_input_types(beam.Pipeline)
+  @beam.typehints.with_output_types(beam.pvalue.PDone)
+  def _ReportDesiredBatchSize(pipeline: beam.Pipeline,
+                              desired_batch_size: int):
+    """A beam PTransform to report the batch size of tf.Transform."""
+
+    def _UpdateDistribution(unused_element):
+      """Updates the batch size distribution."""
+      del unused_element
+      beam.metrics.Metrics.distribution(
+          tft_beam_common.METRICS_NAMESPACE,
+          'desired_batch_size').update(desired_batch_size)
+      return None
+
+    return (
+        pipeline
+        | 'CreateSole' >> beam.Create([None])
+        | 'Report' >> beam.Map(_UpdateDistribution))
+
   @staticmethod
   @beam.ptransform_fn
   @beam.typehints.with_input_types(beam.Pipeline)
@@ -441,29 +739,97 @@ class Executor(base_executor.BaseExecutor):
   @beam.ptransform_fn
   @beam.typehints.with_input_types(Tuple[bytes, tf.train.Example])
   @beam.typehints.with_output_types(beam.pvalue.PDone)
-  def _WriteExamples(pcoll: beam.pvalue.PCollection, file_format: Text,
-                     transformed_example_path: Text) -> beam.pvalue.PDone:
-    """Writes transformed examples compressed in gzip format.
+  def _WriteExamples(pcoll: beam.pvalue.PCollection,
+                     file_format: Text,
+                     transformed_example_path: Text,
+                     compression: Text = labels.COMPRESSION_GZIP,
+                     num_shards: int = 0) -> beam.pvalue.PDone:
+    """Writes transformed examples, compressed in gzip format by default.
 
     Args:
       pcoll: PCollection of transformed examples.
       file_format: The output file format.
       transformed_example_path: path to write to.
+      compression: The compression type, one of labels.COMPRESSION_*.
+      num_shards: The number of files to write, 0 to let the runner decide.
 
     Returns:
       beam.pvalue.PDone.
     """
     assert file_format == labels.FORMAT_TFRECORD, file_format
 
+    if compression == labels.COMPRESSION_UNCOMPRESSED:
+      file_name_suffix = ''
+      compression_type = beam.io.filesystem.CompressionTypes.UNCOMPRESSED
+    else:
+      assert compression == labels.COMPRESSION_GZIP, compression
+      file_name_suffix = '.gz'
+      compression_type = beam.io.filesystem.CompressionTypes.AUTO
+
     # TODO(b/139538871): Implement telemetry, on top of pa.Table once available.
     return (
         pcoll
         | 'Values' >> beam.Values()
         | 'Write' >> beam.io.WriteToTFRecord(
             transformed_example_path,
-            file_name_suffix='.gz',
+            file_name_suffix=file_name_suffix,
+            num_shards=num_shards,
+            compression_type=compression_type,
             coder=beam.coders.ProtoCoder(tf.train.Example)))
 
+  @staticmethod
+  @beam.ptransform_fn
+  @beam.typehints.with_input_types(Dict[Text, Any])
+  @beam.typehints.with_output_types(beam.pvalue.PDone)
+  def _WriteParquet(pcoll: beam.pvalue.PCollection,
+                    schema: schema_pb2.Schema,
+                    transformed_example_path: Text,
+                    num_shards: int = 0) -> beam.pvalue.PDone:
+    """Writes transformed instances as Parquet files.
+
+    Features with a scalar shape are written as columns of values, and other
+    features as columns of lists of values.
+
+    Args:
+      pcoll: PCollection of transformed instances.
+      schema: The schema of the transformed instances.
+      transformed_example_path: path to write to.
+      num_shards: The number of files to write, 0 to let the runner decide.
+
+    Returns:
+      beam.pvalue.PDone.
+
+    Raises:
+      ValueError: If a transformed feature is a SparseFeature.
+    """
+    fields = []
+    for name, spec in sorted(
+        schema_utils.schema_as_feature_spec(schema).feature_spec.items()):
+      if isinstance(spec, tf.io.SparseFeature):
+        raise ValueError(
+            'Parquet materialization does not support SparseFeature '
+            '{}'.format(name))
+      if isinstance(spec, tf.io.FixedLenFeature) and not spec.shape:
+        fields.append(pa.field(name, _ARROW_TYPES[spec.dtype]))
+      else:
+        fields.append(pa.field(name, pa.list_(_ARROW_TYPES[spec.dtype])))
+
+    def _ToRecord(instance: Dict[Text, Any]) -> Dict[Text, Any]:
+      return {
+          k: v.tolist() if isinstance(v, (np.ndarray, np.generic)) else v
+          for k, v in instance.items()
+          if k != _TRANSFORM_INTERNAL_FEATURE_FOR_KEY
+      }
+
+    return (
+        pcoll
+        | 'ToRecord' >> beam.Map(_ToRecord)
+        | 'Write' >> beam.io.WriteToParquet(
+            transformed_example_path,
+            pa.schema(fields),
+            file_name_suffix='.parquet',
+            num_shards=num_shards))
+
   def _GetSchema(self, schema_path: Text) -> schema_pb2.Schema:
     """Gets a tf.metadata schema.
 
@@ -512,7 +878,8 @@ class Executor(base_executor.BaseExecutor):
       # TODO(b/115684207): Remove this and all related code.
       use_tfdv=True,
       # TODO(b/115684207): Remove this and all related code.
-      examples_are_serialized=False
+      examples_are_serialized=False,
+      as_tfrecord=False
   ) -> beam.pvalue.PDone:
     """Generates statistics.
 
@@ -524,6 +891,8 @@ class Executor(base_executor.BaseExecutor):
         statistics.
       use_tfdv: whether use TFDV for computing statistics.
       examples_are_serialized: Unused.
+      as_tfrecord: whether to write statistics as a TFRecord file, as
+        StatisticsGen does, instead of a binary proto file.
 
     Returns:
       beam.pvalue.PDone.
@@ -536,7 +905,8 @@ class Executor(base_executor.BaseExecutor):
     return (
         pcoll
         | 'GenerateStatistics' >> tfdv.GenerateStatistics(stats_options)
-        | 'WriteStats' >> Executor._WriteStats(stats_output_path))
+        | 'WriteStats' >> Executor._WriteStats(
+            stats_output_path, as_tfrecord=as_tfrecord))
 
   # TODO(zhuo): Obviate this once TFXIO is used.
   @beam.typehints.with_input_types(List[bytes])
@@ -606,12 +976,15 @@ class Executor(base_executor.BaseExecutor):
   @beam.typehints.with_input_types(statistics_pb2.DatasetFeatureStatisticsList)
   @beam.typehints.with_output_types(beam.pvalue.PDone)
   def _WriteStats(pcollection_stats: beam.pvalue.PCollection,
-                  stats_output_path: Text) -> beam.pvalue.PDone:
+                  stats_output_path: Text,
+                  as_tfrecord: bool = False) -> beam.pvalue.PDone:
     """Writs Statistics outputs.
 
     Args:
       pcollection_stats: pcollection of statistics.
       stats_output_path: path to write statistics.
+      as_tfrecord: whether to write a TFRecord file, which is the format of
+        `standard_artifacts.ExampleStatistics`.
 
     Returns:
       beam.pvalue.PDone.
@@ -619,6 +992,12 @@ class Executor(base_executor.BaseExecutor):
 
     # TODO(b/68765333): Investigate if this can be avoided.
     tf.io.gfile.makedirs(os.path.dirname(stats_output_path))
+    if as_tfrecord:
+      return (pcollection_stats | 'Write' >> beam.io.WriteToTFRecord(
+          stats_output_path,
+          shard_name_template='',
+          coder=beam.coders.ProtoCoder(
+              statistics_pb2.DatasetFeatureStatisticsList)))
     # TODO(b/117601471): Replace with utility method to write stats.
     return (pcollection_stats | 'Write' >> beam.io.WriteToText(
         stats_output_path,
@@ -818,13 +1197,34 @@ class Executor(base_executor.BaseExecutor):
           preprocessing_fn, optional.
         - labels.PREPROCESSING_FN: Path to a Python function that implements
           preprocessing_fn, optional.
+        - labels.IN_PROCESS_INPUT_SIZE_THRESHOLD_LABEL: Total size in bytes of
+          the analyze and transform data below which the Beam pipeline is run
+          in-process, optional. Only applies if the Beam pipeline args do not
+          set a runner. Defaults to 0, i.e. never.
+        - labels.BATCH_MEMORY_BUDGET_LABEL: Memory budget in bytes for a batch
+          of decoded instances, optional. If set, the batch size is bounded
+          to fit the budget, as estimated on a sample of the data.
       outputs: A dictionary of labelled output values, including:
         - labels.PER_SET_STATS_OUTPUT_PATHS_LABEL: Paths to statistics output,
           optional.
+        - labels.PRE_TRANSFORM_OUTPUT_STATS_PATHS_LABEL: Paths to TFRecord
+          pre-transform statistics output of each transformed dataset,
+          optional.
+        - labels.POST_TRANSFORM_OUTPUT_STATS_PATHS_LABEL: Paths to TFRecord
+          post-transform statistics output of each transformed dataset,
+          optional.
         - labels.TRANSFORM_METADATA_OUTPUT_PATH_LABEL: A path to
           TFTransformOutput output.
         - labels.TRANSFORM_MATERIALIZE_OUTPUT_PATHS_LABEL: Paths to transform
           materialization.
+        - labels.TRANSFORM_MATERIALIZE_FILE_FORMAT_LABEL: File format of
+          transform materialization, optional. Defaults to FORMAT_TFRECORD.
+        - labels.TRANSFORM_MATERIALIZE_COMPRESSION_LABEL: Compression type of
+          FORMAT_TFRECORD transform materialization, optional. Defaults to
+          GZIP.
+        - labels.TRANSFORM_MATERIALIZE_NUM_SHARDS_LABEL: Number of files of
+          each transform materialization, optional. Defaults to 0, i.e. the
+          runner decides.
         - labels.TEMP_OUTPUT_LABEL: A path to temporary directory.
       status_file: Where the status should be written (not yet implemented)
     """
@@ -866,7 +1266,14 @@ class Executor(base_executor.BaseExecutor):
     analyze_input_columns = tft.get_analyze_input_columns(
         preprocessing_fn, feature_spec)
 
-    if not compute_statistics and not materialize_output_paths:
+    output_stats_paths = (
+        value_utils.GetValues(outputs,
+                              labels.PRE_TRANSFORM_OUTPUT_STATS_PATHS_LABEL) +
+        value_utils.GetValues(outputs,
+                              labels.POST_TRANSFORM_OUTPUT_STATS_PATHS_LABEL))
+
+    if (not compute_statistics and not materialize_output_paths and
+        not output_stats_paths):
       if analyze_input_columns:
         absl.logging.warning(
             'Not using the in-place Transform because the following features '
@@ -923,6 +1330,22 @@ class Executor(base_executor.BaseExecutor):
         inputs, labels.TFT_STATISTICS_USE_TFDV_LABEL)
     per_set_stats_output_paths = value_utils.GetValues(
         outputs, labels.PER_SET_STATS_OUTPUT_PATHS_LABEL)
+    pre_transform_output_stats_paths = value_utils.GetValues(
+        outputs, labels.PRE_TRANSFORM_OUTPUT_STATS_PATHS_LABEL)
+    post_transform_output_stats_paths = value_utils.GetValues(
+        outputs, labels.POST_TRANSFORM_OUTPUT_STATS_PATHS_LABEL)
+    materialize_file_format = (
+        value_utils.GetSoleValue(
+            outputs, labels.TRANSFORM_MATERIALIZE_FILE_FORMAT_LABEL,
+            strict=False) or labels.FORMAT_TFRECORD)
+    materialize_compression = (
+        value_utils.GetSoleValue(
+            outputs, labels.TRANSFORM_MATERIALIZE_COMPRESSION_LABEL,
+            strict=False) or labels.COMPRESSION_GZIP)
+    materialize_num_shards = (
+        value_utils.GetSoleValue(
+            outputs, labels.TRANSFORM_MATERIALIZE_NUM_SHARDS_LABEL,
+            strict=False) or 0)
     temp_path = value_utils.GetSoleValue(outputs, labels.TEMP_OUTPUT_LABEL)
 
     input_cache_dir = value_utils.GetSoleValue(
@@ -989,11 +1412,35 @@ class Executor(base_executor.BaseExecutor):
         transform_data_paths, transform_paths_file_formats,
         raw_examples_data_format, transform_input_dataset_metadata,
         can_process_transform_jointly, per_set_stats_output_paths,
-        materialize_output_paths)
+        materialize_output_paths, pre_transform_output_stats_paths,
+        post_transform_output_stats_paths)
 
     desired_batch_size = self._GetDesiredBatchSize(raw_examples_data_format)
+    batch_memory_budget = value_utils.GetSoleValue(
+        inputs, labels.BATCH_MEMORY_BUDGET_LABEL, strict=False)
+    if desired_batch_size is None and batch_memory_budget:
+      desired_batch_size = self._GetBatchSizeForMemoryBudget(
+          transform_data_paths,
+          self._GetDecodeFunction(raw_examples_data_format,
+                                  input_dataset_metadata.schema),
+          batch_memory_budget)
+      absl.logging.info('Batch size for a memory budget of %d bytes: %s',
+                        batch_memory_budget, desired_batch_size)
+
+    in_process_input_size_threshold = value_utils.GetSoleValue(
+        inputs, labels.IN_PROCESS_INPUT_SIZE_THRESHOLD_LABEL, strict=False)
+    if (in_process_input_size_threshold and
+        not self._IsRunnerConfigured() and
+        self._GetInputSize(analyze_data_paths + transform_data_paths) <
+        in_process_input_size_threshold):
+      absl.logging.info(
+          'Running the Transform pipeline in-process as the input data is '
+          'smaller than %d bytes.', in_process_input_size_threshold)
+      pipeline = self._CreateInProcessPipeline(outputs)
+    else:
+      pipeline = self._CreatePipeline(outputs)
 
-    with self._CreatePipeline(outputs) as pipeline:
+    with pipeline:
       with tft_beam.Context(
           temp_dir=temp_path,
           desired_batch_size=desired_batch_size,
@@ -1007,6 +1454,11 @@ class Executor(base_executor.BaseExecutor):
             >> self._IncrementColumnUsageCounter(
                 len(feature_spec.keys()), len(analyze_input_columns),
                 len(transform_input_columns)))
+        if desired_batch_size is not None:
+          _ = (
+              pipeline
+              | 'ReportDesiredBatchSize'
+              >> self._ReportDesiredBatchSize(desired_batch_size))
 
         (new_analyze_data_dict, input_cache, flat_data_required) = (
             pipeline
@@ -1090,13 +1542,19 @@ class Executor(base_executor.BaseExecutor):
           if input_cache_dir is not None:
             # Only copy cache that is relevant to this iteration. This is
             # assuming that this pipeline operates on rolling ranges, so those
-            # cache entries may also be relevant for future iterations.
+            # cache entries may also be relevant for future iterations. Entries
+            # of datasets which are no longer analyzed are dropped.
             for span_cache_dir in input_analysis_data:
               full_span_cache_dir = os.path.join(input_cache_dir,
                                                  span_cache_dir)
               if tf.io.gfile.isdir(full_span_cache_dir):
                 self._CopyCache(full_span_cache_dir,
                                 os.path.join(output_cache_dir, span_cache_dir))
+            absl.logging.info(
+                'Dropped cache entries of datasets no longer analyzed: %s', [
+                    d for d in tf.io.gfile.listdir(input_cache_dir)
+                    if d.rstrip('/') not in input_analysis_data
+                ])
 
           (cache_output
            | 'WriteCache' >> analyzer_cache.WriteAnalysisCacheToFS(
@@ -1105,7 +1563,9 @@ class Executor(base_executor.BaseExecutor):
                sink=self._GetCacheSink(),
                dataset_keys=full_analyze_dataset_keys_list))
 
-        if compute_statistics or materialize_output_paths:
+        if (compute_statistics or materialize_output_paths or
+            pre_transform_output_stats_paths or
+            post_transform_output_stats_paths):
           # Do not compute pre-transform stats if the input format is raw proto,
           # as StatsGen would treat any input as tf.Example. Note that
           # tf.SequenceExamples are wire-format compatible with tf.Examples.
@@ -1157,12 +1617,28 @@ class Executor(base_executor.BaseExecutor):
                 dataset.serialized
                 | 'Decode[{}]'.format(infix)
                 >> self._DecodeInputs(transform_decode_fn))
+            if (dataset.pre_transform_output_stats_path and
+                not self._IsDataFormatProto(raw_examples_data_format)):
+              # Statistics of all input features, from the data which is read
+              # for transform anyway.
+              input_schema_proto = _GetSchemaProto(input_dataset_metadata)
+              (dataset.serialized
+               | 'FromSerializedToArrowTablesForOutputStats[{}]'.format(infix)
+               >> self._FromSerializedToArrowTables(input_schema_proto)
+               | 'GenerateOutputStats[{}]'.format(infix) >> self._GenerateStats(
+                   dataset.pre_transform_output_stats_path,
+                   input_schema_proto,
+                   stats_options=(transform_stats_options
+                                  .get_pre_transform_stats_options()),
+                   as_tfrecord=True))
             (dataset.transformed, metadata) = (
                 ((dataset.decoded, transform_input_dataset_metadata),
                  transform_fn)
                 | 'Transform[{}]'.format(infix) >> tft_beam.TransformDataset())
 
-            if materialize_output_paths or not stats_use_tfdv:
+            if ((materialize_output_paths and
+                 materialize_file_format == labels.FORMAT_TFRECORD) or
+                not stats_use_tfdv):
               dataset.transformed_and_encoded = (
                   dataset.transformed
                   | 'Encode[{}]'.format(infix)
@@ -1219,13 +1695,42 @@ class Executor(base_executor.BaseExecutor):
                     stats_options=post_transform_stats_options,
                     use_tfdv=stats_use_tfdv)
 
+          if post_transform_output_stats_paths:
+            _, metadata = transform_fn
+            transformed_schema_proto = _GetSchemaProto(metadata)
+            for dataset in transform_data_list:
+              infix = 'TransformIndex{}'.format(dataset.index)
+              if not (compute_statistics and stats_use_tfdv):
+                dataset.transformed_and_standardized = (
+                    dataset.transformed
+                    | 'FromDictsToArrowTablesForOutputStats[{}]'.format(infix)
+                    >> self._FromDictsToArrowTables(transformed_schema_proto))
+              (dataset.transformed_and_standardized
+               | 'GeneratePostTransformOutputStats[{}]'.format(infix)
+               >> self._GenerateStats(
+                   dataset.post_transform_output_stats_path,
+                   transformed_schema_proto,
+                   stats_options=(transform_stats_options
+                                  .get_post_transform_stats_options()),
+                   as_tfrecord=True))
+
           if materialize_output_paths:
+            _, metadata = transform_fn
             for dataset in transform_data_list:
               infix = 'TransformIndex{}'.format(dataset.index)
-              (dataset.transformed_and_encoded
-               | 'Materialize[{}]'.format(infix) >> self._WriteExamples(
-                   transform_paths_file_formats[-1],
-                   dataset.materialize_output_path))
+              if materialize_file_format == labels.FORMAT_PARQUET:
+                (dataset.transformed
+                 | 'Materialize[{}]'.format(infix) >> self._WriteParquet(
+                     _GetSchemaProto(metadata),
+                     dataset.materialize_output_path,
+                     num_shards=materialize_num_shards))
+              else:
+                (dataset.transformed_and_encoded
+                 | 'Materialize[{}]'.format(infix) >> self._WriteExamples(
+                     materialize_file_format,
+                     dataset.materialize_output_path,
+                     compression=materialize_compression,
+                     num_shards=materialize_num_shards))
 
     return _Status.OK()
 
@@ -1296,6 +1801,71 @@ class Executor(base_executor.BaseExecutor):
     """
     return self._make_beam_pipeline()
 
+  def _CreateInProcessPipeline(
+      self, unused_outputs: Mapping[Text, Any]) -> beam.Pipeline:
+    """Creates beam pipeline which runs in the current process.
+
+    Used instead of _CreatePipeline() when the input data is small and no
+    runner is configured, so that no SDK worker process is started for each
+    CPU. The pipeline is the same, and so are its outputs.
+
+    Args:
+      unused_outputs: A dictionary of labelled output values.
+
+    Returns:
+      Beam pipeline.
+    """
+    return beam.Pipeline(
+        argv=self._beam_pipeline_args, runner=fn_api_runner.FnApiRunner())
+
+  def _IsRunnerConfigured(self) -> bool:
+    """Returns whether the Beam pipeline args explicitly set a runner."""
+    return bool(
+        PipelineOptions(self._beam_pipeline_args).view_as(
+            StandardOptions).runner)
+
+  @staticmethod
+  def _GetInputSize(file_patterns: Iterable[Text]) -> int:
+    """Returns the total size in bytes of the files matching file_patterns."""
+    return sum(
+        tf.io.gfile.stat(file_path).length
+        for file_pattern in set(file_patterns)
+        for file_path in tf.io.gfile.glob(file_pattern))
+
+  @staticmethod
+  def _GetPreprocessingFingerprint(
+      preprocessing_fn: Any,
+      metadata: dataset_metadata.DatasetMetadata) -> Optional[Text]:
+    """Returns a fingerprint of the transform graph of a preprocessing_fn.
+
+    The transform graph of a preprocessing_fn without analyzers only depends on
+    the preprocessing_fn and the input schema, so data transformed by graphs
+    with the same fingerprint is the same. The graph of a preprocessing_fn with
+    analyzers depends on the data analyzed, and has no fingerprint.
+
+    Args:
+      preprocessing_fn: The tf.Transform preprocessing_fn.
+      metadata: A DatasetMetadata object for the input data.
+
+    Returns:
+      A hex digest of the traced preprocessing_fn and the input schema, or None
+      if the preprocessing_fn has analyzers.
+    """
+    schema_proto = _GetSchemaProto(metadata)
+    with tf.compat.v1.Graph().as_default() as graph:
+      preprocessing_fn(
+          impl_helper.copy_tensors(
+              _create_batched_placeholders(
+                  schema_utils.schema_as_feature_spec(
+                      schema_proto).feature_spec)))
+      if tf.compat.v1.get_collection(analyzer_nodes.TENSOR_REPLACEMENTS):
+        return None
+    fingerprint = hashlib.sha256()
+    fingerprint.update(
+        graph.as_graph_def().SerializeToString(deterministic=True))
+    fingerprint.update(schema_proto.SerializeToString(deterministic=True))
+    return fingerprint.hexdigest()
+
   # TODO(b/114444977): Remove the unused can_process_jointly argument.
   def _MakeDatasetList(
       self,
@@ -1305,7 +1875,9 @@ class Executor(base_executor.BaseExecutor):
       metadata: dataset_metadata.DatasetMetadata,
       can_process_jointly: bool,
       stats_output_paths: Optional[Sequence[Text]] = None,
-      materialize_output_paths: Optional[Sequence[Text]] = None
+      materialize_output_paths: Optional[Sequence[Text]] = None,
+      pre_transform_output_stats_paths: Optional[Sequence[Text]] = None,
+      post_transform_output_stats_paths: Optional[Sequence[Text]] = None
   ) -> List[_Dataset]:
     """Makes a list of Dataset from the given `file_patterns`.
 
@@ -1319,6 +1891,10 @@ class Executor(base_executor.BaseExecutor):
       can_process_jointly: Whether paths can be processed jointly, unused.
       stats_output_paths: The statistics output paths, if applicable.
       materialize_output_paths: The materialization output paths, if applicable.
+      pre_transform_output_stats_paths: The TFRecord pre-transform statistics
+        output paths, if applicable.
+      post_transform_output_stats_paths: The TFRecord post-transform statistics
+        output paths, if applicable.
 
     Returns:
       A list of `_Dataset` sorted by their dataset_key property.
@@ -1332,11 +1908,21 @@ class Executor(base_executor.BaseExecutor):
       assert len(file_patterns) == len(materialize_output_paths)
     else:
       materialize_output_paths = [None] * len(file_patterns)
+    if pre_transform_output_stats_paths:
+      assert len(file_patterns) == len(pre_transform_output_stats_paths)
+    else:
+      pre_transform_output_stats_paths = [None] * len(file_patterns)
+    if post_transform_output_stats_paths:
+      assert len(file_patterns) == len(post_transform_output_stats_paths)
+    else:
+      post_transform_output_stats_paths = [None] * len(file_patterns)
 
     datasets = [
-        _Dataset(p, f, data_format, metadata, s, m)
-        for p, f, s, m in zip(file_patterns, file_formats,
-                              stats_output_paths, materialize_output_paths)
+        _Dataset(p, f, data_format, metadata, s, m, pre, post)
+        for p, f, s, m, pre, post in zip(
+            file_patterns, file_formats, stats_output_paths,
+            materialize_output_paths, pre_transform_output_stats_paths,
+            post_transform_output_stats_paths)
     ]
     result = sorted(datasets, key=lambda dataset: dataset.dataset_key)
     for index, dataset in enumerate(result):
@@ -1395,6 +1981,43 @@ class Executor(base_executor.BaseExecutor):
       return 1
     return None
 
+  def _GetBatchSizeForMemoryBudget(self, file_patterns: Sequence[Text],
+                                   decode_fn: Any,
+                                   batch_memory_budget: int) -> Optional[int]:
+    """Returns a batch size for which decoded batches fit a memory budget.
+
+    The memory of a decoded instance is estimated on the first instances of the
+    data. Wide instances get small batches, which avoids running out of memory,
+    and narrow instances get large ones. If a batch of Beam's default maximum
+    size fits the budget, the batch size is left to Beam.
+
+    Args:
+      file_patterns: File patterns of the data to transform.
+      decode_fn: The function which decodes a serialized instance.
+      batch_memory_budget: Memory budget in bytes for a batch of decoded
+        instances.
+
+    Returns:
+      Batch size or None.
+    """
+    sample = []
+    for file_path in (f for p in file_patterns for f in tf.io.gfile.glob(p)):
+      sample.extend(
+          io_utils.read_tfrecord_head(file_path,
+                                      _BATCH_SIZE_SAMPLE_SIZE - len(sample)))
+      if len(sample) >= _BATCH_SIZE_SAMPLE_SIZE:
+        break
+    if not sample:
+      return None
+    instance_bytes = max(
+        1,
+        sum(_EstimateInstanceBytes(decode_fn(record)) for record in sample) //
+        len(sample))
+    batch_size = batch_memory_budget // instance_bytes
+    if batch_size >= _MAX_BATCH_SIZE:
+      return None
+    return max(_MIN_BATCH_SIZE, batch_size)
+
   def _GetDecodeFunction(self, data_format: Union[Text, int],
                          schema: dataset_schema.Schema) -> Any:
     """Returns the decode function for `data_format`.
@@ -1427,5 +2050,23 @@ class Executor(base_executor.BaseExecutor):
 
   @staticmethod
   def _CopyCache(src, dst):
-    # TODO(b/37788560): Make this more efficient.
-    io_utils.copy_dir(src, dst)
+    """Carries a cache entry forward to the output cache.
+
+    Cache files are never modified once written, so they are hardlinked rather
+    than copied when both directories are on the same local file system.
+
+    Args:
+      src: Directory of the cache entry in the input cache.
+      dst: Directory of the cache entry in the output cache.
+    """
+    for dir_name, _, leaf_files in tf.io.gfile.walk(src):
+      new_dir_name = os.path.join(dst, os.path.relpath(dir_name, src))
+      tf.io.gfile.makedirs(new_dir_name)
+      for leaf_file in leaf_files:
+        leaf_file_path = os.path.join(dir_name, leaf_file)
+        new_file_path = os.path.join(new_dir_name, leaf_file)
+        try:
+          os.link(leaf_file_path, new_file_path)
+        except OSError:
+          # Not a local file system, or different devices.
+          tf.io.gfile.copy(leaf_file_path, new_file_path, overwrite=True)
@@ -19,21 +19,43 @@ from __future__ import division
 from __future__ import print_function
 
 import os
+import shutil
 import tempfile
+import numpy as np
+import pyarrow.parquet as pq
 import tensorflow as tf
 import tensorflow_transform as tft
 from tensorflow_transform.beam import tft_unit
 from tfx import types
+from tfx.components.base import base_executor
 from tfx.components.testdata.module_file import transform_module
 from tfx.components.transform import executor
+from tfx.components.util import examples_utils
+from tfx.proto import transform_pb2
 from tfx.types import artifact_utils
 from tfx.types import standard_artifacts
 
+from google.protobuf import json_format
+from tensorflow_metadata.proto.v0 import statistics_pb2
+
 
 class _TempPath(types.Artifact):
   TYPE_NAME = 'TempPath'
 
 
+def _analyzer_free_preprocessing_fn(inputs):
+  """A preprocessing_fn without analyzers, for incremental materialization."""
+  fare = inputs['fare']
+  return {
+      'fare_xf':
+          tf.squeeze(
+              tf.sparse.to_dense(
+                  tf.SparseTensor(fare.indices, fare.values,
+                                  [fare.dense_shape[0], 1]), 0.0),
+              axis=1)
+  }
+
+
 # TODO(b/122478841): Add more detailed tests.
 class ExecutorTest(tft_unit.TransformTestCase):
 
@@ -151,6 +173,9 @@ class ExecutorTest(tft_unit.TransformTestCase):
       pipelines.append(result)
       return result
 
+    # The test data is small enough to run in-process otherwise.
+    exec_properties = dict(
+        self._exec_properties, in_process_input_size_threshold=0)
     with tft_unit.mock.patch.object(
         executor.Executor,
         '_CreatePipeline',
@@ -158,7 +183,7 @@ class ExecutorTest(tft_unit.TransformTestCase):
         side_effect=_create_pipeline_wrapper):
       transform_executor = executor.Executor()
       transform_executor.Do(self._input_dict, self._output_dict,
-                            self._exec_properties)
+                            exec_properties)
     assert len(pipelines) == 1
     return pipelines[0].metrics
 
@@ -174,6 +199,240 @@ class ExecutorTest(tft_unit.TransformTestCase):
                                 self._exec_properties)
     self._verify_transform_outputs()
 
+  def _read_transformed_examples(self, split):
+    file_paths = tf.io.gfile.glob(
+        os.path.join(self._transformed_examples.uri, split, '*'))
+    records = []
+    for file_path in file_paths:
+      compression_type = 'GZIP' if file_path.endswith('.gz') else ''
+      records.extend(
+          tf.compat.v1.io.tf_record_iterator(
+              file_path,
+              tf.io.TFRecordOptions(compression_type=compression_type)))
+    return sorted(
+        tf.train.Example.FromString(record).SerializeToString(
+            deterministic=True) for record in records)
+
+  def _assertInProcessEquivalentToBeamPipeline(self):
+    """Checks that both pipelines give the same outputs for exec_properties."""
+    exec_properties = dict(self._exec_properties)
+    self._exec_properties['in_process_input_size_threshold'] = 0
+    self._transform_executor.Do(self._input_dict, self._output_dict,
+                                self._exec_properties)
+    self._verify_transform_outputs()
+    beam_examples = {
+        split: self._read_transformed_examples(split)
+        for split in ['train', 'eval']
+    }
+    beam_schema = tft.TFTransformOutput(
+        self._transformed_output.uri).transformed_metadata.schema
+
+    self._output_data_dir = self._get_output_data_dir('in_process')
+    self._make_base_do_params(self._source_data_dir, self._output_data_dir)
+    self._exec_properties = dict(
+        exec_properties, in_process_input_size_threshold=1 << 40)
+    with tft_unit.mock.patch.object(
+        executor.Executor,
+        '_CreateInProcessPipeline',
+        autospec=True,
+        side_effect=lambda self, _: tft_unit.beam.Pipeline(
+            runner=executor.fn_api_runner.FnApiRunner())
+    ) as create_in_process_pipeline:
+      self._transform_executor.Do(self._input_dict, self._output_dict,
+                                  self._exec_properties)
+    create_in_process_pipeline.assert_called_once()
+    self._verify_transform_outputs()
+    for split in ['train', 'eval']:
+      self.assertEqual(beam_examples[split],
+                       self._read_transformed_examples(split))
+    self.assertProtoEquals(
+        beam_schema,
+        tft.TFTransformOutput(
+            self._transformed_output.uri).transformed_metadata.schema)
+
+  def testDoInProcessEquivalentWithModuleFile(self):
+    self._exec_properties['module_file'] = self._module_file
+    self._assertInProcessEquivalentToBeamPipeline()
+
+  def testDoInProcessEquivalentWithPreprocessingFn(self):
+    self._exec_properties['preprocessing_fn'] = self._preprocessing_fn
+    self._assertInProcessEquivalentToBeamPipeline()
+
+  def testDoInProcessEquivalentWithMaterializationConfig(self):
+    self._exec_properties['module_file'] = self._module_file
+    self._exec_properties['materialization_config'] = json_format.MessageToJson(
+        transform_pb2.MaterializationConfig(
+            compression=transform_pb2.MaterializationConfig.UNCOMPRESSED,
+            num_shards=3))
+    self._assertInProcessEquivalentToBeamPipeline()
+
+  def testDoNotInProcessWithConfiguredRunner(self):
+    self._exec_properties['module_file'] = self._module_file
+    self._exec_properties['in_process_input_size_threshold'] = 1 << 40
+    transform_executor = executor.Executor(
+        base_executor.BaseExecutor.Context(
+            beam_pipeline_args=['--runner=DirectRunner']))
+    with tft_unit.mock.patch.object(
+        executor.Executor, '_CreateInProcessPipeline',
+        autospec=True) as create_in_process_pipeline:
+      transform_executor.Do(self._input_dict, self._output_dict,
+                            self._exec_properties)
+    create_in_process_pipeline.assert_not_called()
+    self._verify_transform_outputs()
+
+  def testDoWithUncompressedMaterialization(self):
+    self._exec_properties['module_file'] = self._module_file
+    self._exec_properties['materialization_config'] = json_format.MessageToJson(
+        transform_pb2.MaterializationConfig(
+            compression=transform_pb2.MaterializationConfig.UNCOMPRESSED,
+            num_shards=2))
+    self._transform_executor.Do(self._input_dict, self._output_dict,
+                                self._exec_properties)
+    self._verify_transform_outputs()
+    self.assertEqual(examples_utils.FILE_FORMAT_TFRECORDS,
+                     examples_utils.get_file_format(self._transformed_examples))
+    for split in ['train', 'eval']:
+      file_paths = tf.io.gfile.glob(
+          os.path.join(self._transformed_examples.uri, split, '*'))
+      self.assertLen(file_paths, 2)
+      records = []
+      for file_path in file_paths:
+        self.assertFalse(file_path.endswith('.gz'))
+        records.extend(tf.compat.v1.io.tf_record_iterator(file_path))
+      self.assertNotEmpty(records)
+      tf.train.Example.FromString(records[0])
+
+  def testDoWithParquetMaterialization(self):
+    self._exec_properties['module_file'] = self._module_file
+    self._exec_properties['materialization_config'] = json_format.MessageToJson(
+        transform_pb2.MaterializationConfig(
+            format=transform_pb2.MaterializationConfig.PARQUET))
+    self._transform_executor.Do(self._input_dict, self._output_dict,
+                                self._exec_properties)
+    self._verify_transform_outputs()
+    self.assertEqual(examples_utils.FILE_FORMAT_PARQUET,
+                     examples_utils.get_file_format(self._transformed_examples))
+    transformed_feature_spec = tft.TFTransformOutput(
+        self._transformed_output.uri).transformed_feature_spec()
+    for split in ['train', 'eval']:
+      file_paths = tf.io.gfile.glob(
+          os.path.join(self._transformed_examples.uri, split, '*.parquet'))
+      self.assertNotEmpty(file_paths)
+      table = pq.read_table(file_paths[0])
+      self.assertGreater(table.num_rows, 0)
+      self.assertCountEqual(transformed_feature_spec.keys(),
+                            table.schema.names)
+
+  def testDoWithStatistics(self):
+    statistics_artifacts = []
+    for key in [
+        executor.PRE_TRANSFORM_STATISTICS_KEY,
+        executor.POST_TRANSFORM_STATISTICS_KEY
+    ]:
+      statistics_artifact = standard_artifacts.ExampleStatistics()
+      statistics_artifact.uri = os.path.join(self._output_data_dir, key)
+      statistics_artifact.split_names = artifact_utils.encode_split_names(
+          ['train', 'eval'])
+      self._output_dict[key] = [statistics_artifact]
+      statistics_artifacts.append(statistics_artifact)
+    self._exec_properties['module_file'] = self._module_file
+    self._transform_executor.Do(self._input_dict, self._output_dict,
+                                self._exec_properties)
+    self._verify_transform_outputs()
+
+    for statistics_artifact in statistics_artifacts:
+      for split in ['train', 'eval']:
+        stats_path = os.path.join(statistics_artifact.uri, split,
+                                  'stats_tfrecord')
+        records = list(tf.compat.v1.io.tf_record_iterator(stats_path))
+        self.assertLen(records, 1)
+        stats = statistics_pb2.DatasetFeatureStatisticsList.FromString(
+            records[0])
+        self.assertLen(stats.datasets, 1)
+        self.assertGreater(stats.datasets[0].num_examples, 0)
+        self.assertNotEmpty(stats.datasets[0].features)
+
+  def _run_incremental(self, run_name, spans, previous_transformed_examples,
+                       analyzer_free=True):
+    """Runs Do with incremental materialization on copies of the test data."""
+    self._output_data_dir = self._get_output_data_dir(run_name)
+    self._make_base_do_params(self._source_data_dir, self._output_data_dir)
+    examples_list = []
+    for span in spans:
+      examples = standard_artifacts.Examples()
+      examples.uri = os.path.join(self._get_output_data_dir(),
+                                  'span-{}'.format(span))
+      examples.split_names = artifact_utils.encode_split_names(
+          ['train', 'eval'])
+      examples.span = span
+      if not tf.io.gfile.exists(examples.uri):
+        shutil.copytree(
+            os.path.join(self._source_data_dir, 'csv_example_gen'),
+            examples.uri)
+      examples_list.append(examples)
+    self._input_dict[executor.EXAMPLES_KEY] = examples_list
+    if previous_transformed_examples:
+      self._input_dict[executor.PREVIOUS_TRANSFORMED_EXAMPLES_KEY] = [
+          previous_transformed_examples
+      ]
+    if analyzer_free:
+      self._exec_properties['preprocessing_fn'] = '%s.%s' % (
+          _analyzer_free_preprocessing_fn.__module__,
+          _analyzer_free_preprocessing_fn.__name__)
+    else:
+      self._exec_properties['module_file'] = self._module_file
+    self._exec_properties['materialization_config'] = json_format.MessageToJson(
+        transform_pb2.MaterializationConfig(incremental=True))
+    self._transform_executor.Do(self._input_dict, self._output_dict,
+                                self._exec_properties)
+    return self._transformed_examples
+
+  def _get_span_dirs(self, transformed_examples, split):
+    return sorted(
+        d.rstrip('/') for d in tf.io.gfile.listdir(
+            os.path.join(transformed_examples.uri, split)))
+
+  def testDoWithIncrementalMaterialization(self):
+    first = self._run_incremental('first', [1], None)
+    self.assertEqual({1: first.uri}, examples_utils.get_span_uris(first))
+    self.assertEqual(['span-1'], self._get_span_dirs(first, 'train'))
+
+    # A new span arrives and the preprocessing_fn is unchanged.
+    second = self._run_incremental('second', [1, 2], first)
+    self.assertEqual(
+        first.get_string_custom_property('transform_fingerprint'),
+        second.get_string_custom_property('transform_fingerprint'))
+    self.assertEqual({
+        1: first.uri,
+        2: second.uri
+    }, examples_utils.get_span_uris(second))
+    for split in ['train', 'eval']:
+      self.assertEqual(['span-2'], self._get_span_dirs(second, split))
+      file_patterns = examples_utils.get_split_file_patterns([second], split)
+      self.assertLen(file_patterns, 2)
+      for file_pattern in file_patterns:
+        self.assertNotEmpty(tf.io.gfile.glob(file_pattern))
+
+  def testDoWithIncrementalMaterializationAndAnalyzers(self):
+    first = self._run_incremental('first', [1], None, analyzer_free=False)
+    self.assertNotIn('transform_fingerprint',
+                     first.mlmd_artifact.custom_properties)
+
+    # The transform graph depends on the analyzed spans, so all spans are
+    # materialized.
+    second = self._run_incremental(
+        'second', [1, 2], first, analyzer_free=False)
+    self.assertEqual({
+        1: second.uri,
+        2: second.uri
+    }, examples_utils.get_span_uris(second))
+    for split in ['train', 'eval']:
+      self.assertEqual(['span-1', 'span-2'],
+                       self._get_span_dirs(second, split))
+      self.assertEqual(
+          self._read_transformed_examples(os.path.join(split, 'span-1')),
+          self._read_transformed_examples(os.path.join(split, 'span-2')))
+
   def testDoWithNoPreprocessingFn(self):
     with self.assertRaises(ValueError):
       self._transform_executor.Do(self._input_dict, self._output_dict,
@@ -217,6 +476,46 @@ class ExecutorTest(tft_unit.TransformTestCase):
     # so we expect 9 + 7 + 1 = 17 transform columns.
     self._assertMetricsCounterEqual(metrics, 'transform_columns_count', 17)
 
+  def testCopyCache(self):
+    src = os.path.join(self._output_data_dir, 'src')
+    dst = os.path.join(self._output_data_dir, 'dst')
+    tf.io.gfile.makedirs(os.path.join(src, 'sub'))
+    for path in ['entry', os.path.join('sub', 'entry')]:
+      with tf.io.gfile.GFile(os.path.join(src, path), 'w') as f:
+        f.write(path)
+
+    executor.Executor._CopyCache(src, dst)  # pylint: disable=protected-access
+
+    for path in ['entry', os.path.join('sub', 'entry')]:
+      with tf.io.gfile.GFile(os.path.join(dst, path)) as f:
+        self.assertEqual(path, f.read())
+      # Entries on the same local file system are hardlinked.
+      self.assertTrue(
+          os.path.samefile(os.path.join(src, path), os.path.join(dst, path)))
+
+  def testGetBatchSizeForMemoryBudget(self):
+    data_paths = [
+        os.path.join(self._source_data_dir, 'csv_example_gen', 'train', '*')
+    ]
+    # 4000 bytes per decoded instance.
+    decode_fn = lambda unused_record: {'x': np.zeros(1000, np.float32)}
+    get_batch_size = self._transform_executor._GetBatchSizeForMemoryBudget  # pylint: disable=protected-access
+    self.assertEqual(250, get_batch_size(data_paths, decode_fn, 1000000))
+    self.assertEqual(1, get_batch_size(data_paths, decode_fn, 1))
+    # Large enough batches are left to Beam.
+    self.assertIsNone(get_batch_size(data_paths, decode_fn, 1 << 40))
+
+  def testReportDesiredBatchSize(self):
+    self._exec_properties['preprocessing_fn'] = self._preprocessing_fn
+    self._exec_properties['batch_memory_budget'] = 1 << 20
+    metrics = self._runPipelineGetMetrics(self._input_dict, self._output_dict,
+                                          self._exec_properties)
+    distributions = metrics.query(
+        tft_unit.beam.metrics.metric.MetricsFilter().with_name(
+            'desired_batch_size'))['distributions']
+    self.assertLen(distributions, 1)
+    self.assertBetween(distributions[0].committed.max, 1, 10000)
+
   def testDoWithCache(self):
 
     class InputCache(types.Artifact):
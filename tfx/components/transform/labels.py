@@ -29,20 +29,42 @@ BEAM_PIPELINE_ARGS = 'pipeline_args'
 # This label is currently not used externally.
 EXAMPLES_METADATA_LABEL = 'examples_metadata'
 CACHE_INPUT_PATH_LABEL = 'cache_input_path'
+# Total size in bytes of the input data below which the Beam pipeline is run
+# in-process with a single worker, as pipeline start-up would dominate.
+IN_PROCESS_INPUT_SIZE_THRESHOLD_LABEL = 'in_process_input_size_threshold'
+# Memory budget in bytes for a batch of decoded instances. If set, the batch
+# size of tf.Transform is bounded to fit the budget.
+BATCH_MEMORY_BUDGET_LABEL = 'batch_memory_budget'
 
 # Output labels.
 # TODO(b/72214804): Ideally per-set stats and materialization output paths
 # should be output labels, but they require multiple values. Change this if/when
 # we can add multiple outputs to a single processor label.
 PER_SET_STATS_OUTPUT_PATHS_LABEL = 'per_set_stats_output_paths'
+# Paths to pre- and post-transform statistics of each transformed dataset,
+# written as TFRecord files in the format of StatisticsGen outputs.
+PRE_TRANSFORM_OUTPUT_STATS_PATHS_LABEL = 'pre_transform_output_stats_paths'
+POST_TRANSFORM_OUTPUT_STATS_PATHS_LABEL = 'post_transform_output_stats_paths'
 TRANSFORM_MATERIALIZE_OUTPUT_PATHS_LABEL = (
     'transform_materialize_output_paths')
 TRANSFORM_METADATA_OUTPUT_PATH_LABEL = 'transform_output_path'
 CACHE_OUTPUT_PATH_LABEL = 'cache_output_path'
 TEMP_OUTPUT_LABEL = 'temp_path'
+# Options of the files of transform materialization. The file format is one of
+# the Examples File Formats below, FORMAT_TFRECORD by default. The compression
+# is one of the Compression Types below and only applies to FORMAT_TFRECORD.
+# Shard count 0 lets the runner decide.
+TRANSFORM_MATERIALIZE_FILE_FORMAT_LABEL = 'transform_materialize_file_format'
+TRANSFORM_MATERIALIZE_COMPRESSION_LABEL = 'transform_materialize_compression'
+TRANSFORM_MATERIALIZE_NUM_SHARDS_LABEL = 'transform_materialize_num_shards'
 
 # Examples File Format
 FORMAT_TFRECORD = 'FORMAT_TFRECORD'
+FORMAT_PARQUET = 'FORMAT_PARQUET'
+
+# Compression Type
+COMPRESSION_GZIP = 'GZIP'
+COMPRESSION_UNCOMPRESSED = 'UNCOMPRESSED'
 
 # Examples Data Format
 # Indicates that the data format is tf.Example.
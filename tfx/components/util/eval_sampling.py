@@ -0,0 +1,221 @@
+# Lint as: python2, python3
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Utilities for evaluating models on a sample of the eval examples."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import heapq
+import math
+import os
+from typing import Dict, Iterable, List, Optional, Text, Tuple
+
+import apache_beam as beam
+import tensorflow as tf
+
+from google.protobuf import json_format
+from tfx import types
+from tfx.components.util import sampling_utils
+from tfx.proto import evaluator_pb2
+from tfx.utils import io_utils
+
+# Name of the file, written next to the evaluation results, holding the number
+# of examples in the sample.
+SAMPLE_SIZE_FILE_NAME = 'eval_sample_size'
+
+# Custom properties of the output recording the sampling of the evaluation.
+SAMPLING_CONFIG_PROPERTY = 'eval_sampling_config'
+SAMPLE_SIZE_PROPERTY = 'eval_sample_size'
+
+_DEFAULT_CONFIDENCE_LEVEL = 0.95
+
+# Fixed size samples read this many times their share of the sample from the
+# beginning of each file, so that the sample is selected by hash from more
+# examples than it holds rather than being the first examples of each file.
+_HEAD_OVERREAD_FACTOR = 4
+
+
+def is_sampled(sampling_config: evaluator_pb2.EvalSamplingConfig) -> bool:
+  """Returns whether a sampling config evaluates on a sample."""
+  return bool(sampling_config.WhichOneof('sampling'))
+
+
+def _normal_quantile(p: float) -> float:
+  """Returns the p quantile of the standard normal distribution."""
+  low, high = -10.0, 10.0
+  for _ in range(100):
+    mid = (low + high) / 2
+    if (1 + math.erf(mid / math.sqrt(2))) / 2 < p:
+      low = mid
+    else:
+      high = mid
+  return high
+
+
+def get_sample_size(
+    sampling_config: evaluator_pb2.EvalSamplingConfig) -> Optional[int]:
+  """Returns the maximum number of examples read by a sampling config.
+
+  Args:
+    sampling_config: An evaluator_pb2.EvalSamplingConfig instance.
+
+  Returns:
+    The number of examples, or None if all examples are read.
+
+  Raises:
+    ValueError: If the sampling config is invalid.
+  """
+  sampling = sampling_config.WhichOneof('sampling')
+  if sampling == 'fraction':
+    if not 0 < sampling_config.fraction <= 1:
+      raise ValueError('fraction must be in (0, 1], got {}.'.format(
+          sampling_config.fraction))
+    return None
+  if sampling == 'fixed_size':
+    return sampling_config.fixed_size
+  if sampling == 'max_confidence_interval_half_width':
+    half_width = sampling_config.max_confidence_interval_half_width
+    confidence_level = (
+        sampling_config.confidence_level or _DEFAULT_CONFIDENCE_LEVEL)
+    if not 0 < half_width <= 0.5:
+      raise ValueError(
+          'max_confidence_interval_half_width must be in (0, 0.5], got '
+          '{}.'.format(half_width))
+    if not 0 < confidence_level < 1:
+      raise ValueError('confidence_level must be in (0, 1), got {}.'.format(
+          confidence_level))
+    # The standard deviation of a metric with values in [0, 1] is at most 1/2,
+    # so the half width of its normal confidence interval over n examples is
+    # at most z / (2 * sqrt(n)).
+    z = _normal_quantile((1 + confidence_level) / 2)
+    return int(math.ceil((z / (2 * half_width))**2))
+  return None
+
+
+def _get_stratum(record: bytes, features: List[Text]) -> Text:
+  """Returns the values of features in a serialized tf.Example, as a string."""
+  example = tf.train.Example.FromString(record)
+  values = []
+  for name in features:
+    feature_values = ()
+    if name in example.features.feature:
+      feature = example.features.feature[name]
+      kind = feature.WhichOneof('kind')
+      if kind:
+        feature_values = tuple(getattr(feature, kind).value)
+    values.append(feature_values)
+  return repr(tuple(values))
+
+
+def _sample_stratum(stratum: Tuple[Text, Iterable[bytes]], fraction: float,
+                    counts: Dict[Text, int]) -> List[bytes]:
+  """Returns a fraction, at least one, of a stratum, by smallest hash."""
+  key, records = stratum
+  num_selected = max(1, int(round(fraction * counts[key])))
+  return heapq.nsmallest(
+      num_selected, records, key=sampling_utils.get_record_hash)
+
+
+@beam.ptransform_fn
+@beam.typehints.with_input_types(beam.Pipeline)
+@beam.typehints.with_output_types(bytes)
+def ReadEvalExamples(  # pylint: disable=invalid-name
+    pipeline: beam.Pipeline,
+    file_pattern: Text,
+    sampling_config: evaluator_pb2.EvalSamplingConfig,
+    slice_features: Optional[List[Text]] = None) -> beam.pvalue.PCollection:
+  """Reads serialized eval examples, or a sample of them, from TFRecord files.
+
+  Samples are deterministic: examples are selected by a hash of their
+  serialization, so the same files and sampling config give the same sample.
+
+  Args:
+    pipeline: A Beam pipeline.
+    file_pattern: Pattern of the TFRecord files of the eval examples.
+    sampling_config: An evaluator_pb2.EvalSamplingConfig instance.
+    slice_features: Names of the features the evaluation is sliced by, to
+      stratify the sample by.
+
+  Returns:
+    A PCollection of serialized tf.Examples.
+  """
+  sample_size = get_sample_size(sampling_config)
+  if sample_size is not None:
+    file_paths = tf.io.gfile.glob(file_pattern)
+    size_per_file = -(-sample_size // max(len(file_paths), 1))
+    return (pipeline
+            | 'ListFiles' >> beam.Create(file_paths)
+            # Distributes the files across workers.
+            | 'Reshuffle' >> beam.transforms.Reshuffle()
+            | 'ReadFileHeads' >> beam.FlatMap(
+                io_utils.read_tfrecord_head,
+                _HEAD_OVERREAD_FACTOR * size_per_file)
+            | 'SampleFixedSize' >> beam.combiners.Top.Of(
+                sample_size,
+                key=sampling_utils.get_record_hash,
+                reverse=True)
+            | 'FlattenSample' >> beam.FlatMap(lambda sample: sample))
+
+  records = (
+      pipeline
+      | 'ReadFromTFRecord' >>
+      beam.io.ReadFromTFRecord(file_pattern=file_pattern))
+  if sampling_config.WhichOneof('sampling') != 'fraction':
+    return records
+  fraction = sampling_config.fraction
+  if not (sampling_config.stratify_by_slices and slice_features):
+    return (records
+            | 'SampleFraction' >> beam.Filter(
+                lambda r: sampling_utils.get_record_hash(r) < fraction))
+  keyed_records = (
+      records
+      | 'KeyByStratum' >> beam.Map(lambda r: (_get_stratum(r, slice_features),
+                                              r)))
+  counts = keyed_records | 'CountStrata' >> beam.combiners.Count.PerKey()
+  return (keyed_records
+          | 'GroupByStratum' >> beam.GroupByKey()
+          | 'SampleStrata' >> beam.FlatMap(_sample_stratum, fraction,
+                                           beam.pvalue.AsDict(counts)))
+
+
+@beam.ptransform_fn
+@beam.typehints.with_input_types(bytes)
+def WriteSampleSize(  # pylint: disable=invalid-name
+    examples: beam.pvalue.PCollection,
+    output_dir: Text) -> beam.pvalue.PDone:
+  """Writes the number of examples to SAMPLE_SIZE_FILE_NAME in output_dir."""
+  return (examples
+          | 'CountSample' >> beam.combiners.Count.Globally()
+          | 'WriteSampleSize' >> beam.io.WriteToText(
+              os.path.join(output_dir, SAMPLE_SIZE_FILE_NAME),
+              shard_name_template=''))
+
+
+def record_sampling(artifact: types.Artifact, output_dir: Text,
+                    sampling_config: evaluator_pb2.EvalSamplingConfig) -> None:
+  """Records on an output artifact the sample its evaluation was done on.
+
+  Args:
+    artifact: The output artifact.
+    output_dir: Directory the sample size was written to by WriteSampleSize.
+    sampling_config: The evaluator_pb2.EvalSamplingConfig instance.
+  """
+  artifact.set_string_custom_property(
+      SAMPLING_CONFIG_PROPERTY,
+      json_format.MessageToJson(sampling_config, indent=None))
+  with tf.io.gfile.GFile(os.path.join(output_dir, SAMPLE_SIZE_FILE_NAME)) as f:
+    sample_size = int(f.read().strip())
+  artifact.set_int_custom_property(SAMPLE_SIZE_PROPERTY, sample_size)
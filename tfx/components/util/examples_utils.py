@@ -0,0 +1,130 @@
+# Lint as: python2, python3
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Utilities for the file format and layout of Examples artifacts."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import json
+import os
+from typing import Dict, List, Text
+
+from tfx import types
+from tfx.types import artifact_utils
+
+# Custom property of an Examples artifact for the format of its files.
+FILE_FORMAT_PROPERTY = 'file_format'
+# Gzipped TFRecord files of serialized tf.Examples. Examples artifacts without
+# the file format property are in this format.
+FILE_FORMAT_TFRECORDS_GZIP = 'tfrecords_gzip'
+# Uncompressed TFRecord files of serialized tf.Examples.
+FILE_FORMAT_TFRECORDS = 'tfrecords'
+# Parquet files with a column per feature.
+FILE_FORMAT_PARQUET = 'parquet'
+
+# Custom property of an Examples artifact whose data is laid out by span, which
+# maps each span to the URI of the artifact the span was written to, as a JSON
+# object. The files of a span are in a sub-directory of each split directory of
+# that artifact. Examples artifacts without this property have their files
+# directly in the split directories.
+SPAN_URIS_PROPERTY = 'span_uris'
+
+
+def get_file_format(examples: types.Artifact) -> Text:
+  """Returns the file format of an Examples artifact.
+
+  Args:
+    examples: An Examples artifact.
+
+  Returns:
+    One of the FILE_FORMAT_* values of this module.
+  """
+  if FILE_FORMAT_PROPERTY not in examples.mlmd_artifact.custom_properties:
+    return FILE_FORMAT_TFRECORDS_GZIP
+  return examples.get_string_custom_property(FILE_FORMAT_PROPERTY)
+
+
+def set_file_format(examples: types.Artifact, file_format: Text) -> None:
+  """Records the file format of an Examples artifact.
+
+  Args:
+    examples: An Examples artifact.
+    file_format: One of the FILE_FORMAT_* values of this module.
+  """
+  examples.set_string_custom_property(FILE_FORMAT_PROPERTY, file_format)
+
+
+def get_span_uris(examples: types.Artifact) -> Dict[int, Text]:
+  """Returns the URIs of the artifacts the spans of an Examples artifact are in.
+
+  Args:
+    examples: An Examples artifact.
+
+  Returns:
+    A dict from span to artifact URI, empty if the artifact is not laid out by
+    span.
+  """
+  if SPAN_URIS_PROPERTY not in examples.mlmd_artifact.custom_properties:
+    return {}
+  return {
+      int(span): uri for span, uri in json.loads(
+          examples.get_string_custom_property(SPAN_URIS_PROPERTY)).items()
+  }
+
+
+def set_span_uris(examples: types.Artifact,
+                  span_uris: Dict[int, Text]) -> None:
+  """Records that an Examples artifact is laid out by span.
+
+  Args:
+    examples: An Examples artifact.
+    span_uris: A dict from span to the URI of the artifact the span is written
+      to, which is either `examples` or an artifact it references.
+  """
+  examples.set_string_custom_property(
+      SPAN_URIS_PROPERTY,
+      json.dumps({str(span): uri for span, uri in span_uris.items()},
+                 sort_keys=True))
+
+
+def get_span_dir_name(span: int) -> Text:
+  """Returns the name of the sub-directory of a split for a span."""
+  return 'span-{}'.format(span)
+
+
+def get_split_file_patterns(artifact_list: List[types.Artifact],
+                            split: Text) -> List[Text]:
+  """Returns file patterns of all files of a split of Examples artifacts.
+
+  Args:
+    artifact_list: A list of Examples artifacts, exactly one of which must have
+      the given split.
+    split: Name of split.
+
+  Returns:
+    A list of file patterns, one per span if the artifact is laid out by span.
+  """
+  split_uri = artifact_utils.get_split_uri(artifact_list, split)
+  examples = next(
+      a for a in artifact_list
+      if split in artifact_utils.decode_split_names(a.split_names))
+  span_uris = get_span_uris(examples)
+  if not span_uris:
+    return [os.path.join(split_uri, '*')]
+  return [
+      os.path.join(uri, split, get_span_dir_name(span), '*')
+      for span, uri in sorted(span_uris.items())
+  ]
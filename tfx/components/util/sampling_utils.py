@@ -0,0 +1,37 @@
+# Lint as: python2, python3
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Utilities to sample serialized examples deterministically."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import hashlib
+
+
+def get_record_hash(record: bytes) -> float:
+  """Returns a hash of a serialized record, uniformly distributed in [0, 1).
+
+  Samples select records by their hash rather than at random, so that the same
+  sampling config selects the same records in every run, and results computed
+  over a sample can be cached by the sampling config.
+
+  Args:
+    record: A serialized record, e.g. of a tf.Example.
+
+  Returns:
+    The hash of the record, as a float in [0, 1).
+  """
+  return int(hashlib.sha256(record).hexdigest()[:16], 16) / float(1 << 64)
@@ -0,0 +1,102 @@
+# Lint as: python2, python3
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Utilities to run an executor in several local processes."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import base64
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Sequence, Text
+
+from tfx import types
+from tfx.types import artifact_utils
+
+# Interval between checks of the state of the processes.
+_POLL_INTERVAL_SECONDS = 1
+
+
+def _encode(value: Text) -> Text:
+  return base64.b64encode(value.encode('utf-8')).decode('ascii')
+
+
+def run_executor_processes(
+    executor_class_path: Text,
+    input_dict: Dict[Text, List[types.Artifact]],
+    output_dict: Dict[Text, List[types.Artifact]],
+    exec_properties: Dict[Text, Any],
+    envs: Sequence[Dict[Text, Text]],
+    server_envs: Sequence[Dict[Text, Text]] = ()) -> None:
+  """Runs an executor in local processes until they all complete.
+
+  Each process runs the executor through tfx.scripts.run_executor, with the
+  environment of this process updated with its entry of envs. Server processes
+  are started first and run until the other processes complete. As processes
+  typically coordinate with each other, all processes are killed as soon as
+  one fails or a server exits.
+
+  Args:
+    executor_class_path: Python class of the executor, as <module>.<class>.
+    input_dict: Input dict from input key to a list of artifacts.
+    output_dict: Output dict from output key to a list of artifacts.
+    exec_properties: A dict of execution properties.
+    envs: Environment variables of each process.
+    server_envs: Environment variables of each server process.
+
+  Raises:
+    RuntimeError: If a process fails or a server process exits.
+  """
+  args = [
+      sys.executable, '-m', 'tfx.scripts.run_executor',
+      '--executor_class_path=' + executor_class_path,
+      '--inputs-base64=' +
+      _encode(artifact_utils.jsonify_artifact_dict(input_dict)),
+      '--outputs-base64=' +
+      _encode(artifact_utils.jsonify_artifact_dict(output_dict)),
+      '--exec-properties-base64=' + _encode(json.dumps(exec_properties)),
+  ]
+
+  def _start(env_update):
+    env = dict(os.environ)
+    env.update(env_update)
+    return subprocess.Popen(args, env=env)
+
+  servers = []
+  processes = []
+  try:
+    servers = [_start(env) for env in server_envs]
+    processes = [_start(env) for env in envs]
+    while any(p.poll() is None for p in processes):
+      exited = [i for i, p in enumerate(servers) if p.poll() is not None]
+      if exited:
+        raise RuntimeError(
+            'Server processes {} exited unexpectedly.'.format(exited))
+      failed = [i for i, p in enumerate(processes) if p.poll()]
+      if failed:
+        raise RuntimeError('Processes {} failed.'.format(failed))
+      time.sleep(_POLL_INTERVAL_SECONDS)
+    failed = [i for i, p in enumerate(processes) if p.returncode]
+    if failed:
+      raise RuntimeError('Processes {} failed.'.format(failed))
+  finally:
+    for p in processes + servers:
+      if p.poll() is None:
+        p.kill()
+        p.wait()
@@ -18,13 +18,16 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import contextlib
 import datetime
-from typing import Any, Dict, Iterable, List, Text, Tuple
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Text, Tuple
 
 import apache_beam as beam
 import prestodb
 from proto import presto_config_pb2
 import tensorflow as tf
+from tfx_bsl.beam import shared
 
 from google.protobuf import json_format
 from tfx import types
@@ -32,22 +35,121 @@ from tfx.components.example_gen import base_example_gen_executor
 from tfx.proto import example_gen_pb2
 
 
+# Default number of rows fetched per round trip.
+_DEFAULT_FETCH_SIZE = 10000
+
+
+class _ConnectionPool(object):
+  """A pool of Presto connections, shared by all DoFns of a worker process."""
+
+  def __init__(self, conn_config: presto_config_pb2.PrestoConnConfig):
+    self._conn_config = conn_config
+    self._lock = threading.Lock()
+    self._idle_connections = []
+
+  @contextlib.contextmanager
+  def connection(self) -> Iterator[prestodb.dbapi.Connection]:
+    """Yields an idle connection, creating one if needed, and returns it."""
+    with self._lock:
+      conn = self._idle_connections.pop() if self._idle_connections else None
+    if conn is None:
+      conn = _deserialize_conn_config(self._conn_config)
+    try:
+      yield conn
+    except:
+      # The connection may be in a bad state, so it is not reused.
+      conn.close()
+      raise
+    with self._lock:
+      self._idle_connections.append(conn)
+
+
+class _PrestoDoFnBase(beam.DoFn):
+  """Base class of DoFns which query Presto through a shared connection pool."""
+
+  def __init__(self, conn_config: presto_config_pb2.PrestoConnConfig,
+               shared_handle: shared.Shared):
+    self._conn_config = conn_config
+    self._shared_handle = shared_handle
+    self._pool = None
+
+  def setup(self):
+    self._pool = self._shared_handle.acquire(
+        lambda: _ConnectionPool(self._conn_config))
+
+
 @beam.typehints.with_input_types(Text)
-@beam.typehints.with_output_types(beam.typehints.Iterable[Tuple[Text, Text,
-                                                                Any]])
-class _ReadPrestoDoFn(beam.DoFn):
-  """Beam DoFn class that reads from Presto.
+@beam.typehints.with_output_types(Text)
+class _PartitionQueryDoFn(_PrestoDoFnBase):
+  """Beam DoFn class that splits a query into partition queries."""
+
+  def _get_bounds(self, query: Text) -> Tuple[Optional[int], Optional[int]]:
+    partition_config = self._conn_config.partition_config
+    lower_bound = None
+    upper_bound = None
+    if partition_config.HasField('lower_bound'):
+      lower_bound = partition_config.lower_bound
+    if partition_config.HasField('upper_bound'):
+      upper_bound = partition_config.upper_bound
+    if lower_bound is None or upper_bound is None:
+      with self._pool.connection() as conn:
+        cursor = conn.cursor()
+        try:
+          cursor.execute(
+              'SELECT min({key}), max({key}) FROM ({query}) t'.format(
+                  key=partition_config.key_column, query=query))
+          min_value, max_value = cursor.fetchone()
+        finally:
+          cursor.close()
+      if lower_bound is None:
+        lower_bound = min_value
+      if upper_bound is None:
+        upper_bound = max_value
+    return lower_bound, upper_bound
+
+  def process(self, query: Text) -> Iterable[Text]:
+    """Yields the queries of the partitions of the given query.
 
-  Attributes:
-    cursor: A prestodb.dbapi.Cursor object that reads records from Presto table.
-  """
+    Args:
+      query: A SQL query used to return results from Presto table.
 
-  def __init__(self, client: prestodb.dbapi.Connection):
-    self.cursor = client.cursor()
+    Yields:
+      SQL queries which together return the same rows as the given query.
+    """
+    partition_config = self._conn_config.partition_config
+    if partition_config.num_partitions <= 1:
+      yield query
+      return
+
+    if partition_config.method == (
+        presto_config_pb2.PrestoConnConfig.PartitionConfig.RANGE):
+      lower_bound, upper_bound = self._get_bounds(query)
+      if lower_bound is None or upper_bound is None:
+        # The query result is empty.
+        yield query
+        return
+      for partition_query in _range_partition_queries(
+          query, partition_config.key_column, partition_config.num_partitions,
+          lower_bound, upper_bound):
+        yield partition_query
+    else:
+      for partition_query in _hash_partition_queries(
+          query, partition_config.key_column, partition_config.num_partitions):
+        yield partition_query
+
+
+@beam.typehints.with_input_types(Text)
+@beam.typehints.with_output_types(beam.typehints.Iterable[Tuple[Text, Text,
+                                                                Any]])
+class _ReadPrestoDoFn(_PrestoDoFnBase):
+  """Beam DoFn class that reads from Presto."""
 
   def process(self, query: Text) -> Iterable[Tuple[Text, Text, Any]]:
     """Yields rows from query results.
 
+    Results are streamed in batches of `fetch_size` rows rather than
+    materialized all at once.
+
     Args:
       query: A SQL query used to return results from Presto table.
 
@@ -55,23 +157,68 @@ class _ReadPrestoDoFn(beam.DoFn):
       One row from the query result, represented by a list of tuples. Each tuple
       contains information on column name, column data type, data.
     """
-    self.cursor.execute(query)
-    rows = self.cursor.fetchall()
-    if rows:
-      cols = []
-      col_types = []
-      # Returns a list of (column_name, column_type, None, ...)
-      # https://github.com/prestodb/presto-python-client/blob/master/prestodb/dbapi.py#L199
-      for metadata in self.cursor.description:
-        cols.append(metadata[0])
-        col_types.append(metadata[1])
-
-      for r in rows:
-        yield zip(cols, col_types, r)
-
-  def teardown(self):
-    if self.cursor:
-      self.cursor.close()
+    fetch_size = _DEFAULT_FETCH_SIZE
+    if self._conn_config.HasField('fetch_size'):
+      fetch_size = self._conn_config.fetch_size
+
+    with self._pool.connection() as conn:
+      cursor = conn.cursor()
+      try:
+        cursor.execute(query)
+        cols = None
+        col_types = None
+        while True:
+          rows = cursor.fetchmany(fetch_size)
+          if not rows:
+            break
+          if cols is None:
+            # Returns a list of (column_name, column_type, None, ...)
+            # https://github.com/prestodb/presto-python-client/blob/master/prestodb/dbapi.py#L199
+            cols = [metadata[0] for metadata in cursor.description]
+            col_types = [metadata[1] for metadata in cursor.description]
+          for r in rows:
+            yield zip(cols, col_types, r)
+      finally:
+        cursor.close()
+
+
+def _hash_partition_queries(query: Text, key_column: Text,
+                            num_partitions: int) -> List[Text]:
+  """Returns queries reading the partitions of the query by key hash."""
+  key_hash = ('abs(mod(from_big_endian_64(xxhash64(to_utf8(CAST({key} AS '
+              'varchar)))), {n}))').format(
+                  key=key_column, n=num_partitions)
+  queries = []
+  for i in range(num_partitions):
+    condition = '{} = {}'.format(key_hash, i)
+    if i == 0:
+      condition = '{} OR {} IS NULL'.format(condition, key_column)
+    queries.append('SELECT * FROM ({}) t WHERE {}'.format(query, condition))
+  return queries
+
+
+def _range_partition_queries(query: Text, key_column: Text,
+                             num_partitions: int, lower_bound: int,
+                             upper_bound: int) -> List[Text]:
+  """Returns queries reading the partitions of the query by key range."""
+  num_partitions = max(1, min(num_partitions, upper_bound - lower_bound + 1))
+  # Ceiling division, so that the last boundary is at most upper_bound.
+  stride = -(-(upper_bound - lower_bound + 1) // num_partitions)
+  boundaries = [lower_bound + i * stride for i in range(1, num_partitions)]
+  if not boundaries:
+    return [query]
+
+  conditions = ['{key} < {upper} OR {key} IS NULL'.format(
+      key=key_column, upper=boundaries[0])]
+  for lower, upper in zip(boundaries[:-1], boundaries[1:]):
+    conditions.append('{key} >= {lower} AND {key} < {upper}'.format(
+        key=key_column, lower=lower, upper=upper))
+  conditions.append('{key} >= {lower}'.format(
+      key=key_column, lower=boundaries[-1]))
+  return [
+      'SELECT * FROM ({}) t WHERE {}'.format(query, condition)
+      for condition in conditions
+  ]
 
 
 def _deserialize_conn_config(
@@ -171,6 +318,10 @@ def _PrestoToExample(  # pylint: disable=invalid-name
     split_pattern: Text) -> beam.pvalue.PCollection:
   """Read from Presto and transform to TF examples.
 
+  If a partition config is set in the connection config, the query is split
+  into partition queries which are read in parallel, each worker process
+  sharing a pool of connections.
+
   Args:
     pipeline: beam pipeline.
     input_dict: Input dict from input key to a list of Artifacts.
@@ -185,10 +336,15 @@ def _PrestoToExample(  # pylint: disable=invalid-name
   presto_config = presto_config_pb2.PrestoConnConfig()
   conn_config.custom_config.Unpack(presto_config)
 
-  client = _deserialize_conn_config(presto_config)
+  shared_handle = shared.Shared()
   return (pipeline
           | 'Query' >> beam.Create([split_pattern])
-          | 'QueryTable' >> beam.ParDo(_ReadPrestoDoFn(client))
+          | 'PartitionQuery' >> beam.ParDo(
+              _PartitionQueryDoFn(presto_config, shared_handle))
+          # Spreads the partition queries across workers.
+          | 'Reshuffle' >> beam.Reshuffle()
+          | 'QueryTable' >> beam.ParDo(
+              _ReadPrestoDoFn(presto_config, shared_handle))
           | 'ToTFExample' >> beam.Map(_row_to_example))
 
 
@@ -20,6 +20,7 @@ from __future__ import print_function
 
 import os
 import random
+import sqlite3
 
 import apache_beam as beam
 from apache_beam.testing import util
@@ -37,7 +38,7 @@ from tfx.types import standard_artifacts
 
 class _MockReadPrestoDoFn(beam.DoFn):
 
-  def __init__(self, client):
+  def __init__(self, conn_config, shared_handle):
     pass
 
   def process(self, query):
@@ -49,7 +50,7 @@ class _MockReadPrestoDoFn(beam.DoFn):
 
 class _MockReadPrestoDoFn2(beam.DoFn):
 
-  def __init__(self, client):
+  def __init__(self, conn_config, shared_handle):
     pass
 
   def process(self, query):
@@ -60,6 +61,33 @@ def _mock_deserialize_conn_config(input_config):  # pylint: disable=invalid-name
   return prestodb.dbapi.connect('localhost')
 
 
+class _SqliteCursor(object):
+  """Stand-in for a Presto cursor, reading an all-integer SQLite table."""
+
+  def __init__(self, cursor):
+    self._cursor = cursor
+
+  @property
+  def description(self):
+    return [(metadata[0], 'integer') for metadata in self._cursor.description]
+
+  def __getattr__(self, name):
+    return getattr(self._cursor, name)
+
+
+class _SqliteConnection(object):
+  """Stand-in for a Presto connection, backed by a SQLite database."""
+
+  def __init__(self, path):
+    self._conn = sqlite3.connect(path, check_same_thread=False)
+
+  def cursor(self):
+    return _SqliteCursor(self._conn.cursor())
+
+  def close(self):
+    self._conn.close()
+
+
 class ExecutorTest(tf.test.TestCase):
 
   def testDeserializeConnConfig(self):
@@ -75,6 +103,69 @@ class ExecutorTest(tf.test.TestCase):
                      deseralized_conn.auth)  # test for default auth value
     self.assertEqual(truth_conn.max_attempts, deseralized_conn.max_attempts)
 
+  def testRangePartitionQueries(self):
+    self.assertEqual([
+        'SELECT * FROM (q) t WHERE k < 4 OR k IS NULL',
+        'SELECT * FROM (q) t WHERE k >= 4 AND k < 7',
+        'SELECT * FROM (q) t WHERE k >= 7',
+    ], executor._range_partition_queries('q', 'k', 3, 1, 9))
+    # No more partitions than distinct keys in range.
+    self.assertEqual([
+        'SELECT * FROM (q) t WHERE k < 1 OR k IS NULL',
+        'SELECT * FROM (q) t WHERE k >= 1',
+    ], executor._range_partition_queries('q', 'k', 8, 0, 1))
+    self.assertEqual(['q'], executor._range_partition_queries('q', 'k', 4, 5,
+                                                              5))
+
+  def testHashPartitionQueries(self):
+    queries = executor._hash_partition_queries('q', 'k', 2)
+    self.assertLen(queries, 2)
+    self.assertTrue(queries[0].endswith('= 0 OR k IS NULL'))
+    self.assertTrue(queries[1].endswith('= 1'))
+
+  def testPrestoToExamplePartitioned(self):
+    db_path = os.path.join(self.get_temp_dir(), 'presto.db')
+    conn = sqlite3.connect(db_path)
+    conn.execute('CREATE TABLE fake (i INTEGER, j INTEGER)')
+    conn.executemany('INSERT INTO fake VALUES (?, ?)',
+                     [(i, i * 2) for i in range(10)] + [(None, 100)])
+    conn.commit()
+    conn.close()
+
+    presto_config = presto_config_pb2.PrestoConnConfig(
+        host='localhost',
+        fetch_size=3,
+        partition_config=presto_config_pb2.PrestoConnConfig.PartitionConfig(
+            key_column='i',
+            num_partitions=4,
+            method=presto_config_pb2.PrestoConnConfig.PartitionConfig.RANGE))
+    custom_config = example_gen_pb2.CustomConfig()
+    custom_config.custom_config.Pack(presto_config)
+
+    def _expected_example(i, j):
+      feature = {}
+      feature['i'] = tf.train.Feature() if i is None else tf.train.Feature(
+          int64_list=tf.train.Int64List(value=[i]))
+      feature['j'] = tf.train.Feature(int64_list=tf.train.Int64List(value=[j]))
+      return tf.train.Example(features=tf.train.Features(feature=feature))
+
+    with mock.patch.object(executor, '_deserialize_conn_config',
+                           lambda _: _SqliteConnection(db_path)):
+      with beam.Pipeline() as pipeline:
+        examples = (
+            pipeline | 'ToTFExample' >> executor._PrestoToExample(
+                input_dict={},
+                exec_properties={
+                    'custom_config':
+                        json_format.MessageToJson(
+                            custom_config, preserving_proto_field_name=True)
+                },
+                split_pattern='SELECT i, j FROM fake'))
+        util.assert_that(
+            examples,
+            util.equal_to([_expected_example(i, i * 2) for i in range(10)] +
+                          [_expected_example(None, 100)]))
+
   @mock.patch.multiple(
       executor,
       _ReadPrestoDoFn=_MockReadPrestoDoFn2,
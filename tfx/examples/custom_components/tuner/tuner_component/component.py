@@ -43,6 +43,11 @@ class TunerSpec(ComponentSpec):
   PARAMETERS = {
       'module_file': ExecutionParameter(type=(str, Text), optional=True),
       'tuner_fn': ExecutionParameter(type=(str, Text), optional=True),
+      'num_parallel_trials': ExecutionParameter(type=int, optional=True),
+      'epochs': ExecutionParameter(type=int, optional=True),
+      'steps_per_epoch': ExecutionParameter(type=int, optional=True),
+      'validation_steps': ExecutionParameter(type=int, optional=True),
+      'early_stopping_patience': ExecutionParameter(type=int, optional=True),
   }
   INPUTS = {
       'examples': ChannelParameter(type=standard_artifacts.Examples),
@@ -72,6 +77,11 @@ class Tuner(base_component.BaseComponent):
                schema: types.Channel = None,
                module_file: Optional[Text] = None,
                tuner_fn: Optional[Text] = None,
+               num_parallel_trials: Optional[int] = None,
+               epochs: Optional[int] = None,
+               steps_per_epoch: Optional[int] = None,
+               validation_steps: Optional[int] = None,
+               early_stopping_patience: Optional[int] = None,
                model: Optional[types.Channel] = None,
                best_hyperparameters: Optional[types.Channel] = None,
                instance_name: Optional[Text] = None):
@@ -95,6 +105,18 @@ class Tuner(base_component.BaseComponent):
       tuner_fn:  A python path to UDF model definition function. See
         'module_file' for the required signature of the UDF. Exactly one of
         'module_file' or 'tuner_fn' must be supplied.
+      num_parallel_trials: Optional number of trials run concurrently, each in
+        its own local process. The processes get their trials from one oracle
+        served by a chief process, so the oracle must support distributed
+        tuning. Defaults to 1.
+      epochs: Optional number of epochs of each trial. Defaults to 1.
+      steps_per_epoch: Optional number of training steps per epoch of each
+        trial. Defaults to 1000.
+      validation_steps: Optional number of validation steps per epoch of each
+        trial. Defaults to 500.
+      early_stopping_patience: Optional number of epochs without improvement of
+        the tuning objective after which a trial is stopped. By default trials
+        are not stopped early.
       model: Optional Channel of type `standard_artifacts.Model` for result of
         best model.
       best_hyperparameters: Optional Channel of type
@@ -116,6 +138,11 @@ class Tuner(base_component.BaseComponent):
         schema=schema,
         module_file=module_file,
         tuner_fn=tuner_fn,
+        num_parallel_trials=num_parallel_trials,
+        epochs=epochs,
+        steps_per_epoch=steps_per_epoch,
+        validation_steps=validation_steps,
+        early_stopping_patience=early_stopping_patience,
         model_export_path=model,
         best_hyperparameters=best_hyperparameters)
     super(Tuner, self).__init__(spec=spec, instance_name=instance_name)
@@ -50,6 +50,20 @@ class TunerTest(tf.test.TestCase):
         examples=self.examples, schema=self.schema, tuner_fn='path.to.tuner_fn')
     self._verify_output(tuner)
 
+  def testConstructWithTrialBudget(self):
+    tuner = component.Tuner(
+        examples=self.examples,
+        schema=self.schema,
+        module_file='/path/to/module/file',
+        num_parallel_trials=4,
+        epochs=2,
+        steps_per_epoch=10,
+        validation_steps=5,
+        early_stopping_patience=1)
+    self._verify_output(tuner)
+    self.assertEqual(4, tuner.exec_properties['num_parallel_trials'])
+    self.assertEqual(1, tuner.exec_properties['early_stopping_patience'])
+
   def testConstructDuplicateUserModule(self):
     with self.assertRaises(ValueError):
       _ = component.Tuner(
@@ -20,11 +20,15 @@ from __future__ import print_function
 
 import json
 import os
+import time
 from typing import Any, Dict, List, Text
 import absl
+import tensorflow as tf
 from tensorflow_metadata.proto.v0 import schema_pb2
+from tensorflow.python.lib.io import file_io  # pylint: disable=g-direct-tensorflow-import
 from tfx import types
 from tfx.components.base import base_executor
+from tfx.examples.custom_components.tuner.tuner_component import parallel_tuning
 from tfx.types import artifact_utils
 from tfx.utils import import_utils
 from tfx.utils import io_utils
@@ -32,6 +36,15 @@ from tfx.utils import io_utils
 # Default file name for generated best hyperparameters file.
 _DEFAULT_FILE_NAME = 'best_hyperparameters.txt'
 
+# Default budget of each trial.
+_DEFAULT_EPOCHS = 1
+_DEFAULT_STEPS_PER_EPOCH = 1000
+_DEFAULT_VALIDATION_STEPS = 500
+
+# Subdirectory of the working dir the tuner processes write the trial wall
+# times to.
+_TRIAL_WALL_TIMES_DIR = 'trial_wall_times'
+
 
 class Executor(base_executor.BaseExecutor):
   """TFX Tuner component executor."""
@@ -55,12 +68,10 @@ class Executor(base_executor.BaseExecutor):
     return import_utils.import_func_from_module(
         '.'.join(tuner_fn_path_split[0:-1]), tuner_fn_path_split[-1])
 
-  def Do(self, input_dict: Dict[Text, List[types.Artifact]],
-         output_dict: Dict[Text, List[types.Artifact]],
-         exec_properties: Dict[Text, Any]) -> None:
-    # KerasTuner generates tuning state (e.g., oracle, trials) to working dir.
-    working_dir = self._get_tmp_dir()
-
+  def _GetTunerSpec(self, input_dict: Dict[Text, List[types.Artifact]],
+                    exec_properties: Dict[Text, Any],
+                    working_dir: Text) -> Any:
+    """Returns the TunerFnResult of the user-defined tuner_fn."""
     train_path = artifact_utils.get_split_uri(input_dict['examples'], 'train')
     eval_path = artifact_utils.get_split_uri(input_dict['examples'], 'eval')
     schema_file = io_utils.get_only_uri_in_dir(
@@ -68,19 +79,113 @@ class Executor(base_executor.BaseExecutor):
     schema = io_utils.parse_pbtxt_file(schema_file, schema_pb2.Schema())
 
     tuner_fn = self._GetTunerFn(exec_properties)
-    tuner_spec = tuner_fn(working_dir, io_utils.all_files_pattern(train_path),
-                          io_utils.all_files_pattern(eval_path), schema)
+    return tuner_fn(working_dir, io_utils.all_files_pattern(train_path),
+                    io_utils.all_files_pattern(eval_path), schema)
+
+  def _Search(self, tuner_spec: Any, exec_properties: Dict[Text, Any],
+              working_dir: Text) -> None:
+    """Runs trials of the tuner until its oracle stops the search."""
     tuner = tuner_spec.tuner
+    callbacks = []
+    if exec_properties.get('early_stopping_patience'):
+      callbacks.append(
+          tf.keras.callbacks.EarlyStopping(
+              monitor=tuner.oracle.objective.name,
+              mode=tuner.oracle.objective.direction,
+              patience=exec_properties['early_stopping_patience']))
+
+    # Wraps run_trial to measure the wall time of each trial.
+    trial_wall_times = {}
+    run_trial = tuner.run_trial
+
+    def _TimedRunTrial(trial, *args, **kwargs):
+      start_time = time.time()
+      run_trial(trial, *args, **kwargs)
+      trial_wall_times[trial.trial_id] = time.time() - start_time
+      absl.logging.info('Trial %s took %.1f seconds.', trial.trial_id,
+                        trial_wall_times[trial.trial_id])
+
+    tuner.run_trial = _TimedRunTrial
 
-    tuner.search_space_summary()
     # TODO(jyzhao): assert v2 behavior as KerasTuner doesn't work in v1.
-    # TODO(jyzhao): make steps configurable or move search() to module file.
     tuner.search(
         tuner_spec.train_dataset,
-        steps_per_epoch=1000,
-        validation_steps=500,
-        validation_data=tuner_spec.eval_dataset)
+        epochs=exec_properties.get('epochs') or _DEFAULT_EPOCHS,
+        steps_per_epoch=(exec_properties.get('steps_per_epoch') or
+                         _DEFAULT_STEPS_PER_EPOCH),
+        validation_steps=(exec_properties.get('validation_steps') or
+                          _DEFAULT_VALIDATION_STEPS),
+        validation_data=tuner_spec.eval_dataset,
+        callbacks=callbacks)
+    io_utils.write_string_file(
+        os.path.join(working_dir, _TRIAL_WALL_TIMES_DIR,
+                     parallel_tuning.get_tuner_id() + '.json'),
+        json.dumps(trial_wall_times))
+
+  def _LogTrialWallTimes(self, working_dir: Text) -> None:
+    """Logs the wall time of each trial run by the tuner processes."""
+    trial_wall_times = {}
+    for path in tf.io.gfile.glob(
+        os.path.join(working_dir, _TRIAL_WALL_TIMES_DIR, '*.json')):
+      trial_wall_times.update(
+          json.loads(file_io.read_file_to_string(path)))
+    for trial_id, wall_time in sorted(
+        trial_wall_times.items(), key=lambda item: item[1], reverse=True):
+      absl.logging.info('Trial %s: %.1f seconds.', trial_id, wall_time)
+    absl.logging.info('%d trials took %.1f seconds in total.',
+                      len(trial_wall_times), sum(trial_wall_times.values()))
+
+  def Do(self, input_dict: Dict[Text, List[types.Artifact]],
+         output_dict: Dict[Text, List[types.Artifact]],
+         exec_properties: Dict[Text, Any]) -> None:
+    """Runs a KerasTuner search and writes the best hyperparameters.
+
+    Args:
+      input_dict: Input dict from input key to a list of artifacts, including:
+        - examples: Examples with train and eval splits used for tuning.
+        - schema: Schema of the examples.
+      output_dict: Output dict from output key to a list of artifacts,
+        including:
+        - best_hyperparameters: HyperParameters the best trial was run with.
+      exec_properties: A dict of execution properties, including:
+        - module_file / tuner_fn: Source of the user-defined tuner_fn.
+        - num_parallel_trials: Number of trials run concurrently, each in its
+          own local process. Defaults to 1, in which case the trials run in
+          this process.
+        - epochs, steps_per_epoch, validation_steps: Budget of each trial.
+        - early_stopping_patience: If set, the number of epochs without
+          improvement of the objective after which a trial is stopped.
+
+    Returns:
+      None
+    """
+    if parallel_tuning.is_tuner_process():
+      # The chief serves the oracle from the constructor of the tuner and
+      # never returns, tuners run trials until the oracle stops the search.
+      working_dir = parallel_tuning.get_working_dir()
+      self._Search(
+          self._GetTunerSpec(input_dict, exec_properties, working_dir),
+          exec_properties, working_dir)
+      return
+
+    # KerasTuner generates tuning state (e.g., oracle, trials) to working dir.
+    working_dir = self._get_tmp_dir()
+    num_parallel_trials = exec_properties.get('num_parallel_trials') or 1
+    if num_parallel_trials > 1:
+      parallel_tuning.run_parallel_search(
+          '%s.%s' % (self.__class__.__module__, self.__class__.__name__),
+          input_dict, output_dict, exec_properties, working_dir,
+          num_parallel_trials)
+      # The tuner reloads the oracle the chief saved in working_dir.
+      tuner = self._GetTunerSpec(input_dict, exec_properties,
+                                 working_dir).tuner
+    else:
+      tuner_spec = self._GetTunerSpec(input_dict, exec_properties, working_dir)
+      tuner_spec.tuner.search_space_summary()
+      self._Search(tuner_spec, exec_properties, working_dir)
+      tuner = tuner_spec.tuner
     tuner.results_summary()
+    self._LogTrialWallTimes(working_dir)
 
     best_hparams = tuner.oracle.get_best_trials(
         1)[0].hyperparameters.get_config()
@@ -110,6 +110,25 @@ class ExecutorTest(tf.test.TestCase):
 
     self._verify_output()
 
+  def testDoWithParallelTrials(self):
+    # Create exec properties.
+    exec_properties = {
+        'module_file': os.path.join(self._module_dir, 'iris_utils.py'),
+        'num_parallel_trials': 2,
+        'steps_per_epoch': 10,
+        'validation_steps': 5,
+        'early_stopping_patience': 1,
+    }
+
+    # Run tuner.
+    tuner = executor.Executor(self._context)
+    tuner.Do(
+        input_dict=self._input_dict,
+        output_dict=self._output_dict,
+        exec_properties=exec_properties)
+
+    self._verify_output()
+
 
 if __name__ == '__main__':
   # TODO(jyzhao): v1 doesn't work for dataset and tuner.
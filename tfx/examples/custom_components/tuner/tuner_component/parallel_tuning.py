@@ -0,0 +1,112 @@
+# Lint as: python2, python3
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Runs KerasTuner trials in parallel local processes sharing one oracle."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import socket
+from typing import Any, Dict, List, Text
+
+import absl
+
+from tfx import types
+from tfx.components.util import subprocess_utils
+
+# Environment variables through which KerasTuner distributes a search: the
+# address of the chief process serving the oracle, and the id of the tuner.
+ORACLE_IP_ENV = 'KERASTUNER_ORACLE_IP'
+ORACLE_PORT_ENV = 'KERASTUNER_ORACLE_PORT'
+TUNER_ID_ENV = 'KERASTUNER_TUNER_ID'
+
+# Environment variable holding the working dir shared by the processes.
+_WORKING_DIR_ENV = 'TFX_TUNER_WORKING_DIR'
+
+# Tuner id of the process serving the oracle.
+_CHIEF_TUNER_ID = 'chief'
+
+
+def is_tuner_process() -> bool:
+  """Returns whether this process is a chief or tuner of a parallel search."""
+  return ORACLE_IP_ENV in os.environ
+
+
+def get_tuner_id() -> Text:
+  """Returns the KerasTuner tuner id of this process."""
+  return os.environ.get(TUNER_ID_ENV, 'tuner0')
+
+
+def get_working_dir() -> Text:
+  """Returns the working dir shared by the processes of a parallel search."""
+  return os.environ[_WORKING_DIR_ENV]
+
+
+def _get_unused_port():
+  s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+  try:
+    s.bind(('localhost', 0))
+    return s.getsockname()[1]
+  finally:
+    s.close()
+
+
+def run_parallel_search(executor_class_path: Text,
+                        input_dict: Dict[Text, List[types.Artifact]],
+                        output_dict: Dict[Text, List[types.Artifact]],
+                        exec_properties: Dict[Text, Any], working_dir: Text,
+                        num_parallel_trials: int) -> None:
+  """Runs a tuner executor's search in num_parallel_trials local processes.
+
+  The executor is run in one chief process, which serves the oracle of the
+  tuner over gRPC on a local port, and in num_parallel_trials tuner processes,
+  each of which runs one trial at a time with the hyperparameters it gets from
+  the chief. All processes share
+  working_dir, where the chief saves the state of the oracle after each trial.
+
+  Args:
+    executor_class_path: Python class of the executor, as <module>.<class>.
+    input_dict: Input dict from input key to a list of artifacts.
+    output_dict: Output dict from output key to a list of artifacts.
+    exec_properties: A dict of execution properties.
+    working_dir: Working dir of KerasTuner shared by the processes.
+    num_parallel_trials: Number of trials run concurrently.
+
+  Raises:
+    RuntimeError: If a process fails.
+  """
+  port = _get_unused_port()
+
+  def _env(tuner_id):
+    return {
+        ORACLE_IP_ENV: 'localhost',
+        ORACLE_PORT_ENV: str(port),
+        TUNER_ID_ENV: tuner_id,
+        _WORKING_DIR_ENV: working_dir,
+    }
+
+  absl.logging.info('Starting %d parallel tuners with the oracle on port %d.',
+                    num_parallel_trials, port)
+  # The chief serves the oracle until it is terminated, the tuners exit once
+  # the oracle has no more trials for them.
+  subprocess_utils.run_executor_processes(
+      executor_class_path,
+      input_dict,
+      output_dict,
+      exec_properties,
+      [_env('tuner{}'.format(i)) for i in range(num_parallel_trials)],
+      server_envs=[_env(_CHIEF_TUNER_ID)])
+  absl.logging.info('All %d parallel tuners completed.', num_parallel_trials)
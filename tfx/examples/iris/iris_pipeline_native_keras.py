@@ -94,7 +94,9 @@ def _create_pipeline(pipeline_name: Text, pipeline_root: Text, data_root: Text,
       transform_graph=transform.outputs['transform_graph'],
       schema=infer_schema.outputs['schema'],
       train_args=trainer_pb2.TrainArgs(num_steps=10000),
-      eval_args=trainer_pb2.EvalArgs(num_steps=5000))
+      eval_args=trainer_pb2.EvalArgs(num_steps=5000),
+      early_stopping_config=trainer_pb2.EarlyStoppingConfig(
+          metric_name='loss', max_steps_without_decrease=2000))
 
   # Uses TFMA to compute a evaluation statistics over features of a model.
   model_analyzer = Evaluator(
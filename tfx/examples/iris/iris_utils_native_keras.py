@@ -29,21 +29,21 @@ import tensorflow as tf
 from tensorflow import keras
 import tensorflow_transform as tft
 
+from tfx.components.trainer.data_accessor import DataAccessor
 from tfx.components.trainer.executor import TrainerFnArgs
 
 _FEATURE_KEYS = ['sepal_length', 'sepal_width', 'petal_length', 'petal_width']
 _LABEL_KEY = 'variety'
 
+# Training is split into epochs, after each of which the model is evaluated,
+# e.g. for early stopping.
+_NUM_EPOCHS = 10
+
 
 def _transformed_name(key):
   return key + '_xf'
 
 
-def _gzip_reader_fn(filenames):
-  """Small utility returning a record reader that can read gzip'ed files."""
-  return tf.data.TFRecordDataset(filenames, compression_type='GZIP')
-
-
 def _get_serve_tf_examples_fn(model, tf_transform_output):
   """Returns a function that parses a serialized tf.Example."""
 
@@ -64,14 +64,14 @@ def _get_serve_tf_examples_fn(model, tf_transform_output):
   return serve_tf_examples_fn
 
 
-def _input_fn(file_pattern: Text,
-              tf_transform_output: tft.TFTransformOutput,
+def _input_fn(split: Text,
+              data_accessor: DataAccessor,
               batch_size: int = 200) -> tf.data.Dataset:
   """Generates features and label for tuning/training.
 
   Args:
-    file_pattern: input tfrecord file pattern.
-    tf_transform_output: A TFTransformOutput.
+    split: name of the split of the transformed examples to read.
+    data_accessor: DataAccessor for the transformed examples.
     batch_size: representing the number of consecutive elements of returned
       dataset to combine in a single batch
 
@@ -79,17 +79,8 @@ def _input_fn(file_pattern: Text,
     A dataset that contains (features, indices) tuple where features is a
       dictionary of Tensors, and indices is a single Tensor of label indices.
   """
-  transformed_feature_spec = (
-      tf_transform_output.transformed_feature_spec().copy())
-
-  dataset = tf.data.experimental.make_batched_features_dataset(
-      file_pattern=file_pattern,
-      batch_size=batch_size,
-      features=transformed_feature_spec,
-      reader=_gzip_reader_fn,
-      label_key=_transformed_name(_LABEL_KEY))
-
-  return dataset
+  return data_accessor.tf_dataset(
+      split, batch_size, label_key=_transformed_name(_LABEL_KEY))
 
 
 def _build_keras_model() -> tf.keras.Model:
@@ -147,8 +138,8 @@ def run_fn(fn_args: TrainerFnArgs):
   """
   tf_transform_output = tft.TFTransformOutput(fn_args.transform_output)
 
-  train_dataset = _input_fn(fn_args.train_files, tf_transform_output, 40)
-  eval_dataset = _input_fn(fn_args.eval_files, tf_transform_output, 40)
+  train_dataset = _input_fn('train', fn_args.data_accessor, 40)
+  eval_dataset = _input_fn('eval', fn_args.data_accessor, 40)
 
   # To use distribution strategy, create an appropriate tf.distribute.Strategy
   # and move the creation and compiling of Keras model inside `strategy.scope`.
@@ -161,9 +152,11 @@ def run_fn(fn_args: TrainerFnArgs):
 
   model.fit(
       train_dataset,
-      steps_per_epoch=fn_args.train_steps,
+      epochs=_NUM_EPOCHS,
+      steps_per_epoch=fn_args.train_steps // _NUM_EPOCHS,
       validation_data=eval_dataset,
-      validation_steps=fn_args.eval_steps)
+      validation_steps=fn_args.eval_steps // _NUM_EPOCHS,
+      callbacks=fn_args.early_stopping_callbacks)
 
   signatures = {
       'serving_default':
@@ -83,6 +83,10 @@ class Schema(Artifact):
   TYPE_NAME = 'Schema'
 
 
+class TransformCache(Artifact):
+  TYPE_NAME = 'TransformCache'
+
+
 class TransformGraph(Artifact):
   TYPE_NAME = 'TransformGraph'
 
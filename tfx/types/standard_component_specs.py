@@ -26,7 +26,9 @@ from tfx.proto import evaluator_pb2
 from tfx.proto import example_gen_pb2
 from tfx.proto import infra_validator_pb2
 from tfx.proto import pusher_pb2
+from tfx.proto import statistics_gen_pb2
 from tfx.proto import trainer_pb2
+from tfx.proto import transform_pb2
 from tfx.types import standard_artifacts
 from tfx.types.component_spec import ChannelParameter
 from tfx.types.component_spec import ComponentSpec
@@ -71,6 +73,9 @@ class EvaluatorSpec(ComponentSpec):
       # change at any time.
       'fairness_indicator_thresholds':
           ExecutionParameter(type=List[float], optional=True),
+      'eval_sampling_config':
+          ExecutionParameter(
+              type=evaluator_pb2.EvalSamplingConfig, optional=True),
   }
   INPUTS = {
       'examples':
@@ -129,6 +134,7 @@ class FileBasedExampleGenSpec(ComponentSpec):
   }
   INPUTS = {
       'input': ChannelParameter(type=standard_artifacts.ExternalArtifact),
+      'schema': ChannelParameter(type=standard_artifacts.Schema, optional=True),
   }
   OUTPUTS = {
       'examples': ChannelParameter(type=standard_artifacts.Examples),
@@ -170,7 +176,11 @@ class InfraValidatorSpec(ComponentSpec):
 class ModelValidatorSpec(ComponentSpec):
   """ModelValidator component spec."""
 
-  PARAMETERS = {}
+  PARAMETERS = {
+      'eval_sampling_config':
+          ExecutionParameter(
+              type=evaluator_pb2.EvalSamplingConfig, optional=True),
+  }
   INPUTS = {
       'examples': ChannelParameter(type=standard_artifacts.Examples),
       'model': ChannelParameter(type=standard_artifacts.Model),
@@ -252,9 +262,21 @@ class SchemaGenSpec(ComponentSpec):
 class StatisticsGenSpec(ComponentSpec):
   """StatisticsGen component spec."""
 
-  PARAMETERS = {}
+  PARAMETERS = {
+      'enable_statistics_cache':
+          ExecutionParameter(type=bool, optional=True),
+      'sampling_config':
+          ExecutionParameter(
+              type=statistics_gen_pb2.SamplingConfig, optional=True),
+      'slicing_config':
+          ExecutionParameter(
+              type=statistics_gen_pb2.SlicingConfig, optional=True),
+  }
   INPUTS = {
       'examples': ChannelParameter(type=standard_artifacts.Examples),
+      'cached_statistics':
+          ChannelParameter(
+              type=standard_artifacts.ExampleStatistics, optional=True),
   }
   OUTPUTS = {
       'statistics': ChannelParameter(type=standard_artifacts.ExampleStatistics),
@@ -280,6 +302,14 @@ class TrainerSpec(ComponentSpec):
       'run_fn': ExecutionParameter(type=(str, Text), optional=True),
       'trainer_fn': ExecutionParameter(type=(str, Text), optional=True),
       'custom_config': ExecutionParameter(type=Dict[Text, Any], optional=True),
+      'local_staging_config':
+          ExecutionParameter(
+              type=trainer_pb2.LocalStagingConfig, optional=True),
+      'warm_start_config':
+          ExecutionParameter(type=trainer_pb2.WarmStartConfig, optional=True),
+      'early_stopping_config':
+          ExecutionParameter(
+              type=trainer_pb2.EarlyStoppingConfig, optional=True),
   }
   INPUTS = {
       'examples':
@@ -316,16 +346,38 @@ class TransformSpec(ComponentSpec):
       'module_file': ExecutionParameter(type=(str, Text), optional=True),
       'preprocessing_fn': ExecutionParameter(type=(str, Text), optional=True),
       'custom_config': ExecutionParameter(type=Dict[Text, Any], optional=True),
+      'enable_analyzer_cache': ExecutionParameter(type=bool, optional=True),
+      'materialization_config':
+          ExecutionParameter(
+              type=transform_pb2.MaterializationConfig, optional=True),
+      'in_process_input_size_threshold':
+          ExecutionParameter(type=int, optional=True),
+      'batch_memory_budget':
+          ExecutionParameter(type=int, optional=True),
   }
   INPUTS = {
       'examples': ChannelParameter(type=standard_artifacts.Examples),
       'schema': ChannelParameter(type=standard_artifacts.Schema),
+      'analyzer_cache':
+          ChannelParameter(
+              type=standard_artifacts.TransformCache, optional=True),
+      'previous_transformed_examples':
+          ChannelParameter(type=standard_artifacts.Examples, optional=True),
   }
   OUTPUTS = {
       'transform_graph':
           ChannelParameter(type=standard_artifacts.TransformGraph),
       'transformed_examples':
           ChannelParameter(type=standard_artifacts.Examples),
+      'pre_transform_statistics':
+          ChannelParameter(
+              type=standard_artifacts.ExampleStatistics, optional=True),
+      'post_transform_statistics':
+          ChannelParameter(
+              type=standard_artifacts.ExampleStatistics, optional=True),
+      'updated_analyzer_cache':
+          ChannelParameter(
+              type=standard_artifacts.TransformCache, optional=True),
   }
   # TODO(b/139281215): these input / output names have recently been renamed.
   # These compatibility aliases are temporarily provided for backwards
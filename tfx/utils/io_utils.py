@@ -18,7 +18,7 @@ from __future__ import division
 from __future__ import print_function
 
 import os
-from typing import List, Text
+from typing import Any, Iterable, List, Text
 
 import tensorflow as tf
 
@@ -34,6 +34,9 @@ NANO_PER_SEC = 1000 * 1000 * 1000
 # If path starts with one of those, consider files are in remote filesystem.
 _REMOTE_FS_PREFIX = ['gs://', 'hdfs://', 's3://']
 
+# Size of the chunks files are read in when hashing their contents.
+_READ_CHUNK_SIZE_BYTES = 16 << 20
+
 
 def ensure_local(file_path: Text) -> Text:
   """Ensures that the given file path is made available locally."""
@@ -150,6 +153,49 @@ def generate_fingerprint(split_name: Text, file_pattern: Text) -> Text:
       split_name, len(files), total_bytes, xor_checksum, sum_checksum)
 
 
+def read_tfrecord_head(file_path: Text, limit: int) -> Iterable[bytes]:
+  """Yields up to limit first records of a TFRecord file.
+
+  Only the beginning of the file is read. Files ending with .gz are read as
+  GZIP compressed.
+
+  Args:
+    file_path: Path of the TFRecord file.
+    limit: Maximum number of records to read.
+  """
+  compression_type = 'GZIP' if file_path.endswith('.gz') else ''
+  for index, record in enumerate(
+      tf.compat.v1.io.tf_record_iterator(
+          file_path, tf.io.TFRecordOptions(compression_type))):
+    if index >= limit:
+      break
+    yield record
+
+
+def update_hash_with_dir_content(hasher: Any, dir_path: Text) -> None:
+  """Updates a hashlib hasher with the relative paths and contents of files.
+
+  Files are visited in a deterministic order and read in chunks, so that the
+  digest only depends on the content of dir_path.
+
+  Args:
+    hasher: A hashlib hash object, e.g. hashlib.sha256().
+    dir_path: Path of the directory to hash.
+  """
+  for dir_name, sub_dirs, leaf_files in tf.io.gfile.walk(dir_path):
+    sub_dirs.sort()
+    for leaf_file in sorted(leaf_files):
+      leaf_file_path = os.path.join(dir_name, leaf_file)
+      hasher.update(
+          tf.compat.as_bytes(os.path.relpath(leaf_file_path, dir_path)))
+      with tf.io.gfile.GFile(leaf_file_path, 'rb') as f:
+        while True:
+          chunk = f.read(_READ_CHUNK_SIZE_BYTES)
+          if not chunk:
+            break
+          hasher.update(chunk)
+
+
 class SchemaReader(object):
   """Schema reader."""
 
@@ -18,6 +18,7 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import hashlib
 import os
 # Standard Imports
 import mock
@@ -112,6 +113,32 @@ class IoUtilsTest(tf.test.TestCase):
         'split:split,num_files:2,total_bytes:15,xor_checksum:2,sum_checksum:4',
         fingerprint)
 
+  def testReadTfrecordHead(self):
+    file_path = os.path.join(self._base_dir, 'records', 'data.gz')
+    tf.io.gfile.makedirs(os.path.dirname(file_path))
+    with tf.io.TFRecordWriter(file_path, 'GZIP') as writer:
+      for i in range(5):
+        writer.write(tf.compat.as_bytes(str(i)))
+    self.assertEqual([b'0', b'1', b'2'],
+                     list(io_utils.read_tfrecord_head(file_path, 3)))
+    self.assertEqual(5, len(list(io_utils.read_tfrecord_head(file_path, 10))))
+
+  def testUpdateHashWithDirContent(self):
+
+    def _hash_dir(dir_path):
+      hasher = hashlib.sha256()
+      io_utils.update_hash_with_dir_content(hasher, dir_path)
+      return hasher.hexdigest()
+
+    d1_path = os.path.join(self._base_dir, 'hash1')
+    d2_path = os.path.join(self._base_dir, 'hash2')
+    for dir_path in (d1_path, d2_path):
+      io_utils.write_string_file(os.path.join(dir_path, 'a'), 'testing')
+      io_utils.write_string_file(os.path.join(dir_path, 'b', 'c'), 'testing2')
+    self.assertEqual(_hash_dir(d1_path), _hash_dir(d2_path))
+    io_utils.write_string_file(os.path.join(d2_path, 'b', 'c'), 'testing3')
+    self.assertNotEqual(_hash_dir(d1_path), _hash_dir(d2_path))
+
 
 if __name__ == '__main__':
   tf.test.main()